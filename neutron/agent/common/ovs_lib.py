@@ -863,6 +863,70 @@ class OVSBridge(BaseOVS):
             self._update_ingress_bw_limit_for_port(
                 port_name, max_bw_in_bits, max_burst_in_bits)
 
+    def set_egress_bw_limit_for_ports(self, limits):
+        """Set the egress bandwidth limit of several ports.
+
+        :param limits: dict of (max_kbps, max_burst_kbps) tuples by port
+                       name.
+        """
+        with self.ovsdb.transaction(check_error=True) as txn:
+            for port_name, (max_kbps, max_burst_kbps) in limits.items():
+                txn.add(self.ovsdb.db_set('Interface', port_name,
+                                          ('ingress_policing_rate', max_kbps)))
+                txn.add(self.ovsdb.db_set('Interface', port_name,
+                                          ('ingress_policing_burst',
+                                           max_burst_kbps)))
+
+    def update_ingress_bw_limit_for_ports(self, limits):
+        """Update the ingress bandwidth limit of several ports.
+
+        The QoS and Queue rows of the ports are read with one query per
+        table and written, along with the ports, in a single transaction.
+
+        :param limits: dict of (max_kbps, max_burst_kbps) tuples by port
+                       name.
+        """
+        port_types = {
+            port['name']: port['type'] for port in self.get_ports_attributes(
+                'Interface', columns=['name', 'type'], ports=list(limits),
+                if_exists=True)}
+        qoses = {}
+        for qos in self.ovsdb.db_list(
+                'QoS', columns=['_uuid', 'external_ids']).execute(
+                check_error=True):
+            if set(qos['external_ids']) == {'id'}:
+                qoses[qos['external_ids']['id']] = qos['_uuid']
+        queues = {}
+        for queue in self.ovsdb.db_list(
+                'Queue', columns=['_uuid', 'external_ids']).execute(
+                check_error=True):
+            if (set(queue['external_ids']) == {'id', 'queue_type'} and
+                    queue['external_ids']['queue_type'] ==
+                    str(QOS_DEFAULT_QUEUE)):
+                queues[queue['external_ids']['id']] = queue['_uuid']
+
+        with self.ovsdb.transaction(check_error=True) as txn:
+            for port_name, (max_kbps, max_burst_kbps) in limits.items():
+                max_bw_in_bits = max_kbps * p_const.SI_BASE
+                max_burst_in_bits = max_burst_kbps * p_const.SI_BASE
+                if port_types.get(port_name) in constants.OVS_DPDK_PORT_TYPES:
+                    # cir and cbs should be set in bytes instead of bits
+                    qos_uuid = self._update_bw_limit_profile_dpdk(
+                        txn, port_name, qoses.get(port_name),
+                        {'cir': str(max_bw_in_bits / 8),
+                         'cbs': str(max_burst_in_bits / 8)})
+                else:
+                    queue_uuid = self._update_bw_limit_queue(
+                        txn, port_name, queues.get(port_name),
+                        QOS_DEFAULT_QUEUE,
+                        {'max-rate': str(max_bw_in_bits),
+                         'burst': str(max_burst_in_bits)})
+                    qos_uuid = self._update_bw_limit_profile(
+                        txn, port_name, qoses.get(port_name), queue_uuid,
+                        QOS_DEFAULT_QUEUE, {'max-rate': str(max_bw_in_bits)})
+                txn.add(self.ovsdb.db_set(
+                    'Port', port_name, ('qos', qos_uuid)))
+
     def get_ingress_bw_limit_for_port(self, port_name):
         max_kbps = None
         qos_max_kbps = None
@@ -83,6 +83,21 @@ class QosAgentDriver(object):
         """
         self._handle_update_create_rules('update', port, qos_policy)
 
+    def update_ports(self, ports, qos_policy, old_qos_policy=None):
+        """Reapply QoS rules on a set of ports.
+
+        Drivers able to apply the rules of several ports at once should
+        override this method, by default the rules of old_qos_policy are
+        removed and the rules of qos_policy applied port by port.
+
+        :param ports: list of port objects.
+        :param qos_policy: the QoS policy to be applied on the ports.
+        :param old_qos_policy: the QoS policy to be removed from the ports.
+        """
+        for port in ports:
+            self.delete(port, old_qos_policy)
+            self.update(port, qos_policy)
+
     def delete(self, port, qos_policy=None):
         """Remove QoS rules from port.
 
@@ -286,12 +301,12 @@ class QosAgentExtension(l2_extension.L2AgentExtension):
         old_qos_policy = self.policy_map.get_policy(qos_policy.id)
         if old_qos_policy:
             if self._policy_rules_modified(old_qos_policy, qos_policy):
-                for port in self.policy_map.get_ports(qos_policy):
-                    # NOTE(QoS): for now, just reflush the rules on the port.
-                    #            Later, we may want to apply the difference
-                    #            between the old and new rule lists.
-                    self.qos_driver.delete(port, old_qos_policy)
-                    self.qos_driver.update(port, qos_policy)
+                # NOTE(QoS): for now, just reflush the rules on the ports.
+                #            Later, we may want to apply the difference
+                #            between the old and new rule lists.
+                self.qos_driver.update_ports(
+                    list(self.policy_map.get_ports(qos_policy)), qos_policy,
+                    old_qos_policy)
             self.policy_map.update_policy(qos_policy)
 
     def _process_reset_port(self, port):
@@ -481,7 +481,21 @@ class L3NATAgent(ha.AgentMixin,
         self._pool.resize(pool_size)
         self._pool_size = pool_size
 
+    def _cancel_namespace_cleanup(self, router_id, router):
+        """Keep the namespaces of a router from the stale namespace cleanup.
+
+        This covers the router namespaces and the floating IP namespace of
+        its external network, which may be needed for the first time when a
+        gateway is added to an existing router.
+        """
+        self.namespaces_manager.cancel_cleanup(router_id)
+        ext_net_id = (router.get('external_gateway_info') or {}).get(
+            'network_id')
+        if ext_net_id:
+            self.namespaces_manager.cancel_cleanup(ext_net_id)
+
     def _router_added(self, router_id, router):
+        self._cancel_namespace_cleanup(router_id, router)
         ri = self._create_router(router_id, router)
         registry.notify(resources.ROUTER, events.BEFORE_CREATE,
                         self, router=ri)
@@ -652,6 +666,7 @@ class L3NATAgent(ha.AgentMixin,
             if router.get('ha') and not is_dvr_only_agent and is_ha_router:
                 self.check_ha_state_for_router(
                     router['id'], router.get(lib_const.HA_ROUTER_STATE_KEY))
+            self._cancel_namespace_cleanup(router['id'], router)
             ri.router = router
             registry.notify(resources.ROUTER, events.BEFORE_UPDATE,
                             self, router=ri)
@@ -816,6 +831,9 @@ class L3NATAgent(ha.AgentMixin,
             self.fullsync = True
 
     def fetch_and_sync_all_routers(self, context, ns_manager):
+        # ARP notifications may have been missed, fetch the ports of the
+        # subnets again when the routers are processed.
+        self.clear_subnet_arp_entries()
         prev_router_ids = set(self.router_info)
         curr_router_ids = set()
         timestamp = timeutils.utcnow()
@@ -905,6 +923,7 @@ class L3NATAgent(ha.AgentMixin,
 
     def stop(self):
         LOG.info("Stopping L3 agent")
+        self.namespaces_manager.stop_cleanup()
         if self.conf.cleanup_on_shutdown:
             self._exiting = True
             for router in self.router_info.values():
@@ -14,13 +14,18 @@
 
 import weakref
 
+from neutron_lib import constants as lib_constants
+
 from neutron.agent.l3 import dvr_fip_ns
+from neutron.common import utils as common_utils
 
 
 class AgentMixin(object):
     def __init__(self, host):
         # dvr data
         self._fip_namespaces = weakref.WeakValueDictionary()
+        # subnet_id: {ip_address: mac_address} of the ports of the subnet
+        self._subnet_arp_entries = {}
         super(AgentMixin, self).__init__(host)
 
     def get_fip_ns(self, ext_net_id):
@@ -43,16 +48,64 @@ class AgentMixin(object):
     def get_ports_by_subnet(self, subnet_id):
         return self.plugin_rpc.get_ports_by_subnet(self.context, subnet_id)
 
+    def get_subnet_arp_entries(self, subnet_id):
+        """Return the ARP entries of the ports of a subnet.
+
+        The ports of a subnet are fetched from the server the first time
+        only, the entries are then kept up to date by the add_arp_entry and
+        del_arp_entry notifications until the next full sync, or until the
+        subnet is no longer attached to a router of this agent.
+        """
+        arp_entries = self._subnet_arp_entries.get(subnet_id)
+        if arp_entries is None:
+            ignored_device_owners = (
+                lib_constants.ROUTER_INTERFACE_OWNERS +
+                tuple(
+                    common_utils.get_dvr_allowed_address_pair_device_owners()))
+            arp_entries = {}
+            for p in self.get_ports_by_subnet(subnet_id):
+                if p['device_owner'] not in ignored_device_owners:
+                    for fixed_ip in p['fixed_ips']:
+                        arp_entries[fixed_ip['ip_address']] = p['mac_address']
+            self._subnet_arp_entries[subnet_id] = arp_entries
+        return arp_entries
+
+    def clear_subnet_arp_entries(self):
+        self._subnet_arp_entries.clear()
+
+    def release_subnet_arp_entries(self, port):
+        """Drop the ARP entries of the subnets of a removed internal port.
+
+        The notifications of a subnet are only sent to the agents hosting
+        a router attached to it, so the entries of a subnet no longer
+        attached to any other internal port of this agent are dropped.
+        """
+        subnet_ids = {fixed_ip['subnet_id'] for fixed_ip in port['fixed_ips']}
+        for ri in self.router_info.values():
+            for p in ri.internal_ports:
+                if p['id'] != port['id']:
+                    subnet_ids.difference_update(
+                        fixed_ip['subnet_id'] for fixed_ip in p['fixed_ips'])
+        for subnet_id in subnet_ids:
+            self._subnet_arp_entries.pop(subnet_id, None)
+
     def _update_arp_entry(self, context, payload, action):
+        arp_table = payload['arp_table']
+        ip = arp_table['ip_address']
+        mac = arp_table['mac_address']
+        subnet_id = arp_table['subnet_id']
+        arp_entries = self._subnet_arp_entries.get(subnet_id)
+        if arp_entries is not None:
+            if action == 'add':
+                arp_entries[ip] = mac
+            elif action == 'delete':
+                arp_entries.pop(ip, None)
+
         router_id = payload['router_id']
         ri = self.router_info.get(router_id)
         if not ri:
             return
 
-        arp_table = payload['arp_table']
-        ip = arp_table['ip_address']
-        mac = arp_table['mac_address']
-        subnet_id = arp_table['subnet_id']
         device, device_exists = ri.get_arp_related_dev(subnet_id)
         ri._update_arp_entry(ip, mac, subnet_id, action,
                              device,
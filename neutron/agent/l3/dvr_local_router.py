@@ -222,24 +222,25 @@ class DvrLocalRouter(dvr_router_base.DvrRouterBase):
 
     def _process_arp_cache_for_internal_port(self, subnet_id):
         """Function to process the cached arp entries."""
-        arp_remove = set()
+        arp_entries = {arp_entry for arp_entry in self._pending_arp_set
+                       if subnet_id == arp_entry.subnet_id}
+        if not arp_entries:
+            return
         device, device_exists = self.get_arp_related_dev(subnet_id)
-        for arp_entry in self._pending_arp_set:
-            if subnet_id == arp_entry.subnet_id:
-                try:
-                    state = self._update_arp_entry(
-                        arp_entry.ip, arp_entry.mac,
-                        arp_entry.subnet_id, arp_entry.operation,
-                        device=device,
-                        device_exists=device_exists)
-                except Exception:
-                    state = False
-                if state:
-                    # If the arp update was successful, then
-                    # go ahead and add it to the remove set
-                    arp_remove.add(arp_entry)
-
-        self._pending_arp_set -= arp_remove
+        if not device_exists:
+            return
+        try:
+            self._sync_arp_entries(
+                device, subnet_id,
+                [(arp_entry.ip, arp_entry.mac) for arp_entry in arp_entries
+                 if arp_entry.operation == 'add'],
+                [(arp_entry.ip, arp_entry.mac) for arp_entry in arp_entries
+                 if arp_entry.operation == 'delete'])
+        except Exception:
+            return
+        # If the arp update was successful, then
+        # go ahead and remove the entries from the cache
+        self._pending_arp_set -= arp_entries
 
     def _delete_arp_cache_for_internal_port(self, subnet_id):
         """Function to delete the cached arp entries."""
@@ -274,6 +275,20 @@ class DvrLocalRouter(dvr_router_base.DvrRouterBase):
             with excutils.save_and_reraise_exception():
                 LOG.exception("DVR: Failed updating arp entry")
 
+    def _sync_arp_entries(self, device, subnet_id, entries,
+                          delete_entries=None):
+        """Apply the ARP entries of a subnet in one batch on its device."""
+        try:
+            result = device.neigh.sync(entries, delete_entries=delete_entries)
+        except Exception:
+            with excutils.save_and_reraise_exception():
+                LOG.exception("DVR: Failed updating arp entries of subnet "
+                              "%s", subnet_id)
+        LOG.debug("DVR: arp entries of subnet %(subnet_id)s updated on "
+                  "device %(device)s: %(result)s",
+                  {'subnet_id': subnet_id, 'device': device.name,
+                   'result': result})
+
     def get_arp_related_dev(self, subnet_id):
         port = self._get_internal_port(subnet_id)
         # update arp entry only if the subnet is attached to the router
@@ -286,23 +301,17 @@ class DvrLocalRouter(dvr_router_base.DvrRouterBase):
 
     def _set_subnet_arp_info(self, subnet_id):
         """Set ARP info retrieved from Plugin for existing ports."""
-        # TODO(Carl) Can we eliminate the need to make this RPC while
-        # processing a router.
-        subnet_ports = self.agent.get_ports_by_subnet(subnet_id)
-        ignored_device_owners = (
-            lib_constants.ROUTER_INTERFACE_OWNERS +
-            tuple(common_utils.get_dvr_allowed_address_pair_device_owners()))
+        arp_entries = sorted(self.agent.get_subnet_arp_entries(
+            subnet_id).items())
         device, device_exists = self.get_arp_related_dev(subnet_id)
 
-        for p in subnet_ports:
-            if p['device_owner'] not in ignored_device_owners:
-                for fixed_ip in p['fixed_ips']:
-                    self._update_arp_entry(fixed_ip['ip_address'],
-                                           p['mac_address'],
-                                           subnet_id,
-                                           'add',
-                                           device=device,
-                                           device_exists=device_exists)
+        if device_exists:
+            self._sync_arp_entries(device, subnet_id, arp_entries)
+        else:
+            for ip, mac in arp_entries:
+                self._update_arp_entry(ip, mac, subnet_id, 'add',
+                                       device=device,
+                                       device_exists=device_exists)
         self._process_arp_cache_for_internal_port(subnet_id)
 
     @staticmethod
@@ -483,6 +492,7 @@ class DvrLocalRouter(dvr_router_base.DvrRouterBase):
     def internal_network_removed(self, port):
         self._dvr_internal_network_removed(port)
         super(DvrLocalRouter, self).internal_network_removed(port)
+        self.agent.release_subnet_arp_entries(port)
 
     def get_floating_agent_gw_interface(self, ext_net_id):
         """Filter Floating Agent GW port for the external network."""
@@ -13,8 +13,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import os
 import threading
+import time
 
 import eventlet
 from neutron_lib import constants
@@ -28,6 +30,11 @@ from neutron.notifiers import batch_notifier
 LOG = logging.getLogger(__name__)
 
 KEEPALIVED_STATE_CHANGE_SERVER_BACKLOG = 4096
+# Once a transition is due, the transitions queued within the next
+# STATE_CHANGE_BATCH_DELAY seconds are grouped with it, and the ones due within
+# STATE_CHANGE_BATCH_WINDOW seconds are processed in the same batch.
+STATE_CHANGE_BATCH_DELAY = 0.1
+STATE_CHANGE_BATCH_WINDOW = 0.5
 
 TRANSLATION_MAP = {'master': constants.HA_ROUTER_STATE_ACTIVE,
                    'backup': constants.HA_ROUTER_STATE_STANDBY,
@@ -75,6 +82,101 @@ class L3AgentKeepalivedStateChangeServer(object):
         server.wait()
 
 
+class HAStateTransitionPipeline(object):
+    """Groups the pending HA state transitions and processes them in batches.
+
+    The transitions to "master" are only due "ha_vrrp_advert_int" seconds
+    after they are queued, the others are due right away. Every batch is
+    processed by a pool of ``workers`` green threads, the routers with a
+    gateway and the most floating IPs first.
+    """
+
+    def __init__(self, agent, workers):
+        self.agent = agent
+        self.workers = workers
+        self._pending = {}
+        self._running = False
+        self._wakeup = eventlet.event.Event()
+        self.stats = collections.Counter()
+
+    def add(self, router_id, state):
+        now = time.time()
+        delay = self.agent.conf.ha_vrrp_advert_int if state == 'master' else 0
+        self._pending[router_id] = (state, now, now + delay)
+        if not self._running:
+            self._running = True
+            eventlet.spawn_n(self._dispatch)
+        elif not self._wakeup.ready():
+            self._wakeup.send()
+
+    def _dispatch(self):
+        try:
+            while self._pending:
+                now = time.time()
+                next_due = min(due for __, __, due in self._pending.values())
+                if next_due > now:
+                    with eventlet.Timeout(next_due - now, False):
+                        self._wakeup.wait()
+                    self._wakeup = eventlet.event.Event()
+                    continue
+                eventlet.sleep(STATE_CHANGE_BATCH_DELAY)
+                now = time.time()
+                batch = [(router_id, state, queued_at)
+                         for router_id, (state, queued_at, due) in
+                         self._pending.items()
+                         if due <= now + STATE_CHANGE_BATCH_WINDOW]
+                for router_id, __, __ in batch:
+                    del self._pending[router_id]
+                self._process_batch(batch)
+        finally:
+            self._running = False
+
+    def _get_priority(self, router_id, state):
+        ri = self.agent.router_info.get(router_id)
+        if not ri:
+            return (True, True, 0)
+        floating_ips = ri.router.get(constants.FLOATINGIP_KEY, [])
+        return (state != 'master', not ri.ex_gw_port, -len(floating_ips))
+
+    def _process_batch(self, batch):
+        start = time.time()
+        batch.sort(key=lambda t: self._get_priority(t[0], t[1]))
+        pool = eventlet.GreenPool(self.workers)
+        for router_id, state, queued_at in batch:
+            pool.spawn_n(self._process_transition, router_id, state,
+                         queued_at)
+        pool.waitall()
+        self.stats['batches'] += 1
+        self.stats['max_batch_size'] = max(self.stats['max_batch_size'],
+                                           len(batch))
+        LOG.info('Processed %(count)d HA router state transitions in '
+                 '%(time).3f seconds, stats: %(stats)s',
+                 {'count': len(batch), 'time': time.time() - start,
+                  'stats': dict(self.stats)})
+
+    def _process_transition(self, router_id, state, queued_at):
+        start = time.time()
+        try:
+            processed = self.agent._process_state_change(router_id, state)
+        except Exception:
+            LOG.exception('Failed to process the transition of router '
+                          '%(router_id)s to %(state)s',
+                          {'router_id': router_id, 'state': state})
+            self.stats['failed'] += 1
+            return
+        if not processed:
+            self.stats['skipped'] += 1
+            return
+        end = time.time()
+        self.stats['transitions'] += 1
+        self.stats['max_transition_time'] = max(
+            self.stats['max_transition_time'], end - start)
+        LOG.debug('Router %(router_id)s transition to %(state)s took '
+                  '%(time).3f seconds, %(total).3f seconds after it was '
+                  'queued', {'router_id': router_id, 'state': state,
+                             'time': end - start, 'total': end - queued_at})
+
+
 class AgentMixin(object):
     def __init__(self, host):
         self._init_ha_conf_path()
@@ -86,6 +188,10 @@ class AgentMixin(object):
         eventlet.spawn(self._start_keepalived_notifications_server)
         self._transition_states = {}
         self._transition_state_mutex = threading.Lock()
+        self._state_transition_pipeline = None
+        if self.conf.ha_state_change_workers:
+            self._state_transition_pipeline = HAStateTransitionPipeline(
+                self, self.conf.ha_state_change_workers)
 
     def _get_router_info(self, router_id):
         try:
@@ -140,22 +246,29 @@ class AgentMixin(object):
         :param state: ['master', 'backup']
         """
         if not self._update_transition_state(router_id, state):
-            eventlet.spawn_n(self._enqueue_state_change, router_id, state)
+            if self._state_transition_pipeline:
+                self._state_transition_pipeline.add(router_id, state)
+            else:
+                eventlet.spawn_n(self._enqueue_state_change, router_id, state)
             eventlet.sleep(0)
 
     def _enqueue_state_change(self, router_id, state):
         # NOTE(ralonsoh): move 'master' and 'backup' constants to n-lib
         if state == 'master':
             eventlet.sleep(self.conf.ha_vrrp_advert_int)
+        self._process_state_change(router_id, state)
+
+    def _process_state_change(self, router_id, state):
+        """Apply a due state transition, return whether it was applied."""
         if self._update_transition_state(router_id) != state:
             # If the current "transition state" is not the initial "state" sent
             # to update the router, that means the actual router state is the
             # same as the "transition state" (e.g.: backup-->master-->backup).
-            return
+            return False
 
         ri = self._get_router_info(router_id)
         if ri is None:
-            return
+            return False
 
         state_change_data = {"router_id": router_id, "state": state,
                              "host": ri.agent.host}
@@ -184,6 +297,7 @@ class AgentMixin(object):
         self.pd.process_ha_state(router_id, state == 'master')
         self.state_change_notifier.queue_event((router_id, state))
         self.l3_ext_manager.ha_state_change(self.context, state_change_data)
+        return True
 
     def _configure_ipv6_params(self, ri, state):
         if not self.use_ipv6:
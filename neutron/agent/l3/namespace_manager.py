@@ -10,6 +10,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import time
+
+import eventlet
+from eventlet import event
 from oslo_log import log as logging
 
 from neutron.agent.l3 import dvr_fip_ns
@@ -34,7 +38,8 @@ class NamespaceManager(object):
     to communicate. In the "with" statement, the agent calls keep_router to
     record the id's of the routers whose namespaces should be preserved.
     Any other router and snat namespace present in the system will be deleted
-    by the __exit__ method of this context manager
+    by the __exit__ method of this context manager, or by a background task
+    when "namespace_cleanup_workers" is set.
 
     This pattern can be more generally applicable to other resources
     besides namespaces in the future because it is idempotent and, as such,
@@ -58,6 +63,12 @@ class NamespaceManager(object):
         self.agent_conf = agent_conf
         self.driver = driver
         self._clean_stale = True
+        # namespace name: (prefix, id) of the stale namespaces to delete
+        self._stale_namespaces = {}
+        # namespace name: (id, event sent once deleted) of the stale
+        # namespaces handed to the background cleanup pool
+        self._deleting = {}
+        self._cleanup_thread = None
         self.metadata_driver = metadata_driver
         if metadata_driver:
             self.process_monitor = external_process.ProcessMonitor(
@@ -86,10 +97,96 @@ class NamespaceManager(object):
             _ns_prefix, ns_id = self.get_prefix_and_id(ns)
             if ns_id in self._ids_to_keep:
                 continue
-            self._cleanup(_ns_prefix, ns_id)
+            self._stale_namespaces[ns] = (_ns_prefix, ns_id)
+
+        if self.agent_conf.namespace_cleanup_workers:
+            self._cleanup_thread = eventlet.spawn(
+                self._cleanup_stale_in_background, len(self._all_namespaces))
+        else:
+            self._cleanup_stale(len(self._all_namespaces))
 
         return True
 
+    def _cleanup_stale_in_background(self, scanned):
+        try:
+            self._cleanup_stale(scanned)
+        except Exception:
+            LOG.exception('Failed to clean up the stale namespaces')
+        finally:
+            self._cleanup_thread = None
+
+    def _cleanup_stale(self, scanned):
+        """Delete the stale namespaces and report how long it took."""
+        start = time.time()
+        workers = self.agent_conf.namespace_cleanup_workers
+        rate_limit = self.agent_conf.namespace_cleanup_rate_limit
+        pool = eventlet.GreenPool(workers) if workers else None
+        results = []
+        while self._stale_namespaces:
+            if pool and rate_limit and results:
+                eventlet.sleep(1.0 / rate_limit)
+                if not self._stale_namespaces:
+                    break
+            ns, (ns_prefix, ns_id) = self._stale_namespaces.popitem()
+            if pool:
+                # NOTE: record the deletion before spawning it, spawn() waits
+                # for a free worker.
+                deleted = event.Event()
+                self._deleting[ns] = (ns_id, deleted)
+                results.append(pool.spawn(self._cleanup_stale_namespace, ns,
+                                          ns_prefix, ns_id, deleted))
+            else:
+                results.append(self._cleanup(ns_prefix, ns_id))
+        if pool:
+            results = [thread.wait() for thread in results]
+        LOG.info('Stale namespaces cleanup: %(scanned)d namespaces scanned, '
+                 '%(removed)d removed, %(failed)d failed in %(time).3f '
+                 'seconds',
+                 {'scanned': scanned, 'removed': results.count(True),
+                  'failed': results.count(False),
+                  'time': time.time() - start})
+
+    def _cleanup_stale_namespace(self, ns, ns_prefix, ns_id, deleted):
+        try:
+            return self._cleanup(ns_prefix, ns_id)
+        except Exception:
+            LOG.exception('Failed to destroy stale namespace %s', ns)
+            return False
+        finally:
+            del self._deleting[ns]
+            deleted.send()
+
+    def cancel_cleanup(self, resource_id):
+        """Do not delete the namespaces of a router or external network.
+
+        The namespaces of a router or external network processed after the
+        full synchronization may still be queued for deletion by the
+        background cleanup. The queued deletions are cancelled and the ones
+        already started are waited for, so that the namespaces are only
+        created again once deleted.
+        """
+        for ns, (_ns_prefix, ns_id) in list(self._stale_namespaces.items()):
+            if ns_id == resource_id:
+                del self._stale_namespaces[ns]
+        for ns, (ns_id, deleted) in list(self._deleting.items()):
+            if ns_id == resource_id:
+                LOG.debug('Waiting for the deletion of namespace %s', ns)
+                deleted.wait()
+
+    def stop_cleanup(self):
+        """Stop the background cleanup of the stale namespaces.
+
+        The queued deletions are dropped and the ones already started are
+        waited for, so that no namespace is left half deleted.
+        """
+        cleanup_thread = self._cleanup_thread
+        if not cleanup_thread:
+            return
+        LOG.info('Stopping the stale namespaces cleanup, %d namespaces not '
+                 'deleted', len(self._stale_namespaces))
+        self._stale_namespaces.clear()
+        cleanup_thread.wait()
+
     def keep_router(self, router_id):
         self._ids_to_keep.add(router_id)
 
@@ -143,3 +240,5 @@ class NamespaceManager(object):
             ns.delete()
         except RuntimeError:
             LOG.exception('Failed to destroy stale namespace %s', ns)
+            return False
+        return True
@@ -11,16 +11,20 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
+import collections
 import re
+import time
 
 import eventlet
 import netaddr
 from neutron_lib import constants
 from neutron_lib import exceptions
 from oslo_concurrency import lockutils
+from oslo_config import cfg
 from oslo_log import log as logging
 
 from neutron.agent.linux import utils as linux_utils
+from neutron.privileged.agent.linux import netlink_lib
 
 LOG = logging.getLogger(__name__)
 CONTRACK_MGRS = {}
@@ -40,6 +44,7 @@ class IpConntrackUpdate(object):
         self.device_info_list = device_info_list
         self.rule = rule
         self.remote_ips = remote_ips
+        self.queued_at = time.time()
 
     def __repr__(self):
         return ('<IpConntrackUpdate(device_info_list=%s, rule=%s, '
@@ -53,9 +58,18 @@ def get_conntrack(get_rules_for_table_func, filtered_ports, unfiltered_ports,
     try:
         return CONTRACK_MGRS[namespace]
     except KeyError:
-        ipconntrack = IpConntrackManager(get_rules_for_table_func,
-                                         filtered_ports, unfiltered_ports,
-                                         execute, namespace, zone_per_port)
+        manager_cls = IpConntrackManager
+        if cfg.CONF.SECURITYGROUP.conntrack_backend == 'netlink':
+            if namespace or not netlink_lib.nfct_lib:
+                LOG.warning("The netlink conntrack backend cannot be used "
+                            "%s, falling back to the conntrack tool",
+                            'in namespace %s' % namespace if namespace else
+                            'without libnetfilter_conntrack')
+            else:
+                manager_cls = IpNetlinkConntrackManager
+        ipconntrack = manager_cls(get_rules_for_table_func,
+                                  filtered_ports, unfiltered_ports,
+                                  execute, namespace, zone_per_port)
         CONTRACK_MGRS[namespace] = ipconntrack
         return CONTRACK_MGRS[namespace]
 
@@ -111,6 +125,10 @@ class IpConntrackManager(object):
         update = IpConntrackUpdate(device_info_list, rule, remote_ips)
         self._queue.put(update)
 
+    @property
+    def queue_depth(self):
+        return self._queue.qsize()
+
     @staticmethod
     def _generate_conntrack_cmd_by_rule(rule, namespace):
         ethertype = rule.get('ethertype')
@@ -130,10 +148,8 @@ class IpConntrackManager(object):
         cmd_ns.extend(cmd)
         return cmd_ns
 
-    def _get_conntrack_cmds(self, device_info_list, rule, remote_ip=None):
-        conntrack_cmds = set()
-        cmd = self._generate_conntrack_cmd_by_rule(rule, self.namespace)
-        ethertype = rule.get('ethertype')
+    def _get_device_zone_ips(self, device_info_list, ethertype):
+        """Yield the (zone, IP network) of the devices fixed IPs."""
         for device_info in device_info_list:
             zone_id = self.get_device_zone(device_info, create=False)
             if not zone_id:
@@ -145,17 +161,24 @@ class IpConntrackManager(object):
             ips = device_info.get('fixed_ips', [])
             for ip in ips:
                 net = netaddr.IPNetwork(ip)
-                if str(net.version) not in ethertype:
-                    continue
-                ip_cmd = [str(net.ip), '-w', zone_id]
-                if remote_ip and str(
-                        netaddr.IPNetwork(remote_ip).version) in ethertype:
-                    if rule.get('direction') == 'ingress':
-                        direction = '-s'
-                    else:
-                        direction = '-d'
-                    ip_cmd.extend([direction, str(remote_ip)])
-                conntrack_cmds.add(tuple(cmd + ip_cmd))
+                if str(net.version) in ethertype:
+                    yield zone_id, net
+
+    def _get_conntrack_cmds(self, device_info_list, rule, remote_ip=None):
+        conntrack_cmds = set()
+        cmd = self._generate_conntrack_cmd_by_rule(rule, self.namespace)
+        ethertype = rule.get('ethertype')
+        for zone_id, net in self._get_device_zone_ips(device_info_list,
+                                                      ethertype):
+            ip_cmd = [str(net.ip), '-w', zone_id]
+            if remote_ip and str(
+                    netaddr.IPNetwork(remote_ip).version) in ethertype:
+                if rule.get('direction') == 'ingress':
+                    direction = '-s'
+                else:
+                    direction = '-d'
+                ip_cmd.extend([direction, str(remote_ip)])
+            conntrack_cmds.add(tuple(cmd + ip_cmd))
         return conntrack_cmds
 
     def _delete_conntrack_state(self, device_info_list, rule, remote_ip=None):
@@ -254,3 +277,122 @@ class IpConntrackManager(object):
                 return index + ZONE_START
         # conntrack zones exhausted :( :(
         raise exceptions.CTZoneExhaustedError()
+
+
+class IpNetlinkConntrackManager(IpConntrackManager):
+    """IpConntrackManager deleting the conntrack entries through netlink.
+
+    A single worker drains the queue and deletes the entries matching all
+    the queued updates in one dump and delete pass of the conntrack table,
+    instead of running the conntrack tool once per device address, zone and
+    remote address. The matching entries of the protocols other than TCP,
+    UDP and ICMP, and the entries of the rules with a protocol name unknown
+    to neutron, are deleted with the conntrack tool.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.stats = collections.Counter()
+        super(IpNetlinkConntrackManager, self).__init__(*args, **kwargs)
+
+    def _start_process_queue(self):
+        LOG.debug("Starting ip_conntrack _process_queue_worker() thread")
+        eventlet.spawn_n(self._process_queue_worker)
+
+    def _process_queue(self):
+        updates = []
+        try:
+            # this will block until an entry gets added to the queue
+            updates.append(self._queue.get())
+            while not self._queue.empty():
+                updates.append(self._queue.get_nowait())
+            self._delete_conntrack_state_of_updates(updates)
+        except Exception:
+            LOG.exception("Failed to process ip_conntrack queue entries: %s",
+                          updates)
+
+    def _get_conntrack_filters(self, device_info_list, rule, remote_ip=None):
+        """Return the netlink filters of a rule, None if it has none.
+
+        A rule has no netlink filters when its protocol name is unknown to
+        neutron.
+        """
+        conntrack_filters = set()
+        protocol = rule.get('protocol')
+        if protocol is not None:
+            protocol = str(protocol).lower()
+            protocol = (int(protocol) if protocol.isdigit() else
+                        constants.IP_PROTOCOL_MAP.get(protocol))
+            if protocol is None:
+                return None
+            # 0 is IP in /etc/protocols, it matches any protocol
+            protocol = protocol or None
+        ethertype = rule.get('ethertype')
+        for zone_id, net in self._get_device_zone_ips(device_info_list,
+                                                      ethertype):
+            device_ip, other_ip = str(net.ip), None
+            if remote_ip:
+                remote_net = netaddr.IPNetwork(remote_ip)
+                if str(remote_net.version) in ethertype:
+                    other_ip = str(remote_net.ip)
+            if rule.get('direction') == 'ingress':
+                src, dst = other_ip, device_ip
+            else:
+                src, dst = device_ip, other_ip
+            conntrack_filters.add((net.version, zone_id, protocol, src, dst))
+        return conntrack_filters
+
+    def _delete_conntrack_state_by_filters(self, conntrack_filters):
+        """Delete the entries matching filters with the conntrack tool.
+
+        This is used for the entries of the protocols the netlink library
+        cannot delete.
+        """
+        for ipversion, zone_id, protocol, src, dst in conntrack_filters:
+            cmd = ['conntrack', '-D', '-p', str(protocol),
+                   '-f', 'ipv%s' % ipversion, '-w', str(zone_id)]
+            if src:
+                cmd.extend(['-s', src])
+            if dst:
+                cmd.extend(['-d', dst])
+            try:
+                self.execute(cmd, run_as_root=True, check_exit_code=True,
+                             extra_ok_codes=[1])
+            except RuntimeError:
+                LOG.exception("Failed execute conntrack command %s", cmd)
+
+    def _delete_conntrack_state_of_updates(self, updates):
+        start = time.time()
+        conntrack_filters = set()
+        for update in updates:
+            for remote_ip in update.remote_ips or [None]:
+                update_filters = self._get_conntrack_filters(
+                    update.device_info_list, update.rule, remote_ip)
+                if update_filters is None:
+                    # Let the conntrack tool resolve the protocol name
+                    self._delete_conntrack_state(
+                        update.device_info_list, update.rule, remote_ip)
+                    continue
+                conntrack_filters |= update_filters
+        deleted = 0
+        if conntrack_filters:
+            deleted, unparsed_filters = (
+                netlink_lib.delete_entries_by_filters(
+                    list(conntrack_filters)))
+            self._delete_conntrack_state_by_filters(unparsed_filters)
+        latency = start - min(update.queued_at for update in updates)
+        self.stats['updates'] += len(updates)
+        self.stats['passes'] += 1
+        self.stats['deleted_entries'] += deleted
+        self.stats['max_queue_depth'] = max(self.stats['max_queue_depth'],
+                                            len(updates))
+        self.stats['max_queue_latency'] = max(
+            self.stats['max_queue_latency'], latency)
+        LOG.debug("Deleted %(deleted)d conntrack entries matching "
+                  "%(filters)d filters for %(updates)d queued updates in "
+                  "%(time).3f seconds, oldest update queued %(latency).3f "
+                  "seconds ago, %(depth)d updates left in the queue, stats: "
+                  "%(stats)s",
+                  {'deleted': deleted, 'filters': len(conntrack_filters),
+                   'updates': len(updates), 'time': time.time() - start,
+                   'latency': latency, 'depth': self.queue_depth,
+                   'stats': dict(self.stats)})
@@ -680,6 +680,12 @@ class IpNeighCommand(IpDeviceCommandBase):
                                   self._parent.namespace,
                                   **kwargs)
 
+    def sync(self, entries, delete_entries=None):
+        return sync_neigh_entries(entries,
+                                  self.name,
+                                  self._parent.namespace,
+                                  delete_entries=delete_entries)
+
     def flush(self, ip_version, ip_address):
         """Flush neighbour entries
 
@@ -895,6 +901,29 @@ def dump_neigh_entries(ip_version, device=None, namespace=None, **kwargs):
                                               **kwargs))
 
 
+def sync_neigh_entries(entries, device, namespace=None, delete_entries=None):
+    """Add and delete neighbour entries of a device in one privileged call.
+
+    The entries already present with the same MAC address are left
+    untouched.
+
+    :param entries: list of (ip_address, mac_address) of the entries to add
+    :param device: Device name of the entries
+    :param namespace: The name of the namespace of the device
+    :param delete_entries: list of (ip_address, mac_address) of the entries
+                           to delete
+    :return: a dictionary with the number of 'added', 'deleted' and
+             'unchanged' entries
+    """
+    def _with_ip_version(_entries):
+        return [(common_utils.get_ip_version(ip_address), ip_address,
+                 mac_address) for ip_address, mac_address in _entries or []]
+
+    return privileged.sync_neigh_entries(
+        device, namespace, _with_ip_version(entries),
+        delete_entries=_with_ip_version(delete_entries))
+
+
 def create_network_namespace(namespace, **kwargs):
     """Create a network namespace.
 
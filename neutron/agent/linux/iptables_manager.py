@@ -789,6 +789,54 @@ class IptablesManager(object):
 
         return acc
 
+    def get_traffic_counters_bulk(self, chains, wrap=True):
+        """Return the sum of the traffic counters of the rules of each chain.
+
+        Each table holding any of the chains is listed once, instead of
+        once per chain. The counters are not reset, as "-L -Z" without a
+        chain name would reset the counters of all the chains of the table.
+
+        :returns: a dictionary of counters indexed by chain. The chains which
+                  do not exist are not included.
+        """
+        names = {}
+        cmd_tables = []
+        for chain in chains:
+            chain_cmd_tables = self._get_traffic_counters_cmd_tables(chain,
+                                                                     wrap)
+            if not chain_cmd_tables:
+                LOG.warning('Attempted to get traffic counters of chain %s '
+                            'which does not exist', chain)
+                continue
+            names[get_chain_name(chain, wrap)] = chain
+            cmd_tables += [cmd_table for cmd_table in chain_cmd_tables
+                           if cmd_table not in cmd_tables]
+
+        accs = {chain: {'pkts': 0, 'bytes': 0} for chain in names.values()}
+        for cmd, table in cmd_tables:
+            args = [cmd, '-t', table, '-L', '-n', '-v', '-x',
+                    '-w', self.xlock_wait_time]
+            if self.namespace:
+                args = ['ip', 'netns', 'exec', self.namespace] + args
+            current_table = self.execute(args, run_as_root=True)
+
+            # Each chain is listed as a "Chain <name> ..." line and a header
+            # line, followed by its rules and an empty line
+            acc = None
+            for line in current_table.split('\n'):
+                data = line.split()
+                if not data:
+                    acc = None
+                elif data[0] == 'Chain' and len(data) > 1:
+                    chain = names.get(data[1])
+                    acc = accs[chain] if chain else None
+                elif (acc is not None and len(data) >= 2 and
+                        data[0].isdigit() and data[1].isdigit()):
+                    acc['pkts'] += int(data[0])
+                    acc['bytes'] += int(data[1])
+
+        return accs
+
 
 def _generate_path_between_rules(old_rules, new_rules):
     """Generates iptables commands to get from old_rules to new_rules.
@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import math
 import re
 
@@ -24,6 +25,7 @@ from oslo_log import log as logging
 from pyroute2.iproute import linux as iproute_linux
 from pyroute2.netlink import rtnl
 from pyroute2.netlink.rtnl.tcmsg import common as rtnl_common
+from pyroute2 import protocols as pyroute2_protocols
 
 from neutron._i18n import _
 from neutron.agent.linux import ip_lib
@@ -281,9 +283,17 @@ class TcCommand(ip_lib.IPDevice):
                             namespace=self.namespace)
 
     def update_filters_bw_limit(self, bw_limit, burst_limit):
-        self.delete_filters_bw_limit()
-        add_tc_qdisc(self.name, 'ingress', namespace=self.namespace)
-        return self._add_policy_filter(bw_limit, burst_limit)
+        operations = TcOperations(self.name, namespace=self.namespace)
+        # NOTE(slaweq): For limit traffic egress from instance we need to use
+        # qdisc "ingress" because it is ingress traffic from interface POV:
+        operations.delete_qdisc(is_ingress=True)
+        operations.add_qdisc(TC_QDISC_TYPE_INGRESS)
+        # NOTE(slaweq): it is made in exactly same way how openvswitch is doing
+        # it when configuing ingress traffic limit on port. It can be found in
+        # lib/netdev-linux.c#L4698 in openvswitch sources:
+        operations.add_filter_policy(INGRESS_QDISC_ID, bw_limit, burst_limit,
+                                     MAX_MTU_VALUE, 'drop', priority=49)
+        operations.apply()
 
     def delete_filters_bw_limit(self):
         # NOTE(slaweq): For limit traffic egress from instance we need to use
@@ -297,14 +307,6 @@ class TcCommand(ip_lib.IPDevice):
                         raise_interface_not_found=False,
                         raise_qdisc_not_found=False, namespace=self.namespace)
 
-    def _add_policy_filter(self, bw_limit, burst_limit,
-                           qdisc_id=INGRESS_QDISC_ID):
-        # NOTE(slaweq): it is made in exactly same way how openvswitch is doing
-        # it when configuing ingress traffic limit on port. It can be found in
-        # lib/netdev-linux.c#L4698 in openvswitch sources:
-        add_tc_filter_policy(self.name, qdisc_id, bw_limit, burst_limit,
-                             MAX_MTU_VALUE, 'drop', priority=49)
-
 
 def add_tc_qdisc(device, qdisc_type, parent=None, handle=None, latency_ms=None,
                  max_kbps=None, burst_kb=None, kernel_hz=None,
@@ -331,6 +333,15 @@ def add_tc_qdisc(device, qdisc_type, parent=None, handle=None, latency_ms=None,
 
     [1] https://lartc.org/howto/lartc.qdisc.classful.html
     """
+    args = _get_tc_qdisc_args(qdisc_type, parent=parent, handle=handle,
+                              latency_ms=latency_ms, max_kbps=max_kbps,
+                              burst_kb=burst_kb, kernel_hz=kernel_hz)
+    priv_tc_lib.add_tc_qdisc(device, namespace=namespace, **args)
+
+
+def _get_tc_qdisc_args(qdisc_type, parent=None, handle=None, latency_ms=None,
+                       max_kbps=None, burst_kb=None, kernel_hz=None):
+    """Return the pyroute2 arguments to add a TC qdisc, see add_tc_qdisc"""
     if qdisc_type and qdisc_type not in TC_QDISC_TYPES:
         raise qos_exc.TcLibQdiscTypeError(
             qdisc_type=qdisc_type, supported_qdisc_types=TC_QDISC_TYPES)
@@ -350,7 +361,7 @@ def add_tc_qdisc(device, qdisc_type, parent=None, handle=None, latency_ms=None,
         args['latency'] = latency_ms * 1000
     if parent:
         args['parent'] = rtnl.TC_H_ROOT if parent == 'root' else parent
-    priv_tc_lib.add_tc_qdisc(device, namespace=namespace, **args)
+    return args
 
 
 def list_tc_qdiscs(device, namespace=None):
@@ -361,6 +372,10 @@ def list_tc_qdiscs(device, namespace=None):
     :return: (list) TC qdiscs
     """
     qdiscs = priv_tc_lib.list_tc_qdiscs(device, namespace=namespace)
+    return _parse_tc_qdiscs(qdiscs)
+
+
+def _parse_tc_qdiscs(qdiscs):
     retval = []
     for qdisc in qdiscs:
         qdisc_attrs = {
@@ -419,6 +434,15 @@ def add_tc_policy_class(device, parent, classid, max_kbps, min_kbps=None,
     :return:
     """
     parent = TC_QDISC_PARENT.get(parent, parent)
+    kwargs = _get_tc_policy_class_args(device, parent, classid, max_kbps,
+                                       min_kbps=min_kbps, burst_kb=burst_kb)
+    priv_tc_lib.add_tc_policy_class(device, parent, classid, 'htb',
+                                    namespace=namespace, **kwargs)
+
+
+def _get_tc_policy_class_args(device, parent, classid, max_kbps,
+                              min_kbps=None, burst_kb=None):
+    """Return the pyroute2 rate arguments of a TC HTB policy class"""
     if not burst_kb:
         burst_kb = max_kbps * qos_consts.DEFAULT_BURST_RATE
 
@@ -441,9 +465,7 @@ def add_tc_policy_class(device, parent, classid, max_kbps, min_kbps=None,
                      'qdisc': parent, 'classid': classid})
         rate = min_rate
     kwargs['rate'] = rate
-
-    priv_tc_lib.add_tc_policy_class(device, parent, classid, 'htb',
-                                    namespace=namespace, **kwargs)
+    return kwargs
 
 
 def list_tc_policy_class(device, namespace=None):
@@ -453,6 +475,12 @@ def list_tc_policy_class(device, namespace=None):
     :param namespace: (string) (optional) namespace name
     :return: (list) TC policy classes
     """
+    tc_classes = priv_tc_lib.list_tc_policy_classes(device,
+                                                    namespace=namespace)
+    return _parse_tc_policy_classes(device, tc_classes, namespace=namespace)
+
+
+def _parse_tc_policy_classes(device, tc_classes, namespace=None):
     def get_params(tca_options, qdisc_type):
         if qdisc_type not in TC_QDISC_TYPES:
             return None, None, None
@@ -465,8 +493,6 @@ def list_tc_policy_class(device, namespace=None):
         min_kbps = int(tca_params['rate'] * 8 / 1024)
         return max_kbps, min_kbps, burst_kb
 
-    tc_classes = priv_tc_lib.list_tc_policy_classes(device,
-                                                    namespace=namespace)
     classes = []
     for tc_class in tc_classes:
         index = tc_class['index']
@@ -562,13 +588,17 @@ def add_tc_filter_policy(device, parent, rate_kbps, burst_kb, mtu, action,
     :param namespace: (string) (optional) namespace name
 
     """
-    rate = int(rate_kbps * 1024 / 8)
-    burst = int(burst_kb * 1024 / 8)
+    rate, burst = _get_tc_filter_policy_rate(rate_kbps, burst_kb)
     priv_tc_lib.add_tc_filter_policy(device, parent, priority, rate, burst,
                                      mtu, action, protocol=protocol,
                                      namespace=namespace)
 
 
+def _get_tc_filter_policy_rate(rate_kbps, burst_kb):
+    """Return the rate (bytes/second) and burst (bytes) of a policy filter"""
+    return int(rate_kbps * 1024 / 8), int(burst_kb * 1024 / 8)
+
+
 def list_tc_filters(device, parent, namespace=None):
     """List TC filter in a device
 
@@ -581,35 +611,130 @@ def list_tc_filters(device, parent, namespace=None):
     filters = priv_tc_lib.list_tc_filters(device, parent, namespace=namespace)
     retval = []
     for filter in filters:
-        tca_options = _get_attr(filter, 'TCA_OPTIONS')
-        if not tca_options:
-            continue
-        tca_u32_sel = _get_attr(tca_options, 'TCA_U32_SEL')
-        if not tca_u32_sel:
-            continue
-        keys = []
-        for key in tca_u32_sel['keys']:
-            key_off = key['key_off']
-            value = 0
-            for i in range(4):
-                value = (value << 8) + (key_off & 0xff)
-                key_off = key_off >> 8
-            keys.append({'value': value,
-                         'mask': key['key_val'],
-                         'offset': key['key_offmask']})
-
-        value = {'keys': keys}
-
-        tca_u32_police = _get_attr(tca_options, 'TCA_U32_POLICE')
-        if tca_u32_police:
-            tca_police_tbf = _get_attr(tca_u32_police, 'TCA_POLICE_TBF')
-            if tca_police_tbf:
-                value['rate_kbps'] = int(tca_police_tbf['rate'] * 8 / 1024)
-                value['burst_kb'] = int(
-                    _calc_burst(tca_police_tbf['rate'],
-                                tca_police_tbf['burst']) * 8 / 1024)
-                value['mtu'] = tca_police_tbf['mtu']
-
-        retval.append(value)
+        value = _parse_tc_filter(filter)
+        if value:
+            retval.append(value)
 
     return retval
+
+
+def _parse_tc_filter(filter):
+    """Return the keys and policy of a TC u32 filter, None if it has none"""
+    tca_options = _get_attr(filter, 'TCA_OPTIONS')
+    if not tca_options:
+        return
+    tca_u32_sel = _get_attr(tca_options, 'TCA_U32_SEL')
+    if not tca_u32_sel:
+        return
+    keys = []
+    for key in tca_u32_sel['keys']:
+        key_off = key['key_off']
+        value = 0
+        for i in range(4):
+            value = (value << 8) + (key_off & 0xff)
+            key_off = key_off >> 8
+        keys.append({'value': value,
+                     'mask': key['key_val'],
+                     'offset': key['key_offmask']})
+
+    value = {'keys': keys}
+
+    tca_u32_police = _get_attr(tca_options, 'TCA_U32_POLICE')
+    if tca_u32_police:
+        tca_police_tbf = _get_attr(tca_u32_police, 'TCA_POLICE_TBF')
+        if tca_police_tbf:
+            value['rate_kbps'] = int(tca_police_tbf['rate'] * 8 / 1024)
+            value['burst_kb'] = int(
+                _calc_burst(tca_police_tbf['rate'],
+                            tca_police_tbf['burst']) * 8 / 1024)
+            value['mtu'] = tca_police_tbf['mtu']
+
+    return value
+
+
+def dump_tc_state(device, namespace=None):
+    """Return the TC qdiscs, policy classes and filters of a device
+
+    Everything is read in a single privileged call, e.g. to compare the
+    current state of a device with the expected one before applying any
+    change.
+
+    :param device: (string) device name
+    :param namespace: (string) (optional) namespace name
+    :return: (dict) 'qdiscs' and 'classes', as returned by list_tc_qdiscs and
+             list_tc_policy_class, and 'filters', the filters returned by
+             list_tc_filters for every qdisc, by qdisc handle ('ffff:0')
+    """
+    state = priv_tc_lib.dump_tc_state(device, namespace=namespace)
+    filters = collections.defaultdict(list)
+    for filter in state['filters']:
+        value = _parse_tc_filter(filter)
+        if value:
+            filters[_handle_from_hex_to_string(filter['parent'])].append(
+                value)
+    return {'qdiscs': _parse_tc_qdiscs(state['qdiscs']),
+            'classes': _parse_tc_policy_classes(device, state['classes'],
+                                                namespace=namespace),
+            'filters': dict(filters)}
+
+
+class TcOperations(object):
+    """TC operations on a device, applied in a single privileged call
+
+    The operations are applied in the order they are added. The arguments of
+    every method are the ones of the module function doing the same
+    operation (add_tc_qdisc, delete_tc_qdisc, add_tc_policy_class...).
+    Deleting a qdisc or a policy class that does not exist is not an error.
+    """
+
+    def __init__(self, device, namespace=None):
+        self.device = device
+        self.namespace = namespace
+        self.operations = []
+
+    def add_qdisc(self, qdisc_type, parent=None, handle=None, latency_ms=None,
+                  max_kbps=None, burst_kb=None, kernel_hz=None):
+        self.operations.append(('replace', _get_tc_qdisc_args(
+            qdisc_type, parent=parent, handle=handle, latency_ms=latency_ms,
+            max_kbps=max_kbps, burst_kb=burst_kb, kernel_hz=kernel_hz)))
+
+    def delete_qdisc(self, parent=None, is_ingress=False):
+        args = {}
+        if is_ingress:
+            args['kind'] = TC_QDISC_TYPE_INGRESS
+        if parent:
+            args['parent'] = rtnl.TC_H_ROOT if parent == 'root' else parent
+        self.operations.append(('del', args))
+
+    def add_policy_class(self, parent, classid, max_kbps, min_kbps=None,
+                         burst_kb=None):
+        parent = TC_QDISC_PARENT.get(parent, parent)
+        args = _get_tc_policy_class_args(self.device, parent, classid,
+                                         max_kbps, min_kbps=min_kbps,
+                                         burst_kb=burst_kb)
+        args.update(kind=TC_QDISC_TYPE_HTB, handle=classid, parent=parent)
+        self.operations.append(('replace-class', args))
+
+    def delete_policy_class(self, parent, classid):
+        self.operations.append(('del-class', {'handle': classid,
+                                              'parent': parent}))
+
+    def add_filter_policy(self, parent, rate_kbps, burst_kb, mtu, action,
+                          priority=0, protocol=None):
+        rate, burst = _get_tc_filter_policy_rate(rate_kbps, burst_kb)
+        self.operations.append(('add-filter', {
+            'kind': 'u32', 'parent': parent, 'prio': priority,
+            'protocol': protocol or pyroute2_protocols.ETH_P_ALL,
+            'rate': rate, 'burst': burst, 'mtu': mtu, 'action': action,
+            'keys': ['0x0/0x0'], 'target': 1}))
+
+    def apply(self):
+        if not self.operations:
+            return
+        priv_tc_lib.apply_tc_operations(self.device, self.operations,
+                                        namespace=self.namespace)
+        LOG.debug('Applied %(count)d TC operations on device %(device)s, '
+                  'namespace %(namespace)s',
+                  {'count': len(self.operations), 'device': self.device,
+                   'namespace': self.namespace})
+        self.operations = []
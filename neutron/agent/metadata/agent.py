@@ -12,8 +12,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import hashlib
 import hmac
+import threading
 
 from neutron_lib.agent import topics
 from neutron_lib import constants
@@ -31,7 +33,9 @@ import webob
 
 from neutron._i18n import _
 from neutron.agent.linux import utils as agent_utils
+from neutron.agent import resource_cache
 from neutron.agent import rpc as agent_rpc
+from neutron.api.rpc.callbacks import resources
 from neutron.common import cache_utils as cache
 from neutron.common import ipv6_utils
 from neutron.conf.agent.metadata import config
@@ -80,6 +84,14 @@ class MetadataProxyHandler(object):
         self.plugin_rpc = MetadataPluginAPI(topics.PLUGIN)
         self.context = context.get_admin_context_without_session()
 
+        # The port cache is created in the worker processes, once the
+        # requests start to be served
+        self._port_cache = None
+        self._port_cache_lock = threading.Lock()
+        self._port_cache_networks = set()
+        self._port_cache_routers = set()
+        self.port_cache_stats = collections.Counter()
+
     @webob.dec.wsgify(RequestClass=webob.Request)
     def __call__(self, req):
         try:
@@ -156,18 +168,75 @@ class MetadataProxyHandler(object):
         :param skip_cache: when have to skip getting entry from cache
 
         """
+        if not (network_id or router_id):
+            raise TypeError(_("Either one of parameter network_id or router_id"
+                              " must be passed to _get_ports method."))
+
+        if self.conf.metadata_port_push_cache and not skip_cache:
+            return self._get_ports_from_port_cache(remote_address,
+                                                   network_id=network_id,
+                                                   router_id=router_id)
+
         if network_id:
             networks = (network_id,)
-        elif router_id:
+        else:
             networks = self._get_router_networks(router_id,
                                                  skip_cache=skip_cache)
-        else:
-            raise TypeError(_("Either one of parameter network_id or router_id"
-                              " must be passed to _get_ports method."))
 
         return self._get_ports_for_remote_address(remote_address, networks,
                                                   skip_cache=skip_cache)
 
+    def _get_port_cache(self):
+        with self._port_cache_lock:
+            if self._port_cache is None:
+                port_cache = resource_cache.RemoteResourceCache(
+                    [resources.PORT])
+                port_cache.start_watcher()
+                self._port_cache = port_cache
+        return self._port_cache
+
+    def _get_ports_from_port_cache(self, remote_address, network_id=None,
+                                   router_id=None):
+        """Search the ports with the given ip address in the port cache.
+
+        The first query for a network (or a router) loads all its ports
+        with a single RPC call, the cache is kept up to date afterwards by
+        the port updates and deletions pushed by the server.
+        """
+        port_cache = self._get_port_cache()
+        hit = True
+        if network_id:
+            networks = (network_id,)
+        else:
+            hit = router_id in self._port_cache_routers
+            router_ports = port_cache.get_resources(
+                resources.PORT,
+                {'device_id': (router_id,),
+                 'device_owner': tuple(constants.ROUTER_INTERFACE_OWNERS)})
+            self._port_cache_routers.add(router_id)
+            networks = tuple({p.network_id for p in router_ports})
+
+        hit = hit and self._port_cache_networks.issuperset(networks)
+        ports = []
+        if networks:
+            ports = port_cache.get_resources(
+                resources.PORT, {'network_id': networks})
+            self._port_cache_networks.update(networks)
+        ports = [{'device_id': p.device_id,
+                  'tenant_id': p.project_id,
+                  'network_id': p.network_id} for p in ports
+                 if any(str(ip.ip_address) == remote_address
+                        for ip in p.fixed_ips)]
+
+        self.port_cache_stats['hits' if hit else 'misses'] += 1
+        if not hit:
+            LOG.debug("Port cache miss for remote address %(remote_address)s "
+                      "(hits: %(hits)d, misses: %(misses)d)",
+                      {'remote_address': remote_address,
+                       'hits': self.port_cache_stats['hits'],
+                       'misses': self.port_cache_stats['misses']})
+        return ports
+
     def _get_instance_and_tenant_id(self, req, skip_cache=False):
         remote_address = req.headers.get('X-Forwarded-For')
         network_id = req.headers.get('X-Neutron-Network-ID')
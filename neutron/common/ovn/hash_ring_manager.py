@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import datetime
 
 from oslo_log import log
@@ -33,9 +34,15 @@ class HashRingManager(object):
     def __init__(self, group_name):
         self._hash_ring = None
         self._last_time_loaded = None
+        self._last_time_checked = None
+        self._nodes_marker = None
         self._cache_startup_timeout = True
         self._group = group_name
         self.admin_ctx = context.get_admin_context()
+        # Number of lookups, of loads of the active nodes from the database,
+        # of checks of their change marker, and of builds and updates of the
+        # ring
+        self.stats = collections.Counter()
 
     @property
     def _wait_startup_before_caching(self):
@@ -61,32 +68,83 @@ class HashRingManager(object):
 
         return dont_cache
 
+    def _get_nodes_marker(self):
+        self.stats['checks'] += 1
+        return db_hash_ring.get_active_nodes_marker(
+            self.admin_ctx, constants.HASH_RING_NODES_TIMEOUT, self._group)
+
+    def _load_nodes(self, marker):
+        # NOTE: the marker is read before the nodes, a change in between
+        # only causes the nodes to be loaded again on the next check.
+        nodes = db_hash_ring.get_active_node_uuids(
+            self.admin_ctx,
+            constants.HASH_RING_NODES_TIMEOUT, self._group)
+        self.stats['loads'] += 1
+        self._update_hash_ring(nodes)
+        self._nodes_marker = marker
+        self._last_time_loaded = self._last_time_checked = timeutils.utcnow()
+
     def _load_hash_ring(self, refresh=False):
-        cache_timeout = timeutils.utcnow() - datetime.timedelta(
+        now = timeutils.utcnow()
+        cache_timeout = now - datetime.timedelta(
             seconds=constants.HASH_RING_CACHE_TIMEOUT)
+        load_timeout = now - datetime.timedelta(
+            seconds=constants.HASH_RING_NODES_TIMEOUT)
 
-        # Refresh the cache if:
+        # Load the nodes if:
         # - Refreshed is forced (refresh=True)
-        # - Service just started (_wait_startup_before_caching)
         # - Hash Ring is not yet instantiated
-        # - Cache has timed out
+        # - The nodes were last loaded a heartbeat expiry ago, as a node
+        #   coming back while another one expires leaves the marker as is
         if (refresh or
-                self._wait_startup_before_caching or
                 self._hash_ring is None or
                 not self._hash_ring.nodes or
-                cache_timeout >= self._last_time_loaded):
-            nodes = db_hash_ring.get_active_nodes(
-                self.admin_ctx,
-                constants.HASH_RING_NODES_TIMEOUT, self._group)
-            self._hash_ring = hashring.HashRing({node.node_uuid
-                                                 for node in nodes})
-            self._last_time_loaded = timeutils.utcnow()
+                load_timeout >= self._last_time_loaded):
+            self._load_nodes(self._get_nodes_marker())
+        # Otherwise only check the change marker of the nodes if:
+        # - Service just started (_wait_startup_before_caching)
+        # - Cache has timed out
+        elif (self._wait_startup_before_caching or
+                cache_timeout >= self._last_time_checked):
+            marker = self._get_nodes_marker()
+            if marker != self._nodes_marker:
+                self._load_nodes(marker)
+            else:
+                self._last_time_checked = timeutils.utcnow()
+
+    def _update_hash_ring(self, nodes):
+        # NOTE: The nodes are touched periodically but the membership of
+        # the ring only changes when a node is added, removed or its
+        # heartbeat expires. Only the nodes that joined or left the ring
+        # are applied to it, so the partitions are not recomputed on every
+        # load.
+        if self._hash_ring is None:
+            self._hash_ring = hashring.HashRing(nodes)
+            self.stats['builds'] += 1
+            return
+
+        current_nodes = set(self._hash_ring.nodes)
+        added = nodes - current_nodes
+        removed = current_nodes - nodes
+        if not (added or removed):
+            return
+
+        LOG.debug('Hash ring membership of group %(group)s changed, nodes '
+                  'added: %(added)s, removed: %(removed)s',
+                  {'group': self._group, 'added': sorted(added),
+                   'removed': sorted(removed)})
+        for node in removed:
+            self._hash_ring.remove_node(node)
+        if added:
+            self._hash_ring.add_nodes(added)
+        self.stats['updates'] += 1
 
     def refresh(self):
         self._load_hash_ring(refresh=True)
 
     def get_node(self, key):
         self._load_hash_ring()
+        self.stats['lookups'] += 1
 
         # tooz expects a byte string for the hash
         if isinstance(key, six.string_types):
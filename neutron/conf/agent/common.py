@@ -112,6 +112,18 @@ keep a XenAPI session to pass commands to Dom0.
 """)),
 ]
 
+NETLINK_SOCKET_POOL_OPTS = [
+    cfg.IntOpt('netlink_socket_pool_size', default=0, min=0,
+               help=_("Number of network namespaces whose netlink sockets "
+                      "are kept open by the privsep daemon, to be reused by "
+                      "the next privileged IP and traffic control "
+                      "operations in the same namespace. The sockets of the "
+                      "least recently used namespace are closed when this "
+                      "number is exceeded, and the sockets of a namespace "
+                      "are closed when it is deleted. 0 opens a new socket "
+                      "for every operation.")),
+]
+
 AGENT_STATE_OPTS = [
     cfg.FloatOpt('report_interval', default=30,
                  help=_('Seconds between nodes reporting state to server; '
@@ -216,6 +228,10 @@ def register_root_helper(conf=cfg.CONF):
     conf.register_opts(ROOT_HELPER_OPTS, 'AGENT')
 
 
+def register_netlink_socket_pool_opts(conf=cfg.CONF):
+    conf.register_opts(NETLINK_SOCKET_POOL_OPTS, 'AGENT')
+
+
 def register_agent_state_opts_helper(conf):
     conf.register_opts(AGENT_STATE_OPTS, 'AGENT')
 
@@ -41,6 +41,16 @@ AGENT_OPTS = [
                        "enable_new_agents=False. In the case, user's "
                        "resources will not be scheduled automatically to the "
                        "agent until admin changes admin_state_up to True.")),
+    cfg.IntOpt('agent_full_update_interval', default=0, min=0,
+               help=_("When set, the server only updates the heartbeat "
+                      "timestamp of an agent reporting its state if the "
+                      "content of the report (configurations, resource "
+                      "versions, load...) did not change since the last "
+                      "report it handled for that agent. The whole agent "
+                      "record is still rewritten when the report changes, "
+                      "when the agent starts or revives, and at least every "
+                      "agent_full_update_interval seconds. The default of 0 "
+                      "rewrites the whole agent record on every report.")),
 ]
 
 
@@ -42,6 +42,24 @@ AGENTS_SCHEDULER_OPTS = [
                        'selected for automatic scheduling regardless of this '
                        'option. But manual scheduling to such agents is '
                        'available if this option is True.')),
+    cfg.IntOpt('agent_reschedule_batch_size', default=0, min=0,
+               help=_('Number of resources rescheduled per batch when '
+                      'moving routers and networks away from dead agents. '
+                      'In batch mode the liveness of every dead agent is '
+                      'checked once, every resource is rescheduled once '
+                      'even if it was hosted by several dead agents, and '
+                      'the agents the resources are moved to are notified '
+                      'once per batch where their RPC API allows it. The '
+                      'default of 0 reschedules the resources one binding '
+                      'at a time.')),
+    cfg.IntOpt('dhcp_auto_schedule_batch_size', default=0, min=0,
+               help=_('Number of networks bound per chunk when auto '
+                      'scheduling networks to a DHCP agent. When set, the '
+                      'networks the agent should host are found with a '
+                      'single query instead of a few queries per network, '
+                      'and the scheduler yields to other requests between '
+                      'the chunks. The default of 0 keeps checking the '
+                      'networks one by one.')),
 ]
 
 
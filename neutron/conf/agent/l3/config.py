@@ -106,6 +106,19 @@ OPTS = [
                        'the state change monitor. NOTE: Setting to True '
                        'could affect the data plane when stopping or '
                        'restarting the L3 agent.')),
+    cfg.IntOpt('namespace_cleanup_workers', default=0, min=0,
+               help=_('Number of stale router, SNAT and floating IP '
+                      'namespaces deleted concurrently after the first full '
+                      'synchronization of the routers. When set, the stale '
+                      'namespaces are deleted by a background task, without '
+                      'blocking the processing of the routers. The default '
+                      'of 0 deletes them one by one at the end of the full '
+                      'synchronization.')),
+    cfg.FloatOpt('namespace_cleanup_rate_limit', default=0, min=0,
+                 help=_('Maximum number of stale namespaces whose deletion '
+                        'is started per second by the background namespace '
+                        'cleanup enabled with namespace_cleanup_workers. 0 '
+                        'means no limit.')),
 ]
 
 
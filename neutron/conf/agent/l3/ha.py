@@ -54,6 +54,16 @@ OPTS = [
                       'as master, and master election will be repeated '
                       'in round-robin fashion, until one of the router '
                       'restore the gateway connection.')),
+    cfg.IntOpt('ha_state_change_workers',
+               default=0,
+               min=0,
+               help=_('Number of HA router state transitions processed '
+                      'concurrently. When set, the pending transitions are '
+                      'grouped and processed in batches, the routers with '
+                      'a gateway and the most floating IPs first, and the '
+                      'time spent on every transition is logged. The '
+                      'default of 0 processes every transition in its own '
+                      'green thread as soon as it is due.')),
 ]
 
 
@@ -72,7 +72,15 @@ METADATA_PROXY_HANDLER_OPTS = [
                help=_("Client certificate for nova metadata api server.")),
     cfg.StrOpt('nova_client_priv_key',
                default='',
-               help=_("Private key of client certificate."))
+               help=_("Private key of client certificate.")),
+    cfg.BoolOpt('metadata_port_push_cache', default=False,
+                help=_("Resolve the instance of the metadata requests from "
+                       "a cache of the ports of each network, loaded with a "
+                       "single RPC call the first time a network or router "
+                       "is queried and kept up to date with the port "
+                       "updates pushed by the Neutron server, instead of "
+                       "querying the server for each request. Only used by "
+                       "the neutron-metadata-agent."))
 ]
 
 
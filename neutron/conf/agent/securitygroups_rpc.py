@@ -42,7 +42,22 @@ security_group_opts = [
         default=[],
         help=_('Comma-separated list of ethertypes to be permitted, in '
                'hexadecimal (starting with "0x"). For example, "0x4008" '
-               'to permit InfiniBand.'))
+               'to permit InfiniBand.')),
+    cfg.StrOpt(
+        'conntrack_backend',
+        default='conntrack',
+        choices=['conntrack', 'netlink'],
+        help=_('Backend used by the iptables based firewall drivers to '
+               'delete the conntrack entries of removed rules and remote '
+               'group members. "conntrack" runs the conntrack tool once per '
+               'device address, zone and remote address. "netlink" '
+               'coalesces the queued updates and deletes the matching '
+               'entries of all of them in one dump and delete pass of the '
+               'conntrack table through netlink; it requires '
+               'libnetfilter_conntrack, deletes the matching entries of '
+               'the other protocols than TCP, UDP and ICMP with the '
+               'conntrack tool and falls back to "conntrack" for firewalls '
+               'running in a namespace.'))
 ]
 
 
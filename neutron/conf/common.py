@@ -110,6 +110,30 @@ core_opts = [
     cfg.IntOpt('send_events_interval', default=2,
                help=_('Number of seconds between sending events to nova if '
                       'there are any events to send.')),
+    cfg.BoolOpt('send_events_coalesce', default=False,
+                help=_('Send only the last of the events for the same '
+                       'server, port and event name found in a batch of '
+                       'events to send to nova.')),
+    cfg.IntOpt('send_events_max_batch_size', default=0, min=0,
+               help=_('Maximum number of events sent to nova in a single '
+                      'request; bigger batches are sent in several requests. '
+                      'When set, the interval between two sends is also '
+                      'reduced as the number of pending events grows, down '
+                      'to no wait once that many events are pending. If '
+                      'this is zero, which is the default, all the pending '
+                      'events are sent at once every send_events_interval '
+                      'seconds.')),
+    cfg.IntOpt('placement_full_sync_interval', default=0, min=0,
+               help=_('When set, the placement report service plugin '
+                      'remembers the placement state last synchronized for '
+                      'each agent and only sends the resource providers, '
+                      'traits and inventories which changed since, sending '
+                      'the full state of an agent again after this number '
+                      'of seconds. The full state is also sent when the '
+                      'resource providers of the agent changed in placement '
+                      'since, or when the last synchronization failed. If '
+                      'this is zero, which is the default, the full state '
+                      'of an agent is sent on every synchronization.')),
     cfg.StrOpt('setproctitle', default='on',
                help=_("Set process name to match child worker role. "
                       "Available options are: 'off' - retains the previous "
@@ -27,6 +27,21 @@ L3_AGENTS_SCHEDULER_OPTS = [
     cfg.BoolOpt('allow_automatic_l3agent_failover', default=False,
                 help=_('Automatically reschedule routers from offline L3 '
                        'agents to online L3 agents.')),
+    cfg.StrOpt('router_scheduler_load_metric', default='routers',
+               choices=['routers', 'interfaces', 'floatingips'],
+               help=_('Resource used by the LeastLoadScheduler router '
+                      'scheduler to weigh the routers hosted by an L3 '
+                      'agent. With "routers" every router weighs 1, with '
+                      '"interfaces" or "floatingips" every router weighs 1 '
+                      'plus its number of interfaces or floating IPs.')),
+    cfg.IntOpt('router_scheduler_load_refresh_interval', default=60,
+               min=1,
+               help=_('Seconds the LeastLoadScheduler router scheduler '
+                      'keeps its in-memory view of the L3 agents load '
+                      'before rebuilding it from the database. The view is '
+                      'updated with the routers bound by the scheduler in '
+                      'between, but not with the routers unbound or bound '
+                      'by other server workers.')),
 ]
 
 
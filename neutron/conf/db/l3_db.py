@@ -0,0 +1,34 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+from oslo_config import cfg
+
+from neutron._i18n import _
+
+
+L3_DB_OPTS = [
+    cfg.IntOpt('router_sync_cache_ttl', default=0, min=0,
+               help=_('Number of seconds the sync payload built for a '
+                      'router by get_sync_data is cached and served to the '
+                      'L3 agents. A cached payload is rebuilt when the '
+                      'revision number or the L3 agent bindings of the '
+                      'router, or the revision numbers of its ports, '
+                      'floating IPs and of the networks and subnets of its '
+                      'ports change, including when they are changed by '
+                      'another server process. The default of '
+                      '0 disables the cache.')),
+]
+
+
+def register_db_l3_opts(conf=cfg.CONF):
+    conf.register_opts(L3_DB_OPTS)
@@ -65,7 +65,16 @@ ml2_opts = [
     cfg.IntOpt('overlay_ip_version',
                default=4,
                help=_("IP version of all overlay (tunnel) network endpoints. "
-                      "Use a value of 4 for IPv4 or 6 for IPv6."))
+                      "Use a value of 4 for IPv4 or 6 for IPv6.")),
+    cfg.BoolOpt('bulk_port_binding',
+                default=False,
+                help=_("If True, ports created through a bulk request are "
+                       "bound in groups sharing host, network and vnic_type, "
+                       "reusing the host agents lookup within each group, "
+                       "and all resulting bindings are committed in a single "
+                       "transaction. Ports whose binding fails or can not be "
+                       "committed in bulk fall back to the individual "
+                       "binding process."))
 ]
 
 
@@ -0,0 +1,35 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from oslo_config import cfg
+
+from neutron._i18n import _
+
+
+l2pop_opts = [
+    cfg.IntOpt('fdb_cache_ttl',
+               default=0,
+               min=0,
+               help=_("Time in seconds a per network FDB view is kept in "
+                      "memory by the l2population mechanism driver. The view "
+                      "is built from the database the first time an agent "
+                      "needs the full FDB of a network. It is then updated "
+                      "with the ports changed since, including the changes "
+                      "made by other API or RPC workers, which are found "
+                      "with a query on their revision numbers. A value of 0 "
+                      "disables the cache and the full FDB is always queried "
+                      "from the database.")),
+]
+
+
+def register_l2pop_opts(cfg=cfg.CONF):
+    cfg.register_opts(l2pop_opts, "l2pop")
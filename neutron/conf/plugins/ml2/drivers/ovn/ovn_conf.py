@@ -83,6 +83,17 @@ ovn_opts = [
                       'connection keepalive feature. If non-zero the value '
                       'will be forced to at least 1000 milliseconds. Defaults '
                       'to 60 seconds.')),
+    cfg.IntOpt('ovsdb_txn_coalesce_window',
+               min=0,
+               default=0,
+               help=_('Time window in milliseconds during which the OVN '
+                      'Northbound transactions committed by concurrent '
+                      'requests are gathered and committed as a single '
+                      'OVSDB transaction. Each request still gets the '
+                      'result of its own commands; if the merged '
+                      'transaction fails, the gathered transactions are '
+                      'committed individually. If this is zero, which is '
+                      'the default, transactions are not coalesced.')),
     cfg.StrOpt('neutron_sync_mode',
                default='log',
                choices=('off', 'log', 'repair'),
@@ -98,6 +109,27 @@ ovn_opts = [
                       ' create resources found in Neutron but not in OVN.'
                       ' Also remove resources from OVN'
                       ' that are no longer in Neutron.')),
+    cfg.IntOpt('neutron_sync_chunk_size',
+               min=0,
+               default=0,
+               help=_('Number of Neutron networks, along with their ports '
+                      'and subnets, processed at a time by the OVN '
+                      'Northbound DB synchronization. When set, the '
+                      'switching and routing resources are also '
+                      'synchronized in parallel. If this is zero, which is '
+                      'the default, all the resources are loaded at once '
+                      'and synchronized serially.')),
+    cfg.IntOpt('maintenance_batch_size',
+               min=0,
+               default=0,
+               help=_('Number of inconsistent resources of the same type '
+                      'fixed at a time by the OVN DB maintenance task. '
+                      'The Neutron objects of each batch are loaded with a '
+                      'single query and the fixes are run concurrently, so '
+                      'their OVN Northbound transactions can be merged '
+                      'when ovsdb_txn_coalesce_window is set. If this is '
+                      'zero, which is the default, the resources are fixed '
+                      'one by one.')),
     cfg.BoolOpt('ovn_l3_mode',
                 default=True,
                 deprecated_for_removal=True,
@@ -248,10 +280,22 @@ def get_ovn_ovsdb_probe_interval():
     return cfg.CONF.ovn.ovsdb_probe_interval
 
 
+def get_ovn_ovsdb_txn_coalesce_window():
+    return cfg.CONF.ovn.ovsdb_txn_coalesce_window
+
+
 def get_ovn_neutron_sync_mode():
     return cfg.CONF.ovn.neutron_sync_mode
 
 
+def get_ovn_neutron_sync_chunk_size():
+    return cfg.CONF.ovn.neutron_sync_chunk_size
+
+
+def get_ovn_maintenance_batch_size():
+    return cfg.CONF.ovn.maintenance_batch_size
+
+
 def is_ovn_l3():
     return cfg.CONF.ovn.ovn_l3_mode
 
@@ -177,6 +177,11 @@ agent_opts = [
                        "egress packets will be taken care of in the final "
                        "egress tables direct output flows for unicast "
                        "traffic.")),
+    cfg.BoolOpt('trunk_bulk_wiring', default=False,
+                help=_("Create the patch ports of all the subports of a "
+                       "trunk, and update the trunk metadata, in a single "
+                       "OVSDB transaction. If that transaction fails, the "
+                       "subports are wired one by one.")),
 ]
 
 
@@ -32,6 +32,25 @@ log_driver_opts = [
     cfg.StrOpt(
         'local_output_log_base',
         help=_('Output logfile path on agent side, default syslog file.')),
+    cfg.IntOpt(
+        'packet_log_queue_size',
+        default=0,
+        min=0,
+        help=_('Maximum number of packets queued to be logged. When set, '
+               'the packets sent to the agent are logged asynchronously '
+               'and the ones received while the queue is full are dropped '
+               'and counted. If this is zero, which is the default, each '
+               'packet is logged as soon as it is received.')),
+    cfg.IntOpt(
+        'packet_log_aggregation_window',
+        default=0,
+        min=0,
+        help=_('Time window in seconds during which the queued packets '
+               'matching the same logging flow are aggregated into a single '
+               'log entry, with the number of packets and the time the '
+               'first and last ones were received. Only used when '
+               'packet_log_queue_size is set. If this is zero, which is '
+               'the default, every packet is logged.')),
 ]
 
 
@@ -25,6 +25,12 @@ metering_agent_opts = [
                help=_("Interval between two metering measures")),
     cfg.IntOpt('report_interval', default=300,
                help=_("Interval between two metering reports")),
+    cfg.BoolOpt('bulk_traffic_counters', default=False,
+                help=_("Read the traffic counters of all the metering labels "
+                       "of a router with a single iptables command per "
+                       "table, instead of one command per label. The "
+                       "counters are not reset by the reads, the agent "
+                       "reports the differences with the previous read.")),
 ]
 
 
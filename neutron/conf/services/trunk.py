@@ -0,0 +1,29 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from oslo_config import cfg
+
+from neutron._i18n import _
+
+trunk_opts = [
+    cfg.BoolOpt('trunk_bulk_subport_operations', default=False,
+                help=_('Validate, add and remove the subports of a trunk '
+                       'with a fixed number of database queries per request '
+                       'instead of a few queries per subport, and skip the '
+                       'binding update of the subports already bound to '
+                       'the host of the trunk when an agent asks for them '
+                       'to be bound.')),
+]
+
+
+def register_trunk_opts(cfg=cfg.CONF):
+    cfg.register_opts(trunk_opts)
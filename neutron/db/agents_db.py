@@ -13,8 +13,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import copy
 import datetime
+import hashlib
 
 from eventlet import greenthread
 from neutron_lib.agent import constants as agent_consts
@@ -179,9 +181,22 @@ class AgentAvailabilityZoneMixin(az_ext.AvailabilityZonePluginBase):
             raise az_exc.AvailabilityZoneNotFound(availability_zone=diff.pop())
 
 
+AgentReport = collections.namedtuple(
+    'AgentReport', ['agent_id', 'digest', 'admin_state_up', 'updated_at',
+                    'heartbeat_at'])
+
+
 class AgentDbMixin(ext_agent.AgentPluginBase, AgentAvailabilityZoneMixin):
     """Mixin class to add agent extension to db_base_plugin_v2."""
 
+    @property
+    def _agent_reports(self):
+        # Last report written by this process, per (agent_type, host).
+        if not hasattr(self, '_agent_report_cache'):
+            self._agent_report_cache = {}
+            self.agent_report_stats = collections.Counter()
+        return self._agent_report_cache
+
     def _get_agent(self, context, id):
         agent = agent_obj.Agent.get_object(context, id=id)
         if not agent:
@@ -270,6 +285,7 @@ class AgentDbMixin(ext_agent.AgentPluginBase, AgentAvailabilityZoneMixin):
                          payload=events.DBEventPayload(
                              context, states=(agent,), resource_id=id))
         agent.delete()
+        self._agent_reports.pop((agent.agent_type, agent.host), None)
 
     @db_api.retry_if_session_inactive()
     def update_agent(self, context, id, agent):
@@ -278,6 +294,7 @@ class AgentDbMixin(ext_agent.AgentPluginBase, AgentAvailabilityZoneMixin):
             agent = self._get_agent(context, id)
             agent.update_fields(agent_data)
             agent.update()
+        self._agent_reports.pop((agent.agent_type, agent.host), None)
         return self._make_agent_dict(agent)
 
     @db_api.retry_if_session_inactive()
@@ -368,6 +385,48 @@ class AgentDbMixin(ext_agent.AgentPluginBase, AgentAvailabilityZoneMixin):
                       'delta': delta,
                       'agent_timestamp': agent_timestamp})
 
+    @staticmethod
+    def _get_agent_report_digest(res):
+        return hashlib.sha1(
+            jsonutils.dumps(res, sort_keys=True).encode()).hexdigest()
+
+    def _get_heartbeat_only_report(self, agent_state, digest, current_time):
+        """Return the last report of an agent if only a heartbeat is needed.
+
+        That is the case when the content of the report did not change since
+        the last full update done by this process, that update is recent
+        enough and the agent is still considered alive.
+        """
+        interval = cfg.CONF.agent_full_update_interval
+        if (not interval or agent_state.get('start_flag') or
+                agent_state.get('configurations', {}).get(
+                    'log_agent_heartbeats')):
+            return
+        report = self._agent_reports.get(
+            (agent_state['agent_type'], agent_state['host']))
+        if (not report or report.digest != digest or
+                timeutils.delta_seconds(report.updated_at,
+                                        current_time) >= interval or
+                utils.is_agent_down(report.heartbeat_at)):
+            return
+        return report
+
+    def _update_agent_heartbeat(self, context, agent_state, report,
+                                current_time):
+        with db_api.CONTEXT_WRITER.using(context):
+            updated = context.session.query(agent_model.Agent).filter_by(
+                id=report.agent_id).update(
+                    {'heartbeat_timestamp': current_time},
+                    synchronize_session=False)
+        if not updated:
+            # The agent was deleted by another server
+            return False
+        self._agent_reports[agent_state['agent_type'],
+                            agent_state['host']] = report._replace(
+                                heartbeat_at=current_time)
+        self.agent_report_stats['heartbeat_only'] += 1
+        return True
+
     @db_api.retry_if_session_inactive()
     def create_or_update_agent(self, context, agent_state,
                                agent_timestamp=None):
@@ -378,19 +437,41 @@ class AgentDbMixin(ext_agent.AgentPluginBase, AgentAvailabilityZoneMixin):
         It could be used by agent to do some sync with the server if needed.
         """
         status = agent_consts.AGENT_ALIVE
+        res_keys = ['agent_type', 'binary', 'host', 'topic']
+        res = dict((k, agent_state[k]) for k in res_keys)
+        if 'availability_zone' in agent_state:
+            res['availability_zone'] = agent_state['availability_zone']
+        configurations_dict = agent_state.get('configurations', {})
+        res['configurations'] = jsonutils.dumps(configurations_dict)
+        resource_versions_dict = agent_state.get('resource_versions')
+        if resource_versions_dict:
+            res['resource_versions'] = jsonutils.dumps(
+                resource_versions_dict)
+        res['load'] = self._get_agent_load(agent_state)
+        current_time = timeutils.utcnow()
+        digest = self._get_agent_report_digest(res)
+
+        report = self._get_heartbeat_only_report(agent_state, digest,
+                                                 current_time)
+        if report and self._update_agent_heartbeat(context, agent_state,
+                                                   report, current_time):
+            agent_state_orig = copy.deepcopy(agent_state)
+            agent_state['agent_status'] = status
+            agent_state['admin_state_up'] = report.admin_state_up
+            registry.publish(resources.AGENT, events.AFTER_UPDATE, self,
+                             payload=events.DBEventPayload(
+                                 context=context, metadata={
+                                     'host': agent_state['host'],
+                                     'plugin': self,
+                                     'status': status
+                                 },
+                                 states=(agent_state_orig, ),
+                                 desired_state=agent_state,
+                                 resource_id=report.agent_id
+                             ))
+            return status, agent_state
+
         with db_api.CONTEXT_WRITER.using(context):
-            res_keys = ['agent_type', 'binary', 'host', 'topic']
-            res = dict((k, agent_state[k]) for k in res_keys)
-            if 'availability_zone' in agent_state:
-                res['availability_zone'] = agent_state['availability_zone']
-            configurations_dict = agent_state.get('configurations', {})
-            res['configurations'] = jsonutils.dumps(configurations_dict)
-            resource_versions_dict = agent_state.get('resource_versions')
-            if resource_versions_dict:
-                res['resource_versions'] = jsonutils.dumps(
-                    resource_versions_dict)
-            res['load'] = self._get_agent_load(agent_state)
-            current_time = timeutils.utcnow()
             try:
                 agent = self._get_agent_by_type_and_host(
                     context, agent_state['agent_type'], agent_state['host'])
@@ -429,6 +510,10 @@ class AgentDbMixin(ext_agent.AgentPluginBase, AgentAvailabilityZoneMixin):
                 status = agent_consts.AGENT_NEW
             greenthread.sleep(0)
 
+        self._agent_reports[agent_state['agent_type'], agent_state['host']] = (
+            AgentReport(agent.id, digest, agent.admin_state_up, current_time,
+                        current_time))
+        self.agent_report_stats['full'] += 1
         agent_state['agent_status'] = status
         agent_state['admin_state_up'] = agent.admin_state_up
         registry.publish(resources.AGENT, event_type, self,
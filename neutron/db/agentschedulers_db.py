@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import datetime
 import random
 import time
@@ -129,9 +130,15 @@ class AgentSchedulerDbMixin(agents_db.AgentDbMixin):
                                               resource_id_attr,
                                               resource_name,
                                               reschedule_resource,
-                                              rescheduling_failed):
+                                              rescheduling_failed,
+                                              reschedule_resources=None):
         """Reschedule resources from down neutron agents
         if admin state is up.
+
+        When agent_reschedule_batch_size is set and a reschedule_resources
+        callable is given, the resources are rescheduled in batches: it is
+        called with a list of resource IDs and returns the IDs of the
+        resources it failed to reschedule.
         """
         agent_dead_limit = self.agent_dead_limit_seconds()
         self.wait_down_agents(agent_type, agent_dead_limit)
@@ -139,6 +146,13 @@ class AgentSchedulerDbMixin(agents_db.AgentDbMixin):
         context = ncontext.get_admin_context()
         try:
             down_bindings = get_down_bindings(context, agent_dead_limit)
+            batch_size = cfg.CONF.agent_reschedule_batch_size
+            if batch_size and reschedule_resources:
+                self._reschedule_resources_in_batches(
+                    down_bindings, agent_id_attr, resource_id_attr,
+                    resource_name, reschedule_resources, batch_size,
+                    agent_dead_limit)
+                return
 
             agents_back_online = set()
             for binding in down_bindings:
@@ -180,6 +194,69 @@ class AgentSchedulerDbMixin(agents_db.AgentDbMixin):
                           "rescheduling.",
                           {'resource_name': resource_name})
 
+    def _get_resources_from_dead_agents(self, down_bindings, agent_id_attr,
+                                        resource_id_attr):
+        """Return the resources hosted by dead agents, by resource ID.
+
+        The liveness of every agent is checked once, with a new context to
+        make sure we do not read the agent record from the transaction that
+        fetched the bindings.
+        """
+        context = ncontext.get_admin_context()
+        dead_agents = {}
+        resources = collections.OrderedDict()
+        for binding in down_bindings:
+            agent_id = getattr(binding, agent_id_attr)
+            if agent_id not in dead_agents:
+                try:
+                    agent = self._get_agent(context, agent_id)
+                    dead_agents[agent_id] = not agent.is_active
+                except agent_exc.AgentNotFound:
+                    # the bindings are deleted with the agent
+                    dead_agents[agent_id] = False
+            if dead_agents[agent_id]:
+                resources.setdefault(
+                    getattr(binding, resource_id_attr), []).append(agent_id)
+        return resources
+
+    def _reschedule_resources_in_batches(self, down_bindings, agent_id_attr,
+                                         resource_id_attr, resource_name,
+                                         reschedule_resources, batch_size,
+                                         agent_dead_limit):
+        start = time.time()
+        resources = self._get_resources_from_dead_agents(
+            down_bindings, agent_id_attr, resource_id_attr)
+        for resource_id, agent_ids in resources.items():
+            LOG.warning(
+                "Rescheduling %(resource_name)s %(resource)s from agent(s) "
+                "%(agents)s because they did not report to the server in "
+                "the last %(dead_time)s seconds.",
+                {'resource_name': resource_name,
+                 'resource': resource_id,
+                 'agents': ', '.join(agent_ids),
+                 'dead_time': agent_dead_limit})
+
+        failed = []
+        resource_ids = list(resources)
+        for i in range(0, len(resource_ids), batch_size):
+            # new context for every batch, see
+            # _get_resources_from_dead_agents()
+            context = ncontext.get_admin_context()
+            failed.extend(reschedule_resources(
+                context, resource_ids[i:i + batch_size]))
+        failed = set(failed)
+        if failed:
+            LOG.error("Failed to reschedule %(resource_name)ss %(failed)s",
+                      {'resource_name': resource_name,
+                       'failed': ', '.join(failed)})
+        if resource_ids:
+            LOG.info("Rescheduled %(count)d %(resource_name)ss from dead "
+                     "agents in %(time).3f seconds, %(failed)d failed",
+                     {'count': len(resource_ids) - len(failed),
+                      'resource_name': resource_name,
+                      'time': time.time() - start,
+                      'failed': len(failed)})
+
 
 class DhcpAgentSchedulerDbMixin(dhcpagentscheduler
                                 .DhcpAgentSchedulerPluginBase,
@@ -256,6 +333,48 @@ class DhcpAgentSchedulerDbMixin(dhcpagentscheduler
             # continue in any case
             LOG.exception("Failed to schedule network %s", network_id)
 
+    def _schedule_networks(self, context, network_ids, dhcp_notifier,
+                           batch_size):
+        """Schedule unhosted networks in batches.
+
+        Every network is scheduled once, even if it was hosted by several
+        dead agents, and the networks of a batch are fetched with a single
+        query.
+        """
+        for i in range(0, len(network_ids), batch_size):
+            batch = network_ids[i:i + batch_size]
+            LOG.info("Scheduling unhosted networks %s", ', '.join(batch))
+            networks_by_host = collections.defaultdict(list)
+            for net in self.get_networks(context, filters={'id': batch}):
+                try:
+                    agents = self.schedule_network(context, net)
+                except Exception:
+                    LOG.exception("Failed to schedule network %s", net['id'])
+                    continue
+                if not agents:
+                    LOG.info("Failed to schedule network %s, "
+                             "no eligible agents or it might be "
+                             "already scheduled by another server",
+                             net['id'])
+                for agent in agents or []:
+                    networks_by_host[agent.host].append(net['id'])
+            if not dhcp_notifier:
+                continue
+            # NOTE: the DHCP agent RPC API has no bulk network_create_end
+            # notification, so every network is still notified separately.
+            for host, host_network_ids in networks_by_host.items():
+                LOG.info("Adding networks %(nets)s to DHCP agent on host "
+                         "%(host)s", {'nets': ', '.join(host_network_ids),
+                                      'host': host})
+                for network_id in host_network_ids:
+                    try:
+                        dhcp_notifier.network_added_to_agent(
+                            context, network_id, host)
+                    except Exception:
+                        LOG.exception("Failed to notify DHCP agent on host "
+                                      "%(host)s about network %(net)s",
+                                      {'host': host, 'net': network_id})
+
     def _filter_bindings(self, context, bindings):
         """Skip bindings for which the agent is dead, but starting up."""
 
@@ -312,6 +431,8 @@ class DhcpAgentSchedulerDbMixin(dhcpagentscheduler
                 LOG.warning("No DHCP agents available, "
                             "skipping rescheduling")
                 return
+            batch_size = cfg.CONF.agent_reschedule_batch_size
+            networks_to_schedule = collections.OrderedDict()
             for binding in dead_bindings:
                 LOG.warning("Removing network %(network)s from agent "
                             "%(agent)s because the agent did not report "
@@ -344,9 +465,16 @@ class DhcpAgentSchedulerDbMixin(dhcpagentscheduler
                                   "%(agent)s",
                                   saved_binding)
 
-                if cfg.CONF.network_auto_schedule:
+                if not cfg.CONF.network_auto_schedule:
+                    continue
+                if batch_size:
+                    networks_to_schedule[saved_binding['net']] = None
+                else:
                     self._schedule_network(
                         context, saved_binding['net'], dhcp_notifier)
+            if batch_size:
+                self._schedule_networks(context, list(networks_to_schedule),
+                                        dhcp_notifier, batch_size)
         except Exception:
             # we want to be thorough and catch whatever is raised
             # to avoid loop abortion
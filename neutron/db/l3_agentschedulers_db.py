@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+
 from neutron_lib.api import extensions
 from neutron_lib import constants
 from neutron_lib.db import api as db_api
@@ -68,7 +70,8 @@ class L3AgentSchedulerDbMixin(l3agentscheduler.L3AgentSchedulerPluginBase,
                 resource_id_attr='router_id',
                 resource_name='router',
                 reschedule_resource=self.reschedule_router,
-                rescheduling_failed=l3agentscheduler.RouterReschedulingFailed)
+                rescheduling_failed=l3agentscheduler.RouterReschedulingFailed,
+                reschedule_resources=self.reschedule_routers)
 
     def get_down_router_bindings(self, context, agent_dead_limit):
         cutoff = self.get_cutoff_time(agent_dead_limit)
@@ -281,6 +284,113 @@ class L3AgentSchedulerDbMixin(l3agentscheduler.L3AgentSchedulerPluginBase,
                 raise l3agentscheduler.RouterReschedulingFailed(
                     router_id=router_id)
 
+    def reschedule_routers(self, context, router_ids):
+        """Reschedule a batch of routers to (a) new l3 agent(s)
+
+        Every router is rescheduled in its own transaction, like in
+        reschedule_router(), but the l3 agents are notified once per host
+        for the whole batch.
+
+        :returns: the IDs of the routers which could not be rescheduled.
+        """
+        bindings = rb_obj.RouterL3AgentBinding.get_objects(
+            context, router_id=router_ids)
+        agents = {agent.id: agent for agent in ag_obj.Agent.get_objects(
+            context, id=list({b.l3_agent_id for b in bindings}))}
+        cur_agents = collections.defaultdict(list)
+        for binding in bindings:
+            if binding.l3_agent_id in agents:
+                cur_agents[binding.router_id].append(
+                    agents[binding.l3_agent_id])
+
+        failed = []
+        new_agents = {}
+        try:
+            for router_id in router_ids:
+                try:
+                    with db_api.CONTEXT_WRITER.using(context):
+                        self._unschedule_router(
+                            context, router_id,
+                            [agent.id for agent in cur_agents[router_id]])
+                        self.schedule_router(context, router_id)
+                        router_agents = self._get_l3_agents_hosting_routers(
+                            context, [router_id])
+                        if not router_agents:
+                            raise l3agentscheduler.RouterReschedulingFailed(
+                                router_id=router_id)
+                except Exception:
+                    # catching any exception so that the other routers of
+                    # the batch are still rescheduled
+                    LOG.exception("Failed to reschedule router %s", router_id)
+                    failed.append(router_id)
+                    continue
+                new_agents[router_id] = router_agents
+        finally:
+            # the routers already moved must reach their new agents
+            failed.extend(self._notify_agents_routers_rescheduled(
+                context, cur_agents, new_agents))
+        return failed
+
+    def _notify_agents_routers_rescheduled(self, context, old_agents,
+                                           new_agents):
+        """Notify the l3 agents about rescheduled routers, once per host.
+
+        :returns: the IDs of the routers that could not be added to the new
+                  agents.
+        """
+        l3_notifier = self.agent_notifiers.get(constants.AGENT_TYPE_L3)
+        if not l3_notifier or not new_agents:
+            return []
+
+        routers = {router['id']: router for router in self.get_routers(
+            context, filters={'id': list(new_agents)})}
+        retained = collections.defaultdict(list)
+        added = collections.defaultdict(list)
+        for router_id, agents in new_agents.items():
+            new_hosts = set(agent['host'] for agent in agents)
+            for agent in old_agents[router_id]:
+                if agent['host'] in new_hosts:
+                    continue
+                router = routers.get(router_id, {'id': router_id})
+                if self._check_router_retain_needed(context, router,
+                                                    agent['host']):
+                    retained[agent['host']].append(router_id)
+                    continue
+                # there is no bulk router removal notification
+                try:
+                    l3_notifier.router_removed_from_agent(
+                        context, router_id, agent['host'])
+                except oslo_messaging.MessagingException:
+                    LOG.exception("Failed to remove router %(router)s from "
+                                  "l3 agent on host %(host)s",
+                                  {'router': router_id,
+                                   'host': agent['host']})
+            for agent in agents:
+                added[agent['host'], agent['id']].append(router_id)
+
+        for host, router_ids in retained.items():
+            try:
+                l3_notifier.routers_updated_on_host(context, router_ids, host)
+            except oslo_messaging.MessagingException:
+                LOG.exception("Failed to notify l3 agent on host %(host)s "
+                              "of the update of routers %(routers)s",
+                              {'routers': ', '.join(router_ids),
+                               'host': host})
+
+        failed = []
+        for (host, agent_id), router_ids in added.items():
+            try:
+                l3_notifier.router_added_to_agent(context, router_ids, host)
+            except oslo_messaging.MessagingException:
+                LOG.exception("Failed to add routers %(routers)s to l3 "
+                              "agent on host %(host)s",
+                              {'routers': ', '.join(router_ids),
+                               'host': host})
+                for router_id in router_ids:
+                    self._unbind_router(context, router_id, agent_id)
+                failed.extend(router_ids)
+        return failed
+
     def list_routers_on_l3_agent(self, context, agent_id):
         binding_objs = rb_obj.RouterL3AgentBinding.get_objects(
                 context, l3_agent_id=agent_id)
@@ -487,8 +597,8 @@ class L3AgentSchedulerDbMixin(l3agentscheduler.L3AgentSchedulerPluginBase,
 
     def schedule_routers(self, context, routers):
         """Schedule the routers to l3 agents."""
-        for router in routers:
-            self.schedule_router(context, router, candidates=None)
+        if self.router_scheduler:
+            self.router_scheduler.schedule_routers(self, context, routers)
 
     def get_l3_agent_with_min_routers(self, context, agent_ids):
         if not agent_ids:
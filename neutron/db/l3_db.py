@@ -36,6 +36,7 @@ from neutron_lib.plugins import directory
 from neutron_lib.plugins import utils as plugin_utils
 from neutron_lib import rpc as n_rpc
 from neutron_lib.services import base as base_services
+from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_utils import uuidutils
 from sqlalchemy import orm
@@ -45,7 +46,9 @@ from neutron._i18n import _
 from neutron.api.rpc.agentnotifiers import l3_rpc_agent_api
 from neutron.common import ipv6_utils
 from neutron.common import utils
+from neutron.conf.db import l3_db as l3_db_conf
 from neutron.db import _utils as db_utils
+from neutron.db import l3_sync_cache
 from neutron.db.models import l3 as l3_models
 from neutron.db import models_v2
 from neutron.db import standardattrdescription_db as st_attr
@@ -59,6 +62,8 @@ from neutron import worker as neutron_worker
 
 LOG = logging.getLogger(__name__)
 
+l3_db_conf.register_db_l3_opts()
+
 
 DEVICE_OWNER_HA_REPLICATED_INT = constants.DEVICE_OWNER_HA_REPLICATED_INT
 DEVICE_OWNER_ROUTER_INTF = constants.DEVICE_OWNER_ROUTER_INTF
@@ -92,6 +97,8 @@ class L3_NAT_dbonly_mixin(l3.RouterPluginBase,
 
     _fip_qos = None
 
+    _router_sync_cache = None
+
     def __new__(cls, *args, **kwargs):
         inst = super(L3_NAT_dbonly_mixin, cls).__new__(cls, *args, **kwargs)
         inst._start_janitor()
@@ -106,6 +113,15 @@ class L3_NAT_dbonly_mixin(l3.RouterPluginBase,
             l3plugin.prevent_l3_port_deletion(
                 payload.context, payload.resource_id)
 
+    @property
+    def router_sync_cache(self):
+        if (self._router_sync_cache is None and
+                cfg.CONF.router_sync_cache_ttl):
+            self._router_sync_cache = l3_sync_cache.RouterSyncCache(
+                cfg.CONF.router_sync_cache_ttl)
+            self._router_sync_cache.subscribe()
+        return self._router_sync_cache
+
     @property
     def _is_dns_integration_supported(self):
         if self._dns_integration is None:
@@ -1450,8 +1466,11 @@ class L3_NAT_dbonly_mixin(l3.RouterPluginBase,
     @db_api.retry_if_session_inactive()
     def update_floatingip_status(self, context, floatingip_id, status):
         """Update operational status for floating IP in neutron DB."""
-        return l3_obj.FloatingIP.update_object(
+        fip = l3_obj.FloatingIP.update_object(
             context, {'status': status}, id=floatingip_id)
+        if self.router_sync_cache and fip:
+            self.router_sync_cache.invalidate([fip.router_id])
+        return fip
 
     @registry.receives(resources.PORT, [events.PRECOMMIT_DELETE])
     def _precommit_delete_port_callback(
@@ -1832,6 +1851,13 @@ class L3_NAT_dbonly_mixin(l3.RouterPluginBase,
             return (routers, interfaces, floating_ips)
 
     def get_sync_data(self, context, router_ids=None, active=None):
+        if self.router_sync_cache and context.is_admin:
+            return self.router_sync_cache.get_sync_data(
+                context, router_ids, active, self._get_sync_data)
+        return self._get_sync_data(context, router_ids=router_ids,
+                                   active=active)
+
+    def _get_sync_data(self, context, router_ids=None, active=None):
         routers, interfaces, floating_ips = self._get_router_info_list(
             context, router_ids=router_ids, active=active)
         ports_to_populate = [router['gw_port'] for router in routers
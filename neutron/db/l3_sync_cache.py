@@ -0,0 +1,260 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import copy
+import time
+
+from neutron_lib.callbacks import events
+from neutron_lib.callbacks import registry
+from neutron_lib.callbacks import resources
+from neutron_lib import constants
+from oslo_log import log as logging
+from sqlalchemy import func
+from sqlalchemy import orm
+
+from neutron.db.models import l3 as l3_models
+from neutron.db.models import l3agent as rb_model
+from neutron.db import models_v2
+from neutron.db import standard_attr
+
+LOG = logging.getLogger(__name__)
+
+RouterSyncEntry = collections.namedtuple(
+    'RouterSyncEntry', ['key', 'built_at', 'router', 'network_ids'])
+
+
+class RouterSyncCache(object):
+    """Per router sync payloads served to the L3 agents.
+
+    The payload built by get_sync_data() for a router is kept for ``ttl``
+    seconds, keyed by the revision number and the L3 agent bindings of the
+    router and by a change marker of its ports, floating IPs and of the
+    networks and subnets of its ports, read from the database so that the
+    changes made by other server processes are seen. It is also dropped on
+    the router, port, floating IP, subnet and network events seen by this
+    process.
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._entries = {}
+        self._routers_by_network = collections.defaultdict(set)
+        # Number of builds in progress and of invalidations seen during them
+        # per router, used to discard a payload whose build raced with an
+        # event.
+        self._building = collections.Counter()
+        self._changes = collections.Counter()
+        self.stats = collections.Counter()
+
+    def subscribe(self):
+        registry.subscribe(self._router_callback, resources.ROUTER,
+                           events.AFTER_UPDATE)
+        registry.subscribe(self._router_callback, resources.ROUTER,
+                           events.AFTER_DELETE)
+        registry.subscribe(self._router_callback, resources.ROUTER_INTERFACE,
+                           events.AFTER_CREATE)
+        registry.subscribe(self._router_callback, resources.ROUTER_INTERFACE,
+                           events.AFTER_DELETE)
+        for event in (events.AFTER_CREATE, events.AFTER_UPDATE,
+                      events.AFTER_DELETE):
+            registry.subscribe(self._port_callback, resources.PORT, event)
+            registry.subscribe(self._subnet_callback, resources.SUBNET, event)
+        registry.subscribe(self._floatingip_callback, resources.FLOATING_IP,
+                           events.AFTER_UPDATE)
+        registry.subscribe(self._floatingip_callback, resources.FLOATING_IP,
+                           events.AFTER_DELETE)
+        registry.subscribe(self._network_callback, resources.NETWORK,
+                           events.AFTER_UPDATE)
+
+    def _router_callback(self, resource, event, trigger, **kwargs):
+        self.invalidate([kwargs.get('router_id')])
+
+    def _port_callback(self, resource, event, trigger, **kwargs):
+        ports = (kwargs.get('port'), kwargs.get('original_port'))
+        self.invalidate([port.get('device_id') for port in ports if port])
+
+    def _floatingip_callback(self, resource, event, trigger, **kwargs):
+        self.invalidate([kwargs.get('router_id'),
+                         kwargs.get('last_known_router_id')])
+
+    def _subnet_callback(self, resource, event, trigger, **kwargs):
+        self.invalidate_network(kwargs['subnet']['network_id'])
+
+    def _network_callback(self, resource, event, trigger, **kwargs):
+        self.invalidate_network(kwargs['network']['id'])
+
+    def _drop_entry(self, router_id):
+        entry = self._entries.pop(router_id, None)
+        if entry:
+            for network_id in entry.network_ids:
+                self._routers_by_network[network_id].discard(router_id)
+        return entry
+
+    def invalidate(self, router_ids):
+        for router_id in router_ids:
+            if not router_id:
+                continue
+            if router_id in self._building:
+                self._changes[router_id] += 1
+            if self._drop_entry(router_id):
+                self.stats['invalidated'] += 1
+
+    def invalidate_network(self, network_id):
+        self.invalidate(list(self._routers_by_network.pop(network_id, ())))
+
+    @staticmethod
+    def _filter_routers(query, router_ids, active):
+        if router_ids:
+            query = query.filter(l3_models.Router.id.in_(router_ids))
+        if active is not None:
+            query = query.filter(l3_models.Router.admin_state_up == active)
+        return query
+
+    @classmethod
+    def _get_related_markers(cls, context, router_ids, active, model,
+                             *joins):
+        """Return a change marker of the resources related to the routers.
+
+        The marker is the number of resources, the sum of their revision
+        numbers and their highest standard attribute ID: an update bumps a
+        revision number, a deletion lowers the count and a creation raises
+        the highest ID.
+        """
+        sa_model = standard_attr.StandardAttribute
+        query = context.session.query(
+            l3_models.Router.id, func.count(sa_model.id),
+            func.sum(sa_model.revision_number), func.max(sa_model.id))
+        for target, onclause in joins:
+            query = query.join(target, onclause)
+        query = query.join(sa_model, sa_model.id == model.standard_attr_id)
+        query = cls._filter_routers(query, router_ids, active)
+        query = query.group_by(l3_models.Router.id)
+        return {router_id: (count, int(revisions or 0), max_id)
+                for router_id, count, revisions, max_id in query}
+
+    @classmethod
+    def _get_router_keys(cls, context, router_ids, active):
+        """Return the change keys of the routers.
+
+        A key holds the revision number and L3 agents of the router and the
+        change markers of its ports, floating IPs, floating IP ports, and of
+        the networks and subnets of its ports.
+        """
+        router = l3_models.Router
+        port = models_v2.Port
+        fip = l3_models.FloatingIP
+        fip_port = orm.aliased(models_v2.Port)
+        router_port_join = (port, port.device_id == router.id)
+        fip_join = (fip, fip.router_id == router.id)
+        related = [
+            (port, router_port_join),
+            (fip, fip_join),
+            (fip_port, fip_join, (fip_port, fip_port.id == fip.fixed_port_id)),
+            (models_v2.Network, router_port_join,
+             (models_v2.Network, models_v2.Network.id == port.network_id)),
+            (models_v2.Subnet, router_port_join,
+             (models_v2.Subnet, models_v2.Subnet.network_id ==
+              port.network_id)),
+        ]
+        markers = [cls._get_related_markers(context, router_ids, active,
+                                            model, *joins)
+                   for model, *joins in related]
+
+        query = context.session.query(
+            l3_models.Router.id,
+            standard_attr.StandardAttribute.revision_number,
+            rb_model.RouterL3AgentBinding.l3_agent_id)
+        query = query.join(
+            standard_attr.StandardAttribute,
+            standard_attr.StandardAttribute.id ==
+            l3_models.Router.standard_attr_id)
+        query = query.outerjoin(
+            rb_model.RouterL3AgentBinding,
+            rb_model.RouterL3AgentBinding.router_id == l3_models.Router.id)
+        query = cls._filter_routers(query, router_ids, active)
+        revisions = {}
+        agents = collections.defaultdict(set)
+        for router_id, revision_number, agent_id in query:
+            revisions[router_id] = revision_number
+            if agent_id:
+                agents[router_id].add(agent_id)
+        return {router_id: (revision_number, tuple(sorted(agents[router_id])),
+                            tuple(marker.get(router_id) for marker in markers))
+                for router_id, revision_number in revisions.items()}
+
+    @staticmethod
+    def _get_network_ids(router):
+        ports = list(router.get(constants.INTERFACE_KEY, []))
+        if router.get('gw_port'):
+            ports.append(router['gw_port'])
+        return {port['network_id'] for port in ports}
+
+    def get_sync_data(self, context, router_ids, active, build_sync_data):
+        """Return the sync data of the routers.
+
+        The payloads of the routers that are not cached, or whose revision
+        number or bindings changed, are built with ``build_sync_data``.
+        """
+        keys = self._get_router_keys(context, router_ids, active)
+        if not router_ids and active is None:
+            # full sync, drop the routers deleted by other processes
+            for router_id in set(self._entries) - set(keys):
+                self._drop_entry(router_id)
+        now = time.monotonic()
+        routers = []
+        missing = []
+        for router_id, key in keys.items():
+            entry = self._entries.get(router_id)
+            if (entry and entry.key == key and
+                    now - entry.built_at < self.ttl):
+                routers.append(copy.deepcopy(entry.router))
+            else:
+                missing.append(router_id)
+        self.stats['hits'] += len(routers)
+        self.stats['misses'] += len(missing)
+        if not missing:
+            return routers
+
+        self._building.update(missing)
+        changes = {router_id: self._changes[router_id]
+                   for router_id in missing}
+        try:
+            built = build_sync_data(context, router_ids=missing,
+                                    active=active)
+            self._cache_routers(built, keys, changes, now)
+        finally:
+            self._building.subtract(missing)
+            for router_id in missing:
+                if self._building[router_id] <= 0:
+                    del self._building[router_id]
+                    self._changes.pop(router_id, None)
+        routers.extend(built)
+        LOG.debug("Built the sync data of %(built)d routers, %(cached)d "
+                  "served from the cache, cache stats: %(stats)s",
+                  {'built': len(built), 'cached': len(routers) - len(built),
+                   'stats': dict(self.stats)})
+        return routers
+
+    def _cache_routers(self, routers, keys, changes, built_at):
+        for router in routers:
+            router_id = router['id']
+            if (router_id not in keys or
+                    self._changes[router_id] != changes.get(router_id)):
+                continue
+            self._drop_entry(router_id)
+            network_ids = self._get_network_ids(router)
+            self._entries[router_id] = RouterSyncEntry(
+                keys[router_id], built_at, copy.deepcopy(router),
+                network_ids)
+            for network_id in network_ids:
+                self._routers_by_network[network_id].add(router_id)
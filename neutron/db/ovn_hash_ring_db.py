@@ -19,6 +19,7 @@ from neutron_lib.db import api as db_api
 from oslo_config import cfg
 from oslo_utils import timeutils
 from oslo_utils import uuidutils
+from sqlalchemy import func
 
 from neutron.db.models import ovn as ovn_models
 
@@ -67,3 +68,29 @@ def get_active_nodes(context, interval, group_name, from_host=False):
         if from_host:
             query = query.filter_by(hostname=CONF.host)
         return query.all()
+
+
+def get_active_node_uuids(context, interval, group_name):
+    limit = timeutils.utcnow() - datetime.timedelta(seconds=interval)
+    with db_api.CONTEXT_READER.using(context):
+        query = context.session.query(ovn_models.OVNHashRing.node_uuid).filter(
+            ovn_models.OVNHashRing.updated_at >= limit,
+            ovn_models.OVNHashRing.group_name == group_name)
+        return {node_uuid for node_uuid, in query}
+
+
+def get_active_nodes_marker(context, interval, group_name):
+    """Return a change marker of the active nodes of a group.
+
+    The marker is the number of active nodes and the creation time of the
+    newest one, which change when a node is added or removed, or when its
+    heartbeat expires, but not when the nodes are touched.
+    """
+    limit = timeutils.utcnow() - datetime.timedelta(seconds=interval)
+    with db_api.CONTEXT_READER.using(context):
+        query = context.session.query(
+            func.count(ovn_models.OVNHashRing.node_uuid),
+            func.max(ovn_models.OVNHashRing.created_at)).filter(
+            ovn_models.OVNHashRing.updated_at >= limit,
+            ovn_models.OVNHashRing.group_name == group_name)
+        return tuple(query.one())
@@ -10,6 +10,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import threading
 
 import eventlet
@@ -18,11 +19,31 @@ from neutron.common import utils
 
 
 class BatchNotifier(object):
-    def __init__(self, batch_interval, callback):
+    def __init__(self, batch_interval, callback, event_key=None,
+                 max_batch_size=0):
+        """Initialize the notifier.
+
+        :param batch_interval: the number of seconds to wait between two
+                               sends.
+        :param callback: the function called with the list of events to send.
+        :param event_key: if given, a function returning a key for an event.
+                          Only the last of the events of a batch with the
+                          same key is sent.
+        :param max_batch_size: if given, the maximum number of events the
+                               callback is called with. The events of a
+                               bigger batch are sent in chunks, and the
+                               interval before the next send is reduced as
+                               the number of queued events grows.
+        """
         self._pending_events = eventlet.Queue()
         self.callback = callback
         self.batch_interval = batch_interval
+        self.event_key = event_key
+        self.max_batch_size = max_batch_size
         self._mutex = threading.Lock()
+        # Number of events queued, coalesced with a later event of the same
+        # batch and sent, and number of times the callback was called
+        self.stats = collections.Counter()
 
     def queue_event(self, event):
         """Called to queue sending an event with the next batch of events.
@@ -50,6 +71,7 @@ class BatchNotifier(object):
             return
 
         self._pending_events.put(event)
+        self.stats['queued'] += 1
 
         def synced_send():
             if not self._mutex.locked():
@@ -58,12 +80,38 @@ class BatchNotifier(object):
                         self._notify()
                         # sleeping after send while holding the lock allows
                         # subsequent events to batch up
-                        eventlet.sleep(self.batch_interval)
+                        eventlet.sleep(self._get_batch_interval())
 
         utils.spawn_n(synced_send)
 
+    def _get_batch_interval(self):
+        if not self.max_batch_size:
+            return self.batch_interval
+        # The more events are already waiting, the sooner they are sent; no
+        # need to wait once a full batch is queued
+        pending = self._pending_events.qsize()
+        return self.batch_interval * max(
+            0.0, 1.0 - float(pending) / self.max_batch_size)
+
+    def _coalesce(self, events):
+        # Keep the last event of each key, at its position, so the events
+        # sent still follow the order of the latest changes
+        last_index = {self.event_key(event): index
+                      for index, event in enumerate(events)}
+        coalesced = [event for index, event in enumerate(events)
+                     if last_index[self.event_key(event)] == index]
+        self.stats['coalesced'] += len(events) - len(coalesced)
+        return coalesced
+
     def _notify(self):
         batched_events = []
         while not self._pending_events.empty():
             batched_events.append(self._pending_events.get())
-        self.callback(batched_events)
+        if self.event_key:
+            batched_events = self._coalesce(batched_events)
+        chunk_size = self.max_batch_size or max(len(batched_events), 1)
+        for i in range(0, len(batched_events), chunk_size):
+            events = batched_events[i:i + chunk_size]
+            self.stats['sent'] += len(events)
+            self.stats['batches'] += 1
+            self.callback(events)
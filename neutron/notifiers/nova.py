@@ -65,7 +65,10 @@ class Notifier(object):
             ext for ext in nova_client.discover_extensions(NOVA_API_VERSION)
             if ext.name == "server_external_events"]
         self.batch_notifier = batch_notifier.BatchNotifier(
-            cfg.CONF.send_events_interval, self.send_events)
+            cfg.CONF.send_events_interval, self.send_events,
+            event_key=(self._get_event_key
+                       if cfg.CONF.send_events_coalesce else None),
+            max_batch_size=cfg.CONF.send_events_max_batch_size)
 
     def _get_nova_client(self):
         global_id = common_context.generate_request_id()
@@ -77,6 +80,10 @@ class Notifier(object):
             extensions=self.extensions,
             global_request_id=global_id)
 
+    @staticmethod
+    def _get_event_key(event):
+        return event['server_uuid'], event.get('tag'), event['name']
+
     def _is_compute_port(self, port):
         try:
             if (port['device_id'] and
@@ -242,7 +249,11 @@ class Notifier(object):
         self.send_port_status(None, None, port)
 
     def send_events(self, batched_events):
-        LOG.debug("Sending events: %s", batched_events)
+        LOG.debug("Sending events: %s (events queued: %d, coalesced: %d, "
+                  "sent: %d)", batched_events,
+                  self.batch_notifier.stats['queued'],
+                  self.batch_notifier.stats['coalesced'],
+                  self.batch_notifier.stats['sent'])
         novaclient = self._get_nova_client()
         try:
             response = novaclient.server_external_events.create(
@@ -82,6 +82,37 @@ class SubPort(base.NeutronDbObject):
                 segmentation_id=self.segmentation_id,
                 trunk_id=self.trunk_id)
 
+    @classmethod
+    def bulk_create(cls, context, trunk_id, subports):
+        """Create the subports of a trunk with a single INSERT statement.
+
+        :param subports: list of dicts with the port_id, segmentation_type
+                         and segmentation_id of every subport.
+        :returns: the list of created SubPort objects.
+        """
+        values = [{'port_id': subport['port_id'],
+                   'trunk_id': trunk_id,
+                   'segmentation_type': subport['segmentation_type'],
+                   'segmentation_id': int(subport['segmentation_id'])}
+                  for subport in subports]
+        try:
+            with cls.db_context_writer(context):
+                context.session.execute(
+                    cls.db_model.__table__.insert(), values)
+        except o_db_exc.DBReferenceError as ex:
+            if ex.key_table == Trunk.db_model.__tablename__:
+                raise t_exc.TrunkNotFound(trunk_id=trunk_id)
+            raise n_exc.PortNotFound(
+                port_id=', '.join(v['port_id'] for v in values))
+        except o_db_exc.DBDuplicateEntry:
+            raise t_exc.DuplicateSubPorts(trunk_id=trunk_id)
+        objs = []
+        for value in values:
+            obj = cls(context, **value)
+            obj.obj_reset_changes()
+            objs.append(obj)
+        return objs
+
 
 @base.NeutronObjectRegistry.register
 class Trunk(base.NeutronDbObject):
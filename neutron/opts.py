@@ -36,6 +36,7 @@ import neutron.conf.common
 import neutron.conf.db.dvr_mac_db
 import neutron.conf.db.extraroute_db
 import neutron.conf.db.l3_agentschedulers_db
+import neutron.conf.db.l3_db
 import neutron.conf.db.l3_dvr_db
 import neutron.conf.db.l3_gwmode_db
 import neutron.conf.db.l3_hamode_db
@@ -44,6 +45,7 @@ import neutron.conf.extensions.conntrack_helper
 import neutron.conf.plugins.ml2.config
 import neutron.conf.plugins.ml2.drivers.agent
 import neutron.conf.plugins.ml2.drivers.driver_type
+import neutron.conf.plugins.ml2.drivers.l2pop
 import neutron.conf.plugins.ml2.drivers.linuxbridge
 import neutron.conf.plugins.ml2.drivers.macvtap
 import neutron.conf.plugins.ml2.drivers.mech_sriov.agent_common
@@ -54,6 +56,7 @@ import neutron.conf.quota
 import neutron.conf.service
 import neutron.conf.services.logging
 import neutron.conf.services.metering_agent
+import neutron.conf.services.trunk
 import neutron.conf.wsgi
 import neutron.db.migration.cli
 import neutron.extensions.l3
@@ -85,6 +88,7 @@ def list_agent_opts():
         ('agent',
          itertools.chain(
              neutron.conf.agent.common.ROOT_HELPER_OPTS,
+             neutron.conf.agent.common.NETLINK_SOCKET_POOL_OPTS,
              neutron.conf.agent.common.AGENT_STATE_OPTS,
              neutron.conf.agent.common.IPTABLES_OPTS,
              neutron.conf.agent.common.PROCESS_MONITOR_OPTS,
@@ -104,7 +108,8 @@ def list_extension_opts():
          itertools.chain(
              neutron.conf.extensions.allowedaddresspairs
              .allowed_address_pair_opts,
-             neutron.conf.extensions.conntrack_helper.conntrack_helper_opts)
+             neutron.conf.extensions.conntrack_helper.conntrack_helper_opts,
+             neutron.conf.services.trunk.trunk_opts)
          ),
         ('quotas',
          itertools.chain(
@@ -120,6 +125,7 @@ def list_db_opts():
          itertools.chain(
              neutron.conf.agent.database.agents_db.AGENT_OPTS,
              neutron.conf.db.extraroute_db.EXTRA_ROUTE_OPTS,
+             neutron.conf.db.l3_db.L3_DB_OPTS,
              neutron.conf.db.l3_gwmode_db.L3GWMODE_OPTS,
              neutron.conf.agent.database.agentschedulers_db
                     .AGENTS_SCHEDULER_OPTS,
@@ -268,6 +274,8 @@ def list_ml2_conf_opts():
          neutron.conf.plugins.ml2.drivers.driver_type.vxlan_opts),
         ('ml2_type_geneve',
          neutron.conf.plugins.ml2.drivers.driver_type.geneve_opts),
+        ('l2pop',
+         neutron.conf.plugins.ml2.drivers.l2pop.l2pop_opts),
         ('securitygroup',
          neutron.conf.agent.securitygroups_rpc.security_group_opts),
         ('ovs_driver',
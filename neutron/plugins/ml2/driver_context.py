@@ -145,6 +145,7 @@ class PortContext(MechanismDriverContext, api.PortContext):
             self._original_vif_details = None
             self._original_binding_levels = None
         self._new_port_status = None
+        self._host_agents_cache = None
 
     # The following methods are for use by the ML2 plugin and are not
     # part of the driver API.
@@ -165,6 +166,11 @@ class PortContext(MechanismDriverContext, api.PortContext):
     def _pop_binding_level(self):
         return self._binding_levels.pop()
 
+    def _set_host_agents_cache(self, cache):
+        # NOTE: the cache is shared by the contexts of a bulk binding
+        # operation, so host agents are retrieved once per (host, agent_type).
+        self._host_agents_cache = cache
+
     # The following implement the abstract methods and properties of
     # the driver API.
 
@@ -292,6 +298,14 @@ class PortContext(MechanismDriverContext, api.PortContext):
         return self._segments_to_bind
 
     def host_agents(self, agent_type):
+        if self._host_agents_cache is None:
+            return self._get_host_agents(agent_type)
+        key = (self._binding.host, agent_type)
+        if key not in self._host_agents_cache:
+            self._host_agents_cache[key] = self._get_host_agents(agent_type)
+        return self._host_agents_cache[key]
+
+    def _get_host_agents(self, agent_type):
         return self._plugin.get_agents(self._plugin_context,
                                        filters={'agent_type': [agent_type],
                                                 'host': [self._binding.host]})
@@ -16,11 +16,13 @@
 from neutron_lib import constants as const
 from oslo_serialization import jsonutils
 from oslo_utils import timeutils
+from sqlalchemy import func
 from sqlalchemy import orm
 
 from neutron.db.models import agent as agent_model
 from neutron.db.models import l3ha as l3ha_model
 from neutron.db import models_v2
+from neutron.db import standard_attr
 from neutron.objects import agent as agent_objs
 from neutron.plugins.ml2 import models as ml2_models
 
@@ -100,8 +102,11 @@ def _get_ha_router_interface_ids(context, network_id):
     return query.from_self(models_v2.Port.id).distinct()
 
 
-def get_nondistributed_active_network_ports(context, network_id):
+def get_nondistributed_active_network_ports(context, network_id,
+                                            port_ids=None):
     query = _get_active_network_ports(context, network_id)
+    if port_ids is not None:
+        query = query.filter(models_v2.Port.id.in_(port_ids))
     # Exclude DVR and HA router interfaces
     query = query.filter(models_v2.Port.device_owner !=
                          const.DEVICE_OWNER_DVR_INTERFACE)
@@ -128,6 +133,46 @@ def get_dvr_active_network_ports(context, network_id):
             if get_agent_ip(agent)]
 
 
+def get_network_ports_marker(context, network_id):
+    """Return a change marker of the ports of a network.
+
+    The marker is the number of ports, the sum of their revision numbers
+    and their highest standard attribute ID: a port status, binding or
+    fixed IP update bumps a revision number, a deletion lowers the count
+    and a creation raises the highest ID.
+    """
+    sa_model = standard_attr.StandardAttribute
+    query = context.session.query(
+        func.count(sa_model.id), func.sum(sa_model.revision_number),
+        func.max(sa_model.id)).select_from(sa_model)
+    query = query.join(models_v2.Port,
+                       models_v2.Port.standard_attr_id == sa_model.id)
+    query = query.filter(models_v2.Port.network_id == network_id)
+    count, revisions, max_id = query.one()
+    return count, int(revisions or 0), max_id
+
+
+def get_network_ports_revisions(context, network_id, changed_since=None):
+    """Return the revision data of the ports of a network.
+
+    :param changed_since: if set, only the ports updated at or after this
+                          time are returned.
+    :returns: a list of (port ID, standard attribute ID, revision number,
+              device owner, status, updated at) tuples.
+    """
+    sa_model = standard_attr.StandardAttribute
+    query = context.session.query(
+        models_v2.Port.id, sa_model.id, sa_model.revision_number,
+        models_v2.Port.device_owner, models_v2.Port.status,
+        sa_model.updated_at)
+    query = query.join(sa_model,
+                       models_v2.Port.standard_attr_id == sa_model.id)
+    query = query.filter(models_v2.Port.network_id == network_id)
+    if changed_since is not None:
+        query = query.filter(sa_model.updated_at >= changed_since)
+    return query.all()
+
+
 def get_distributed_active_network_ports(context, network_id):
     return (get_dvr_active_network_ports(context, network_id) +
             get_ha_active_network_ports(context, network_id))
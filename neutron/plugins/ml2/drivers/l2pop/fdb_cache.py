@@ -0,0 +1,223 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import itertools
+import time
+
+from neutron_lib import constants as const
+from oslo_log import log as logging
+
+from neutron.plugins.ml2.drivers.l2pop import db as l2pop_db
+
+LOG = logging.getLogger(__name__)
+
+
+class NetworkFdbView(object):
+    """FDB view of a single network.
+
+    ``port_revisions`` maps the ID of every port of the network to its
+    standard attribute ID, revision number, device owner and status, which
+    give the change marker of the ports the view is up to date with.
+    ``tunnels`` maps the hosts of the DVR ports to their tunnel IP,
+    ``ports`` maps the ID of every other non distributed active port to its
+    host, the tunnel IP of that host and its MAC/IP entries.
+    """
+
+    def __init__(self):
+        self.port_revisions = {}
+        self.tunnels = {}
+        self.ports = {}
+        self.ha_port_ids = set()
+        self.changed_since = None
+        self.built_at = time.monotonic()
+
+    @property
+    def marker(self):
+        """The marker of l2pop_db.get_network_ports_marker() of the view."""
+        revisions = self.port_revisions.values()
+        return (len(self.port_revisions),
+                sum(revision for __, revision, __, __ in revisions),
+                max((sa_id for sa_id, __, __, __ in revisions),
+                    default=None))
+
+    def update_port_revisions(self, rows):
+        """Record the revision data of the given ports.
+
+        :returns: the IDs of the ports added or changed.
+        """
+        changed = set()
+        for port_id, sa_id, revision, owner, status, updated_at in rows:
+            revision_data = (sa_id, revision, owner, status)
+            if self.port_revisions.get(port_id) != revision_data:
+                self.port_revisions[port_id] = revision_data
+                changed.add(port_id)
+            if (owner in l2pop_db.HA_ROUTER_PORTS and
+                    status == const.PORT_STATUS_ACTIVE):
+                self.ha_port_ids.add(port_id)
+            else:
+                self.ha_port_ids.discard(port_id)
+            if updated_at and (self.changed_since is None or
+                               updated_at > self.changed_since):
+                self.changed_since = updated_at
+        return changed
+
+    def is_distributed_port(self, port_id):
+        revision_data = self.port_revisions.get(port_id)
+        return bool(revision_data and
+                    revision_data[2] == const.DEVICE_OWNER_DVR_INTERFACE)
+
+    def remove_port(self, port_id):
+        self.port_revisions.pop(port_id, None)
+        self.ports.pop(port_id, None)
+        self.ha_port_ids.discard(port_id)
+
+    def get_fdb(self, exclude_host, ha_tunnels=()):
+        fdb = {}
+        hosts = itertools.chain(
+            self.tunnels.items(), ha_tunnels,
+            ((host, ip) for host, ip, __ in self.ports.values()))
+        for host, ip in hosts:
+            if host != exclude_host:
+                fdb.setdefault(ip, [const.FLOODING_ENTRY])
+        for __, ip, entries in self.ports.values():
+            if ip in fdb:
+                fdb[ip].extend(entries)
+        return fdb
+
+
+class NetworkFdbCache(object):
+    """Per network FDB views of the l2population driver.
+
+    A view is built from the database the first time the full FDB of a
+    network is needed. On each later use, the change marker of the ports of
+    the network is read with one aggregate query. If it differs from the
+    marker of the view, only the ports updated since the last use are read
+    and applied to the view, so that the port changes made by any server
+    process are seen without rebuilding it. The ports deleted through this
+    process are removed from the views by the driver. A view is rebuilt if
+    it can't be brought up to date that way, or after ``ttl`` seconds.
+
+    The tunnels of the HA router ports depend on the router bindings rather
+    than on the ports, so they are read from the database on each use, but
+    only for the networks with active HA router ports.
+    """
+
+    def __init__(self, ttl, get_port_fdb_entries):
+        self.ttl = ttl
+        self._get_port_fdb_entries = get_port_fdb_entries
+        self._views = {}
+        self.stats = collections.Counter()
+
+    @staticmethod
+    def _get_tunnels(network_ports):
+        for binding, agent in network_ports:
+            ip = l2pop_db.get_agent_ip(agent)
+            if not ip:
+                LOG.debug("Unable to retrieve the agent ip, check "
+                          "the agent %s configuration.", agent.host)
+                continue
+            yield binding, agent.host, ip
+
+    def _load_tunnels(self, context, network_id, view):
+        view.tunnels = {
+            host: ip for __, host, ip in self._get_tunnels(
+                l2pop_db.get_dvr_active_network_ports(context, network_id))}
+
+    def _load_ports(self, context, network_id, view, port_ids=None):
+        for binding, host, ip in self._get_tunnels(
+                l2pop_db.get_nondistributed_active_network_ports(
+                    context, network_id, port_ids=port_ids)):
+            view.ports[binding.port_id] = (
+                host, ip, self._get_port_fdb_entries(binding.port))
+
+    def _build_view(self, context, network_id):
+        # NOTE: the revisions are read before the ports, a port changed in
+        # between is read again on the next use of the view.
+        view = NetworkFdbView()
+        view.update_port_revisions(
+            l2pop_db.get_network_ports_revisions(context, network_id))
+        self._load_tunnels(context, network_id, view)
+        self._load_ports(context, network_id, view)
+        self._views[network_id] = view
+        return view
+
+    def _refresh_view(self, context, network_id, view, marker):
+        """Apply the changes of the ports updated since the last use.
+
+        :returns: whether the view is up to date with the marker.
+        """
+        if marker[0] < len(view.port_revisions):
+            # ports deleted by another server process
+            return False
+        changed = view.update_port_revisions(
+            l2pop_db.get_network_ports_revisions(
+                context, network_id, changed_since=view.changed_since))
+        if view.marker != marker:
+            return False
+        for port_id in changed:
+            view.ports.pop(port_id, None)
+        self._load_ports(context, network_id, view, port_ids=changed)
+        if any(view.is_distributed_port(port_id) for port_id in changed):
+            self._load_tunnels(context, network_id, view)
+        return True
+
+    def _get_view(self, context, network_id):
+        marker = l2pop_db.get_network_ports_marker(context, network_id)
+        view = self._views.get(network_id)
+        if view and time.monotonic() - view.built_at >= self.ttl:
+            self.stats['expired'] += 1
+        elif view and view.marker == marker:
+            self.stats['hits'] += 1
+            return view
+        elif view and self._refresh_view(context, network_id, view,
+                                         marker):
+            self.stats['refreshes'] += 1
+            return view
+        elif view:
+            self.stats['changed'] += 1
+        self.stats['misses'] += 1
+        view = self._build_view(context, network_id)
+        LOG.debug("Built FDB view of network %(network)s: %(ports)d "
+                  "ports, %(tunnels)d distributed tunnels, cache "
+                  "stats: %(stats)s",
+                  {'network': network_id, 'ports': len(view.ports),
+                   'tunnels': len(view.tunnels),
+                   'stats': dict(self.stats)})
+        return view
+
+    def get_fdb(self, context, network_id, exclude_host):
+        """Return the FDB entries of a network, by tunnel IP.
+
+        The entries of the agent running on ``exclude_host`` are skipped.
+        """
+        view = self._get_view(context, network_id)
+        ha_tunnels = ()
+        if view.ha_port_ids:
+            ha_tunnels = [
+                (host, ip) for __, host, ip in self._get_tunnels(
+                    l2pop_db.get_ha_active_network_ports(context,
+                                                         network_id))]
+        return view.get_fdb(exclude_host, ha_tunnels)
+
+    def remove_port(self, network_id, port_id):
+        view = self._views.get(network_id)
+        if not view:
+            return
+        if view.is_distributed_port(port_id):
+            # the DVR tunnels are reloaded with the view
+            del self._views[network_id]
+        else:
+            view.remove_port(port_id)
+
+    def remove_network(self, network_id):
+        self._views.pop(network_id, None)
@@ -19,25 +19,34 @@ from neutron_lib import exceptions
 from neutron_lib.plugins import constants as plugin_constants
 from neutron_lib.plugins import directory
 from neutron_lib.plugins.ml2 import api
+from oslo_config import cfg
 from oslo_log import log as logging
 
 from neutron._i18n import _
+from neutron.conf.plugins.ml2.drivers import l2pop as l2pop_conf
 from neutron.db import l3_hamode_db
 from neutron.plugins.ml2.drivers.l2pop import db as l2pop_db
+from neutron.plugins.ml2.drivers.l2pop import fdb_cache
 from neutron.plugins.ml2.drivers.l2pop import rpc as l2pop_rpc
 
 LOG = logging.getLogger(__name__)
 
+l2pop_conf.register_l2pop_opts()
+
 
 class L2populationMechanismDriver(api.MechanismDriver):
 
     def __init__(self):
         super(L2populationMechanismDriver, self).__init__()
         self.L2populationAgentNotify = l2pop_rpc.L2populationAgentNotifyAPI()
+        self.fdb_cache = None
 
     def initialize(self):
         LOG.debug("Experimental L2 population driver")
         self.rpc_ctx = n_context.get_admin_context_without_session()
+        if cfg.CONF.l2pop.fdb_cache_ttl:
+            self.fdb_cache = fdb_cache.NetworkFdbCache(
+                cfg.CONF.l2pop.fdb_cache_ttl, self._get_port_fdb_entries)
 
     def _get_port_fdb_entries(self, port):
         # the port might be concurrently deleted
@@ -72,8 +81,14 @@ class L2populationMechanismDriver(api.MechanismDriver):
 
         return other_fdb_ports
 
+    def delete_network_postcommit(self, context):
+        if self.fdb_cache:
+            self.fdb_cache.remove_network(context.current['id'])
+
     def delete_port_postcommit(self, context):
         port = context.current
+        if self.fdb_cache:
+            self.fdb_cache.remove_port(port['network_id'], port['id'])
         agent_host = context.host
         plugin_context = context._plugin_context
         fdb_entries = self._get_agent_fdb(
@@ -216,6 +231,11 @@ class L2populationMechanismDriver(api.MechanismDriver):
                              {'segment_id': segment['segmentation_id'],
                               'network_type': segment['network_type'],
                               'ports': {}}}
+        if self.fdb_cache:
+            agent_fdb_entries[network_id]['ports'].update(
+                self.fdb_cache.get_fdb(context, network_id, agent.host))
+            return agent_fdb_entries
+
         tunnel_network_ports = (
             l2pop_db.get_distributed_active_network_ports(context, network_id))
         fdb_network_ports = (
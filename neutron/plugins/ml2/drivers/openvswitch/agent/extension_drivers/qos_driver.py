@@ -158,6 +158,66 @@ class QosOVSAgentDriver(qos.QosLinuxAgentDriver):
             max_burst_kbps
         )
 
+    def update_ports(self, ports, qos_policy, old_qos_policy=None):
+        """Reapply QoS rules on a set of ports.
+
+        The bandwidth limits of all the ports are set in one OVSDB
+        transaction per direction, the other rules are applied port by port.
+        """
+        rules = list(self._iterate_rules(qos_policy.rules))
+        old_rules = (list(self._iterate_rules(old_qos_policy.rules))
+                     if old_qos_policy else None)
+        egress_limits = {}
+        ingress_limits = {}
+        for port in ports:
+            vif_port = port.get('vif_port')
+            bw_limit_rules = {}
+            other_rules = []
+            for rule in rules:
+                if not rule.should_apply_to_port(port):
+                    continue
+                if rule.rule_type == qos_consts.RULE_TYPE_BANDWIDTH_LIMIT:
+                    if vif_port:
+                        bw_limit_rules[rule.direction] = rule
+                else:
+                    other_rules.append(rule)
+
+            if old_rules is None:
+                self.delete(port)
+            for rule in old_rules or []:
+                # NOTE: the bandwidth limits overwritten below do not need
+                # to be removed first.
+                if (rule.rule_type == qos_consts.RULE_TYPE_BANDWIDTH_LIMIT and
+                        rule.direction in bw_limit_rules):
+                    continue
+                self._handle_rule_delete(
+                    port, rule.rule_type,
+                    ingress=self._rule_is_ingress_direction(rule))
+
+            for direction, rule in bw_limit_rules.items():
+                self.ports[port['port_id']][
+                    (qos_consts.RULE_TYPE_BANDWIDTH_LIMIT, direction)] = port
+                if direction == constants.INGRESS_DIRECTION:
+                    ingress_limits[vif_port.port_name] = (
+                        rule.max_kbps or 0, rule.max_burst_kbps or 0)
+                else:
+                    egress_limits[vif_port.port_name] = (
+                        rule.max_kbps,
+                        int(self._get_egress_burst_value(rule)))
+            for rule in other_rules:
+                handler = getattr(self, 'update_%s' % rule.rule_type)
+                handler(port, rule)
+
+        if egress_limits:
+            self.br_int.set_egress_bw_limit_for_ports(egress_limits)
+        if ingress_limits:
+            self.br_int.update_ingress_bw_limit_for_ports(ingress_limits)
+        LOG.debug("Bandwidth limits of QoS policy %(policy_id)s applied on "
+                  "%(egress)d ports in egress and %(ingress)d ports in "
+                  "ingress direction",
+                  {'policy_id': qos_policy.id, 'egress': len(egress_limits),
+                   'ingress': len(ingress_limits)})
+
     def create_minimum_bandwidth(self, port, rule):
         self.update_minimum_bandwidth(port, rule)
 
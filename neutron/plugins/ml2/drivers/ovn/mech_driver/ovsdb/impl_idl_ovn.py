@@ -10,7 +10,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import contextlib
+import threading
+import time
+import traceback
 import uuid
 
 from neutron_lib import exceptions as n_exc
@@ -52,6 +56,99 @@ class OvnNbTransaction(idl_trans.Transaction):
         self.api.nb_global.increment('nb_cfg')
 
 
+class OvnNbCoalescedTransaction(OvnNbTransaction):
+    """A single transaction running the commands of several transactions."""
+
+    def __init__(self, api, ovsdb_connection, timeout, transactions):
+        super(OvnNbCoalescedTransaction, self).__init__(
+            api, ovsdb_connection, timeout, check_error=True,
+            log_errors=False,
+            bump_nb_cfg=any(txn.bump_nb_cfg for txn in transactions))
+        self.transactions = transactions
+        for txn in transactions:
+            self.commands.extend(txn.commands)
+
+    def do_commit(self):
+        try:
+            result = super(OvnNbCoalescedTransaction, self).do_commit()
+        except Exception as e:
+            LOG.debug('Coalesced transaction failed, committing its %(num)d '
+                      'transactions individually. Reason: %(error)s',
+                      {'num': len(self.transactions), 'error': e})
+            result = None
+        if result is None:
+            self._commit_individually()
+            return
+
+        index = 0
+        for txn in self.transactions:
+            txn.results.put(result[index:index + len(txn.commands)])
+            index += len(txn.commands)
+        return result
+
+    def _commit_individually(self):
+        # NOTE: the commands are run again in their own transaction so any
+        # error (e.g. a revision conflict) is reported to the request that
+        # caused it, exactly as if the transaction had not been coalesced.
+        for txn in self.transactions:
+            try:
+                txn.results.put(txn.do_commit())
+            except Exception as ex:
+                txn.results.put(idlutils.ExceptionResult(
+                    ex=ex, tb=traceback.format_exc()))
+
+
+class OvnNbTransactionCoalescer(object):
+    """Merge the NB transactions committed within a short time window.
+
+    The coalescer is used by the transactions in place of the OVSDB
+    connection. The first transaction queued opens a window during which
+    the transactions of other requests are gathered, then all of them are
+    committed as one OVSDB transaction. Every request still waits for the
+    result of its own commands, so the revision numbers are bumped by each
+    request only once its own commands have been committed.
+    """
+
+    def __init__(self, api, window):
+        self.api = api
+        self.window = window
+        self._lock = threading.Lock()
+        self._pending = []
+        self.stats = collections.Counter()
+
+    @property
+    def timeout(self):
+        return self.api.ovsdb_connection.timeout
+
+    def queue_txn(self, txn):
+        with self._lock:
+            self._pending.append(txn)
+            if len(self._pending) > 1:
+                return
+        time.sleep(self.window)
+        with self._lock:
+            transactions, self._pending = self._pending, []
+
+        self.stats['transactions'] += len(transactions)
+        self.stats['commits'] += 1
+        if len(transactions) == 1:
+            txn = transactions[0]
+        else:
+            txn = OvnNbCoalescedTransaction(
+                self.api, self.api.ovsdb_connection, self.timeout,
+                transactions)
+            LOG.debug('Coalesced %(num)d OVN NB transactions into one. '
+                      'Stats: %(stats)s',
+                      {'num': len(transactions), 'stats': dict(self.stats)})
+        try:
+            self.api.ovsdb_connection.queue_txn(txn)
+        except Exception as ex:
+            result = idlutils.ExceptionResult(ex=ex,
+                                              tb=traceback.format_exc())
+            for pending_txn in transactions:
+                pending_txn.results.put(result)
+
+
 # This version of Backend doesn't use a class variable for ovsdb_connection
 # and therefor allows networking-ovn to manage connection scope on its own
 class Backend(ovs_idl.Backend):
@@ -161,6 +258,11 @@ class OvsdbNbOvnIdl(nb_impl_idl.OvnNbApiIdlImpl, Backend):
         super(OvsdbNbOvnIdl, self).__init__(connection)
         self.idl._session.reconnect.set_probe_interval(
             cfg.get_ovn_ovsdb_probe_interval())
+        coalesce_window = cfg.get_ovn_ovsdb_txn_coalesce_window()
+        self.txn_coalescer = None
+        if coalesce_window:
+            self.txn_coalescer = OvnNbTransactionCoalescer(
+                self, coalesce_window / 1000.0)
 
     @property
     def nb_global(self):
@@ -169,8 +271,9 @@ class OvsdbNbOvnIdl(nb_impl_idl.OvnNbApiIdlImpl, Backend):
     def create_transaction(self, check_error=False, log_errors=True,
                            bump_nb_cfg=False):
         return OvnNbTransaction(
-            self, self.ovsdb_connection, self.ovsdb_connection.timeout,
-            check_error, log_errors, bump_nb_cfg=bump_nb_cfg)
+            self, self.txn_coalescer or self.ovsdb_connection,
+            self.ovsdb_connection.timeout, check_error, log_errors,
+            bump_nb_cfg=bump_nb_cfg)
 
     @contextlib.contextmanager
     def transaction(self, *args, **kwargs):
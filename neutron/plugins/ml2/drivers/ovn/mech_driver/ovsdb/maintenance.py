@@ -14,9 +14,13 @@
 #    under the License.
 
 import abc
+import collections
 import inspect
+import itertools
+import operator
 import threading
 
+import eventlet
 from futurist import periodics
 from neutron_lib.api.definitions import external_net
 from neutron_lib import constants as n_const
@@ -140,6 +144,7 @@ class DBInconsistenciesPeriodics(SchemaAwarePeriodicsBase):
         self._resources_func_map = {
             ovn_const.TYPE_NETWORKS: {
                 'neutron_get': self._ovn_client._plugin.get_network,
+                'neutron_get_bulk': self._ovn_client._plugin.get_networks,
                 'ovn_get': self._nb_idl.get_lswitch,
                 'ovn_create': self._ovn_client.create_network,
                 'ovn_update': self._ovn_client.update_network,
@@ -147,6 +152,7 @@ class DBInconsistenciesPeriodics(SchemaAwarePeriodicsBase):
             },
             ovn_const.TYPE_PORTS: {
                 'neutron_get': self._ovn_client._plugin.get_port,
+                'neutron_get_bulk': self._ovn_client._plugin.get_ports,
                 'ovn_get': self._nb_idl.get_lswitch_port,
                 'ovn_create': self._ovn_client.create_port,
                 'ovn_update': self._ovn_client.update_port,
@@ -154,6 +160,8 @@ class DBInconsistenciesPeriodics(SchemaAwarePeriodicsBase):
             },
             ovn_const.TYPE_FLOATINGIPS: {
                 'neutron_get': self._ovn_client._l3_plugin.get_floatingip,
+                'neutron_get_bulk':
+                    self._ovn_client._l3_plugin.get_floatingips,
                 'ovn_get': self._nb_idl.get_floatingip,
                 'ovn_create': self._ovn_client.create_floatingip,
                 'ovn_update': self._ovn_client.update_floatingip,
@@ -161,6 +169,7 @@ class DBInconsistenciesPeriodics(SchemaAwarePeriodicsBase):
             },
             ovn_const.TYPE_ROUTERS: {
                 'neutron_get': self._ovn_client._l3_plugin.get_router,
+                'neutron_get_bulk': self._ovn_client._l3_plugin.get_routers,
                 'ovn_get': self._nb_idl.get_lrouter,
                 'ovn_create': self._ovn_client.create_router,
                 'ovn_update': self._ovn_client.update_router,
@@ -168,6 +177,8 @@ class DBInconsistenciesPeriodics(SchemaAwarePeriodicsBase):
             },
             ovn_const.TYPE_SECURITY_GROUPS: {
                 'neutron_get': self._ovn_client._plugin.get_security_group,
+                'neutron_get_bulk':
+                    self._ovn_client._plugin.get_security_groups,
                 'ovn_get': self._get_security_group,
                 'ovn_create': self._ovn_client.create_security_group,
                 'ovn_delete': self._ovn_client.delete_security_group,
@@ -175,6 +186,8 @@ class DBInconsistenciesPeriodics(SchemaAwarePeriodicsBase):
             ovn_const.TYPE_SECURITY_GROUP_RULES: {
                 'neutron_get':
                     self._ovn_client._plugin.get_security_group_rule,
+                'neutron_get_bulk':
+                    self._ovn_client._plugin.get_security_group_rules,
                 'ovn_get': self._nb_idl.get_acl_by_id,
                 'ovn_create': self._ovn_client.create_security_group_rule,
                 'ovn_delete': self._ovn_client.delete_security_group_rule,
@@ -182,6 +195,7 @@ class DBInconsistenciesPeriodics(SchemaAwarePeriodicsBase):
             ovn_const.TYPE_ROUTER_PORTS: {
                 'neutron_get':
                     self._ovn_client._plugin.get_port,
+                'neutron_get_bulk': self._ovn_client._plugin.get_ports,
                 'ovn_get': self._nb_idl.get_lrouter_port,
                 'ovn_create': self._create_lrouter_port,
                 'ovn_update': self._ovn_client.update_router_port,
@@ -212,16 +226,15 @@ class DBInconsistenciesPeriodics(SchemaAwarePeriodicsBase):
                 LOG.exception(
                     'Unknown error while executing "%s"', func.__name__)
 
-    def _fix_create_update(self, context, row):
+    def _fix_create_update(self, context, row, n_obj=None):
         res_map = self._resources_func_map[row.resource_type]
         try:
-            # Get the latest version of the resource in Neutron DB
-            n_obj = res_map['neutron_get'](context, row.resource_uuid)
+            # Get the latest version of the resource in Neutron DB, unless
+            # it was already loaded along with the rest of its batch
+            if n_obj is None:
+                n_obj = res_map['neutron_get'](context, row.resource_uuid)
         except n_exc.NotFound:
-            LOG.warning('Skip fixing resource %(res_uuid)s (type: '
-                        '%(res_type)s). Resource does not exist in Neutron '
-                        'database anymore', {'res_uuid': row.resource_uuid,
-                                             'res_type': row.resource_type})
+            self._log_missing_neutron_resource(row)
             return
 
         ovn_obj = res_map['ovn_get'](row.resource_uuid)
@@ -254,6 +267,13 @@ class DBInconsistenciesPeriodics(SchemaAwarePeriodicsBase):
                     revision_numbers_db.bump_revision(context, n_obj,
                                                       row.resource_type)
 
+    @staticmethod
+    def _log_missing_neutron_resource(row):
+        LOG.warning('Skip fixing resource %(res_uuid)s (type: '
+                    '%(res_type)s). Resource does not exist in Neutron '
+                    'database anymore', {'res_uuid': row.resource_uuid,
+                                         'res_type': row.resource_type})
+
     def _fix_delete(self, context, row):
         res_map = self._resources_func_map[row.resource_type]
         ovn_obj = res_map['ovn_get'](row.resource_uuid)
@@ -349,14 +369,38 @@ class DBInconsistenciesPeriodics(SchemaAwarePeriodicsBase):
         self._log_maintenance_inconsistencies(create_update_inconsistencies,
                                               delete_inconsistencies)
         self._sync_timer.restart()
+        stats = collections.Counter(
+            scanned=(len(create_update_inconsistencies) +
+                     len(delete_inconsistencies)))
+
+        batch_size = ovn_conf.get_ovn_maintenance_batch_size()
+        for rows, type_ in ((create_update_inconsistencies,
+                             INCONSISTENCY_TYPE_CREATE_UPDATE),
+                            (delete_inconsistencies,
+                             INCONSISTENCY_TYPE_DELETE)):
+            if batch_size:
+                self._fix_inconsistencies_in_batches(rows, type_,
+                                                     batch_size, stats)
+            else:
+                for row in rows:
+                    self._fix_inconsistency(admin_context, row, type_,
+                                            stats)
 
-        dbg_log_msg = ('Maintenance task: Fixing resource %(res_uuid)s '
-                       '(type: %(res_type)s) at %(type_)s')
-        # Fix the create/update resources inconsistencies
-        for row in create_update_inconsistencies:
-            LOG.debug(dbg_log_msg, {'res_uuid': row.resource_uuid,
-                                    'res_type': row.resource_type,
-                                    'type_': INCONSISTENCY_TYPE_CREATE_UPDATE})
+        self._sync_timer.stop()
+        LOG.info('Maintenance task: Synchronization finished '
+                 '(took %(time).2f seconds, rows scanned: %(scanned)d, '
+                 'fixed: %(fixed)d, skipped: %(skipped)d, '
+                 'failed: %(failed)d)',
+                 {'time': self._sync_timer.elapsed(),
+                  'scanned': stats['scanned'], 'fixed': stats['fixed'],
+                  'skipped': stats['skipped'], 'failed': stats['failed']})
+
+    def _fix_inconsistency(self, context, row, type_, stats, **kwargs):
+        LOG.debug('Maintenance task: Fixing resource %(res_uuid)s '
+                  '(type: %(res_type)s) at %(type_)s',
+                  {'res_uuid': row.resource_uuid,
+                   'res_type': row.resource_type, 'type_': type_})
+        if type_ == INCONSISTENCY_TYPE_CREATE_UPDATE:
             try:
                 # NOTE(lucasagomes): The way to fix subnets is bit
                 # different than other resources. A subnet in OVN language
@@ -365,35 +409,85 @@ class DBInconsistenciesPeriodics(SchemaAwarePeriodicsBase):
                 # to True. So, it's possible to have a consistent subnet
                 # resource even when it does not exist in the OVN database.
                 if row.resource_type == ovn_const.TYPE_SUBNETS:
-                    self._fix_create_update_subnet(admin_context, row)
+                    self._fix_create_update_subnet(context, row)
                 else:
-                    self._fix_create_update(admin_context, row)
+                    self._fix_create_update(context, row, **kwargs)
             except Exception:
+                stats['failed'] += 1
                 LOG.exception('Maintenance task: Failed to fix resource '
                               '%(res_uuid)s (type: %(res_type)s)',
                               {'res_uuid': row.resource_uuid,
                                'res_type': row.resource_type})
-
-        # Fix the deleted resources inconsistencies
-        for row in delete_inconsistencies:
-            LOG.debug(dbg_log_msg, {'res_uuid': row.resource_uuid,
-                                    'res_type': row.resource_type,
-                                    'type_': INCONSISTENCY_TYPE_DELETE})
+                return
+        else:
             try:
                 if row.resource_type == ovn_const.TYPE_SUBNETS:
-                    self._ovn_client.delete_subnet(admin_context,
+                    self._ovn_client.delete_subnet(context,
                                                    row.resource_uuid)
                 else:
-                    self._fix_delete(admin_context, row)
+                    self._fix_delete(context, row)
             except Exception:
+                stats['failed'] += 1
                 LOG.exception('Maintenance task: Failed to fix deleted '
                               'resource %(res_uuid)s (type: %(res_type)s)',
                               {'res_uuid': row.resource_uuid,
                                'res_type': row.resource_type})
+                return
+        stats['fixed'] += 1
 
-        self._sync_timer.stop()
-        LOG.info('Maintenance task: Synchronization finished '
-                 '(took %.2f seconds)', self._sync_timer.elapsed())
+    def _get_neutron_objects(self, context, resource_type, rows):
+        """Load the Neutron objects of a batch of rows with one query.
+
+        :returns: A dictionary of Neutron objects indexed by ID or None if
+                  they could not be loaded, in which case each one will be
+                  retrieved when fixing its row.
+        """
+        res_map = self._resources_func_map[resource_type]
+        try:
+            n_objs = res_map['neutron_get_bulk'](
+                context, filters={'id': [row.resource_uuid for row in rows]})
+        except Exception:
+            LOG.exception('Maintenance task: Failed to retrieve %(count)d '
+                          'resources of type %(res_type)s, they will be '
+                          'retrieved one by one',
+                          {'count': len(rows), 'res_type': resource_type})
+            return
+        return {n_obj['id']: n_obj for n_obj in n_objs}
+
+    def _fix_inconsistencies_in_batches(self, rows, type_, batch_size,
+                                        stats):
+        # NOTE: The rows are sorted by resource type in the order the
+        # resources depend on each other, so all the rows of one type are
+        # fixed before moving on to the next type. Each green thread uses
+        # its own context, a database session can't be shared among them.
+        pool = eventlet.GreenPool(batch_size)
+        for resource_type, type_rows in itertools.groupby(
+                rows, key=operator.attrgetter('resource_type')):
+            type_rows = list(type_rows)
+            timer = timeutils.StopWatch().start()
+            for i in range(0, len(type_rows), batch_size):
+                batch = type_rows[i:i + batch_size]
+                n_objs = None
+                if (type_ == INCONSISTENCY_TYPE_CREATE_UPDATE and
+                        resource_type != ovn_const.TYPE_SUBNETS):
+                    n_objs = self._get_neutron_objects(
+                        n_context.get_admin_context(), resource_type, batch)
+                for row in batch:
+                    kwargs = {}
+                    if n_objs is not None:
+                        if row.resource_uuid not in n_objs:
+                            self._log_missing_neutron_resource(row)
+                            stats['skipped'] += 1
+                            continue
+                        kwargs['n_obj'] = n_objs[row.resource_uuid]
+                    pool.spawn_n(self._fix_inconsistency,
+                                 n_context.get_admin_context(), row, type_,
+                                 stats, **kwargs)
+            pool.waitall()
+            LOG.debug('Maintenance task: Fixed %(count)d resources of type '
+                      '%(res_type)s at %(type_)s (took %(time).2f seconds)',
+                      {'count': len(type_rows), 'res_type': resource_type,
+                       'type_': type_, 'time': timer.elapsed()})
 
     def _create_lrouter_port(self, context, port):
         router_id = port['device_id']
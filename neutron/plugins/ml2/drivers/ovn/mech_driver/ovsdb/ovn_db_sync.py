@@ -14,6 +14,7 @@ import abc
 from datetime import datetime
 import itertools
 
+import eventlet
 from eventlet import greenthread
 from neutron_lib.api.definitions import l3
 from neutron_lib.api.definitions import provider_net as pnet
@@ -24,6 +25,7 @@ from neutron_lib.plugins import constants as plugin_constants
 from neutron_lib.plugins import directory
 from neutron_lib.utils import helpers
 from oslo_log import log
+from oslo_utils import timeutils
 import six
 
 from neutron.common.ovn import acl as acl_utils
@@ -88,6 +90,11 @@ class OvnNbSynchronizer(OvnDbSynchronizer):
 
         ctx = context.get_admin_context()
 
+        chunk_size = ovn_conf.get_ovn_neutron_sync_chunk_size()
+        if chunk_size:
+            self._do_sync_chunked(ctx, chunk_size)
+            return
+
         self.sync_address_sets(ctx)
         self.sync_port_groups(ctx)
         self.sync_networks_ports_and_dhcp_opts(ctx)
@@ -95,6 +102,52 @@ class OvnNbSynchronizer(OvnDbSynchronizer):
         self.sync_acls(ctx)
         self.sync_routers_and_rports(ctx)
 
+    def _do_sync_chunked(self, ctx, chunk_size):
+        # Address Sets and Port Groups are referenced by the ACLs created
+        # along with the ports, so they are synced first. Then the
+        # switching and routing resources, which are independent from each
+        # other, are synced in parallel. Each green thread uses its own
+        # context, a database session can't be shared among them.
+        start = timeutils.utcnow()
+        self.sync_address_sets(ctx)
+        self.sync_port_groups(ctx)
+
+        def _sync_switching(ctx):
+            self.sync_networks_ports_and_dhcp_opts_chunked(ctx, chunk_size)
+            self.sync_port_dns_records(ctx)
+            self.sync_acls(ctx)
+
+        pool = eventlet.GreenPool()
+        threads = [
+            pool.spawn(self._run_sync_task, name, sync_func)
+            for name, sync_func in (
+                ('switching', _sync_switching),
+                ('routing', self.sync_routers_and_rports))]
+        failures = [exc for exc in (thread.wait() for thread in threads)
+                    if exc is not None]
+        if failures:
+            raise failures[0]
+        LOG.info('OVN-NB Sync finished in %s seconds',
+                 timeutils.delta_seconds(start, timeutils.utcnow()))
+
+    @staticmethod
+    def _run_sync_task(name, sync_func):
+        """Run a sync function with its own admin context.
+
+        :returns: the exception raised by the sync function, if any, so the
+                  other sync functions run in parallel can complete.
+        """
+        start = timeutils.utcnow()
+        try:
+            sync_func(context.get_admin_context())
+        except Exception as e:
+            LOG.exception('OVN-NB Sync of %s resources failed', name)
+            return e
+        LOG.info('OVN-NB Sync of %(name)s resources finished in %(time)s '
+                 'seconds', {'name': name,
+                             'time': timeutils.delta_seconds(
+                                 start, timeutils.utcnow())})
+
     def _create_port_in_ovn(self, ctx, port):
         # Remove any old ACLs for the port to avoid creating duplicate ACLs.
         self.ovn_api.delete_acl(
@@ -758,17 +811,24 @@ class OvnNbSynchronizer(OvnDbSynchronizer):
         LOG.debug('OVN-NB Sync routers and router ports finished %s',
                   str(datetime.now()))
 
-    def _sync_subnet_dhcp_options(self, ctx, db_networks,
-                                  ovn_subnet_dhcp_options):
-        LOG.debug('OVN-NB Sync DHCP options for Neutron subnets started')
-
+    def _get_db_subnets_with_dhcp(self, ctx, filters=None):
         db_subnets = {}
-        filters = {'enable_dhcp': [1]}
+        filters = dict(filters or {}, enable_dhcp=[1])
         for subnet in self.core_plugin.get_subnets(ctx, filters=filters):
             if (subnet['ip_version'] == constants.IP_VERSION_6 and
                     subnet.get('ipv6_address_mode') == constants.IPV6_SLAAC):
                 continue
             db_subnets[subnet['id']] = subnet
+        return db_subnets
+
+    def _sync_subnet_dhcp_options(self, ctx, db_networks,
+                                  ovn_subnet_dhcp_options, db_subnets=None):
+        LOG.debug('OVN-NB Sync DHCP options for Neutron subnets started')
+
+        if db_subnets is None:
+            db_subnets = self._get_db_subnets_with_dhcp(ctx)
+        else:
+            db_subnets = dict(db_subnets)
 
         del_subnet_dhcp_opts_list = []
         for subnet_id, ovn_dhcp_opts in ovn_subnet_dhcp_options.items():
@@ -889,16 +949,18 @@ class OvnNbSynchronizer(OvnDbSynchronizer):
         LOG.debug('OVN-NB Sync DHCP options for Neutron ports with extra '
                   'dhcp options assigned finished')
 
-    def _sync_metadata_ports(self, ctx, db_ports):
+    def _sync_metadata_ports(self, ctx, db_ports, networks=None):
         """Ensure metadata ports in all Neutron networks.
 
-        This method will ensure that all networks have one and only one
-        metadata port.
+        This method will ensure that all networks (or only the given ones)
+        have one and only one metadata port.
         """
         if not ovn_conf.is_ovn_metadata_enabled():
             return
         LOG.debug('OVN sync metadata ports started')
-        for net in self.core_plugin.get_networks(ctx):
+        if networks is None:
+            networks = self.core_plugin.get_networks(ctx)
+        for net in networks:
             dhcp_ports = self.core_plugin.get_ports(ctx, filters=dict(
                 network_id=[net['id']],
                 device_owner=[constants.DEVICE_OWNER_DHCP]))
@@ -963,10 +1025,24 @@ class OvnNbSynchronizer(OvnDbSynchronizer):
                     utils.is_lsp_ignored(port)}
 
         ovn_all_dhcp_options = self.ovn_api.get_all_dhcp_options()
+        lswitches = self.ovn_api.get_all_logical_switches_with_ports()
+        self._sync_networks_ports_and_dhcp_opts(
+            ctx, db_networks, db_ports, lswitches, ovn_all_dhcp_options)
+        LOG.debug('OVN-NB Sync networks, ports and DHCP options finished')
+
+    def _sync_networks_ports_and_dhcp_opts(self, ctx, db_networks, db_ports,
+                                           lswitches, ovn_all_dhcp_options,
+                                           db_subnets=None):
+        """Sync the given Neutron networks and ports with the given NB rows.
+
+        Any logical switch in lswitches not matching a network in
+        db_networks is deleted, as are the DHCP options in
+        ovn_all_dhcp_options not matching a Neutron subnet or port. If
+        db_subnets is None, all the Neutron subnets are retrieved.
+        """
         db_network_cache = dict(db_networks)
 
         ports_need_sync_dhcp_opts = []
-        lswitches = self.ovn_api.get_all_logical_switches_with_ports()
         del_lswitchs_list = []
         del_lports_list = []
         add_provnet_ports_list = []
@@ -1005,10 +1081,12 @@ class OvnNbSynchronizer(OvnDbSynchronizer):
                     LOG.warning("Create network in OVN NB failed for "
                                 "network %s", network['id'])
 
-        self._sync_metadata_ports(ctx, db_ports)
+        self._sync_metadata_ports(ctx, db_ports,
+                                  networks=db_network_cache.values())
 
         self._sync_subnet_dhcp_options(
-            ctx, db_network_cache, ovn_all_dhcp_options['subnets'])
+            ctx, db_network_cache, ovn_all_dhcp_options['subnets'],
+            db_subnets=db_subnets)
 
         for port_id, port in db_ports.items():
             LOG.warning("Port found in Neutron but not in OVN "
@@ -1078,8 +1156,77 @@ class OvnNbSynchronizer(OvnDbSynchronizer):
         self._sync_port_dhcp_options(ctx, ports_need_sync_dhcp_opts,
                                      ovn_all_dhcp_options['ports_v4'],
                                      ovn_all_dhcp_options['ports_v6'])
+
+    def _get_networks_in_chunks(self, ctx, chunk_size):
+        marker = None
+        while True:
+            networks = self.core_plugin.get_networks(
+                ctx, sorts=[('id', True)], limit=chunk_size, marker=marker)
+            if networks:
+                yield networks
+            if len(networks) < chunk_size:
+                return
+            marker = networks[-1]['id']
+
+    def sync_networks_ports_and_dhcp_opts_chunked(self, ctx, chunk_size):
+        """Sync networks, ports and DHCP options by chunks of networks.
+
+        The Neutron networks are retrieved chunk_size at a time, along with
+        their ports and subnets, and compared with the logical switches and
+        DHCP options of the NB DB indexed by name and ID, so the Neutron
+        resources never need to be loaded all at once. The NB rows not
+        matched by any chunk are deleted at the end.
+        """
+        LOG.debug('OVN-NB Sync networks, ports and DHCP options started '
+                  '(chunk size %d)', chunk_size)
+        start = timeutils.utcnow()
+        lswitches = {lswitch['name']: lswitch for lswitch in
+                     self.ovn_api.get_all_logical_switches_with_ports()}
+        ovn_all_dhcp_options = self.ovn_api.get_all_dhcp_options()
+        num_networks = num_ports = 0
+        for networks in self._get_networks_in_chunks(ctx, chunk_size):
+            network_ids = [net['id'] for net in networks]
+            db_networks = {utils.ovn_name(net['id']): net
+                           for net in networks}
+            db_ports = {port['id']: port for port in
+                        self.core_plugin.get_ports(
+                            ctx, filters={'network_id': network_ids})
+                        if not utils.is_lsp_ignored(port)}
+            db_subnets = self._get_db_subnets_with_dhcp(
+                ctx, filters={'network_id': network_ids})
+            chunk_lswitches = [lswitches.pop(name) for name in db_networks
+                               if name in lswitches]
+            port_ids = set(db_ports)
+            for lswitch in chunk_lswitches:
+                port_ids.update(lswitch['ports'])
+            chunk_dhcp_options = {
+                'subnets': self._pop_items(ovn_all_dhcp_options['subnets'],
+                                           db_subnets),
+                'ports_v4': self._pop_items(ovn_all_dhcp_options['ports_v4'],
+                                            port_ids),
+                'ports_v6': self._pop_items(ovn_all_dhcp_options['ports_v6'],
+                                            port_ids)}
+            num_networks += len(networks)
+            num_ports += len(db_ports)
+            self._sync_networks_ports_and_dhcp_opts(
+                ctx, db_networks, db_ports, chunk_lswitches,
+                chunk_dhcp_options, db_subnets=db_subnets)
+            LOG.info('OVN-NB Sync processed %(networks)d networks and '
+                     '%(ports)d ports in %(time)s seconds',
+                     {'networks': num_networks, 'ports': num_ports,
+                      'time': timeutils.delta_seconds(start,
+                                                      timeutils.utcnow())})
+
+        # The remaining NB rows do not belong to any Neutron network.
+        self._sync_networks_ports_and_dhcp_opts(
+            ctx, {}, {}, list(lswitches.values()), ovn_all_dhcp_options,
+            db_subnets={})
         LOG.debug('OVN-NB Sync networks, ports and DHCP options finished')
 
+    @staticmethod
+    def _pop_items(items, keys):
+        return {key: items.pop(key) for key in keys if key in items}
+
     def sync_port_dns_records(self, ctx):
         if self.mode != SYNC_MODE_REPAIR:
             return
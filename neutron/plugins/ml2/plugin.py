@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+
 from eventlet import greenthread
 import netaddr
 from netaddr.strategy import eui48
@@ -558,7 +560,7 @@ class Ml2Plugin(db_base_plugin_v2.NeutronDbPluginV2,
 
         return context, need_notify, try_again
 
-    def _bind_port(self, orig_context):
+    def _bind_port(self, orig_context, host_agents_cache=None):
         # Construct a new PortContext from the one from the previous
         # transaction.
         port = orig_context.current
@@ -575,149 +577,268 @@ class Ml2Plugin(db_base_plugin_v2.NeutronDbPluginV2,
             self, orig_context._plugin_context, port,
             orig_context.network.current, new_binding, None,
             original_port=orig_context.original)
+        if host_agents_cache is not None:
+            new_context._set_host_agents_cache(host_agents_cache)
 
         # Attempt to bind the port and return the context with the
         # result.
         self.mechanism_manager.bind_port(new_context)
         return new_context
 
+    def _bind_ports_if_needed_bulk(self, contexts):
+        """Bind a list of newly created ports in bulk.
+
+        Ports are grouped by (host, network, vnic_type) so that the host
+        agents lookup done by the mechanism drivers is executed once per
+        group, and all the successful bindings are committed in a single
+        transaction. Ports that fail to bind or whose binding can not be
+        committed this way go through the regular _bind_port_if_needed()
+        process, with its retries.
+        """
+        groups = collections.defaultdict(list)
+        for context in contexts:
+            if (context.network.network_segments and
+                    self._should_bind_port(context)):
+                key = (context._binding.host, context.network.current['id'],
+                       context._binding.vnic_type)
+                groups[key].append(context)
+
+        host_agents_cache = {}
+        bind_pairs = []
+        for (host, network_id, vnic_type), group in groups.items():
+            LOG.debug("Binding %(count)s ports of network %(network)s on "
+                      "host %(host)s with vnic_type %(vnic_type)s",
+                      {'count': len(group), 'network': network_id,
+                       'host': host, 'vnic_type': vnic_type})
+            for context in group:
+                bind_context = self._bind_port(
+                    context, host_agents_cache=host_agents_cache)
+                if (bind_context.vif_type !=
+                        portbindings.VIF_TYPE_BINDING_FAILED):
+                    bind_pairs.append((context, bind_context))
+
+        committed = self._commit_port_bindings_bulk(bind_pairs)
+        bound_contexts = []
+        for context in contexts:
+            port_id = context.current['id']
+            bound_context = committed.get(port_id)
+            if bound_context is None:
+                try:
+                    bound_context = self._bind_port_if_needed(context)
+                except ml2_exc.MechanismDriverError:
+                    with excutils.save_and_reraise_exception():
+                        LOG.error("_bind_port_if_needed failed, deleting "
+                                  "port '%s'", port_id)
+                        self.delete_port(context._plugin_context, port_id,
+                                         l3_port_check=False)
+            bound_contexts.append(bound_context)
+        return bound_contexts
+
+    def _commit_port_bindings_bulk(self, bind_pairs):
+        """Commit the bindings of several ports in one transaction.
+
+        :param bind_pairs: list of (orig_context, bind_context) tuples
+        :returns: a dictionary of the resulting PortContext per port ID, for
+                  the ports whose binding does not need to be tried again
+        """
+        if not bind_pairs:
+            return {}
+        plugin_context = bind_pairs[0][0]._plugin_context
+        for orig_context, bind_context in bind_pairs:
+            self._notify_port_binding_before_update(orig_context,
+                                                    bind_context)
+        try:
+            with db_api.CONTEXT_WRITER.using(plugin_context):
+                results = [self._commit_port_binding_db(orig_context,
+                                                        bind_context, True)
+                           for orig_context, bind_context in bind_pairs]
+        except Exception:
+            LOG.exception("Failed to commit the bindings of %s ports in "
+                          "bulk, binding them individually",
+                          len(bind_pairs))
+            return {}
+
+        committed = {}
+        for (orig_context, _bind_context), result in zip(bind_pairs,
+                                                         results):
+            port_id = orig_context.current['id']
+            try:
+                cur_context, _need_notify, try_again = (
+                    self._after_commit_port_binding(orig_context, result,
+                                                    False))
+            except ml2_exc.MechanismDriverError:
+                with excutils.save_and_reraise_exception():
+                    LOG.error("_commit_port_bindings_bulk failed, deleting "
+                              "port '%s'", port_id)
+                    self.delete_port(plugin_context, port_id,
+                                     l3_port_check=False)
+            if not try_again:
+                committed[port_id] = cur_context
+        return committed
+
     def _commit_port_binding(self, orig_context, bind_context,
                              need_notify, update_binding_levels=True):
-        port_id = orig_context.current['id']
         plugin_context = orig_context._plugin_context
-        orig_binding = orig_context._binding
-        new_binding = bind_context._binding
+        self._notify_port_binding_before_update(orig_context, bind_context)
 
+        # After we've attempted to bind the port, we begin a
+        # transaction, get the current port state, and decide whether
+        # to commit the binding results.
+        with db_api.CONTEXT_WRITER.using(plugin_context):
+            result = self._commit_port_binding_db(
+                orig_context, bind_context, update_binding_levels)
+
+        return self._after_commit_port_binding(orig_context, result,
+                                               need_notify)
+
+    def _notify_port_binding_before_update(self, orig_context, bind_context):
         # TODO(yamahata): revise what to be passed or new resource
         # like PORTBINDING should be introduced?
         # It would be addressed during EventPayload conversion.
         registry.notify(resources.PORT, events.BEFORE_UPDATE, self,
-                        context=plugin_context, port=orig_context.current,
+                        context=orig_context._plugin_context,
+                        port=orig_context.current,
                         original_port=orig_context.current,
-                        orig_binding=orig_binding, new_binding=new_binding)
+                        orig_binding=orig_context._binding,
+                        new_binding=bind_context._binding)
 
-        # After we've attempted to bind the port, we begin a
-        # transaction, get the current port state, and decide whether
-        # to commit the binding results.
-        with db_api.CONTEXT_WRITER.using(plugin_context):
-            # Get the current port state and build a new PortContext
-            # reflecting this state as original state for subsequent
-            # mechanism driver update_port_*commit() calls.
-            try:
-                port_db = self._get_port(plugin_context, port_id)
-                cur_binding = p_utils.get_port_binding_by_status_and_host(
-                    port_db.port_bindings, const.ACTIVE)
-            except exc.PortNotFound:
-                port_db, cur_binding = None, None
-            if not port_db or not cur_binding:
-                # The port has been deleted concurrently, so just
-                # return the unbound result from the initial
-                # transaction that completed before the deletion.
-                LOG.debug("Port %s has been deleted concurrently", port_id)
-                return orig_context, False, False
-            # Since the mechanism driver bind_port() calls must be made
-            # outside a DB transaction locking the port state, it is
-            # possible (but unlikely) that the port's state could change
-            # concurrently while these calls are being made. If another
-            # thread or process succeeds in binding the port before this
-            # thread commits its results, the already committed results are
-            # used. If attributes such as binding:host_id, binding:profile,
-            # or binding:vnic_type are updated concurrently, the try_again
-            # flag is returned to indicate that the commit was unsuccessful.
-            oport = self._make_port_dict(port_db)
-            port = self._make_port_dict(port_db)
-            network = bind_context.network.current
-            if port['device_owner'] == const.DEVICE_OWNER_DVR_INTERFACE:
-                # REVISIT(rkukura): The PortBinding instance from the
-                # ml2_port_bindings table, returned as cur_binding
-                # from port_db.port_binding above, is
-                # currently not used for DVR distributed ports, and is
-                # replaced here with the DistributedPortBinding instance from
-                # the ml2_distributed_port_bindings table specific to the host
-                # on which the distributed port is being bound. It
-                # would be possible to optimize this code to avoid
-                # fetching the PortBinding instance in the DVR case,
-                # and even to avoid creating the unused entry in the
-                # ml2_port_bindings table. But the upcoming resolution
-                # for bug 1367391 will eliminate the
-                # ml2_distributed_port_bindings table, use the
-                # ml2_port_bindings table to store non-host-specific
-                # fields for both distributed and non-distributed
-                # ports, and introduce a new ml2_port_binding_hosts
-                # table for the fields that need to be host-specific
-                # in the distributed case. Since the PortBinding
-                # instance will then be needed, it does not make sense
-                # to optimize this code to avoid fetching it.
-                cur_binding = db.get_distributed_port_binding_by_host(
-                    plugin_context, port_id, orig_binding.host)
-            cur_context_binding = cur_binding
+    def _commit_port_binding_db(self, orig_context, bind_context,
+                                update_binding_levels):
+        """Commit the binding results of a port; must run in a transaction.
+
+        Returns None if the port has been deleted concurrently, otherwise a
+        (cur_context, commit, port_db, oport) tuple to be passed to
+        _after_commit_port_binding once the transaction is finished.
+        """
+        port_id = orig_context.current['id']
+        plugin_context = orig_context._plugin_context
+        orig_binding = orig_context._binding
+        new_binding = bind_context._binding
+        # Get the current port state and build a new PortContext
+        # reflecting this state as original state for subsequent
+        # mechanism driver update_port_*commit() calls.
+        try:
+            port_db = self._get_port(plugin_context, port_id)
+            cur_binding = p_utils.get_port_binding_by_status_and_host(
+                port_db.port_bindings, const.ACTIVE)
+        except exc.PortNotFound:
+            port_db, cur_binding = None, None
+        if not port_db or not cur_binding:
+            # The port has been deleted concurrently, so just
+            # return the unbound result from the initial
+            # transaction that completed before the deletion.
+            LOG.debug("Port %s has been deleted concurrently", port_id)
+            return None
+        # Since the mechanism driver bind_port() calls must be made
+        # outside a DB transaction locking the port state, it is
+        # possible (but unlikely) that the port's state could change
+        # concurrently while these calls are being made. If another
+        # thread or process succeeds in binding the port before this
+        # thread commits its results, the already committed results are
+        # used. If attributes such as binding:host_id, binding:profile,
+        # or binding:vnic_type are updated concurrently, the try_again
+        # flag is returned to indicate that the commit was unsuccessful.
+        oport = self._make_port_dict(port_db)
+        port = self._make_port_dict(port_db)
+        network = bind_context.network.current
+        if port['device_owner'] == const.DEVICE_OWNER_DVR_INTERFACE:
+            # REVISIT(rkukura): The PortBinding instance from the
+            # ml2_port_bindings table, returned as cur_binding
+            # from port_db.port_binding above, is
+            # currently not used for DVR distributed ports, and is
+            # replaced here with the DistributedPortBinding instance from
+            # the ml2_distributed_port_bindings table specific to the host
+            # on which the distributed port is being bound. It
+            # would be possible to optimize this code to avoid
+            # fetching the PortBinding instance in the DVR case,
+            # and even to avoid creating the unused entry in the
+            # ml2_port_bindings table. But the upcoming resolution
+            # for bug 1367391 will eliminate the
+            # ml2_distributed_port_bindings table, use the
+            # ml2_port_bindings table to store non-host-specific
+            # fields for both distributed and non-distributed
+            # ports, and introduce a new ml2_port_binding_hosts
+            # table for the fields that need to be host-specific
+            # in the distributed case. Since the PortBinding
+            # instance will then be needed, it does not make sense
+            # to optimize this code to avoid fetching it.
+            cur_binding = db.get_distributed_port_binding_by_host(
+                plugin_context, port_id, orig_binding.host)
+        cur_context_binding = cur_binding
+        if new_binding.status == const.INACTIVE:
+            cur_context_binding = (
+                p_utils.get_port_binding_by_status_and_host(
+                    port_db.port_bindings, const.INACTIVE,
+                    host=new_binding.host))
+        cur_context = driver_context.PortContext(
+            self, plugin_context, port, network, cur_context_binding, None,
+            original_port=oport)
+
+        # Commit our binding results only if port has not been
+        # successfully bound concurrently by another thread or
+        # process and no binding inputs have been changed.
+        commit = ((cur_binding.vif_type in
+                   [portbindings.VIF_TYPE_UNBOUND,
+                    portbindings.VIF_TYPE_BINDING_FAILED]) and
+                  orig_binding.host == cur_binding.host and
+                  orig_binding.vnic_type == cur_binding.vnic_type and
+                  orig_binding.profile == cur_binding.profile)
+
+        if commit:
+            # Update the port's binding state with our binding
+            # results.
             if new_binding.status == const.INACTIVE:
-                cur_context_binding = (
-                    p_utils.get_port_binding_by_status_and_host(
-                        port_db.port_bindings, const.INACTIVE,
-                        host=new_binding.host))
-            cur_context = driver_context.PortContext(
-                self, plugin_context, port, network, cur_context_binding, None,
-                original_port=oport)
-
-            # Commit our binding results only if port has not been
-            # successfully bound concurrently by another thread or
-            # process and no binding inputs have been changed.
-            commit = ((cur_binding.vif_type in
-                       [portbindings.VIF_TYPE_UNBOUND,
-                        portbindings.VIF_TYPE_BINDING_FAILED]) and
-                      orig_binding.host == cur_binding.host and
-                      orig_binding.vnic_type == cur_binding.vnic_type and
-                      orig_binding.profile == cur_binding.profile)
-
-            if commit:
-                # Update the port's binding state with our binding
-                # results.
-                if new_binding.status == const.INACTIVE:
-                    cur_context_binding.status = const.ACTIVE
-                    cur_binding.status = const.INACTIVE
-                else:
-                    cur_context_binding.vif_type = new_binding.vif_type
-                    cur_context_binding.vif_details = new_binding.vif_details
-                if update_binding_levels:
-                    db.clear_binding_levels(plugin_context, port_id,
-                                            cur_binding.host)
-                    db.set_binding_levels(plugin_context,
-                                          bind_context._binding_levels)
-                # refresh context with a snapshot of updated state
-                cur_context._binding = driver_context.InstanceSnapshot(
-                    cur_context_binding)
-                cur_context._binding_levels = bind_context._binding_levels
-
-                # Update PortContext's port dictionary to reflect the
-                # updated binding state.
-                self._update_port_dict_binding(port, cur_context_binding)
-
-                # Update the port status if requested by the bound driver.
-                if (bind_context._binding_levels and
-                        bind_context._new_port_status):
-                    port_db.status = bind_context._new_port_status
-                    port['status'] = bind_context._new_port_status
-
-                # Call the mechanism driver precommit methods, commit
-                # the results, and call the postcommit methods.
-                self.mechanism_manager.update_port_precommit(cur_context)
+                cur_context_binding.status = const.ACTIVE
+                cur_binding.status = const.INACTIVE
             else:
-                # Try to populate the PortContext with the current binding
-                # levels so that the RPC notification won't get suppressed.
-                # This is to avoid leaving ports stuck in a DOWN state.
-                # For more information see bug:
-                # https://bugs.launchpad.net/neutron/+bug/1755810
-                LOG.warning("Concurrent port binding operations failed on "
-                            "port %s", port_id)
-                levels = db.get_binding_level_objs(plugin_context, port_id,
-                                                   cur_binding.host)
-                for level in levels:
-                    cur_context._push_binding_level(level)
-                # refresh context with a snapshot of the current binding state
-                cur_context._binding = driver_context.InstanceSnapshot(
-                    cur_binding)
-
+                cur_context_binding.vif_type = new_binding.vif_type
+                cur_context_binding.vif_details = new_binding.vif_details
+            if update_binding_levels:
+                db.clear_binding_levels(plugin_context, port_id,
+                                        cur_binding.host)
+                db.set_binding_levels(plugin_context,
+                                      bind_context._binding_levels)
+            # refresh context with a snapshot of updated state
+            cur_context._binding = driver_context.InstanceSnapshot(
+                cur_context_binding)
+            cur_context._binding_levels = bind_context._binding_levels
+
+            # Update PortContext's port dictionary to reflect the
+            # updated binding state.
+            self._update_port_dict_binding(port, cur_context_binding)
+
+            # Update the port status if requested by the bound driver.
+            if (bind_context._binding_levels and
+                    bind_context._new_port_status):
+                port_db.status = bind_context._new_port_status
+                port['status'] = bind_context._new_port_status
+
+            # Call the mechanism driver precommit methods, commit
+            # the results, and call the postcommit methods.
+            self.mechanism_manager.update_port_precommit(cur_context)
+        else:
+            # Try to populate the PortContext with the current binding
+            # levels so that the RPC notification won't get suppressed.
+            # This is to avoid leaving ports stuck in a DOWN state.
+            # For more information see bug:
+            # https://bugs.launchpad.net/neutron/+bug/1755810
+            LOG.warning("Concurrent port binding operations failed on "
+                        "port %s", port_id)
+            levels = db.get_binding_level_objs(plugin_context, port_id,
+                                               cur_binding.host)
+            for level in levels:
+                cur_context._push_binding_level(level)
+            # refresh context with a snapshot of the current binding state
+            cur_context._binding = driver_context.InstanceSnapshot(
+                cur_binding)
+
+        return cur_context, commit, port_db, oport
+
+    def _after_commit_port_binding(self, orig_context, result, need_notify):
+        if result is None:
+            return orig_context, False, False
+        cur_context, commit, port_db, oport = result
+        plugin_context = orig_context._plugin_context
         if commit:
             # Continue, using the port state as of the transaction that
             # just finished, whether that transaction committed new
@@ -1410,6 +1531,18 @@ class Ml2Plugin(db_base_plugin_v2.NeutronDbPluginV2,
         return self._after_create_port(context, result, mech_context)
 
     def _after_create_port(self, context, result, mech_context):
+        self._notify_port_created(context, result, mech_context)
+        try:
+            bound_context = self._bind_port_if_needed(mech_context)
+        except ml2_exc.MechanismDriverError:
+            with excutils.save_and_reraise_exception():
+                LOG.error("_bind_port_if_needed "
+                          "failed, deleting port '%s'", result['id'])
+                self.delete_port(context, result['id'], l3_port_check=False)
+
+        return bound_context.current
+
+    def _notify_port_created(self, context, result, mech_context):
         # notify any plugin that is interested in port create events
         kwargs = {'context': context, 'port': result}
         registry.notify(resources.PORT, events.AFTER_CREATE, self, **kwargs)
@@ -1421,15 +1554,14 @@ class Ml2Plugin(db_base_plugin_v2.NeutronDbPluginV2,
                 LOG.error("mechanism_manager.create_port_postcommit "
                           "failed, deleting port '%s'", result['id'])
                 self.delete_port(context, result['id'], l3_port_check=False)
-        try:
-            bound_context = self._bind_port_if_needed(mech_context)
-        except ml2_exc.MechanismDriverError:
-            with excutils.save_and_reraise_exception():
-                LOG.error("_bind_port_if_needed "
-                          "failed, deleting port '%s'", result['id'])
-                self.delete_port(context, result['id'], l3_port_check=False)
 
-        return bound_context.current
+    def _after_create_ports_bulk(self, context, port_data):
+        for port in port_data:
+            self._notify_port_created(context, port['port_dict'],
+                                      port['mech_context'])
+        mech_contexts = [port['mech_context'] for port in port_data]
+        bound_contexts = self._bind_ports_if_needed_bulk(mech_contexts)
+        return [bound_context.current for bound_context in bound_contexts]
 
     @utils.transaction_guard
     @db_api.retry_if_session_inactive()
@@ -1578,11 +1710,15 @@ class Ml2Plugin(db_base_plugin_v2.NeutronDbPluginV2,
                         })
 
         # Perform actions after the transaction is committed
-        completed_ports = []
         for port in port_data:
             resource_extend.apply_funcs('ports',
                                         port['port_dict'],
                                         port['port_obj'].db_obj)
+        if cfg.CONF.ml2.bulk_port_binding:
+            return self._after_create_ports_bulk(context, port_data)
+
+        completed_ports = []
+        for port in port_data:
             completed_ports.append(
                     self._after_create_port(context,
                                             port['port_dict'],
@@ -10,13 +10,17 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import collections
+import contextlib
 import ctypes
 from ctypes import util as ctypes_util
 import errno
 import os
 import socket
+import threading
 
 from neutron_lib import constants
+from oslo_config import cfg
 from oslo_log import log as logging
 import pyroute2
 from pyroute2 import netlink
@@ -28,15 +32,22 @@ from pyroute2 import NetlinkError
 from pyroute2 import netns
 
 from neutron._i18n import _
+from neutron.conf.agent import common as common_config
 from neutron import privileged
 
 
 LOG = logging.getLogger(__name__)
 
+common_config.register_netlink_socket_pool_opts()
+
 _IP_VERSION_FAMILY_MAP = {4: socket.AF_INET, 6: socket.AF_INET6}
 
 NETNS_RUN_DIR = '/var/run/netns'
 
+# NOTE: the functions looking up a device run get_link_id() with a socket of
+# the same namespace already in use, two sockets are kept to serve both.
+_POOLED_SOCKETS_PER_NAMESPACE = 2
+
 _CDLL = None
 
 
@@ -194,6 +205,135 @@ def get_iproute(namespace):
         return pyroute2.IPRoute()
 
 
+class NetlinkSocketPool(object):
+    """Netlink sockets kept open per network namespace
+
+    A socket is used by one caller at a time, it is taken out of the pool
+    while in use and put back afterwards. Up to ``size`` namespaces keep
+    their idle sockets in the pool, the least recently used one being closed
+    first. A socket is discarded if its namespace has been deleted or
+    recreated since the socket was opened.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._lock = threading.Lock()
+        # namespace: (namespace inode, [idle sockets])
+        self._sockets = collections.OrderedDict()
+        self.stats = dict.fromkeys(
+            ('created', 'reused', 'evicted', 'invalidated'), 0)
+
+    @staticmethod
+    def _get_inode(namespace):
+        if not namespace:
+            return
+        try:
+            return os.stat(os.path.join(NETNS_RUN_DIR, namespace)).st_ino
+        except OSError:
+            return
+
+    def get(self, namespace):
+        """Return the inode of the namespace and a socket to use"""
+        inode = self._get_inode(namespace)
+        stale = []
+        with self._lock:
+            entry = self._sockets.get(namespace)
+            if entry and entry[0] != inode:
+                stale = self._sockets.pop(namespace)[1]
+                self.stats['invalidated'] += len(stale)
+            elif entry and entry[1]:
+                self.stats['reused'] += 1
+                return inode, entry[1].pop()
+            self.stats['created'] += 1
+        for ip in stale:
+            ip.close()
+        return inode, get_iproute(namespace)
+
+    def put(self, namespace, inode, ip):
+        """Put back in the pool a socket returned by get()"""
+        closed = [ip]
+        with self._lock:
+            entry = self._sockets.get(namespace)
+            if (namespace and inode is None) or (entry and entry[0] != inode):
+                # The namespace was deleted or recreated while in use
+                entry = None
+            elif not entry:
+                entry = self._sockets[namespace] = (inode, [])
+            if entry:
+                self._sockets.move_to_end(namespace)
+                if len(entry[1]) < _POOLED_SOCKETS_PER_NAMESPACE:
+                    entry[1].append(closed.pop())
+            while len(self._sockets) > self.size:
+                evicted = self._sockets.popitem(last=False)[1][1]
+                self.stats['evicted'] += len(evicted)
+                closed += evicted
+        for _ip in closed:
+            _ip.close()
+
+    def invalidate(self, namespace):
+        """Close the sockets of a namespace"""
+        with self._lock:
+            sockets = self._sockets.pop(namespace, (None, []))[1]
+            self.stats['invalidated'] += len(sockets)
+        for ip in sockets:
+            ip.close()
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self.stats, open=sum(
+                len(sockets) for _inode, sockets in self._sockets.values()))
+
+
+_SOCKET_POOL = None
+
+
+def _get_socket_pool():
+    global _SOCKET_POOL
+    size = cfg.CONF.AGENT.netlink_socket_pool_size
+    if not size:
+        return
+    if _SOCKET_POOL is None:
+        _SOCKET_POOL = NetlinkSocketPool(size)
+    return _SOCKET_POOL
+
+
+@contextlib.contextmanager
+def get_pooled_iproute(namespace):
+    """Return a netlink socket of the namespace from the socket pool
+
+    The socket is put back in the pool unless the caller fails with an error
+    that may have left it in an unknown state. A new socket is opened, and
+    closed after use, if the pool is disabled.
+    """
+    pool = _get_socket_pool()
+    if not pool:
+        with get_iproute(namespace) as ip:
+            yield ip
+        return
+
+    inode, ip = pool.get(namespace)
+    reuse = False
+    try:
+        yield ip
+        reuse = True
+    except (NetlinkError, NetworkInterfaceNotFound):
+        # NOTE: the kernel answered, the socket can still be used.
+        reuse = True
+        raise
+    finally:
+        if reuse:
+            pool.put(namespace, inode, ip)
+        else:
+            ip.close()
+
+
+@privileged.default.entrypoint
+def get_netlink_socket_pool_stats():
+    """Return the number of sockets in the pool and their reuse counters"""
+    pool = _get_socket_pool()
+    return pool.get_stats() if pool else {}
+
+
 @privileged.default.entrypoint
 def open_namespace(namespace):
     """Open namespace to test if the namespace is ready to be manipulated"""
@@ -237,7 +377,7 @@ def _translate_ip_device_exception(e, device=None, namespace=None):
 
 
 def get_link_id(device, namespace, raise_exception=True):
-    with get_iproute(namespace) as ip:
+    with get_pooled_iproute(namespace) as ip:
         link_id = ip.link_lookup(ifname=device)
     if not link_id or len(link_id) < 1:
         if raise_exception:
@@ -251,7 +391,7 @@ def get_link_id(device, namespace, raise_exception=True):
 
 def _run_iproute_link(command, device, namespace=None, **kwargs):
     try:
-        with get_iproute(namespace) as ip:
+        with get_pooled_iproute(namespace) as ip:
             idx = get_link_id(device, namespace)
             return ip.link(command, index=idx, **kwargs)
     except NetlinkError as e:
@@ -265,7 +405,7 @@ def _run_iproute_link(command, device, namespace=None, **kwargs):
 
 def _run_iproute_neigh(command, device, namespace, **kwargs):
     try:
-        with get_iproute(namespace) as ip:
+        with get_pooled_iproute(namespace) as ip:
             idx = get_link_id(device, namespace)
             return ip.neigh(command, ifindex=idx, **kwargs)
     except NetlinkError as e:
@@ -279,7 +419,7 @@ def _run_iproute_neigh(command, device, namespace, **kwargs):
 
 def _run_iproute_addr(command, device, namespace, **kwargs):
     try:
-        with get_iproute(namespace) as ip:
+        with get_pooled_iproute(namespace) as ip:
             idx = get_link_id(device, namespace)
             return ip.addr(command, index=idx, **kwargs)
     except NetlinkError as e:
@@ -334,7 +474,7 @@ def delete_ip_address(ip_version, ip, prefixlen, device, namespace):
 def flush_ip_addresses(ip_version, device, namespace):
     family = _IP_VERSION_FAMILY_MAP[ip_version]
     try:
-        with get_iproute(namespace) as ip:
+        with get_pooled_iproute(namespace) as ip:
             idx = get_link_id(device, namespace)
             ip.flush_addr(index=idx, family=family)
     except OSError as e:
@@ -347,7 +487,7 @@ def flush_ip_addresses(ip_version, device, namespace):
 def create_interface(ifname, namespace, kind, **kwargs):
     ifname = ifname[:constants.DEVICE_NAME_MAX_LEN]
     try:
-        with get_iproute(namespace) as ip:
+        with get_pooled_iproute(namespace) as ip:
             physical_interface = kwargs.pop("physical_interface", None)
             if physical_interface:
                 link_key = "vxlan_link" if kind == "vxlan" else "link"
@@ -483,6 +623,71 @@ def dump_neigh_entries(ip_version, device, namespace, **kwargs):
     return entries
 
 
+@privileged.default.entrypoint
+def sync_neigh_entries(device, namespace, entries, delete_entries=None):
+    """Add and delete permanent neighbour entries of a device at once.
+
+    The neighbour table of the device is dumped once, then only the entries
+    missing or not permanent with the same MAC address are replaced and only
+    the entries present are deleted, all on the same netlink socket.
+
+    :param device: Device name of the entries
+    :param namespace: The name of the namespace of the device
+    :param entries: list of (ip_version, ip_address, mac_address) of the
+                    entries to add
+    :param delete_entries: list of (ip_version, ip_address, mac_address) of
+                           the entries to delete
+    :return: a dictionary with the number of 'added', 'deleted' and
+             'unchanged' entries
+    """
+    delete_entries = delete_entries or []
+    permanent = ndmsg.states['permanent']
+    result = {'added': 0, 'deleted': 0, 'unchanged': 0}
+    try:
+        with get_pooled_iproute(namespace) as ip:
+            idx = get_link_id(device, namespace)
+            current = {}
+            for ip_version in {entry[0] for entry in
+                               list(entries) + list(delete_entries)}:
+                for neigh in ip.neigh(
+                        'dump', ifindex=idx,
+                        family=_IP_VERSION_FAMILY_MAP[ip_version]):
+                    attrs = dict(neigh['attrs'])
+                    current[attrs['NDA_DST']] = (attrs.get('NDA_LLADDR'),
+                                                 neigh['state'])
+
+            for ip_version, ip_address, mac_address in entries:
+                if current.get(ip_address) == (mac_address, permanent):
+                    result['unchanged'] += 1
+                    continue
+                ip.neigh('replace', ifindex=idx, dst=ip_address,
+                         lladdr=mac_address,
+                         family=_IP_VERSION_FAMILY_MAP[ip_version],
+                         state=permanent)
+                result['added'] += 1
+
+            for ip_version, ip_address, mac_address in delete_entries:
+                if ip_address not in current:
+                    continue
+                try:
+                    ip.neigh('delete', ifindex=idx, dst=ip_address,
+                             lladdr=mac_address,
+                             family=_IP_VERSION_FAMILY_MAP[ip_version])
+                except NetlinkError as e:
+                    if e.code != errno.ENOENT:
+                        raise
+                    continue
+                result['deleted'] += 1
+    except NetlinkError as e:
+        _translate_ip_device_exception(e, device, namespace)
+        raise
+    except OSError as e:
+        if e.errno == errno.ENOENT:
+            raise NetworkNamespaceNotFound(netns_name=namespace)
+        raise
+    return result
+
+
 @privileged.default.entrypoint
 def create_netns(name, **kwargs):
     """Create a network namespace.
@@ -502,6 +707,9 @@ def remove_netns(name, **kwargs):
 
     :param name: The name of the namespace to remove
     """
+    pool = _get_socket_pool()
+    if pool:
+        pool.invalidate(name)
     try:
         netns.remove(name, libc=_get_cdll())
     except OSError as e:
@@ -548,7 +756,7 @@ def get_link_devices(namespace, **kwargs):
     :return: (list) interfaces in a namespace
     """
     try:
-        with get_iproute(namespace) as ip:
+        with get_pooled_iproute(namespace) as ip:
             return make_serializable(ip.get_links(**kwargs))
     except OSError as e:
         if e.errno == errno.ENOENT:
@@ -578,7 +786,7 @@ def get_ip_addresses(namespace, **kwargs):
     :return: (tuple) IP addresses in a namespace
     """
     try:
-        with get_iproute(namespace) as ip:
+        with get_pooled_iproute(namespace) as ip:
             return make_serializable(ip.get_addr(**kwargs))
     except OSError as e:
         if e.errno == errno.ENOENT:
@@ -590,7 +798,7 @@ def get_ip_addresses(namespace, **kwargs):
 def list_ip_rules(namespace, ip_version, match=None, **kwargs):
     """List all IP rules"""
     try:
-        with get_iproute(namespace) as ip:
+        with get_pooled_iproute(namespace) as ip:
             rules = make_serializable(ip.get_rules(
                 family=_IP_VERSION_FAMILY_MAP[ip_version],
                 match=match, **kwargs))
@@ -610,7 +818,7 @@ def list_ip_rules(namespace, ip_version, match=None, **kwargs):
 def add_ip_rule(namespace, **kwargs):
     """Add a new IP rule"""
     try:
-        with get_iproute(namespace) as ip:
+        with get_pooled_iproute(namespace) as ip:
             ip.rule('add', **kwargs)
     except netlink_exceptions.NetlinkError as e:
         if e.code == errno.EEXIST:
@@ -626,7 +834,7 @@ def add_ip_rule(namespace, **kwargs):
 def delete_ip_rule(namespace, **kwargs):
     """Delete an IP rule"""
     try:
-        with get_iproute(namespace) as ip:
+        with get_pooled_iproute(namespace) as ip:
             ip.rule('del', **kwargs)
     except OSError as e:
         if e.errno == errno.ENOENT:
@@ -678,7 +886,7 @@ def add_ip_route(namespace, cidr, ip_version, device=None, via=None,
         namespace, ip_version, cidr, device, via, table, metric, scope,
         'static'))
     try:
-        with get_iproute(namespace) as ip:
+        with get_pooled_iproute(namespace) as ip:
             ip.route('replace', **kwargs)
     except OSError as e:
         if e.errno == errno.ENOENT:
@@ -692,7 +900,7 @@ def list_ip_routes(namespace, ip_version, device=None, table=None, **kwargs):
     kwargs.update(_make_pyroute2_route_args(
         namespace, ip_version, None, device, None, table, None, None, None))
     try:
-        with get_iproute(namespace) as ip:
+        with get_pooled_iproute(namespace) as ip:
             return make_serializable(ip.route('show', **kwargs))
     except OSError as e:
         if e.errno == errno.ENOENT:
@@ -707,7 +915,7 @@ def delete_ip_route(namespace, cidr, ip_version, device=None, via=None,
     kwargs.update(_make_pyroute2_route_args(
         namespace, ip_version, cidr, device, via, table, None, scope, None))
     try:
-        with get_iproute(namespace) as ip:
+        with get_pooled_iproute(namespace) as ip:
             ip.route('del', **kwargs)
     except OSError as e:
         if e.errno == errno.ENOENT:
@@ -37,6 +37,7 @@
 
 import ctypes
 from ctypes import util
+import itertools
 import re
 
 from neutron_lib import constants
@@ -266,6 +267,52 @@ def _parse_entry(entry, ipversion, zone):
     return tuple(parsed_entry)
 
 
+def _get_entry_zone(raw_entry):
+    match = re.search(r'\bzone=(\d+)\b', raw_entry)
+    return int(match.group(1)) if match else None
+
+
+def _get_matching_filter(ipversion, zone, protocol, src, dst, filters):
+    """Return the first of the filters matching a conntrack entry
+
+    :param filters: set of (ipversion, zone, protocol, src_ip, dst_ip)
+        tuples in which None matches any protocol or address
+    :return: the matching filter, None if there is none
+    """
+    for key in itertools.product((protocol, None), (src, None), (dst, None)):
+        if (ipversion, zone) + key in filters:
+            return (ipversion, zone) + key
+
+
+def _entry_matches(entry, filters):
+    """Check if a parsed entry matches any of the filters
+
+    :param entry: conntrack entry parsed by _parse_entry
+    :param filters: set of (ipversion, zone, protocol, src_ip, dst_ip)
+        tuples in which None matches any protocol or address
+    """
+    return _get_matching_filter(
+        entry[0], entry[-1], constants.IP_PROTOCOL_MAP.get(entry[1]),
+        entry[4], entry[5], filters) is not None
+
+
+def _get_unparsed_entry_filter(entry, raw_entry, ipversion, zone, filters):
+    """Return the filter to delete an entry _parse_entry cannot parse
+
+    The filter holds the protocol number and the original direction
+    addresses of the entry, restricted by the matching filter, or is None
+    if no filter matches.
+    """
+    src = re.search(r'\bsrc=(\S+)', raw_entry)
+    dst = re.search(r'\bdst=(\S+)', raw_entry)
+    if not (entry[2].isdigit() and src and dst):
+        return
+    matching_filter = _get_matching_filter(
+        ipversion, zone, int(entry[2]), src.group(1), dst.group(1), filters)
+    if matching_filter:
+        return (ipversion, zone, int(entry[2])) + matching_filter[3:]
+
+
 @privileged.default.entrypoint
 def list_entries(zone):
     """List and parse all conntrack entries in zone
@@ -292,13 +339,7 @@ def list_entries(zone):
     return sorted(parsed_entries, key=lambda x: x[3])
 
 
-@privileged.default.entrypoint
-def delete_entries(entries):
-    """Delete selected entries
-
-    :param entries: list of parsed (as tuple) entries to delete
-    :return: None
-    """
+def _delete_entries(entries):
     entry_args = []
     for entry in entries:
         entry_arg = {'ipversion': entry[0], 'protocol': entry[1]}
@@ -308,3 +349,57 @@ def delete_entries(entries):
 
     with ConntrackManager() as conntrack:
         conntrack.delete_entries(entry_args)
+
+
+@privileged.default.entrypoint
+def delete_entries(entries):
+    """Delete selected entries
+
+    :param entries: list of parsed (as tuple) entries to delete
+    :return: None
+    """
+    _delete_entries(entries)
+
+
+@privileged.default.entrypoint
+def delete_entries_by_filters(filters):
+    """Delete the entries matching any of the filters in one pass
+
+    The conntrack table is dumped once per IP version and the matching
+    entries are deleted with a single conntrack handler, whatever the number
+    of filters. Only the TCP, UDP and ICMP entries can be deleted, the
+    filters matching the entries of the other protocols are returned, with
+    the protocol of the entries, for the caller to delete them.
+
+    :param filters: list of (ipversion, zone, protocol, src_ip, dst_ip)
+        tuples, protocol being an IP protocol number. A None protocol,
+        src_ip or dst_ip matches any value.
+    :return: number of deleted entries, list of the filters of the entries
+        not deleted
+    """
+    filters = {tuple(f) for f in filters}
+    zones = {f[1] for f in filters}
+    entries = []
+    unparsed_filters = set()
+    for ipversion in IP_VERSIONS:
+        with ConntrackManager(nl_constants.IPVERSION_SOCKET[ipversion]) \
+                as conntrack:
+            raw_entries = conntrack.list_entries()
+
+        for raw_entry in raw_entries:
+            _entry = raw_entry.split()
+            zone = _get_entry_zone(raw_entry)
+            if zone not in zones:
+                continue
+            if _entry[1] not in ATTR_POSITIONS:
+                unparsed_filter = _get_unparsed_entry_filter(
+                    _entry, raw_entry, ipversion, zone, filters)
+                if unparsed_filter:
+                    unparsed_filters.add(unparsed_filter)
+                continue
+            parsed_entry = _parse_entry(_entry, ipversion, zone)
+            if _entry_matches(parsed_entry, filters):
+                entries.append(parsed_entry)
+    if entries:
+        _delete_entries(entries)
+    return len(entries), sorted(unparsed_filters, key=str)
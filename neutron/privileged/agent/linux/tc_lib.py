@@ -43,7 +43,7 @@ def add_tc_qdisc(device, namespace=None, **kwargs):
     """Add TC qdisc"""
     index = ip_lib.get_link_id(device, namespace)
     try:
-        with ip_lib.get_iproute(namespace) as ip:
+        with ip_lib.get_pooled_iproute(namespace) as ip:
             ip.tc('replace', index=index, **kwargs)
     except OSError as e:
         if e.errno == errno.ENOENT:
@@ -56,7 +56,7 @@ def list_tc_qdiscs(device, namespace=None):
     """List all TC qdiscs of a device"""
     index = ip_lib.get_link_id(device, namespace)
     try:
-        with ip_lib.get_iproute(namespace) as ip:
+        with ip_lib.get_pooled_iproute(namespace) as ip:
             return ip_lib.make_serializable(ip.get_qdiscs(index=index))
     except OSError as e:
         if e.errno == errno.ENOENT:
@@ -76,7 +76,7 @@ def delete_tc_qdisc(device, parent=None, kind=None, namespace=None,
             args['parent'] = parent
         if kind:
             args['kind'] = kind
-        with ip_lib.get_iproute(namespace) as ip:
+        with ip_lib.get_pooled_iproute(namespace) as ip:
             ip.tc('del', index=index, **args)
     except ip_lib.NetworkInterfaceNotFound:
         if raise_interface_not_found:
@@ -103,7 +103,7 @@ def add_tc_policy_class(device, parent, classid, class_type, namespace=None,
     """Add/replace TC policy class"""
     try:
         index = ip_lib.get_link_id(device, namespace)
-        with ip_lib.get_iproute(namespace) as ip:
+        with ip_lib.get_pooled_iproute(namespace) as ip:
             ip.tc('replace-class', kind=class_type, index=index,
                   handle=classid, parent=parent, **kwargs)
     except OSError as e:
@@ -117,7 +117,7 @@ def list_tc_policy_classes(device, namespace=None):
     """List all TC policy classes of a device"""
     try:
         index = ip_lib.get_link_id(device, namespace)
-        with ip_lib.get_iproute(namespace) as ip:
+        with ip_lib.get_pooled_iproute(namespace) as ip:
             return ip_lib.make_serializable(ip.get_classes(index=index))
     except OSError as e:
         if e.errno == errno.ENOENT:
@@ -131,7 +131,7 @@ def delete_tc_policy_class(device, parent, classid, namespace=None,
     """Delete TC policy class"""
     try:
         index = ip_lib.get_link_id(device, namespace)
-        with ip_lib.get_iproute(namespace) as ip:
+        with ip_lib.get_pooled_iproute(namespace) as ip:
             ip.tc('del-class', index=index, handle=classid, parent=parent,
                   **kwargs)
     except OSError as e:
@@ -152,7 +152,7 @@ def add_tc_filter_match32(device, parent, priority, class_id, keys,
     protocol = protocol or pyroute2_protocols.ETH_P_ALL
     try:
         index = ip_lib.get_link_id(device, namespace)
-        with ip_lib.get_iproute(namespace) as ip:
+        with ip_lib.get_pooled_iproute(namespace) as ip:
             ip.tc('add-filter', kind='u32', index=index,
                   parent=parent, prio=priority, target=class_id,
                   protocol=protocol, keys=keys, **kwargs)
@@ -178,7 +178,7 @@ def add_tc_filter_policy(device, parent, priority, rate, burst, mtu, action,
     protocol = protocol or pyroute2_protocols.ETH_P_ALL
     try:
         index = ip_lib.get_link_id(device, namespace)
-        with ip_lib.get_iproute(namespace) as ip:
+        with ip_lib.get_pooled_iproute(namespace) as ip:
             ip.tc('add-filter', kind='u32', index=index,
                   parent=parent, prio=priority, protocol=protocol,
                   rate=rate, burst=burst, mtu=mtu, action=action,
@@ -194,10 +194,68 @@ def list_tc_filters(device, parent, namespace=None, **kwargs):
     """List TC filters"""
     try:
         index = ip_lib.get_link_id(device, namespace)
-        with ip_lib.get_iproute(namespace) as ip:
+        with ip_lib.get_pooled_iproute(namespace) as ip:
             return ip_lib.make_serializable(
                 ip.get_filters(index=index, parent=parent, **kwargs))
     except OSError as e:
         if e.errno == errno.ENOENT:
             raise ip_lib.NetworkNamespaceNotFound(netns_name=namespace)
         raise
+
+
+@privileged.default.entrypoint
+def apply_tc_operations(device, operations, namespace=None):
+    """Apply a list of TC operations on a device
+
+    All the operations are sent through the same netlink socket, in a single
+    privileged call.
+
+    :param operations: list of (command, kwargs) tuples; "command" is a
+                       pyroute2 tc command ('replace', 'del', 'replace-class',
+                       'del-class', 'add-filter', ...) and "kwargs" its
+                       arguments, without the device index. Deleting a qdisc
+                       or a class that does not exist is not an error.
+    """
+    try:
+        index = ip_lib.get_link_id(device, namespace)
+        with ip_lib.get_pooled_iproute(namespace) as ip:
+            for command, kwargs in operations:
+                try:
+                    ip.tc(command, index=index, **kwargs)
+                except pyroute2.NetlinkError as e:
+                    # NOTE: as in delete_tc_qdisc, deleting a missing ingress
+                    # qdisc returns EINVAL instead of ENOENT.
+                    if (command in ('del', 'del-class') and
+                            (e.code == errno.ENOENT or
+                             (e.code == errno.EINVAL and
+                              kwargs.get('kind') == 'ingress'))):
+                        continue
+                    raise
+    except OSError as e:
+        if e.errno == errno.ENOENT:
+            raise ip_lib.NetworkNamespaceNotFound(netns_name=namespace)
+        raise
+
+
+@privileged.default.entrypoint
+def dump_tc_state(device, namespace=None):
+    """List all TC qdiscs, policy classes and filters of a device
+
+    The filters of every qdisc of the device are returned.
+    """
+    try:
+        index = ip_lib.get_link_id(device, namespace)
+        with ip_lib.get_pooled_iproute(namespace) as ip:
+            qdiscs = ip.get_qdiscs(index=index)
+            classes = ip.get_classes(index=index)
+            filters = []
+            for qdisc in qdiscs:
+                filters.extend(ip.get_filters(index=index,
+                                              parent=qdisc['handle']))
+            return ip_lib.make_serializable({'qdiscs': qdiscs,
+                                             'classes': classes,
+                                             'filters': filters})
+    except OSError as e:
+        if e.errno == errno.ENOENT:
+            raise ip_lib.NetworkNamespaceNotFound(netns_name=namespace)
+        raise
@@ -16,15 +16,22 @@
 
 import collections
 from operator import itemgetter
+import time
 
+from eventlet import greenthread
 from neutron_lib.api.definitions import availability_zone as az_def
+from neutron_lib.api.validators import availability_zone as az_validator
 from neutron_lib import constants
 from neutron_lib.db import api as db_api
 from neutron_lib.objects import exceptions
 from oslo_config import cfg
 from oslo_log import log as logging
+import sqlalchemy as sa
+from sqlalchemy import sql
 
 from neutron.agent.common import utils as agent_utils
+from neutron.db.models import segment as segment_model
+from neutron.db import models_v2
 from neutron.db.network_dhcp_agent_binding import models as ndab_model
 from neutron.objects import agent as agent_obj
 from neutron.objects import network
@@ -40,6 +47,9 @@ class AutoScheduler(object):
         """Schedule non-hosted networks to the DHCP agent on the specified
            host.
         """
+        if cfg.CONF.dhcp_auto_schedule_batch_size:
+            return self._auto_schedule_networks_in_batches(
+                context, host, cfg.CONF.dhcp_auto_schedule_batch_size)
         agents_per_network = cfg.CONF.dhcp_agents_per_network
         # a list of (agent, net_ids) tuples
         bindings_to_add = []
@@ -105,6 +115,113 @@ class AutoScheduler(object):
                   ', '.join(debug_data))
         return True
 
+    @staticmethod
+    def _get_networks_to_schedule(context, host, agent_id):
+        """Return the DHCP enabled networks the agent could host.
+
+        A single query returns, for every DHCP enabled subnet, the
+        availability zone hints of its network, the number of DHCP agents
+        hosting the network, whether ``agent_id`` is one of them and whether
+        the segment of the subnet is mapped to ``host``. The result is a dict
+        of network ID to an (is_routed_network, on_host, hosted_by_agent,
+        agents, az_hints) tuple.
+        """
+        binding = ndab_model.NetworkDhcpAgentBinding
+        subnet = models_v2.Subnet
+        mapping = segment_model.SegmentHostMapping
+        agents_q = context.session.query(
+            binding.network_id,
+            sa.func.count(binding.dhcp_agent_id).label('agents'),
+            sa.func.sum(sql.case([(binding.dhcp_agent_id == agent_id, 1)],
+                                 else_=0)).label('hosted')
+        ).group_by(binding.network_id).subquery()
+        query = context.session.query(
+            subnet.network_id, subnet.segment_id,
+            models_v2.Network.availability_zone_hints,
+            agents_q.c.agents, agents_q.c.hosted, mapping.host)
+        query = query.join(
+            models_v2.Network, models_v2.Network.id == subnet.network_id)
+        query = query.outerjoin(
+            agents_q, agents_q.c.network_id == subnet.network_id)
+        query = query.outerjoin(
+            mapping, sa.and_(mapping.segment_id == subnet.segment_id,
+                             mapping.host == host))
+        query = query.filter(subnet.enable_dhcp == sql.true())
+
+        networks = {}
+        for (net_id, segment_id, az_hints, agents, hosted,
+                mapping_host) in query:
+            is_routed, on_host = networks.get(net_id, (False, False))[:2]
+            networks[net_id] = (
+                is_routed or bool(segment_id),
+                on_host or bool(mapping_host),
+                bool(hosted), agents or 0,
+                az_validator.convert_az_string_to_list(az_hints))
+        return networks
+
+    def _auto_schedule_networks_in_batches(self, context, host, batch_size):
+        """Set based variant of auto_schedule_networks().
+
+        The networks the agent should host are found with a single query
+        instead of a few queries per network, and bound in chunks of
+        ``batch_size`` networks, yielding to the other greenthreads between
+        the chunks.
+        """
+        start = time.time()
+        agents_per_network = cfg.CONF.dhcp_agents_per_network
+        bindings_to_add = []
+        with db_api.CONTEXT_READER.using(context):
+            if not context.session.query(models_v2.Subnet.network_id).filter(
+                    models_v2.Subnet.enable_dhcp == sql.true()).first():
+                LOG.debug('No non-hosted networks')
+                return False
+            dhcp_agents = agent_obj.Agent.get_objects(
+                context, agent_type=constants.AGENT_TYPE_DHCP,
+                host=host, admin_state_up=True)
+            for dhcp_agent in dhcp_agents:
+                if agent_utils.is_agent_down(dhcp_agent.heartbeat_timestamp):
+                    LOG.warning('DHCP agent %s is not active', dhcp_agent.id)
+                    continue
+                networks = self._get_networks_to_schedule(
+                    context, host, dhcp_agent.id)
+                for net_id, (is_routed_network, on_host, hosted, agents,
+                             az_hints) in networks.items():
+                    if is_routed_network:
+                        if not on_host:
+                            continue
+                    elif agents >= agents_per_network:
+                        continue
+                    if hosted:
+                        continue
+                    az_hints = (az_hints or
+                                cfg.CONF.default_availability_zones)
+                    if (az_hints and
+                            dhcp_agent['availability_zone'] not in az_hints):
+                        continue
+                    bindings_to_add.append(
+                        (dhcp_agent, net_id, is_routed_network))
+        query_time = time.time() - start
+
+        # do it outside transaction so particular scheduling results don't
+        # make other to fail
+        for i in range(0, len(bindings_to_add), batch_size):
+            if i:
+                greenthread.sleep(0)
+            for agent, net_id, is_routed_network in (
+                    bindings_to_add[i:i + batch_size]):
+                self.resource_filter.bind(
+                    context, [agent], net_id,
+                    force_scheduling=is_routed_network)
+        if bindings_to_add:
+            LOG.info('Auto scheduled %(count)d networks to the DHCP agents '
+                     'of host %(host)s in %(chunks)d chunks, query time '
+                     '%(query).3f seconds, bind time %(bind).3f seconds',
+                     {'count': len(bindings_to_add), 'host': host,
+                      'chunks': (len(bindings_to_add) - 1) // batch_size + 1,
+                      'query': query_time,
+                      'bind': time.time() - start - query_time})
+        return True
+
 
 class ChanceScheduler(base_scheduler.BaseChanceScheduler, AutoScheduler):
 
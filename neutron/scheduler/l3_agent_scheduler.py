@@ -18,6 +18,7 @@ import collections
 import functools
 import itertools
 import random
+import time
 
 from neutron_lib.api.definitions import availability_zone as az_def
 from neutron_lib import constants as lib_const
@@ -27,15 +28,20 @@ from oslo_config import cfg
 from oslo_db import exception as db_exc
 from oslo_log import log as logging
 import six
+from sqlalchemy import func
 
 from neutron.common import utils
+from neutron.conf.db import l3_agentschedulers_db
 from neutron.conf.db import l3_hamode_db
+from neutron.db.models import l3 as l3_models
 from neutron.db.models import l3agent as rb_model
+from neutron.objects import agent as ag_obj
 from neutron.objects import l3agent as rb_obj
 
 
 LOG = logging.getLogger(__name__)
 cfg.CONF.register_opts(l3_hamode_db.L3_HA_OPTS)
+l3_agentschedulers_db.register_db_l3agentschedulers_opts()
 
 
 @six.add_metaclass(abc.ABCMeta)
@@ -52,6 +58,11 @@ class L3Scheduler(object):
         return self._schedule_router(
             plugin, context, router_id, candidates=candidates)
 
+    def schedule_routers(self, plugin, context, router_ids):
+        """Schedule the routers to active L3 agents, one by one."""
+        for router_id in router_ids:
+            plugin.schedule_router(context, router_id)
+
     def _router_has_binding(self, context, router_id, l3_agent_id):
         router_binding_model = rb_model.RouterL3AgentBinding
 
@@ -97,7 +108,11 @@ class L3Scheduler(object):
         target_routers = self._get_routers_can_schedule(
             plugin, context, underscheduled_routers, l3_agent)
 
-        for router in target_routers:
+        self._schedule_routers_to_agent(plugin, context, target_routers,
+                                        l3_agent)
+
+    def _schedule_routers_to_agent(self, plugin, context, routers, l3_agent):
+        for router in routers:
             self.schedule(plugin, context, router['id'], candidates=[l3_agent])
 
     def _get_underscheduled_routers(self, plugin, context):
@@ -225,6 +240,12 @@ class L3Scheduler(object):
         sync_router = plugin.get_router(context, router_id)
         candidates = candidates or self._get_candidates(
             plugin, context, sync_router)
+        return self._bind_router_to_candidates(plugin, context, sync_router,
+                                               candidates)
+
+    def _bind_router_to_candidates(self, plugin, context, sync_router,
+                                   candidates):
+        router_id = sync_router['id']
         if not candidates:
             return
         elif sync_router.get('ha', False):
@@ -352,10 +373,14 @@ class LeastRoutersScheduler(L3Scheduler):
             context, candidate_ids)
         return chosen_agent
 
+    def _get_agents_ordered_by_load(self, plugin, context, candidates):
+        return plugin.get_l3_agents_ordered_by_num_routers(
+            context, [candidate['id'] for candidate in candidates])
+
     def _choose_router_agents_for_ha(self, plugin, context, candidates):
         num_agents = self._get_num_of_agents_for_ha(len(candidates))
-        ordered_agents = plugin.get_l3_agents_ordered_by_num_routers(
-            context, [candidate['id'] for candidate in candidates])
+        ordered_agents = self._get_agents_ordered_by_load(
+            plugin, context, candidates)
         return ordered_agents[:num_agents]
 
 
@@ -389,8 +414,11 @@ class AZLeastRoutersScheduler(LeastRoutersScheduler):
             super(AZLeastRoutersScheduler, self)._get_candidates(
                 plugin, context, sync_router))
 
+        return self._filter_candidates_by_az(sync_router, all_candidates)
+
+    def _filter_candidates_by_az(self, router, all_candidates):
         candidates = []
-        az_hints = self._get_az_hints(sync_router)
+        az_hints = self._get_az_hints(router)
         for agent in all_candidates:
             if not az_hints or agent['availability_zone'] in az_hints:
                 candidates.append(agent)
@@ -398,8 +426,8 @@ class AZLeastRoutersScheduler(LeastRoutersScheduler):
         return candidates
 
     def _choose_router_agents_for_ha(self, plugin, context, candidates):
-        ordered_agents = plugin.get_l3_agents_ordered_by_num_routers(
-            context, [candidate['id'] for candidate in candidates])
+        ordered_agents = self._get_agents_ordered_by_load(
+            plugin, context, candidates)
         num_agents = self._get_num_of_agents_for_ha(len(ordered_agents))
 
         # Order is kept in each az
@@ -416,3 +444,169 @@ class AZLeastRoutersScheduler(LeastRoutersScheduler):
             if len(selected_agents) >= num_agents:
                 break
         return selected_agents
+
+
+class L3AgentLoadView(object):
+    """In-memory view of the load of the L3 agents.
+
+    The load of an agent is the sum of the weights of the routers bound to
+    it. A router weighs 1, plus its number of interfaces or floating IPs
+    depending on the metric. The view is rebuilt from the database with a
+    few aggregate queries every refresh_interval seconds and updated with
+    the routers bound in between.
+    """
+
+    def __init__(self, metric, refresh_interval):
+        self.metric = metric
+        self.refresh_interval = refresh_interval
+        self._agent_loads = collections.Counter()
+        self._router_weights = {}
+        self._refreshed_at = None
+        self.stats = collections.Counter()
+
+    def _get_router_weights(self, context):
+        if self.metric == 'interfaces':
+            query = context.session.query(
+                l3_models.RouterPort.router_id,
+                func.count(l3_models.RouterPort.port_id)).filter(
+                    l3_models.RouterPort.port_type.in_(
+                        lib_const.ROUTER_INTERFACE_OWNERS)).group_by(
+                            l3_models.RouterPort.router_id)
+        elif self.metric == 'floatingips':
+            query = context.session.query(
+                l3_models.FloatingIP.router_id,
+                func.count(l3_models.FloatingIP.id)).filter(
+                    l3_models.FloatingIP.router_id.isnot(None)).group_by(
+                        l3_models.FloatingIP.router_id)
+        else:
+            return {}
+        return dict(query.all())
+
+    def refresh(self, context):
+        start = time.time()
+        with lib_db_api.CONTEXT_READER.using(context):
+            router_weights = self._get_router_weights(context)
+            bindings = context.session.query(
+                rb_model.RouterL3AgentBinding.router_id,
+                rb_model.RouterL3AgentBinding.l3_agent_id).all()
+        agent_loads = collections.Counter()
+        for router_id, agent_id in bindings:
+            agent_loads[agent_id] += 1 + router_weights.get(router_id, 0)
+        self._agent_loads = agent_loads
+        self._router_weights = router_weights
+        self._refreshed_at = time.time()
+        self.stats['refreshes'] += 1
+        LOG.debug("Refreshed the L3 agents load view in %(time).3f seconds: "
+                  "%(bindings)d router bindings, %(agents)d agents",
+                  {'time': self._refreshed_at - start,
+                   'bindings': len(bindings),
+                   'agents': len(agent_loads)})
+
+    def _ensure_fresh(self, context):
+        if (self._refreshed_at is None or
+                time.time() - self._refreshed_at >= self.refresh_interval):
+            self.refresh(context)
+        else:
+            self.stats['hits'] += 1
+
+    def get_agents_ordered_by_load(self, context, agents):
+        self._ensure_fresh(context)
+        return sorted(agents, key=lambda agent: self._agent_loads[agent['id']])
+
+    def add_router(self, agent_id, router_id):
+        self._agent_loads[agent_id] += 1 + self._router_weights.get(
+            router_id, 0)
+
+
+class LeastLoadScheduler(AZLeastRoutersScheduler):
+    """Allocate to the L3 agent with the least load.
+
+    Unlike LeastRoutersScheduler, the load of the candidates is not queried
+    for each router but read from an L3AgentLoadView, and can be weighted
+    by the number of interfaces or floating IPs of the routers. Routers are
+    still spread across availability zones like in AZLeastRoutersScheduler.
+
+    A list of routers is scheduled in one pass: the routers, their current
+    L3 agents and the active L3 agents are read once for the whole list.
+    """
+
+    def __init__(self):
+        super(LeastLoadScheduler, self).__init__()
+        self.load_view = L3AgentLoadView(
+            cfg.CONF.router_scheduler_load_metric,
+            cfg.CONF.router_scheduler_load_refresh_interval)
+
+    def _get_agents_ordered_by_load(self, plugin, context, candidates):
+        return self.load_view.get_agents_ordered_by_load(context, candidates)
+
+    def _choose_router_agent(self, plugin, context, candidates):
+        return self._get_agents_ordered_by_load(plugin, context,
+                                                candidates)[0]
+
+    def _get_routers_can_schedule_by_id(self, plugin, context, routers):
+        return [router for router in routers
+                if plugin.router_supports_scheduling(context, router['id'])]
+
+    def _get_hosted_router_ids(self, context, router_ids):
+        """Return the IDs of the routers bound to an enabled L3 agent."""
+        bindings = rb_obj.RouterL3AgentBinding.get_objects(
+            context, router_id=router_ids)
+        if not bindings:
+            return set()
+        agent_ids = {agent.id for agent in ag_obj.Agent.get_objects(
+            context, id=list({binding.l3_agent_id for binding in bindings}),
+            admin_state_up=True)}
+        return {binding.router_id for binding in bindings
+                if binding.l3_agent_id in agent_ids}
+
+    def schedule_routers(self, plugin, context, router_ids):
+        """Schedule the routers to active L3 agents in one pass."""
+        if not router_ids:
+            return
+        routers = self._get_routers_can_schedule_by_id(
+            plugin, context,
+            plugin.get_routers(context, filters={'id': router_ids}))
+        if not routers:
+            return
+
+        with lib_db_api.CONTEXT_READER.using(context):
+            hosted_router_ids = self._get_hosted_router_ids(
+                context, [router['id'] for router in routers])
+            active_l3_agents = plugin.get_l3_agents(context, active=True)
+        if not active_l3_agents:
+            LOG.warning('No active L3 agents')
+            return
+
+        for router in routers:
+            # allow one router is hosted by just one enabled l3 agent
+            # hosting, like in _get_candidates()
+            if router['id'] in hosted_router_ids and not router.get('ha'):
+                LOG.debug('Router %s has already been hosted by an L3 agent',
+                          router['id'])
+                continue
+            candidates = self._filter_candidates_by_az(
+                router, plugin.get_l3_agent_candidates(
+                    context, router, active_l3_agents))
+            if not candidates:
+                LOG.warning('No L3 agents can host the router %s',
+                            router['id'])
+                continue
+            self._bind_router_to_candidates(plugin, context, router,
+                                            candidates)
+
+    def _schedule_routers_to_agent(self, plugin, context, routers, l3_agent):
+        # the routers were read by _get_underscheduled_routers(), they are
+        # not read again one by one
+        for router in self._get_routers_can_schedule_by_id(plugin, context,
+                                                           routers):
+            self._bind_router_to_candidates(plugin, context, router,
+                                            [l3_agent])
+
+    def bind_router(self, plugin, context, router_id, agent_id,
+                    is_manual_scheduling=False, is_ha=False):
+        binding = super(LeastLoadScheduler, self).bind_router(
+            plugin, context, router_id, agent_id,
+            is_manual_scheduling=is_manual_scheduling, is_ha=is_ha)
+        if binding:
+            self.load_view.add_router(agent_id, router_id)
+        return binding
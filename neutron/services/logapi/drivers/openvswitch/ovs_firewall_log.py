@@ -14,7 +14,9 @@
 #    under the License.
 
 import collections
+import time
 
+import eventlet
 from neutron_lib import constants as lib_const
 from neutron_lib.services.logapi import constants as log_const
 from os_ken.base import app_manager
@@ -23,6 +25,7 @@ from oslo_config import cfg
 from oslo_log import formatters
 from oslo_log import handlers
 from oslo_log import log as logging
+from oslo_utils import timeutils
 
 from neutron.agent.linux.openvswitch_firewall import constants as ovsfw_consts
 from neutron.agent.linux.openvswitch_firewall import firewall as ovsfw
@@ -145,10 +148,16 @@ class OVSFirewallLoggingDriver(log_ext.LoggingDriver):
         self.cookies_table = set()
         self.cookie_ids_to_delete = set()
         self.conj_id_map = ovsfw.ConjIdMap()
+        self._packet_log_queue = None
+        # Number of packets queued, dropped because the queue was full,
+        # aggregated into the log entry of a previous packet and logged
+        self.packet_log_stats = collections.Counter()
+        self._reported_drops = 0
 
     def initialize(self, resource_rpc, **kwargs):
         self.resource_rpc = resource_rpc
         setup_logging()
+        self.start_packet_log_worker()
         self.start_logapp()
 
     @staticmethod
@@ -165,18 +174,92 @@ class OVSFirewallLoggingDriver(log_ext.LoggingDriver):
         self.log_app.start()
         self.log_app.register_packet_in_handler(self.packet_in_handler)
 
+    def start_packet_log_worker(self):
+        queue_size = cfg.CONF.network_log.packet_log_queue_size
+        if not queue_size:
+            return
+        self._packet_log_queue = eventlet.queue.LightQueue(queue_size)
+        eventlet.spawn_n(self._packet_log_worker)
+
     def packet_in_handler(self, ev):
         msg = ev.msg
-        cookie_id = msg.cookie
-        pkt = packet.Packet(msg.data)
+        if self._packet_log_queue is None:
+            self._log_packet(msg.cookie, msg.data)
+            return
+
+        # NOTE: The packet is only decoded by the log worker, so the OpenFlow
+        # app is never held by the logging of the packets.
+        try:
+            self._packet_log_queue.put_nowait(
+                (msg.cookie, msg.data, timeutils.utcnow()))
+            self.packet_log_stats['queued'] += 1
+        except eventlet.queue.Full:
+            self.packet_log_stats['dropped'] += 1
+
+    def _log_packet(self, cookie_id, data, count=1, first=None, last=None):
+        pkt = packet.Packet(data)
+        self.packet_log_stats['logged'] += 1
         try:
             cookie_entry = self._get_cookie_by_id(cookie_id)
+        except log_exc.CookieNotFound:
+            LOG.warning("Unknown cookie=%s packet_in pkt=%s", cookie_id, pkt)
+            return
+        if count == 1:
             LOG.info("action=%s project_id=%s log_resource_ids=%s vm_port=%s "
                      "pkt=%s", cookie_entry.action, cookie_entry.project,
                      list(cookie_entry.log_object_refs),
                      cookie_entry.port, pkt)
-        except log_exc.CookieNotFound:
-            LOG.warning("Unknown cookie=%s packet_in pkt=%s", cookie_id, pkt)
+        else:
+            LOG.info("action=%s project_id=%s log_resource_ids=%s vm_port=%s "
+                     "pkt=%s count=%s first_seen=%s last_seen=%s",
+                     cookie_entry.action, cookie_entry.project,
+                     list(cookie_entry.log_object_refs), cookie_entry.port,
+                     pkt, count, first.isoformat(), last.isoformat())
+
+    def _packet_log_worker(self):
+        while True:
+            try:
+                self._process_packet_log_queue(
+                    cfg.CONF.network_log.packet_log_aggregation_window)
+            except Exception:
+                LOG.exception("Failed to log packets")
+
+    def _process_packet_log_queue(self, window):
+        """Log the packets queued during an aggregation window.
+
+        The packets of the same cookie are logged once, along with their
+        number and the time the first and last ones were received.
+        """
+        cookie_id, data, received_at = self._packet_log_queue.get()
+        # cookie -> [first packet, count, first timestamp, last timestamp]
+        events = collections.OrderedDict(
+            [(cookie_id, [data, 1, received_at, received_at])])
+        deadline = time.time() + window
+        while window:
+            timeout = deadline - time.time()
+            if timeout <= 0:
+                break
+            try:
+                cookie_id, data, received_at = self._packet_log_queue.get(
+                    timeout=timeout)
+            except eventlet.queue.Empty:
+                break
+            if cookie_id in events:
+                events[cookie_id][1] += 1
+                events[cookie_id][3] = received_at
+                self.packet_log_stats['aggregated'] += 1
+            else:
+                events[cookie_id] = [data, 1, received_at, received_at]
+
+        for cookie_id, (data, count, first, last) in events.items():
+            self._log_packet(cookie_id, data, count, first, last)
+
+        dropped = self.packet_log_stats['dropped']
+        if dropped > self._reported_drops:
+            LOG.warning("%d packets were not logged because the log queue "
+                        "was full (%d in total)",
+                        dropped - self._reported_drops, dropped)
+            self._reported_drops = dropped
 
     def defer_apply_on(self):
         self._deferred = True
@@ -74,6 +74,9 @@ class RouterWithMetering(object):
         self.iptables_manager = None
         self.snat_iptables_manager = None
         self.metering_labels = {}
+        # The last traffic counters read by label, when they are not reset
+        # by the reads
+        self.traffic_counters = {}
 
         self.create_iptables_managers()
 
@@ -311,6 +314,7 @@ class IptablesMeteringDriver(abstract_driver.MeteringAbstractDriver):
         for label in labels:
             label_id = label['id']
             del rm.metering_labels[label_id]
+            rm.traffic_counters.pop(label_id, None)
 
     @log_helpers.log_method_call
     def add_metering_label(self, context, routers):
@@ -422,6 +426,37 @@ class IptablesMeteringDriver(abstract_driver.MeteringAbstractDriver):
         for router in routers:
             self._process_disassociate_metering_label(router)
 
+    def _get_router_traffic_counters(self, rm):
+        """Return the traffic counters of the labels of a router by label.
+
+        The label chains are read without resetting their counters, so the
+        counters returned are the differences with the previous read.
+
+        :raises RuntimeError: if any of the counters could not be read.
+        """
+        label_chains = {
+            label_id: iptables_manager.get_chain_name(
+                WRAP_NAME + LABEL + label_id, wrap=False)
+            for label_id in rm.metering_labels}
+        chain_accs = rm.iptables_manager.get_traffic_counters_bulk(
+            label_chains.values(), wrap=False)
+
+        label_accs = {}
+        for label_id, chain in label_chains.items():
+            chain_acc = chain_accs.get(chain)
+            if chain_acc is None:
+                continue
+            last_acc = rm.traffic_counters.get(label_id)
+            rm.traffic_counters[label_id] = chain_acc
+            # Counters lower than the last ones were reset, e.g. when the
+            # chain was recreated
+            if (last_acc and chain_acc['pkts'] >= last_acc['pkts'] and
+                    chain_acc['bytes'] >= last_acc['bytes']):
+                chain_acc = {'pkts': chain_acc['pkts'] - last_acc['pkts'],
+                             'bytes': chain_acc['bytes'] - last_acc['bytes']}
+            label_accs[label_id] = chain_acc
+        return label_accs
+
     @log_helpers.log_method_call
     def get_traffic_counters(self, context, routers):
         accs = {}
@@ -431,21 +466,33 @@ class IptablesMeteringDriver(abstract_driver.MeteringAbstractDriver):
             if not rm:
                 continue
 
-            for label_id in rm.metering_labels:
+            if self.conf.bulk_traffic_counters:
                 try:
-                    chain = iptables_manager.get_chain_name(WRAP_NAME +
-                                                            LABEL +
-                                                            label_id,
-                                                            wrap=False)
-
-                    chain_acc = rm.iptables_manager.get_traffic_counters(
-                        chain, wrap=False, zero=True)
+                    label_accs = self._get_router_traffic_counters(rm)
                 except RuntimeError:
                     LOG.exception('Failed to get traffic counters, '
                                   'router: %s', router)
                     routers_to_reconfigure.add(router['id'])
                     continue
-
+            else:
+                label_accs = {}
+                for label_id in rm.metering_labels:
+                    try:
+                        chain = iptables_manager.get_chain_name(WRAP_NAME +
+                                                                LABEL +
+                                                                label_id,
+                                                                wrap=False)
+
+                        label_accs[label_id] = (
+                            rm.iptables_manager.get_traffic_counters(
+                                chain, wrap=False, zero=True))
+                    except RuntimeError:
+                        LOG.exception('Failed to get traffic counters, '
+                                      'router: %s', router)
+                        routers_to_reconfigure.add(router['id'])
+                        continue
+
+            for label_id, chain_acc in label_accs.items():
                 if not chain_acc:
                     continue
 
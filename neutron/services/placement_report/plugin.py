@@ -19,10 +19,12 @@ from neutron_lib.callbacks import events
 from neutron_lib.callbacks import registry
 from neutron_lib.callbacks import resources
 from neutron_lib.placement import client as place_client
+from neutron_lib.placement import utils as place_utils
 from neutron_lib.plugins import directory
 from neutron_lib.services import base as service_base
 from oslo_config import cfg
 from oslo_log import log as logging
+from oslo_utils import timeutils
 
 from neutron.agent.common import placement_report
 from neutron.notifiers import batch_notifier
@@ -58,11 +60,91 @@ class PlacementReportPlugin(service_base.ServicePluginBase):
         self._agents = PlacementReporterAgents(self._core_plugin)
         self._batch_notifier = batch_notifier.BatchNotifier(
             cfg.CONF.send_events_interval, self._execute_deferred)
+        # (agent type, host) -> the placement client calls last synced
+        # successfully for the agent, the generations of its resource
+        # providers read after that sync and the time of its last full sync
+        self._synced_states = {}
 
     def _execute_deferred(self, deferred_batch):
         for deferred in deferred_batch:
             deferred()
 
+    @staticmethod
+    def _get_agent_rp_uuids(uuid_ns, hypervisor_rps):
+        rp_uuids = set()
+        for device, hypervisor in hypervisor_rps.items():
+            rp_uuids.add(place_utils.agent_resource_provider_uuid(
+                uuid_ns, hypervisor['name']))
+            rp_uuids.add(place_utils.device_resource_provider_uuid(
+                uuid_ns, hypervisor['name'], device))
+        return rp_uuids
+
+    def _get_rp_generations(self, hypervisor_rps, rp_uuids):
+        generations = {}
+        for hypervisor_uuid in {hypervisor['uuid']
+                                for hypervisor in hypervisor_rps.values()}:
+            rps = self._placement_client.list_resource_providers(
+                in_tree=hypervisor_uuid)['resource_providers']
+            generations.update({rp['uuid']: rp['generation'] for rp in rps
+                                if rp['uuid'] in rp_uuids})
+        return generations
+
+    def _get_deferred_calls_to_sync(self, agent_key, deferred_batch,
+                                    hypervisor_rps, rp_uuids):
+        """Return the calls which changed since the last sync of an agent.
+
+        The last synced calls are only trusted if the resource providers of
+        the agent still have the generations read after that sync, i.e. they
+        were not changed in placement since, by another server or anyone
+        else.
+
+        :returns: a tuple of the calls to execute and whether this is a full
+                  sync.
+        """
+        full_sync_interval = cfg.CONF.placement_full_sync_interval
+        synced_state = self._synced_states.get(agent_key)
+        if (not full_sync_interval or synced_state is None or
+                timeutils.is_older_than(synced_state['full_sync_at'],
+                                        full_sync_interval)):
+            return deferred_batch, True
+        try:
+            generations = self._get_rp_generations(hypervisor_rps, rp_uuids)
+        except (ks_exc.HttpError, ks_exc.ClientException):
+            LOG.exception('placement: failed to read the resource providers '
+                          'of agent type %s on host %s', *agent_key)
+            return deferred_batch, True
+        if generations != synced_state['generations']:
+            LOG.debug('placement: resource providers changed since the last '
+                      'sync of agent type %s on host %s', *agent_key)
+            return deferred_batch, True
+        return [deferred for deferred in deferred_batch
+                if str(deferred) not in synced_state['calls']], False
+
+    def _update_synced_state(self, agent_key, deferred_batch, failed_calls,
+                             full_sync, hypervisor_rps, rp_uuids):
+        if not cfg.CONF.placement_full_sync_interval:
+            return
+        # NOTE: After a placement error, the state of the agent in placement
+        # is unknown, so it is synced in full the next time.
+        if failed_calls:
+            self._synced_states.pop(agent_key, None)
+            return
+        try:
+            generations = self._get_rp_generations(hypervisor_rps, rp_uuids)
+        except (ks_exc.HttpError, ks_exc.ClientException):
+            LOG.exception('placement: failed to read the resource providers '
+                          'of agent type %s on host %s', *agent_key)
+            self._synced_states.pop(agent_key, None)
+            return
+        # NOTE: The calls of the desired state replace the ones previously
+        # synced, so a value reverted to an earlier one is sent again.
+        synced_state = self._synced_states.setdefault(
+            agent_key, {'calls': set(), 'full_sync_at': None})
+        synced_state['calls'] = {str(deferred) for deferred in deferred_batch}
+        synced_state['generations'] = generations
+        if full_sync:
+            synced_state['full_sync_at'] = timeutils.utcnow()
+
     def _get_rp_by_name(self, name):
         rps = self._placement_client.list_resource_providers(
             name=name)['resource_providers']
@@ -114,6 +196,8 @@ class PlacementReportPlugin(service_base.ServicePluginBase):
                     'uuid': name2uuid[hypervisor],
                 }
         except (IndexError, ks_exc.HttpError, ks_exc.ClientException):
+            self._synced_states.pop(
+                (agent['agent_type'], agent['host']), None)
             agent_db.resources_synced = False
             agent_db.update()
 
@@ -138,6 +222,8 @@ class PlacementReportPlugin(service_base.ServicePluginBase):
             client=self._placement_client)
 
         deferred_batch = state.deferred_sync()
+        agent_key = (agent['agent_type'], agent['host'])
+        rp_uuids = self._get_agent_rp_uuids(uuid_ns, hypervisor_rps)
 
         # NOTE(bence romsics): Some client calls depend on earlier
         # ones, but not all. There are calls in a batch that can succeed
@@ -155,19 +241,30 @@ class PlacementReportPlugin(service_base.ServicePluginBase):
         # we'll yield to other eventlet threads in each call therefore
         # the performance should not be affected by the wrapping.
         def batch():
-            errors = False
-
-            for deferred in deferred_batch:
+            deferred_calls, full_sync = self._get_deferred_calls_to_sync(
+                agent_key, deferred_batch, hypervisor_rps, rp_uuids)
+            LOG.debug('placement: %(count)d of %(total)d placement client '
+                      'calls to sync for agent type %(type)s on host '
+                      '%(host)s',
+                      {'count': len(deferred_calls),
+                       'total': len(deferred_batch),
+                       'type': agent['agent_type'], 'host': agent['host']})
+            failed_calls = set()
+
+            for deferred in deferred_calls:
                 try:
                     LOG.debug('placement client: {}'.format(deferred))
                     deferred.execute()
                 except Exception:
-                    errors = True
+                    failed_calls.add(str(deferred))
                     LOG.exception(
                         'placement client call failed: %s',
                         str(deferred))
 
-            resources_synced = not errors
+            self._update_synced_state(agent_key, deferred_batch,
+                                      failed_calls, full_sync,
+                                      hypervisor_rps, rp_uuids)
+            resources_synced = not failed_calls
             agent_db.resources_synced = resources_synced
             agent_db.update()
 
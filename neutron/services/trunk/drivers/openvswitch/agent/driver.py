@@ -97,5 +97,6 @@ def init_handler(resource, event, trigger, payload=None):
     global TRUNK_SKELETON
 
     manager = trunk_manager.TrunkManager(trigger.int_br)
-    handler = ovsdb_handler.OVSDBHandler(manager)
+    handler = ovsdb_handler.OVSDBHandler(
+        manager, bulk_wiring=cfg.CONF.AGENT.trunk_bulk_wiring)
     TRUNK_SKELETON = OVSTrunkSkeleton(handler)
@@ -118,10 +118,11 @@ class OVSDBHandler(object):
     delete).
     """
 
-    def __init__(self, trunk_manager):
+    def __init__(self, trunk_manager, bulk_wiring=False):
         self.timeout = DEFAULT_WAIT_FOR_PORT_TIMEOUT
         self._context = n_context.get_admin_context_without_session()
         self.trunk_manager = trunk_manager
+        self.bulk_wiring = bulk_wiring
         self.trunk_rpc = agent.TrunkStub()
 
     @property
@@ -266,6 +267,7 @@ class OVSDBHandler(object):
     def wire_subports_for_trunk(self, context, trunk_id, subports,
                                 trunk_bridge=None, parent_port=None):
         """Create OVS ports associated to the logical subports."""
+        start = time.monotonic()
         # Tell the server that subports must be bound to this host.
         subport_bindings = self.trunk_rpc.update_subport_bindings(
             context, subports)
@@ -273,6 +275,23 @@ class OVSDBHandler(object):
         # Bindings were successful: create the OVS subports.
         subport_bindings = subport_bindings.get(trunk_id, [])
         subports_mac = {p['id']: p['mac_address'] for p in subport_bindings}
+        if self.bulk_wiring and subports:
+            try:
+                self._wire_subports_in_bulk(
+                    trunk_id, subports, subports_mac, trunk_bridge,
+                    parent_port)
+            except (RuntimeError, tman.TrunkManagerError,
+                    exceptions.ParentPortNotFound) as e:
+                LOG.warning("Failed to wire the subports of trunk "
+                            "%(trunk_id)s in bulk, wiring them one by one: "
+                            "%(err)s", {'trunk_id': trunk_id, 'err': e})
+            else:
+                LOG.debug("Added trunk %(trunk_id)s with %(count)d subports "
+                          "in %(time).3f seconds",
+                          {'trunk_id': trunk_id, 'count': len(subports),
+                           'time': time.monotonic() - start})
+                return constants.TRUNK_ACTIVE_STATUS
+
         subport_ids = []
         for subport in subports:
             try:
@@ -301,9 +320,32 @@ class OVSDBHandler(object):
             # normal.
             return constants.TRUNK_DEGRADED_STATUS
 
-        LOG.debug("Added trunk: %s", trunk_id)
+        LOG.debug("Added trunk %(trunk_id)s with %(count)d subports in "
+                  "%(time).3f seconds",
+                  {'trunk_id': trunk_id, 'count': len(subport_ids),
+                   'time': time.monotonic() - start})
         return self._get_current_status(subports, subport_ids)
 
+    def _wire_subports_in_bulk(self, trunk_id, subports, subports_mac,
+                               trunk_bridge=None, parent_port=None):
+        """Create the OVS subports and store the trunk metadata at once.
+
+        Both the patch ports of all the subports and the trunk metadata are
+        written in a single OVSDB transaction, so either all of them are
+        created or none is.
+        """
+        trunk_bridge = trunk_bridge or ovs_lib.OVSBridge(
+            utils.gen_trunk_br_name(trunk_id))
+        # The parent port is read before the transaction is started
+        parent_port = parent_port or self._get_parent_port(trunk_bridge)
+        sub_ports = [(subport.port_id, subports_mac[subport.port_id],
+                      subport.segmentation_id) for subport in subports]
+        with trunk_bridge.ovsdb.transaction(check_error=True):
+            self.trunk_manager.add_sub_ports(trunk_id, sub_ports)
+            self._update_trunk_metadata(
+                trunk_bridge, parent_port, trunk_id,
+                [subport.port_id for subport in subports])
+
     def unwire_subports_for_trunk(self, trunk_id, subport_ids):
         """Destroy OVS ports associated to the logical subports."""
         ids = []
@@ -369,6 +411,7 @@ class OVSDBHandler(object):
             server's state.
         """
         ctx = self.context
+        start = time.monotonic()
         try:
             parent_port_id = (
                 self.trunk_manager.get_port_uuid_from_external_ids(port))
@@ -423,6 +466,10 @@ class OVSDBHandler(object):
         else:
             status = constants.TRUNK_DEGRADED_STATUS
         self.report_trunk_status(ctx, trunk.id, status)
+        LOG.info("Wired trunk %(trunk_id)s with %(count)d subports in "
+                 "%(time).3f seconds, status %(status)s",
+                 {'trunk_id': trunk.id, 'count': len(trunk.sub_ports),
+                  'time': time.monotonic() - start, 'status': status})
 
     def _set_trunk_metadata(self, trunk_bridge, port, trunk_id, subport_ids):
         """Set trunk metadata in OVS port for trunk parent port."""
@@ -272,6 +272,27 @@ class TrunkManager(object):
         except RuntimeError as e:
             raise TrunkManagerError(error=e)
 
+    def add_sub_ports(self, trunk_id, sub_ports):
+        """Create sub_ports in a single OVSDB transaction.
+
+        The transaction is merged into the OVSDB transaction of the caller,
+        if any.
+
+        :param trunk_id: ID of the trunk.
+        :param sub_ports: list of (port_id, port_mac, segmentation_id)
+                          tuples.
+        """
+        bridge = TrunkBridge(trunk_id)
+        try:
+            if not bridge.exists():
+                raise exc.TrunkBridgeNotFound(bridge=bridge.br_name)
+            with bridge.ovsdb.transaction(check_error=True):
+                for port_id, port_mac, segmentation_id in sub_ports:
+                    SubPort(trunk_id, port_id, port_mac,
+                            segmentation_id).plug(self.br_int)
+        except RuntimeError as e:
+            raise TrunkManagerError(error=e)
+
     def remove_sub_port(self, trunk_id, port_id):
         """Remove a sub_port.
 
@@ -36,6 +36,11 @@ class DuplicateSubPort(n_exc.InUse):
                 "%(segmentation_id)s already in use on trunk %(trunk_id)s.")
 
 
+class DuplicateSubPorts(n_exc.InUse):
+    message = _("Subports could not be added to trunk %(trunk_id)s: one of "
+                "their ports or segmentation details is already in use.")
+
+
 class ParentPortInUse(n_exc.InUse):
     message = _("Port %(port_id)s is currently in use and is not "
                 "eligible for use as a parent port.")
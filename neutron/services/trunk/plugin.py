@@ -27,10 +27,12 @@ from neutron_lib.db import resource_extend
 from neutron_lib.plugins import directory
 from neutron_lib.services import base as service_base
 from neutron_lib.services.trunk import constants
+from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_utils import excutils
 from oslo_utils import uuidutils
 
+from neutron.conf.services import trunk as trunk_conf
 from neutron.db import db_base_plugin_common
 from neutron.objects import base as objects_base
 from neutron.objects import trunk as trunk_objects
@@ -42,6 +44,8 @@ from neutron.services.trunk.seg_types import validators
 
 LOG = logging.getLogger(__name__)
 
+trunk_conf.register_trunk_opts()
+
 
 @resource_extend.has_resource_extenders
 @registry.has_registry_receivers
@@ -293,6 +297,7 @@ class TrunkPlugin(service_base.ServicePluginBase):
     @db_base_plugin_common.convert_result_to_dict
     def add_subports(self, context, trunk_id, subports):
         """Add one or more subports to trunk."""
+        bulk = cfg.CONF.trunk_bulk_subport_operations
         with db_api.CONTEXT_WRITER.using(context):
             trunk = self._get_trunk(context, trunk_id)
 
@@ -302,7 +307,7 @@ class TrunkPlugin(service_base.ServicePluginBase):
             subports_validator = rules.SubPortsValidator(
                 self._segmentation_types, subports, trunk['port_id'])
             subports = subports_validator.validate(
-                context, basic_validation=True)
+                context, basic_validation=True, bulk=bulk)
             added_subports = []
 
             rules.trunk_can_be_managed(context, trunk)
@@ -321,16 +326,23 @@ class TrunkPlugin(service_base.ServicePluginBase):
             else:
                 trunk.update(status=constants.TRUNK_DOWN_STATUS)
 
-            for subport in subports:
-                obj = trunk_objects.SubPort(
-                               context=context,
-                               trunk_id=trunk_id,
-                               port_id=subport['port_id'],
-                               segmentation_type=subport['segmentation_type'],
-                               segmentation_id=subport['segmentation_id'])
-                obj.create()
-                trunk['sub_ports'].append(obj)
-                added_subports.append(obj)
+            if bulk:
+                if subports:
+                    self._raise_if_segmentations_in_use(trunk, subports)
+                    added_subports = trunk_objects.SubPort.bulk_create(
+                        context, trunk_id, subports)
+                    trunk['sub_ports'].extend(added_subports)
+            else:
+                for subport in subports:
+                    obj = trunk_objects.SubPort(
+                        context=context,
+                        trunk_id=trunk_id,
+                        port_id=subport['port_id'],
+                        segmentation_type=subport['segmentation_type'],
+                        segmentation_id=subport['segmentation_id'])
+                    obj.create()
+                    trunk['sub_ports'].append(obj)
+                    added_subports.append(obj)
             payload = callbacks.TrunkPayload(context, trunk_id,
                                              current_trunk=trunk,
                                              original_trunk=original_trunk,
@@ -347,6 +359,7 @@ class TrunkPlugin(service_base.ServicePluginBase):
     def remove_subports(self, context, trunk_id, subports):
         """Remove one or more subports from trunk."""
         subports = subports['sub_ports']
+        bulk = cfg.CONF.trunk_bulk_subport_operations
         with db_api.CONTEXT_WRITER.using(context):
             trunk = self._get_trunk(context, trunk_id)
             original_trunk = copy.deepcopy(trunk)
@@ -370,8 +383,13 @@ class TrunkPlugin(service_base.ServicePluginBase):
                 if not subport_obj:
                     raise trunk_exc.SubPortNotFound(trunk_id=trunk_id,
                                                     port_id=subport['port_id'])
-                subport_obj.delete()
+                if not bulk:
+                    subport_obj.delete()
                 removed_subports.append(subport_obj)
+            if bulk and removed_subports:
+                trunk_objects.SubPort.delete_objects(
+                    context, trunk_id=trunk_id,
+                    port_id=[subport.port_id for subport in removed_subports])
 
             del trunk.sub_ports[:]
             trunk.sub_ports.extend(current_subports.values())
@@ -401,6 +419,25 @@ class TrunkPlugin(service_base.ServicePluginBase):
         trunk = self.get_trunk(context, trunk_id)
         return {'sub_ports': trunk['sub_ports']}
 
+    @staticmethod
+    def _raise_if_segmentations_in_use(trunk, subports):
+        """Check the segmentation details of the subports as a set.
+
+        The segmentation details must be unique among the subports being
+        added and the ones already on the trunk.
+        """
+        in_use = {(subport.segmentation_type, subport.segmentation_id)
+                  for subport in trunk.sub_ports}
+        for subport in subports:
+            segmentation = (subport['segmentation_type'],
+                            int(subport['segmentation_id']))
+            if segmentation in in_use:
+                raise trunk_exc.DuplicateSubPort(
+                    segmentation_type=segmentation[0],
+                    segmentation_id=segmentation[1],
+                    trunk_id=trunk.id)
+            in_use.add(segmentation)
+
     def _get_trunk(self, context, trunk_id):
         """Return the trunk object or raise if not found."""
         obj = trunk_objects.Trunk.get_object(context, id=trunk_id)
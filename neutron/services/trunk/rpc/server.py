@@ -19,6 +19,7 @@ from neutron_lib.db import api as db_api
 from neutron_lib.plugins import directory
 from neutron_lib import rpc as n_rpc
 from neutron_lib.services.trunk import constants as trunk_consts
+from oslo_config import cfg
 from oslo_log import helpers as log_helpers
 from oslo_log import log as logging
 import oslo_messaging
@@ -28,12 +29,15 @@ from neutron.api.rpc.callbacks import events
 from neutron.api.rpc.callbacks.producer import registry
 from neutron.api.rpc.callbacks import resources
 from neutron.api.rpc.handlers import resources_rpc
+from neutron.conf.services import trunk as trunk_conf
 from neutron.objects import trunk as trunk_objects
 from neutron.services.trunk import exceptions as trunk_exc
 from neutron.services.trunk.rpc import constants
 
 LOG = logging.getLogger(__name__)
 
+trunk_conf.register_trunk_opts()
+
 # This module contains stub (client-side) and skeleton (server-side)
 # proxy code that executes in the Neutron server process space. This
 # is needed if any of the trunk service plugin drivers has a remote
@@ -137,7 +141,19 @@ class TrunkSkeleton(object):
         self._safe_update_trunk(
             trunk, status=trunk_consts.TRUNK_BUILD_STATUS)
 
+        bound_ports = {}
+        if cfg.CONF.trunk_bulk_subport_operations:
+            bound_ports = self._get_bound_subports(
+                context, port_ids, trunk_host)
+            LOG.debug("%(bound)d of %(total)d subports of trunk %(trunk)s "
+                      "are already bound to host %(host)s",
+                      {'bound': len(bound_ports), 'total': len(port_ids),
+                       'trunk': trunk.id, 'host': trunk_host})
+
         for port_id in port_ids:
+            if port_id in bound_ports:
+                updated_ports.append(bound_ports[port_id])
+                continue
             try:
                 updated_port = self._handle_port_binding(context, port_id,
                                                          trunk, trunk_host)
@@ -164,6 +180,20 @@ class TrunkSkeleton(object):
 
         return updated_ports
 
+    def _get_bound_subports(self, context, port_ids, trunk_host):
+        """Return the subports that are already bound to the given host.
+
+        Their binding does not need to be updated, so they are fetched with
+        a single query rather than updated one by one.
+        """
+        ports = self.core_plugin.get_ports(context, filters={'id': port_ids})
+        return {port['id']: port for port in ports
+                if port.get(portbindings.HOST_ID) == trunk_host and
+                port['device_owner'] == trunk_consts.TRUNK_SUBPORT_OWNER and
+                port.get(portbindings.VIF_TYPE) not in (
+                    portbindings.VIF_TYPE_BINDING_FAILED,
+                    portbindings.VIF_TYPE_UNBOUND)}
+
     def _handle_port_binding(self, context, port_id, trunk, trunk_host):
         """Bind the given port to the given host.
 
@@ -158,8 +158,12 @@ class SubPortsValidator(object):
         self.trunk_port_id = trunk_port_id
 
     def validate(self, context,
-                 basic_validation=False, trunk_validation=True):
-        """Validate that subports can be used in a trunk."""
+                 basic_validation=False, trunk_validation=True, bulk=False):
+        """Validate that subports can be used in a trunk.
+
+        If bulk is True, the subports are validated with a fixed number of
+        database queries rather than a few queries per subport.
+        """
         # Perform basic validation on subports, in case subports
         # are not automatically screened by the API layer.
         if basic_validation:
@@ -170,6 +174,9 @@ class SubPortsValidator(object):
         if trunk_validation:
             trunk_port_mtu = self._get_port_mtu(context, self.trunk_port_id)
             subport_mtus = self._prepare_subports(context)
+            if bulk:
+                return self._validate_bulk(
+                    context, trunk_port_mtu, subport_mtus)
             return [self._validate(context, s, trunk_port_mtu, subport_mtus)
                     for s in self.subports]
         else:
@@ -304,6 +311,46 @@ class SubPortsValidator(object):
         trunk_validator = TrunkPortValidator(subport['port_id'])
         trunk_validator.validate(context, parent_port=False)
 
+    def _raise_if_subports_are_used(self, context):
+        """Bulk version of _raise_if_subport_is_used_in_other_trunk."""
+        port_ids = [subport['port_id'] for subport in self.subports]
+        subports = trunk_objects.SubPort.get_objects(
+            context, port_id=port_ids)
+        if subports:
+            raise trunk_exc.TrunkPortInUse(port_id=subports[0].port_id)
+        trunks = trunk_objects.Trunk.get_objects(context, port_id=port_ids)
+        if trunks:
+            raise trunk_exc.ParentPortInUse(port_id=trunks[0].port_id)
+
+        core_plugin = directory.get_plugin()
+        ports = {port['id']: port for port in core_plugin.get_ports(
+            context, filters={'id': port_ids},
+            fields=['id', 'network_id', 'device_id'])}
+        for port_id in port_ids:
+            port = ports.get(port_id)
+            if not port:
+                raise n_exc.PortNotFound(port_id=port_id)
+            if port['device_id']:
+                raise n_exc.PortInUse(net_id=port['network_id'],
+                                      port_id=port_id,
+                                      device_id=port['device_id'])
+
+    def _validate_bulk(self, context, trunk_port_mtu, subport_mtus):
+        segmentations = set()
+        for subport in self.subports:
+            self._raise_subport_is_parent_port(context, subport)
+            self._raise_subport_invalid_mtu(
+                context, subport, trunk_port_mtu, subport_mtus)
+            segmentations.add(
+                self._raise_if_segmentation_details_missing(subport))
+
+        for segmentation_type, segmentation_id in segmentations:
+            self._raise_if_segmentation_details_invalid(
+                segmentation_type, segmentation_id)
+
+        self._raise_if_subports_are_used(context)
+        return self.subports
+
     def _validate(self, context, subport, trunk_port_mtu, subport_mtus):
         self._raise_subport_is_parent_port(context, subport)
 
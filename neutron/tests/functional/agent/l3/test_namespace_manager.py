@@ -21,6 +21,7 @@ from neutron.agent.l3 import dvr_snat_ns
 from neutron.agent.l3 import namespace_manager
 from neutron.agent.l3 import namespaces
 from neutron.agent.linux import ip_lib
+from neutron.conf.agent.l3 import config as l3_config
 from neutron.tests.functional import base
 
 _uuid = uuidutils.generate_uuid
@@ -31,6 +32,8 @@ class NamespaceManagerTestFramework(base.BaseSudoTestCase):
     def setUp(self):
         super(NamespaceManagerTestFramework, self).setUp()
         self.agent_conf = cfg.CONF
+        l3_config.register_l3_agent_config_opts(l3_config.OPTS,
+                                                self.agent_conf)
         self.metadata_driver_mock = mock.Mock()
         self.namespace_manager = namespace_manager.NamespaceManager(
             self.agent_conf, driver=None,
@@ -88,3 +91,18 @@ class NamespaceManagerTestCase(NamespaceManagerTestFramework):
                                      self.agent_conf,
                                      ns_name))
             self.assertFalse(self._namespace_exists(ns_name))
+
+    def test_namespace_manager_cleanup_in_background(self):
+        self.config(namespace_cleanup_workers=2)
+        to_delete = {self._create_namespace(_uuid(),
+                                            namespaces.RouterNamespace)
+                     for _ in range(3)}
+
+        with mock.patch.object(namespace_manager.NamespaceManager, 'list_all',
+                               return_value=to_delete):
+            with self.namespace_manager:
+                pass
+            self.namespace_manager._cleanup_thread.wait()
+
+        for ns_name in to_delete:
+            self.assertFalse(self._namespace_exists(ns_name))
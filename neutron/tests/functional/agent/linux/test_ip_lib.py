@@ -449,6 +449,25 @@ class IpLibTestCase(IpLibTestFramework):
         # trying to delete a non-existent entry shouldn't raise an error
         device.neigh.delete(TEST_IP_NEIGH, mac_address)
 
+    def test_sync_neigh_entries(self):
+        attr = self.generate_device_details(
+            ip_cidrs=["%s/24" % TEST_IP, "fd00::1/64"]
+        )
+        mac_address = net.get_random_mac('fa:16:3e:00:00:00'.split(':'))
+        device = self.manage_device(attr)
+        device.neigh.add(TEST_IP_NEIGH, mac_address)
+
+        result = device.neigh.sync([(TEST_IP_NEIGH, mac_address),
+                                    ('fd00::2', mac_address)])
+        self.assertEqual({'added': 1, 'deleted': 0, 'unchanged': 1}, result)
+        self.assertIn('fd00::2',
+                      [neigh['dst'] for neigh in device.neigh.dump(6)])
+
+        result = device.neigh.sync(
+            [], delete_entries=[(TEST_IP_NEIGH, mac_address)])
+        self.assertEqual({'added': 0, 'deleted': 1, 'unchanged': 0}, result)
+        self.assertEqual([], device.neigh.dump(4))
+
     def _check_for_device_name(self, ip, name, should_exist):
         exist = any(d for d in ip.get_devices() if d.name == name)
         self.assertEqual(should_exist, exist)
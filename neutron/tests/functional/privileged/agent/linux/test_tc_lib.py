@@ -291,3 +291,29 @@ class TcFilterClassTestCase(functional_base.BaseSudoTestCase):
         self.assertEqual(2500, filters[0]['rate_kbps'])
         self.assertEqual(1500, filters[0]['burst_kb'])
         self.assertEqual(1200, filters[0]['mtu'])
+
+    def test_apply_tc_operations(self):
+        operations = tc_lib.TcOperations(self.device,
+                                         namespace=self.namespace)
+        operations.delete_qdisc(is_ingress=True)
+        operations.add_qdisc(tc_lib.TC_QDISC_TYPE_INGRESS)
+        operations.add_filter_policy(tc_lib.INGRESS_QDISC_ID, 2500, 1500,
+                                     1200, 'drop', priority=49)
+        operations.apply()
+
+        state = tc_lib.dump_tc_state(self.device, namespace=self.namespace)
+        self.assertEqual(['ingress'],
+                         [qdisc['qdisc_type'] for qdisc in state['qdiscs']])
+        filters = state['filters']['ffff:0']
+        self.assertEqual(1, len(filters))
+        self.assertEqual(2500, filters[0]['rate_kbps'])
+        self.assertEqual(1500, filters[0]['burst_kb'])
+        self.assertEqual(1200, filters[0]['mtu'])
+
+    def test_apply_tc_operations_delete_missing(self):
+        priv_tc_lib.apply_tc_operations(
+            self.device, [('del', {'kind': 'ingress'}),
+                          ('del', {'parent': rtnl.TC_H_ROOT})],
+            namespace=self.namespace)
+        self.assertEqual([], priv_tc_lib.list_tc_qdiscs(
+            self.device, namespace=self.namespace))
@@ -483,6 +483,58 @@ class OVS_Lib_Test(base.BaseTestCase):
             port_exists_mock.assert_called_once_with("test_port")
             set_egress_mock.assert_not_called()
 
+    def test_set_egress_bw_limit_for_ports(self):
+        self.br.ovsdb = mock.MagicMock()
+        txn = self.br.ovsdb.transaction.return_value.__enter__.return_value
+        self.br.set_egress_bw_limit_for_ports({'port1': (1000, 800),
+                                               'port2': (2000, 1600)})
+        self.br.ovsdb.transaction.assert_called_once_with(check_error=True)
+        self.br.ovsdb.db_set.assert_has_calls([
+            mock.call('Interface', 'port1', ('ingress_policing_rate', 1000)),
+            mock.call('Interface', 'port1', ('ingress_policing_burst', 800)),
+            mock.call('Interface', 'port2', ('ingress_policing_rate', 2000)),
+            mock.call('Interface', 'port2', ('ingress_policing_burst', 1600))
+        ])
+        self.assertEqual(4, txn.add.call_count)
+
+    def test_update_ingress_bw_limit_for_ports(self):
+        self.br.ovsdb = mock.MagicMock()
+        self.br.get_ports_attributes = mock.Mock(return_value=[
+            {'name': 'port1', 'type': ''},
+            {'name': 'port2', 'type': 'dpdkvhostuser'}])
+        self.br.ovsdb.db_list.return_value.execute.side_effect = [
+            [{'_uuid': 'qos1', 'external_ids': {'id': 'port1'}},
+             {'_uuid': 'qos-min-bw', 'external_ids': {'id': 'port1',
+                                                      'type': 'min'}}],
+            [{'_uuid': 'queue1',
+              'external_ids': {'id': 'port1',
+                               'queue_type': str(ovs_lib.QOS_DEFAULT_QUEUE)}}]
+        ]
+        with mock.patch.object(
+                self.br, '_update_bw_limit_queue',
+                return_value='queue1') as update_queue, \
+                mock.patch.object(
+                    self.br, '_update_bw_limit_profile',
+                    return_value='qos1') as update_profile, \
+                mock.patch.object(
+                    self.br, '_update_bw_limit_profile_dpdk',
+                    return_value='qos2') as update_profile_dpdk:
+            self.br.update_ingress_bw_limit_for_ports({'port1': (1, 2),
+                                                       'port2': (8, 16)})
+        txn = self.br.ovsdb.transaction.return_value.__enter__.return_value
+        self.br.ovsdb.transaction.assert_called_once_with(check_error=True)
+        update_queue.assert_called_once_with(
+            txn, 'port1', 'queue1', ovs_lib.QOS_DEFAULT_QUEUE,
+            {'max-rate': '1000', 'burst': '2000'})
+        update_profile.assert_called_once_with(
+            txn, 'port1', 'qos1', 'queue1', ovs_lib.QOS_DEFAULT_QUEUE,
+            {'max-rate': '1000'})
+        update_profile_dpdk.assert_called_once_with(
+            txn, 'port2', None, {'cir': '1000.0', 'cbs': '2000.0'})
+        self.br.ovsdb.db_set.assert_has_calls([
+            mock.call('Port', 'port1', ('qos', 'qos1')),
+            mock.call('Port', 'port2', ('qos', 'qos2'))])
+
     def test_get_vifs_by_ids(self):
         db_list_res = [
             {'name': 'qvo1', 'ofport': 1,
@@ -141,6 +141,20 @@ class QosAgentDriverTestCase(base.BaseTestCase):
         self.driver.delete_bandwidth_limit_ingress.assert_called_with(
             self.port)
 
+    def test_update_ports(self):
+        port2 = dict(self.port, device_owner='another-device-owner')
+        self.driver.update_ports([self.port, port2], self.policy, self.policy)
+        self.driver.delete_bandwidth_limit.assert_has_calls([
+            mock.call(self.port), mock.call(port2)])
+        self.driver.delete_bandwidth_limit_ingress.assert_has_calls([
+            mock.call(self.port), mock.call(port2)])
+        self.driver.update_bandwidth_limit.assert_has_calls([
+            mock.call(self.port, self.egress_bandwidth_limit_rule),
+            mock.call(self.port, self.ingress_bandwidth_limit_rule),
+            mock.call(port2, self.egress_bandwidth_limit_rule),
+            mock.call(port2, self.ingress_bandwidth_limit_rule)
+        ])
+
     def test__iterate_rules_with_unknown_rule_type(self):
         self.policy.rules.append(self.fake_rule)
         rules = list(self.driver._iterate_rules(self.policy.rules))
@@ -397,12 +411,14 @@ class QosExtensionRpcTestCase(QosExtensionBaseTestCase):
         policy_obj = mock.Mock()
         policy_obj.id = port1['qos_policy_id']
         self.qos_ext._process_update_policy(policy_obj)
-        self.qos_ext.qos_driver.update.assert_called_with(port1, policy_obj)
+        self.qos_ext.qos_driver.update_ports.assert_called_with(
+            [port1], policy_obj, TEST_POLICY)
 
-        self.qos_ext.qos_driver.update.reset_mock()
+        self.qos_ext.qos_driver.update_ports.reset_mock()
         policy_obj.id = port2['qos_policy_id']
         self.qos_ext._process_update_policy(policy_obj)
-        self.qos_ext.qos_driver.update.assert_called_with(port2, policy_obj)
+        self.qos_ext.qos_driver.update_ports.assert_called_with(
+            [port2], policy_obj, TEST_POLICY2)
 
     def test__process_update_policy_descr_not_propagated_into_driver(self):
         port = self._create_test_port_dict(qos_policy_id=TEST_POLICY.id)
@@ -413,6 +429,7 @@ class QosExtensionRpcTestCase(QosExtensionBaseTestCase):
             TEST_POLICY_DESCR)
         self.assertFalse(self.qos_ext.qos_driver.delete.called)
         self.assertFalse(self.qos_ext.qos_driver.update.called)
+        self.assertFalse(self.qos_ext.qos_driver.update_ports.called)
         self.assertEqual(TEST_POLICY_DESCR,
                          self.qos_ext.policy_map.get_policy(TEST_POLICY.id))
 
@@ -422,6 +439,7 @@ class QosExtensionRpcTestCase(QosExtensionBaseTestCase):
         self.assertFalse(self.qos_ext._policy_rules_modified.called)
         self.assertFalse(self.qos_ext.qos_driver.delete.called)
         self.assertFalse(self.qos_ext.qos_driver.update.called)
+        self.assertFalse(self.qos_ext.qos_driver.update_ports.called)
         self.assertIsNone(self.qos_ext.policy_map.get_policy(
             TEST_POLICY_DESCR.id))
 
@@ -265,6 +265,45 @@ class TestBasicRouterOperations(BasicRouterOperationsFramework):
     def test_enqueue_state_change_from_none_to_backup_to_master(self):
         self._enqueue_state_change_transitions(['backup', 'master'], 2)
 
+    def test_enqueue_state_change_pipeline_from_none_to_master(self):
+        self.conf.set_override('ha_state_change_workers', 2)
+        self._enqueue_state_change_transitions(['master'], 1)
+
+    def test_enqueue_state_change_pipeline_from_none_to_master_to_backup(
+            self):
+        self.conf.set_override('ha_state_change_workers', 2)
+        self._enqueue_state_change_transitions(['master', 'backup'], 0)
+
+    def test_enqueue_state_change_pipeline_priority(self):
+        self.conf.set_override('ha_state_change_workers', 1)
+        self.conf.set_override('ha_vrrp_advert_int', 1)
+        agent = l3_agent.L3NATAgent(HOSTNAME, self.conf)
+        routers = {
+            'no-gw': mock.MagicMock(ex_gw_port=None, router={}),
+            'gw': mock.MagicMock(ex_gw_port={'id': 'gw'}, router={}),
+            'gw-fips': mock.MagicMock(
+                ex_gw_port={'id': 'gw'},
+                router={lib_constants.FLOATINGIP_KEY: [{}, {}]}),
+            'master': mock.MagicMock(ex_gw_port=None, router={})}
+        agent.router_info.update(routers)
+        processed = []
+        with mock.patch.object(
+                agent, '_process_state_change',
+                side_effect=lambda router_id, state: processed.append(
+                    router_id) or True):
+            agent.enqueue_state_change('master', 'master')
+            for router_id in ('no-gw', 'gw', 'gw-fips'):
+                agent.enqueue_state_change(router_id, 'backup')
+            eventlet.sleep(self.conf.ha_vrrp_advert_int + 1)
+
+        # the transitions to backup are grouped in a first batch, the
+        # transition to master is due after ha_vrrp_advert_int
+        self.assertEqual(['gw-fips', 'gw', 'no-gw', 'master'], processed)
+        stats = agent._state_transition_pipeline.stats
+        self.assertEqual(4, stats['transitions'])
+        self.assertEqual(2, stats['batches'])
+        self.assertEqual(3, stats['max_batch_size'])
+
     def test_enqueue_state_change_metadata_disable(self):
         self.conf.set_override('enable_metadata_proxy', False)
         self.conf.set_override('ha_vrrp_advert_int', 1)
@@ -3930,6 +3969,35 @@ class TestBasicRouterOperations(BasicRouterOperationsFramework):
         self.assertTrue(mock_delete.called)
         self.assertFalse(mock_dscm.called)
 
+    def test_router_added_cancels_namespace_cleanup(self):
+        router = l3_test_common.prepare_router_data()
+        ext_net_id = _uuid()
+        router['external_gateway_info']['network_id'] = ext_net_id
+        agent = l3_agent.L3NATAgent(HOSTNAME, self.conf)
+        with mock.patch.object(agent.namespaces_manager,
+                               'cancel_cleanup') as cancel_cleanup, \
+                mock.patch.object(l3router.RouterInfo, 'initialize'):
+            agent._router_added(router['id'], router)
+        cancel_cleanup.assert_has_calls([mock.call(router['id']),
+                                         mock.call(ext_net_id)])
+
+    def test_router_gateway_added_cancels_namespace_cleanup(self):
+        agent = l3_agent.L3NATAgent(HOSTNAME, self.conf)
+        router = {'id': _uuid(),
+                  'routes': [],
+                  'admin_state_up': True,
+                  'external_gateway_info': None}
+        agent._process_router_if_compatible(router)
+        ext_net_id = _uuid()
+        router = dict(router, external_gateway_info={'network_id': ext_net_id})
+        ri = agent.router_info[router['id']]
+        with mock.patch.object(agent.namespaces_manager,
+                               'cancel_cleanup') as cancel_cleanup, \
+                mock.patch.object(ri, 'process'):
+            agent._process_router_if_compatible(router)
+        cancel_cleanup.assert_has_calls([mock.call(router['id']),
+                                         mock.call(ext_net_id)])
+
     @mock.patch.object(lla.LinkLocalAllocator, '_write')
     @mock.patch.object(l3router.RouterInfo, '_get_gw_ips_cidr')
     def test_process_floating_ip_addresses_not_care_port_forwarding(
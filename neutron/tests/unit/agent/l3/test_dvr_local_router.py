@@ -12,6 +12,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import copy
+
 import mock
 from neutron_lib.api.definitions import portbindings
 from neutron_lib import constants as lib_constants
@@ -524,14 +526,79 @@ class TestDvrRouterOperations(base.BaseTestCase):
                                '_process_arp_cache_for_internal_port') as parp:
             ri._set_subnet_arp_info(subnet_id)
         self.assertEqual(1, parp.call_count)
-        self.mock_ip_dev.neigh.add.assert_called_once_with(
-            '1.2.3.4', '00:11:22:33:44:55')
+        self.mock_ip_dev.neigh.sync.assert_called_once_with(
+            [('1.2.3.4', '00:11:22:33:44:55')], delete_entries=None)
+        self.mock_ip_dev.neigh.add.assert_not_called()
+
+        # The ports of the subnet are fetched once
+        ri._set_subnet_arp_info(subnet_id)
+        self.assertEqual(1, self.plugin_api.get_ports_by_subnet.call_count)
 
         # Test negative case
         router['distributed'] = False
         ri._set_subnet_arp_info(subnet_id)
         self.mock_ip_dev.neigh.add.never_called()
 
+    def test__set_subnet_arp_info_updated_by_notifications(self):
+        agent = l3_agent.L3NATAgent(HOSTNAME, self.conf)
+        router = l3_test_common.prepare_router_data(num_internal_ports=2)
+        router['distributed'] = True
+        self._set_ri_kwargs(agent, router['id'], router)
+        ri = dvr_router.DvrLocalRouter(HOSTNAME, **self.ri_kwargs)
+        ports = ri.router.get(lib_constants.INTERFACE_KEY, [])
+        subnet_id = l3_test_common.get_subnet_id(ports[0])
+        self.plugin_api.get_ports_by_subnet.return_value = [
+            {'mac_address': '00:11:22:33:44:55',
+             'device_owner': 'compute:nova',
+             'fixed_ips': [{'ip_address': '1.2.3.4',
+                            'prefixlen': 24,
+                            'subnet_id': subnet_id}]}]
+        ri._set_subnet_arp_info(subnet_id)
+
+        for action, ip_address in (('add', '1.2.3.5'), ('delete', '1.2.3.4')):
+            payload = {'arp_table': {'ip_address': ip_address,
+                                     'mac_address': '00:11:22:33:44:66',
+                                     'subnet_id': subnet_id},
+                       'router_id': router['id']}
+            agent._update_arp_entry(None, payload, action)
+        self.mock_ip_dev.neigh.sync.reset_mock()
+        ri._set_subnet_arp_info(subnet_id)
+        self.mock_ip_dev.neigh.sync.assert_called_once_with(
+            [('1.2.3.5', '00:11:22:33:44:66')], delete_entries=None)
+        self.assertEqual(1, self.plugin_api.get_ports_by_subnet.call_count)
+
+        # The ports are fetched again after a full sync
+        agent.clear_subnet_arp_entries()
+        ri._set_subnet_arp_info(subnet_id)
+        self.assertEqual(2, self.plugin_api.get_ports_by_subnet.call_count)
+
+    def test_internal_network_removed_releases_subnet_arp_entries(self):
+        agent = l3_agent.L3NATAgent(HOSTNAME, self.conf)
+        router = l3_test_common.prepare_router_data(num_internal_ports=2)
+        router['distributed'] = True
+        self._set_ri_kwargs(agent, router['id'], router)
+        ri = dvr_router.DvrLocalRouter(HOSTNAME, **self.ri_kwargs)
+        ports = ri.router.get(lib_constants.INTERFACE_KEY, [])
+        ri.internal_ports = list(ports)
+        agent.router_info[ri.router_id] = ri
+        subnet_id = l3_test_common.get_subnet_id(ports[0])
+        self.plugin_api.get_ports_by_subnet.return_value = []
+        agent.get_subnet_arp_entries(subnet_id)
+
+        # Another internal port is still attached to the subnet
+        port = copy.deepcopy(ports[0])
+        port['id'] = _uuid()
+        with mock.patch.object(ri, '_dvr_internal_network_removed'):
+            ri.internal_network_removed(port)
+        agent.get_subnet_arp_entries(subnet_id)
+        self.assertEqual(1, self.plugin_api.get_ports_by_subnet.call_count)
+
+        # The last internal port on the subnet is removed
+        with mock.patch.object(ri, '_dvr_internal_network_removed'):
+            ri.internal_network_removed(ports[0])
+        agent.get_subnet_arp_entries(subnet_id)
+        self.assertEqual(2, self.plugin_api.get_ports_by_subnet.call_count)
+
     def test_add_arp_entry(self):
         agent = l3_agent.L3NATAgent(HOSTNAME, self.conf)
         router = l3_test_common.prepare_router_data(num_internal_ports=2)
@@ -598,12 +665,23 @@ class TestDvrRouterOperations(base.BaseTestCase):
         ri, subnet_id = self._setup_test_for_arp_entry_cache()
         ri._cache_arp_entry('1.7.23.11', '00:11:22:33:44:55',
                             subnet_id, 'add')
-        self.assertEqual(1, len(ri._pending_arp_set))
-        with mock.patch.object(ri, '_update_arp_entry') as update_arp:
-            update_arp.return_value = True
+        ri._cache_arp_entry('1.7.23.12', '00:11:22:33:44:66',
+                            subnet_id, 'delete')
+        self.assertEqual(2, len(ri._pending_arp_set))
         ri._process_arp_cache_for_internal_port(subnet_id)
+        self.mock_ip_dev.neigh.sync.assert_called_once_with(
+            [('1.7.23.11', '00:11:22:33:44:55')],
+            delete_entries=[('1.7.23.12', '00:11:22:33:44:66')])
         self.assertEqual(0, len(ri._pending_arp_set))
 
+    def test__process_arp_cache_for_internal_port_sync_failed(self):
+        ri, subnet_id = self._setup_test_for_arp_entry_cache()
+        ri._cache_arp_entry('1.7.23.11', '00:11:22:33:44:55',
+                            subnet_id, 'add')
+        self.mock_ip_dev.neigh.sync.side_effect = RuntimeError
+        ri._process_arp_cache_for_internal_port(subnet_id)
+        self.assertEqual(1, len(ri._pending_arp_set))
+
     def test__delete_arp_cache_for_internal_port(self):
         ri, subnet_id = self._setup_test_for_arp_entry_cache()
         ri._cache_arp_entry('1.7.23.11', '00:11:22:33:44:55',
@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import eventlet
+from eventlet import event
 import mock
 from oslo_utils import uuidutils
 
@@ -112,3 +114,135 @@ class TestNamespaceManager(NamespaceManagerTestCaseFramework):
                         mock.call(dvr_snat_ns.SNAT_NS_PREFIX, router_id)]
             mock_cleanup.assert_has_calls(expected, any_order=True)
             self.assertEqual(2, mock_cleanup.call_count)
+
+    def _test_cleanup_stale(self, workers=0, rate_limit=0):
+        self.agent_conf.namespace_cleanup_workers = workers
+        self.agent_conf.namespace_cleanup_rate_limit = rate_limit
+        router_ids = [_uuid() for _ in range(3)]
+        ns_names = [namespaces.NS_PREFIX + router_id
+                    for router_id in router_ids]
+        with mock.patch.object(ip_lib, 'list_network_namespaces',
+                               return_value=ns_names), \
+                mock.patch.object(self.ns_manager, '_cleanup',
+                                  return_value=True) as mock_cleanup:
+            with self.ns_manager as ns_manager:
+                ns_manager.keep_router(router_ids[0])
+            if workers:
+                self.ns_manager._cleanup_thread.wait()
+        mock_cleanup.assert_has_calls(
+            [mock.call(namespaces.NS_PREFIX, router_id)
+             for router_id in router_ids[1:]], any_order=True)
+        self.assertEqual(2, mock_cleanup.call_count)
+        self.assertEqual({}, self.ns_manager._stale_namespaces)
+        self.assertIsNone(self.ns_manager._cleanup_thread)
+
+    def test_cleanup_stale(self):
+        self._test_cleanup_stale()
+
+    def test_cleanup_stale_in_background(self):
+        self._test_cleanup_stale(workers=2)
+
+    @mock.patch.object(namespace_manager.eventlet, 'sleep')
+    def test_cleanup_stale_in_background_rate_limit(self, mock_sleep):
+        self._test_cleanup_stale(workers=2, rate_limit=4)
+        mock_sleep.assert_called_once_with(0.25)
+
+    def test_cleanup_stale_in_background_error(self):
+        self.agent_conf.namespace_cleanup_workers = 2
+        self.agent_conf.namespace_cleanup_rate_limit = 0
+        ns_names = [namespaces.NS_PREFIX + _uuid() for _ in range(3)]
+        with mock.patch.object(ip_lib, 'list_network_namespaces',
+                               return_value=ns_names), \
+                mock.patch.object(self.ns_manager, '_cleanup',
+                                  side_effect=[True, OSError, True]), \
+                mock.patch.object(namespace_manager.LOG, 'info') as log_info:
+            with self.ns_manager:
+                pass
+            self.ns_manager._cleanup_thread.wait()
+        self.assertEqual(2, log_info.call_args[0][1]['removed'])
+        self.assertEqual(1, log_info.call_args[0][1]['failed'])
+        self.assertEqual({}, self.ns_manager._deleting)
+
+    def test_stop_cleanup(self):
+        self.agent_conf.namespace_cleanup_workers = 1
+        self.agent_conf.namespace_cleanup_rate_limit = 0
+        deleting = event.Event()
+        release = event.Event()
+
+        def _cleanup(ns_prefix, ns_id):
+            if not deleting.ready():
+                deleting.send()
+            release.wait()
+            return True
+
+        ns_names = [namespaces.NS_PREFIX + _uuid() for _ in range(4)]
+        with mock.patch.object(ip_lib, 'list_network_namespaces',
+                               return_value=ns_names), \
+                mock.patch.object(self.ns_manager, '_cleanup',
+                                  side_effect=_cleanup) as mock_cleanup:
+            with self.ns_manager:
+                pass
+            deleting.wait()
+            stop = eventlet.spawn(self.ns_manager.stop_cleanup)
+            eventlet.sleep(0)
+            # The started deletion is waited for
+            self.assertFalse(stop.dead)
+            release.send()
+            stop.wait()
+        # The deletion started and the one waiting for a worker are done,
+        # the other ones are dropped
+        self.assertEqual(2, mock_cleanup.call_count)
+        self.assertEqual({}, self.ns_manager._stale_namespaces)
+        self.assertIsNone(self.ns_manager._cleanup_thread)
+
+    def test_stop_cleanup_not_started(self):
+        self.ns_manager.stop_cleanup()
+        self.assertIsNone(self.ns_manager._cleanup_thread)
+
+    def test_cancel_cleanup(self):
+        self.agent_conf.namespace_cleanup_workers = 1
+        router_id = _uuid()
+        ns_names = [namespaces.NS_PREFIX + router_id,
+                    dvr_snat_ns.SNAT_NS_PREFIX + router_id,
+                    namespaces.NS_PREFIX + _uuid()]
+        with mock.patch.object(ip_lib, 'list_network_namespaces',
+                               return_value=ns_names), \
+                mock.patch.object(self.ns_manager, '_cleanup',
+                                  return_value=True) as mock_cleanup:
+            with self.ns_manager:
+                pass
+            # The background cleanup has not started yet
+            self.ns_manager.cancel_cleanup(router_id)
+            self.ns_manager._cleanup_thread.wait()
+        mock_cleanup.assert_called_once_with(
+            namespaces.NS_PREFIX, namespaces.get_id_from_ns_name(ns_names[2]))
+
+    def test_cancel_cleanup_waits_for_started_deletion(self):
+        self.agent_conf.namespace_cleanup_workers = 1
+        router_id = _uuid()
+        deleting = event.Event()
+        release = event.Event()
+
+        def _cleanup(ns_prefix, ns_id):
+            deleting.send()
+            release.wait()
+            return True
+
+        with mock.patch.object(ip_lib, 'list_network_namespaces',
+                               return_value=[namespaces.NS_PREFIX +
+                                             router_id]), \
+                mock.patch.object(self.ns_manager, '_cleanup',
+                                  side_effect=_cleanup):
+            with self.ns_manager:
+                pass
+            cleanup_thread = self.ns_manager._cleanup_thread
+            deleting.wait()
+            cancel = eventlet.spawn(self.ns_manager.cancel_cleanup,
+                                    router_id)
+            eventlet.sleep(0)
+            # The deletion has started, the router has to wait for it
+            self.assertFalse(cancel.dead)
+            release.send()
+            cancel.wait()
+            cleanup_thread.wait()
+        self.assertEqual({}, self.ns_manager._deleting)
@@ -13,8 +13,10 @@
 #    limitations under the License.
 
 import mock
+from oslo_config import cfg
 
 from neutron.agent.linux import ip_conntrack
+from neutron.conf.agent import securitygroups_rpc
 from neutron.tests import base
 
 
@@ -39,3 +41,123 @@ class IPConntrackTestCase(base.BaseTestCase):
         dev_info_list = [dev_info for _ in range(10)]
         self.mgr._delete_conntrack_state(dev_info_list, rule)
         self.assertEqual(1, len(self.execute.mock_calls))
+
+
+class IPNetlinkConntrackTestCase(base.BaseTestCase):
+
+    def setUp(self):
+        super(IPNetlinkConntrackTestCase, self).setUp()
+        self.execute = mock.Mock()
+        self.mgr = ip_conntrack.IpNetlinkConntrackManager(
+                     self._get_rule_for_table, {}, {}, self.execute,
+                     zone_per_port=True)
+        self.delete = mock.patch.object(
+            ip_conntrack.netlink_lib, 'delete_entries_by_filters',
+            return_value=(3, [])).start()
+
+    def _get_rule_for_table(self, table):
+        return ['test --physdev-in tapdevice -j CT --zone 100']
+
+    def _drain_queue(self):
+        while not self.mgr._queue.empty():
+            self.mgr._process_queue()
+
+    def test_delete_conntrack_state_coalesces_updates(self):
+        dev_info = {'device': 'tapdevice',
+                    'fixed_ips': ['1.2.3.4', 'fe80::1']}
+        unknown_dev_info = {'device': 'tapunknown', 'fixed_ips': ['1.2.3.5']}
+        self.mgr.delete_conntrack_state_by_rule(
+            [dev_info, unknown_dev_info],
+            {'ethertype': 'IPv4', 'direction': 'ingress',
+             'protocol': 'tcp'})
+        self.mgr.delete_conntrack_state_by_remote_ips(
+            [dev_info], 'IPv4', ['10.0.0.1', '10.0.0.2'])
+        self.mgr.delete_conntrack_state_by_rule(
+            [dev_info], {'ethertype': 'IPv6', 'direction': 'egress',
+                         'protocol': '0'})
+        self.assertEqual(4, self.mgr.queue_depth)
+
+        self._drain_queue()
+
+        self.delete.assert_called_once_with(mock.ANY)
+        self.assertEqual(
+            {(4, 100, 6, None, '1.2.3.4'),
+             (4, 100, None, '10.0.0.1', '1.2.3.4'),
+             (4, 100, None, '10.0.0.2', '1.2.3.4'),
+             (4, 100, None, '1.2.3.4', '10.0.0.1'),
+             (4, 100, None, '1.2.3.4', '10.0.0.2'),
+             (6, 100, None, 'fe80::1', None)},
+            set(self.delete.call_args[0][0]))
+        self.assertEqual(0, self.mgr.queue_depth)
+        self.assertEqual(4, self.mgr.stats['updates'])
+        self.assertEqual(1, self.mgr.stats['passes'])
+        self.assertEqual(3, self.mgr.stats['deleted_entries'])
+        self.assertEqual(4, self.mgr.stats['max_queue_depth'])
+
+        self.execute.assert_not_called()
+
+    def test_delete_conntrack_state_unparsed_entries(self):
+        self.delete.return_value = (0, [(4, 100, 47, '10.0.0.1', '1.2.3.4')])
+        self.mgr.delete_conntrack_state_by_remote_ips(
+            [{'device': 'tapdevice', 'fixed_ips': ['1.2.3.4']}], 'IPv4',
+            ['10.0.0.1'])
+        self._drain_queue()
+        self.execute.assert_called_once_with(
+            ['conntrack', '-D', '-p', '47', '-f', 'ipv4', '-w', '100',
+             '-s', '10.0.0.1', '-d', '1.2.3.4'],
+            run_as_root=True, check_exit_code=True, extra_ok_codes=[1])
+
+    def test_delete_conntrack_state_unknown_protocol(self):
+        self.mgr.delete_conntrack_state_by_rule(
+            [{'device': 'tapdevice', 'fixed_ips': ['1.2.3.4']}],
+            {'ethertype': 'IPv4', 'direction': 'ingress',
+             'protocol': 'unknown'})
+        self._drain_queue()
+        self.delete.assert_not_called()
+        self.execute.assert_called_once_with(
+            ['conntrack', '-D', '-p', 'unknown', '-f', 'ipv4', '-d',
+             '1.2.3.4', '-w', 100],
+            run_as_root=True, check_exit_code=True, extra_ok_codes=[1])
+
+    def test_get_conntrack_filters_unknown_protocol(self):
+        self.assertIsNone(self.mgr._get_conntrack_filters(
+            [{'device': 'tapdevice', 'fixed_ips': ['1.2.3.4']}],
+            {'ethertype': 'IPv4', 'direction': 'ingress',
+             'protocol': 'unknown'}))
+        self.execute.assert_not_called()
+
+    def test_delete_conntrack_state_no_zone(self):
+        self.mgr.delete_conntrack_state_by_rule(
+            [{'device': 'tapunknown', 'fixed_ips': ['1.2.3.5']}],
+            {'ethertype': 'IPv4', 'direction': 'ingress'})
+        self._drain_queue()
+        self.delete.assert_not_called()
+        self.assertEqual(1, self.mgr.stats['passes'])
+
+
+class GetConntrackTestCase(base.BaseTestCase):
+
+    def setUp(self):
+        super(GetConntrackTestCase, self).setUp()
+        securitygroups_rpc.register_securitygroups_opts()
+        cfg.CONF.set_override('conntrack_backend', 'netlink',
+                              group='SECURITYGROUP')
+        mock.patch.dict(ip_conntrack.CONTRACK_MGRS, clear=True).start()
+        mock.patch.object(ip_conntrack.IpConntrackManager,
+                          '_start_process_queue').start()
+
+    def _get_conntrack(self, namespace=None):
+        return ip_conntrack.get_conntrack(
+            lambda table: [], {}, {}, namespace=namespace)
+
+    def test_get_conntrack_netlink(self):
+        with mock.patch.object(ip_conntrack.netlink_lib, 'nfct_lib',
+                               'libnetfilter_conntrack.so.3'):
+            self.assertIsInstance(self._get_conntrack(),
+                                  ip_conntrack.IpNetlinkConntrackManager)
+
+    def test_get_conntrack_netlink_in_namespace(self):
+        with mock.patch.object(ip_conntrack.netlink_lib, 'nfct_lib',
+                               'libnetfilter_conntrack.so.3'):
+            mgr = self._get_conntrack(namespace='qrouter-1')
+        self.assertNotIsInstance(mgr, ip_conntrack.IpNetlinkConntrackManager)
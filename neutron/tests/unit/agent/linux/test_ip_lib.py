@@ -1358,6 +1358,47 @@ class TestIpNeighCommand(TestIPCmdBase):
             family=2,
             ifindex=1)
 
+    @mock.patch.object(pyroute2, 'NetNS')
+    def test_sync_entries(self, mock_netns):
+        mock_netns_instance = mock_netns.return_value
+        mock_netns_enter = mock_netns_instance.__enter__.return_value
+        mock_netns_enter.link_lookup.return_value = [1]
+        permanent = ndmsg.states['permanent']
+        current = [
+            {'attrs': [('NDA_DST', '192.168.45.100'),
+                       ('NDA_LLADDR', 'cc:dd:ee:ff:ab:cd')],
+             'state': permanent},
+            {'attrs': [('NDA_DST', '192.168.45.101'),
+                       ('NDA_LLADDR', 'cc:dd:ee:ff:ab:ce')],
+             'state': ndmsg.states['reachable']},
+            {'attrs': [('NDA_DST', '192.168.45.102'),
+                       ('NDA_LLADDR', 'cc:dd:ee:ff:ab:cf')],
+             'state': permanent}]
+        mock_netns_enter.neigh.side_effect = (
+            lambda command, **kwargs: current if command == 'dump' else None)
+        result = self.neigh_cmd.sync(
+            [('192.168.45.100', 'cc:dd:ee:ff:ab:cd'),
+             ('192.168.45.101', 'cc:dd:ee:ff:ab:ce'),
+             ('192.168.45.103', 'cc:dd:ee:ff:ab:d0')],
+            delete_entries=[('192.168.45.102', 'cc:dd:ee:ff:ab:cf'),
+                            ('192.168.45.104', 'cc:dd:ee:ff:ab:d1')])
+        self.assertEqual({'added': 2, 'deleted': 1, 'unchanged': 1}, result)
+        mock_netns_enter.neigh.assert_has_calls([
+            mock.call('dump', ifindex=1, family=2),
+            mock.call('replace', ifindex=1, dst='192.168.45.101',
+                      lladdr='cc:dd:ee:ff:ab:ce', family=2, state=permanent),
+            mock.call('replace', ifindex=1, dst='192.168.45.103',
+                      lladdr='cc:dd:ee:ff:ab:d0', family=2, state=permanent),
+            mock.call('delete', ifindex=1, dst='192.168.45.102',
+                      lladdr='cc:dd:ee:ff:ab:cf', family=2)])
+        self.assertEqual(4, mock_netns_enter.neigh.call_count)
+
+    @mock.patch.object(pyroute2, 'NetNS')
+    def test_sync_entries_nonexistent_namespace(self, mock_netns):
+        mock_netns.side_effect = OSError(errno.ENOENT, None)
+        with testtools.ExpectedException(ip_lib.NetworkNamespaceNotFound):
+            self.neigh_cmd.sync([('192.168.45.100', 'cc:dd:ee:ff:ab:cd')])
+
     def test_flush(self):
         self.neigh_cmd.flush(4, '192.168.0.1')
         self._assert_sudo([4], ('flush', 'to', '192.168.0.1'))
@@ -1100,6 +1100,41 @@ class IptablesManagerStateFulTestCase(IptablesManagerBaseTestCase):
         tools.verify_mock_calls(self.execute, expected_calls_and_values,
                                 any_order=True)
 
+    def test_get_traffic_counters_bulk(self):
+        dump = (TRAFFIC_COUNTERS_DUMP + '\n' +
+                'Chain INPUT (policy ACCEPT 0 packets, 0 bytes)\n'
+                '    pkts      bytes target     prot opt in     out     source'
+                '               destination         \n'
+                '      10     840 chain3     all  --  *      *       0.0.0.0/0'
+                '            0.0.0.0/0           \n')
+        cmd_tables = set(
+            self.iptables._get_traffic_counters_cmd_tables('OUTPUT') +
+            self.iptables._get_traffic_counters_cmd_tables('INPUT'))
+        expected_calls_and_values = [
+            (mock.call([cmd, '-t', table, '-L', '-n', '-v', '-x', '-w', '10'],
+                       run_as_root=True),
+             dump if table == 'filter' else '')
+            for cmd, table in cmd_tables]
+
+        tools.setup_mock_calls(self.execute, expected_calls_and_values)
+
+        with mock.patch.object(iptables_manager, "LOG") as log:
+            accs = self.iptables.get_traffic_counters_bulk(
+                ['OUTPUT', 'INPUT', 'chain1'])
+        log.warning.assert_called_once_with(
+            'Attempted to get traffic counters of chain %s which '
+            'does not exist', 'chain1')
+
+        # Each table is listed only once
+        self.assertEqual(len(cmd_tables), self.execute.call_count)
+        tools.verify_mock_calls(self.execute, expected_calls_and_values,
+                                any_order=True)
+        factor = 2 if self.use_ipv6 else 1
+        self.assertEqual({'OUTPUT': {'pkts': 800 * factor,
+                                     'bytes': 131802 * factor},
+                          'INPUT': {'pkts': 10 * factor,
+                                    'bytes': 840 * factor}}, accs)
+
     def test_add_blank_rule(self):
         iptables_args = {}
         iptables_args.update(IPTABLES_ARG)
@@ -127,6 +127,10 @@ class TestTcCommand(base.BaseTestCase):
             tc_lib, 'list_tc_filters').start()
         self.mock_add_tc_filter_policy = mock.patch.object(
             tc_lib, 'add_tc_filter_policy').start()
+        self.mock_dump_tc_state = mock.patch.object(
+            tc_lib, 'dump_tc_state').start()
+        self.mock_apply_tc_operations = mock.patch.object(
+            priv_tc_lib, 'apply_tc_operations').start()
 
     def test_check_kernel_hz_lower_then_zero(self):
         self.assertRaises(
@@ -175,14 +179,25 @@ class TestTcCommand(base.BaseTestCase):
 
     def test_update_filters_bw_limit(self):
         self.tc.update_filters_bw_limit(BW_LIMIT, BURST)
-        self.mock_add_tc_qdisc.assert_called_once_with(
-            self.tc.name, 'ingress', namespace=self.tc.namespace)
-        self.mock_delete_tc_qdisc.assert_called_once_with(
-            self.tc.name, is_ingress=True, raise_interface_not_found=False,
-            raise_qdisc_not_found=False, namespace=self.tc.namespace)
-        self.mock_add_tc_filter_policy.assert_called_once_with(
-            self.tc.name, tc_lib.INGRESS_QDISC_ID, BW_LIMIT, BURST,
-            tc_lib.MAX_MTU_VALUE, 'drop', priority=49)
+        operations = [
+            ('del', {'kind': 'ingress'}),
+            ('replace', {'kind': 'ingress'}),
+            ('add-filter', {'kind': 'u32', 'parent': tc_lib.INGRESS_QDISC_ID,
+                            'prio': 49, 'protocol': mock.ANY,
+                            'rate': BW_LIMIT * 128, 'burst': BURST * 128,
+                            'mtu': tc_lib.MAX_MTU_VALUE, 'action': 'drop',
+                            'keys': ['0x0/0x0'], 'target': 1})]
+        self.mock_apply_tc_operations.assert_called_once_with(
+            self.tc.name, operations, namespace=self.tc.namespace)
+        self.mock_add_tc_qdisc.assert_not_called()
+        self.mock_delete_tc_qdisc.assert_not_called()
+        self.mock_add_tc_filter_policy.assert_not_called()
+
+    def test_set_filters_bw_limit(self):
+        self.tc.set_filters_bw_limit(BW_LIMIT, BURST)
+        self.mock_dump_tc_state.assert_not_called()
+        self.mock_apply_tc_operations.assert_called_once_with(
+            self.tc.name, mock.ANY, namespace=self.tc.namespace)
 
     def test_delete_filters_bw_limit(self):
         self.tc.delete_filters_bw_limit()
@@ -397,3 +412,69 @@ class TcFilterTestCase(base.BaseTestCase):
                 '0x90ab0000/0xffff0000+46']
         mock_add_filter.assert_called_once_with(
             'device', 'parent', 1, 'classid', keys, namespace='ns')
+
+
+class TcOperationsTestCase(base.BaseTestCase):
+
+    def setUp(self):
+        super(TcOperationsTestCase, self).setUp()
+        self.mock_apply_tc_operations = mock.patch.object(
+            priv_tc_lib, 'apply_tc_operations').start()
+        self.operations = tc_lib.TcOperations('device', namespace='ns')
+
+    def test_apply(self):
+        self.operations.add_qdisc('htb', parent='root', handle='1:')
+        self.operations.add_policy_class('1:', '1:10', 2000, min_kbps=1000,
+                                         burst_kb=1200)
+        self.operations.delete_policy_class('1:', '1:20')
+        self.operations.delete_qdisc(parent='root')
+        self.operations.apply()
+        operations = [
+            ('replace', {'kind': 'htb', 'handle': '1:0',
+                         'parent': rtnl.TC_H_ROOT}),
+            ('replace-class', {'kind': 'htb', 'handle': '1:10',
+                               'parent': '1:', 'ceil': 256000,
+                               'burst': 153600, 'rate': 128000}),
+            ('del-class', {'handle': '1:20', 'parent': '1:'}),
+            ('del', {'parent': rtnl.TC_H_ROOT})]
+        self.mock_apply_tc_operations.assert_called_once_with(
+            'device', operations, namespace='ns')
+        self.assertEqual([], self.operations.operations)
+
+    def test_apply_no_operations(self):
+        self.operations.apply()
+        self.mock_apply_tc_operations.assert_not_called()
+
+    def test_add_qdisc_wrong_qdisc_type(self):
+        self.assertRaises(qos_exc.TcLibQdiscTypeError,
+                          self.operations.add_qdisc, 'other_type')
+        self.assertEqual([], self.operations.operations)
+
+    @mock.patch('pyroute2.netlink.rtnl.tcmsg.common.tick_in_usec', 15.625)
+    def test_dump_tc_state(self):
+        qdisc = {'index': 2, 'handle': 0xffff0000,
+                 'parent': rtnl.TC_H_INGRESS,
+                 'attrs': (('TCA_KIND', 'ingress'), )}
+        tca_police_tbf = {'rate': 320000, 'burst': 9375000, 'mtu': 1200}
+        head_filter = {'parent': 0xffff0000, 'attrs': ()}
+        police_filter = {
+            'parent': 0xffff0000,
+            'attrs': (('TCA_OPTIONS', {'attrs': (
+                ('TCA_U32_SEL', {'keys': [{'key_off': 0, 'key_val': 0,
+                                           'key_offmask': 0}]}),
+                ('TCA_U32_POLICE', {'attrs': (
+                    ('TCA_POLICE_TBF', tca_police_tbf), )}))}), )}
+        with mock.patch.object(priv_tc_lib, 'dump_tc_state') as mock_dump:
+            mock_dump.return_value = {
+                'qdiscs': [qdisc], 'classes': [],
+                'filters': [head_filter, police_filter]}
+            state = tc_lib.dump_tc_state('device', namespace='ns')
+        mock_dump.assert_called_once_with('device', namespace='ns')
+        self.assertEqual([{'qdisc_type': 'ingress', 'parent': 'ingress',
+                           'handle': 'ffff:0'}], state['qdiscs'])
+        self.assertEqual([], state['classes'])
+        self.assertEqual(
+            {'ffff:0': [{'keys': [{'value': 0, 'mask': 0, 'offset': 0}],
+                         'rate_kbps': 2500, 'burst_kb': 1500,
+                         'mtu': 1200}]},
+            state['filters'])
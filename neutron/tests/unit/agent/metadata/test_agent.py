@@ -24,6 +24,7 @@ from oslo_utils import fileutils
 from neutron.agent.linux import utils as agent_utils
 from neutron.agent.metadata import agent
 from neutron.agent import metadata_agent
+from neutron.api.rpc.callbacks import resources
 from neutron.common import cache_utils as cache
 from neutron.common import utils
 from neutron.conf.agent.metadata import config as meta_conf
@@ -449,6 +450,64 @@ class TestMetadataProxyHandlerNewCache(TestMetadataProxyHandlerBase,
     fake_conf_fixture = NewCacheConfFixture(fake_conf)
 
 
+class TestMetadataProxyHandlerPortCache(TestMetadataProxyHandlerBase):
+
+    def setUp(self):
+        super(TestMetadataProxyHandlerPortCache, self).setUp()
+        self.fake_conf_fixture.config(metadata_port_push_cache=True)
+        rcache_p = mock.patch.object(agent.resource_cache,
+                                     'RemoteResourceCache')
+        self.rcache = rcache_p.start().return_value
+        self.ports = [
+            self._make_port('net1', 'router1',
+                            n_const.DEVICE_OWNER_ROUTER_INTF, '10.0.0.1'),
+            self._make_port('net1', 'vm1', 'compute:nova', '10.0.0.10'),
+            self._make_port('net2', 'vm2', 'compute:nova', '10.0.0.10')]
+
+        def get_resources(rtype, filters):
+            return [p for p in self.ports
+                    if all(getattr(p, k) in v for k, v in filters.items())]
+
+        self.rcache.get_resources.side_effect = get_resources
+
+    @staticmethod
+    def _make_port(network_id, device_id, device_owner, ip_address):
+        return mock.Mock(network_id=network_id, device_id=device_id,
+                         device_owner=device_owner,
+                         project_id='tenant-' + device_id,
+                         fixed_ips=[mock.Mock(ip_address=ip_address)])
+
+    def test_get_ports_network_id(self):
+        expected = [{'device_id': 'vm1', 'tenant_id': 'tenant-vm1',
+                     'network_id': 'net1'}]
+        for _ in range(2):
+            self.assertEqual(expected, self.handler._get_ports(
+                '10.0.0.10', network_id='net1'))
+        self.rcache.start_watcher.assert_called_once_with()
+        self.rcache.get_resources.assert_called_with(
+            resources.PORT, {'network_id': ('net1',)})
+        self.assertEqual({'hits': 1, 'misses': 1},
+                         self.handler.port_cache_stats)
+        self.handler.plugin_rpc.get_ports.assert_not_called()
+
+    def test_get_ports_router_id(self):
+        expected = [{'device_id': 'vm1', 'tenant_id': 'tenant-vm1',
+                     'network_id': 'net1'}]
+        for _ in range(2):
+            self.assertEqual(expected, self.handler._get_ports(
+                '10.0.0.10', router_id='router1'))
+        self.assertEqual({'hits': 1, 'misses': 1},
+                         self.handler.port_cache_stats)
+        self.handler.plugin_rpc.get_ports.assert_not_called()
+
+    def test_get_ports_skip_cache(self):
+        self.handler.plugin_rpc.get_ports.return_value = []
+        self.assertEqual([], self.handler._get_ports(
+            '10.0.0.10', network_id='net1', skip_cache=True))
+        self.rcache.get_resources.assert_not_called()
+        self.assertFalse(self.handler.port_cache_stats)
+
+
 class TestUnixDomainMetadataProxy(base.BaseTestCase):
     def setUp(self):
         super(TestUnixDomainMetadataProxy, self).setUp()
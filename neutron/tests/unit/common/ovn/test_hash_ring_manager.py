@@ -109,6 +109,64 @@ class TestHashRingManager(testlib_api.SqlTestCaseLight):
         # The ring should re-balance and as it was before
         self._verify_hashes(hash_dict_before)
 
+    def test_ring_rebuilt_only_on_membership_change(self):
+        node_1_uuid = db_hash_ring.add_node(
+            self.admin_ctx, HASH_RING_TEST_GROUP, 'node-1')
+        self.hash_ring_manager.refresh()
+        self.assertEqual(1, self.hash_ring_manager.stats['builds'])
+
+        # Touching the nodes doesn't change the membership of the ring
+        db_hash_ring.touch_nodes_from_host(
+            self.admin_ctx, HASH_RING_TEST_GROUP)
+        hash_ring = self.hash_ring_manager._hash_ring
+        with mock.patch.object(hash_ring, 'add_nodes') as mock_add, \
+                mock.patch.object(hash_ring, 'remove_node') as mock_remove:
+            self.hash_ring_manager.refresh()
+            mock_add.assert_not_called()
+            mock_remove.assert_not_called()
+        self.assertEqual(2, self.hash_ring_manager.stats['loads'])
+        self.assertEqual(1, self.hash_ring_manager.stats['builds'])
+        self.assertEqual(0, self.hash_ring_manager.stats['updates'])
+
+        # Only the new node is added to the existing ring
+        node_2_uuid = db_hash_ring.add_node(
+            self.admin_ctx, HASH_RING_TEST_GROUP, 'node-2')
+        self.hash_ring_manager.refresh()
+        self.assertIs(hash_ring, self.hash_ring_manager._hash_ring)
+        self.assertEqual({node_1_uuid, node_2_uuid},
+                         set(hash_ring.nodes))
+        self.assertEqual(1, self.hash_ring_manager.stats['builds'])
+        self.assertEqual(1, self.hash_ring_manager.stats['updates'])
+
+        self._verify_hashes({'fake-uuid': node_1_uuid,
+                             'fake-uuid-0': node_2_uuid})
+        self.assertEqual(2, self.hash_ring_manager.stats['lookups'])
+
+    def _get_node_at(self, seconds):
+        utcnow = timeutils.utcnow() + datetime.timedelta(seconds=seconds)
+        with mock.patch.object(timeutils, 'utcnow', return_value=utcnow):
+            self.hash_ring_manager.get_node('fake-uuid')
+
+    def test_nodes_loaded_only_on_marker_change(self):
+        db_hash_ring.add_node(self.admin_ctx, HASH_RING_TEST_GROUP, 'node-1')
+        # The service startup is over
+        self.hash_ring_manager._cache_startup_timeout = False
+        self.hash_ring_manager.refresh()
+        stats = self.hash_ring_manager.stats
+
+        # The cache expired but the nodes are unchanged
+        self._get_node_at(constants.HASH_RING_CACHE_TIMEOUT)
+        self.assertEqual(2, stats['checks'])
+        self.assertEqual(1, stats['loads'])
+
+        # A node is added in another worker before the cache expires
+        self.hash_ring_manager.refresh()
+        db_hash_ring.add_node(self.admin_ctx, HASH_RING_TEST_GROUP, 'node-2')
+        self._get_node_at(constants.HASH_RING_CACHE_TIMEOUT)
+        self.assertEqual(4, stats['checks'])
+        self.assertEqual(3, stats['loads'])
+        self.assertEqual(2, len(self.hash_ring_manager._hash_ring.nodes))
+
     def test__wait_startup_before_caching(self):
         db_hash_ring.add_node(self.admin_ctx, HASH_RING_TEST_GROUP, 'node-1')
         db_hash_ring.add_node(self.admin_ctx, HASH_RING_TEST_GROUP, 'node-2')
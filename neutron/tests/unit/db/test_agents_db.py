@@ -18,6 +18,7 @@ import copy
 import datetime
 
 import mock
+from neutron_lib.agent import constants as agent_consts
 from neutron_lib import constants
 from neutron_lib import context
 from neutron_lib.db import api as db_api
@@ -191,6 +192,45 @@ class TestAgentsDbMixin(TestAgentsDbBase):
         agent = self.plugin.get_agents(self.context)[0]
         self.assertFalse(agent['admin_state_up'])
 
+    def test_create_or_update_agent_heartbeat_only(self):
+        cfg.CONF.set_override('agent_full_update_interval', 600)
+        self.plugin.create_or_update_agent(self.context, self.agent_status,
+                                           timeutils.utcnow())
+        first = self.plugin.get_agents(self.context)[0]
+        with mock.patch.object(agent_obj.Agent, 'update') as update:
+            status, state = self.plugin.create_or_update_agent(
+                self.context, dict(self.agent_status), timeutils.utcnow())
+        update.assert_not_called()
+        self.assertEqual(agent_consts.AGENT_ALIVE, status)
+        self.assertTrue(state['admin_state_up'])
+        agent = self.plugin.get_agents(self.context)[0]
+        self.assertGreaterEqual(agent['heartbeat_timestamp'],
+                                first['heartbeat_timestamp'])
+        self.assertEqual({'full': 1, 'heartbeat_only': 1},
+                         dict(self.plugin.agent_report_stats))
+
+    def test_create_or_update_agent_heartbeat_only_config_changed(self):
+        cfg.CONF.set_override('agent_full_update_interval', 600)
+        self.plugin.create_or_update_agent(self.context, self.agent_status,
+                                           timeutils.utcnow())
+        status = dict(self.agent_status, configurations={'foo': 'bar'})
+        self.plugin.create_or_update_agent(self.context, status,
+                                           timeutils.utcnow())
+        agent = self.plugin.get_agents(self.context)[0]
+        self.assertEqual({'foo': 'bar'}, agent['configurations'])
+        self.assertEqual({'full': 2},
+                         dict(self.plugin.agent_report_stats))
+
+    def test_create_or_update_agent_heartbeat_only_agent_deleted(self):
+        cfg.CONF.set_override('agent_full_update_interval', 600)
+        self.plugin.create_or_update_agent(self.context, self.agent_status,
+                                           timeutils.utcnow())
+        agent_obj.Agent.delete_objects(self.context)
+        status, state = self.plugin.create_or_update_agent(
+            self.context, dict(self.agent_status), timeutils.utcnow())
+        self.assertEqual(agent_consts.AGENT_NEW, status)
+        self.assertEqual(1, len(self.plugin.get_agents(self.context)))
+
     def test_agent_health_check(self):
         agents = [{'agent_type': "DHCP Agent",
                    'heartbeat_timestamp': '2015-05-06 22:40:40.432295',
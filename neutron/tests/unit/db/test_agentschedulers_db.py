@@ -796,6 +796,81 @@ class OvsAgentSchedulerTestCase(OvsAgentSchedulerTestCaseBase):
             ret_b = l3_rpc_cb.get_router_ids(self.adminContext, host=L3_HOSTB)
         self.assertEqual(ret_b, ret_a)
 
+    def test_router_reschedule_from_dead_agent_batched(self):
+        cfg.CONF.set_override('agent_reschedule_batch_size', 10)
+        plugin = directory.get_plugin(plugin_constants.L3)
+        l3_notifier = mock.Mock()
+        mock.patch.dict(plugin.agent_notifiers,
+                        {constants.AGENT_TYPE_L3: l3_notifier}).start()
+        with self.router() as r1, self.router() as r2:
+            l3_rpc_cb = l3_rpc.L3RpcCallback()
+            self._register_agent_states()
+
+            # schedule the routers to host A
+            ret_a = l3_rpc_cb.get_router_ids(self.adminContext, host=L3_HOSTA)
+            with mock.patch.object(plugin, 'reschedule_router') as rr:
+                self._take_down_agent_and_run_reschedule(L3_HOSTA)
+            rr.assert_not_called()
+
+            # B should now pick up both routers, notified at once
+            ret_b = l3_rpc_cb.get_router_ids(self.adminContext, host=L3_HOSTB)
+        self.assertEqual(sorted(ret_a), sorted(ret_b))
+        l3_notifier.router_added_to_agent.assert_called_once_with(
+            mock.ANY, mock.ANY, L3_HOSTB)
+        self.assertEqual(
+            sorted([r1['router']['id'], r2['router']['id']]),
+            sorted(l3_notifier.router_added_to_agent.call_args[0][1]))
+
+    def test_router_reschedule_from_dead_agent_batched_unexpected_error(
+            self):
+        cfg.CONF.set_override('agent_reschedule_batch_size', 10)
+        plugin = directory.get_plugin(plugin_constants.L3)
+        l3_notifier = mock.Mock()
+        mock.patch.dict(plugin.agent_notifiers,
+                        {constants.AGENT_TYPE_L3: l3_notifier}).start()
+        schedule_router = plugin.schedule_router
+        with self.router() as r1, self.router() as r2:
+            l3_rpc_cb = l3_rpc.L3RpcCallback()
+            self._register_agent_states()
+            l3_rpc_cb.get_router_ids(self.adminContext, host=L3_HOSTA)
+
+            def _schedule_router(context, router_id, *args, **kwargs):
+                if router_id == r1['router']['id']:
+                    raise ValueError()
+                return schedule_router(context, router_id, *args, **kwargs)
+
+            with mock.patch.object(plugin, 'schedule_router',
+                                   side_effect=_schedule_router):
+                self._take_down_agent_and_run_reschedule(L3_HOSTA)
+
+            # the other router of the batch is rescheduled and notified
+            ret_b = l3_rpc_cb.get_router_ids(self.adminContext, host=L3_HOSTB)
+        self.assertEqual([r2['router']['id']], ret_b)
+        l3_notifier.router_added_to_agent.assert_called_once_with(
+            mock.ANY, [r2['router']['id']], L3_HOSTB)
+
+    def test_router_reschedule_from_dead_agent_batched_removal_error(self):
+        cfg.CONF.set_override('agent_reschedule_batch_size', 10)
+        plugin = directory.get_plugin(plugin_constants.L3)
+        l3_notifier = mock.Mock()
+        l3_notifier.router_removed_from_agent.side_effect = (
+            oslo_messaging.MessagingTimeout)
+        mock.patch.dict(plugin.agent_notifiers,
+                        {constants.AGENT_TYPE_L3: l3_notifier}).start()
+        with self.router(), self.router():
+            l3_rpc_cb = l3_rpc.L3RpcCallback()
+            self._register_agent_states()
+
+            # schedule the routers to host A
+            l3_rpc_cb.get_router_ids(self.adminContext, host=L3_HOSTA)
+            self._take_down_agent_and_run_reschedule(L3_HOSTA)
+
+        # both removals were attempted and B was still notified
+        self.assertEqual(
+            2, l3_notifier.router_removed_from_agent.call_count)
+        l3_notifier.router_added_to_agent.assert_called_once_with(
+            mock.ANY, mock.ANY, L3_HOSTB)
+
     def test_router_no_reschedule_from_dead_admin_down_agent(self):
         with self.router() as r:
             l3_rpc_cb = l3_rpc.L3RpcCallback()
@@ -25,6 +25,7 @@ from neutron_lib.exceptions import l3 as l3_exc
 from neutron_lib.plugins import constants as plugin_constants
 from neutron_lib.plugins import directory
 from neutron_lib.plugins import utils as plugin_utils
+from oslo_config import cfg
 from oslo_utils import uuidutils
 import testtools
 
@@ -35,6 +36,7 @@ from neutron.objects import network as network_obj
 from neutron.objects import ports as port_obj
 from neutron.objects import router as l3_obj
 from neutron.objects import subnet as subnet_obj
+from neutron.services.revisions import revision_plugin
 from neutron.tests import base
 from neutron.tests.unit.db import test_db_base_plugin_v2
 
@@ -527,3 +529,88 @@ class L3TestCase(test_db_base_plugin_v2.NeutronDbPluginV2TestCase):
         mock_log.warning.assert_called_once_with(self.GET_PORTS_BY_ROUTER_MSG,
                                                  msg_vars)
         self._check_routerports((False, True))
+
+    def _get_sync_data_with_cache(self):
+        with mock.patch.object(self.mixin, '_get_sync_data',
+                               wraps=self.mixin._get_sync_data) as build:
+            routers = self.mixin.get_sync_data(self.ctx, [self.router['id']])
+        return routers, build.call_count
+
+    def test_get_sync_data_cached(self):
+        cfg.CONF.set_override('router_sync_cache_ttl', 60)
+        self._add_router_interfaces()
+        routers, built = self._get_sync_data_with_cache()
+        self.assertEqual(1, built)
+        cached_routers, built = self._get_sync_data_with_cache()
+        self.assertEqual(0, built)
+        self.assertEqual(routers, cached_routers)
+        self.assertEqual(2, len(cached_routers[0][n_const.INTERFACE_KEY]))
+        # the payloads served are copies of the cached one
+        cached_routers[0][n_const.INTERFACE_KEY].pop()
+        routers, built = self._get_sync_data_with_cache()
+        self.assertEqual(2, len(routers[0][n_const.INTERFACE_KEY]))
+        self.assertEqual({'hits': 2, 'misses': 1},
+                         dict(self.mixin.router_sync_cache.stats))
+
+    def test_get_sync_data_cache_invalidated_by_port_update(self):
+        cfg.CONF.set_override('router_sync_cache_ttl', 60)
+        self._add_router_interfaces()
+        self._get_sync_data_with_cache()
+        self.core_plugin.update_port(
+            self.ctx, self.ports[0]['port']['id'],
+            {'port': {'name': 'new-name'}})
+        routers, built = self._get_sync_data_with_cache()
+        self.assertEqual(1, built)
+        self.assertIn('new-name', [port['name'] for port in
+                                   routers[0][n_const.INTERFACE_KEY]])
+
+    def test_get_sync_data_cache_invalidated_by_subnet_update(self):
+        cfg.CONF.set_override('router_sync_cache_ttl', 60)
+        self._add_router_interfaces()
+        self._get_sync_data_with_cache()
+        self.core_plugin.update_subnet(
+            self.ctx, self.subnets[0]['subnet']['id'],
+            {'subnet': {'dns_nameservers': ['8.8.8.8']}})
+        routers, built = self._get_sync_data_with_cache()
+        self.assertEqual(1, built)
+
+    def _test_get_sync_data_cache_changed_by_other_process(self, change):
+        revision_plugin.RevisionPlugin()
+        cfg.CONF.set_override('router_sync_cache_ttl', 60)
+        self._add_router_interfaces()
+        self._get_sync_data_with_cache()
+        # the events of the changes made by another server process are not
+        # seen by this one
+        with mock.patch.object(self.mixin.router_sync_cache, 'invalidate'):
+            change()
+        return self._get_sync_data_with_cache()
+
+    def test_get_sync_data_cache_port_updated_by_other_process(self):
+        routers, built = (
+            self._test_get_sync_data_cache_changed_by_other_process(
+                lambda: self.core_plugin.update_port(
+                    self.ctx, self.ports[0]['port']['id'],
+                    {'port': {'name': 'new-name'}})))
+        self.assertEqual(1, built)
+        self.assertIn('new-name', [port['name'] for port in
+                                   routers[0][n_const.INTERFACE_KEY]])
+
+    def test_get_sync_data_cache_subnet_updated_by_other_process(self):
+        _routers, built = (
+            self._test_get_sync_data_cache_changed_by_other_process(
+                lambda: self.core_plugin.update_subnet(
+                    self.ctx, self.subnets[0]['subnet']['id'],
+                    {'subnet': {'dns_nameservers': ['8.8.8.8']}})))
+        self.assertEqual(1, built)
+
+    def test_get_sync_data_cache_unchanged_by_other_process(self):
+        _routers, built = (
+            self._test_get_sync_data_cache_changed_by_other_process(
+                lambda: None))
+        self.assertEqual(0, built)
+
+    def test_get_sync_data_no_cache(self):
+        self._add_router_interfaces()
+        self.assertIsNone(self.mixin.router_sync_cache)
+        self.assertEqual(1, self._get_sync_data_with_cache()[1])
+        self.assertEqual(1, self._get_sync_data_with_cache()[1])
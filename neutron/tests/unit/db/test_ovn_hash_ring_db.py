@@ -136,6 +136,45 @@ class TestHashRing(testlib_api.SqlTestCaseLight):
         self.assertEqual(1, len(active_nodes))
         self.assertEqual(another_host_node, active_nodes[0].node_uuid)
 
+    def test_active_node_uuids(self):
+        nodes = self._add_nodes_and_assert_exists(count=2)
+        self._add_nodes_and_assert_exists(group_name='another-group')
+
+        self.assertEqual(set(nodes), ovn_hash_ring_db.get_active_node_uuids(
+            self.admin_ctx, interval=60, group_name=HASH_RING_TEST_GROUP))
+
+        # Substract 60 seconds from utcnow() and touch the nodes
+        fake_utcnow = timeutils.utcnow() - datetime.timedelta(seconds=60)
+        with mock.patch.object(timeutils, 'utcnow') as mock_utcnow:
+            mock_utcnow.return_value = fake_utcnow
+            ovn_hash_ring_db.touch_node(self.admin_ctx, nodes[0])
+
+        self.assertEqual({nodes[1]}, ovn_hash_ring_db.get_active_node_uuids(
+            self.admin_ctx, interval=60, group_name=HASH_RING_TEST_GROUP))
+
+    def test_active_nodes_marker(self):
+        self.assertEqual((0, None), ovn_hash_ring_db.get_active_nodes_marker(
+            self.admin_ctx, interval=60, group_name=HASH_RING_TEST_GROUP))
+        nodes = self._add_nodes_and_assert_exists(count=2)
+        self._add_nodes_and_assert_exists(group_name='another-group')
+        marker = ovn_hash_ring_db.get_active_nodes_marker(
+            self.admin_ctx, interval=60, group_name=HASH_RING_TEST_GROUP)
+        self.assertEqual(2, marker[0])
+
+        # Touching the nodes doesn't change the marker
+        ovn_hash_ring_db.touch_nodes_from_host(self.admin_ctx,
+                                               HASH_RING_TEST_GROUP)
+        self.assertEqual(marker, ovn_hash_ring_db.get_active_nodes_marker(
+            self.admin_ctx, interval=60, group_name=HASH_RING_TEST_GROUP))
+
+        # Substract 60 seconds from utcnow() and touch a node
+        fake_utcnow = timeutils.utcnow() - datetime.timedelta(seconds=60)
+        with mock.patch.object(timeutils, 'utcnow') as mock_utcnow:
+            mock_utcnow.return_value = fake_utcnow
+            ovn_hash_ring_db.touch_node(self.admin_ctx, nodes[0])
+        self.assertEqual(1, ovn_hash_ring_db.get_active_nodes_marker(
+            self.admin_ctx, interval=60, group_name=HASH_RING_TEST_GROUP)[0])
+
     def test_active_nodes_from_host(self):
         self._add_nodes_and_assert_exists(count=3)
 
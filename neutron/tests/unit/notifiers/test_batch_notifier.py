@@ -75,3 +75,37 @@ class TestBatchNotifier(base.BaseTestCase):
         expected = ['Event %s' % i for i in range(events)]
         # Check the events have been handled in the same input order.
         self.assertEqual(expected, list(self._received_events.queue))
+
+    def test_notify_coalesce_events(self):
+        self.notifier.event_key = lambda event: event[0]
+        for event in (('a', 1), ('b', 1), ('a', 2), ('c', 1), ('b', 2)):
+            self.notifier._pending_events.put(event)
+        self.notifier._notify()
+        # The last event of each key is kept, in the order they were queued
+        self.assertEqual([('a', 2), ('c', 1), ('b', 2)],
+                         list(self._received_events.queue))
+        self.assertEqual(2, self.notifier.stats['coalesced'])
+        self.assertEqual(3, self.notifier.stats['sent'])
+
+    def test_notify_max_batch_size(self):
+        callback = mock.Mock()
+        self.notifier = batch_notifier.BatchNotifier(2, callback,
+                                                     max_batch_size=2)
+        for i in range(5):
+            self.notifier._pending_events.put(i)
+        self.notifier._notify()
+        callback.assert_has_calls([mock.call([0, 1]), mock.call([2, 3]),
+                                   mock.call([4])])
+        self.assertEqual(3, self.notifier.stats['batches'])
+        self.assertEqual(5, self.notifier.stats['sent'])
+
+    def test_get_batch_interval(self):
+        self.assertEqual(2, self.notifier._get_batch_interval())
+        self.notifier.max_batch_size = 4
+        self.assertEqual(2, self.notifier._get_batch_interval())
+        for i in range(2):
+            self.notifier._pending_events.put(i)
+        self.assertEqual(1, self.notifier._get_batch_interval())
+        for i in range(3):
+            self.notifier._pending_events.put(i)
+        self.assertEqual(0, self.notifier._get_batch_interval())
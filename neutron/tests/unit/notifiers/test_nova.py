@@ -369,3 +369,21 @@ class TestNovaNotify(base.BaseTestCase):
         self.assertEqual(
             expected_event,
             self.nova_notifier.batch_notifier._pending_events.get())
+
+    def test_batch_notifier_coalesce_events(self):
+        cfg.CONF.set_override('send_events_coalesce', True)
+        cfg.CONF.set_override('send_events_max_batch_size', 10)
+        notifier = nova.Notifier()
+        self.assertEqual(10, notifier.batch_notifier.max_batch_size)
+        device_id = '32102d7b-1cf4-404d-b50a-97aae1f55f87'
+        events = [{'server_uuid': device_id, 'name': nova.VIF_PLUGGED,
+                   'status': status, 'tag': self.port_uuid}
+                  for status in ('failed', 'completed')]
+        events.insert(1, {'name': 'network-changed',
+                          'server_uuid': device_id, 'tag': self.port_uuid})
+        for event in events:
+            notifier.batch_notifier._pending_events.put(event)
+        with mock.patch.object(notifier, 'send_events') as send_events:
+            notifier.batch_notifier.callback = send_events
+            notifier.batch_notifier._notify()
+        send_events.assert_called_once_with(events[1:])
@@ -12,6 +12,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import datetime
+
 import netaddr
 from neutron_lib.api.definitions import portbindings
 from neutron_lib import constants
@@ -27,6 +29,7 @@ from neutron.objects import ports as port_obj
 from neutron.objects import router as l3_objs
 from neutron.plugins.ml2.drivers.l2pop import db as l2pop_db
 from neutron.plugins.ml2 import models
+from neutron.services.revisions import revision_plugin
 from neutron.tests.common import helpers
 from neutron.tests.unit import testlib_api
 
@@ -180,6 +183,43 @@ class TestL2PopulationDBTestCase(testlib_api.SqlTestCase):
             self.ctx, TEST_NETWORK_ID)
         self.assertEqual(0, len(fdb_network_ports))
 
+    def test_get_network_ports_marker(self):
+        revision_plugin.RevisionPlugin()
+        self.assertEqual(
+            (0, 0, None),
+            l2pop_db.get_network_ports_marker(self.ctx, TEST_NETWORK_ID))
+        self._setup_port_binding()
+        marker = l2pop_db.get_network_ports_marker(self.ctx, TEST_NETWORK_ID)
+        self.assertEqual(1, marker[0])
+
+        port = port_obj.Port.get_objects(
+            self.ctx, network_id=TEST_NETWORK_ID)[0]
+        port.status = constants.PORT_STATUS_DOWN
+        port.update()
+        self.assertNotEqual(
+            marker,
+            l2pop_db.get_network_ports_marker(self.ctx, TEST_NETWORK_ID))
+
+    def test_get_network_ports_revisions(self):
+        revision_plugin.RevisionPlugin()
+        self._setup_port_binding()
+        rows = l2pop_db.get_network_ports_revisions(self.ctx, TEST_NETWORK_ID)
+        self.assertEqual(1, len(rows))
+        port_id, __, revision, __, __, updated_at = rows[0]
+        self.assertEqual(
+            [], l2pop_db.get_network_ports_revisions(
+                self.ctx, TEST_NETWORK_ID,
+                changed_since=updated_at + datetime.timedelta(seconds=1)))
+
+        port = port_obj.Port.get_object(self.ctx, id=port_id)
+        port.status = constants.PORT_STATUS_DOWN
+        port.update()
+        rows = l2pop_db.get_network_ports_revisions(
+            self.ctx, TEST_NETWORK_ID, changed_since=updated_at)
+        self.assertEqual(port_id, rows[0][0])
+        self.assertGreater(rows[0][2], revision)
+        self.assertEqual(constants.PORT_STATUS_DOWN, rows[0][4])
+
     def test__get_ha_router_interface_ids_with_ha_dvr_snat_port(self):
         helpers.register_dhcp_agent()
         helpers.register_l3_agent()
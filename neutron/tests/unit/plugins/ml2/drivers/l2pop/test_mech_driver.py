@@ -24,6 +24,7 @@ from neutron_lib import context
 from neutron_lib import exceptions
 from neutron_lib.plugins import constants as plugin_constants
 from neutron_lib.plugins import directory
+from oslo_config import cfg
 from oslo_serialization import jsonutils
 import testtools
 
@@ -32,6 +33,7 @@ from neutron.db import l3_agentschedulers_db
 from neutron.db import l3_hamode_db
 from neutron.plugins.ml2 import driver_context
 from neutron.plugins.ml2.drivers.l2pop import db as l2pop_db
+from neutron.plugins.ml2.drivers.l2pop import fdb_cache
 from neutron.plugins.ml2.drivers.l2pop import mech_driver as l2pop_mech_driver
 from neutron.plugins.ml2.drivers.l2pop import rpc as l2pop_rpc
 from neutron.plugins.ml2.drivers.l2pop.rpc_manager import l2population_rpc
@@ -39,6 +41,7 @@ from neutron.plugins.ml2 import managers
 from neutron.plugins.ml2 import models
 from neutron.plugins.ml2 import rpc
 from neutron.scheduler import l3_agent_scheduler
+from neutron.services.revisions import revision_plugin
 from neutron.tests import base
 from neutron.tests.common import helpers
 from neutron.tests.unit.plugins.ml2 import test_plugin
@@ -1373,6 +1376,15 @@ class TestL2PopulationRpcTestCase(test_plugin.Ml2PluginV2TestCase):
             l2pop_mech.L2populationAgentNotify.update_fdb_entries.called)
 
 
+class TestL2PopulationRpcTestCaseFdbCache(TestL2PopulationRpcTestCase):
+
+    def setUp(self):
+        cfg.CONF.set_override('fdb_cache_ttl', 3600, group='l2pop')
+        super(TestL2PopulationRpcTestCaseFdbCache, self).setUp()
+        # the port revision numbers the cached views are checked against
+        revision_plugin.RevisionPlugin()
+
+
 class TestL2PopulationMechDriver(base.BaseTestCase):
 
     def _test_get_tunnels(self, agent_ip, exclude_host=True):
@@ -1511,3 +1523,144 @@ class TestL2PopulationMechDriver(base.BaseTestCase):
         mech_driver = l2pop_mech_driver.L2populationMechanismDriver()
         with testtools.ExpectedException(exceptions.InvalidInput):
             mech_driver.update_port_precommit(ctx)
+
+    @staticmethod
+    def _get_port_revisions(*port_ids, **kwargs):
+        revision = kwargs.get('revision', 0)
+        rows = [('ha_port', 1, 0, constants.DEVICE_OWNER_HA_REPLICATED_INT,
+                 constants.PORT_STATUS_ACTIVE, None)]
+        rows += [(port_id, i + 2, revision, 'compute:nova',
+                  constants.PORT_STATUS_ACTIVE, None)
+                 for i, port_id in enumerate(port_ids)]
+        return rows
+
+    def _create_agent_fdb_cached(self, mech_driver, agent, fdb_network_ports,
+                                 agent_ips, port_revisions):
+        dvr_network_ports, dvr_agent = (
+            self._mock_network_ports(HOST + '1', [None]))
+        ha_network_ports, ha_agent = (
+            self._mock_network_ports(HOST + '4', [None]))
+        agent_ips = dict(agent_ips)
+        agent_ips[dvr_agent] = '10.0.0.1'
+        agent_ips[ha_agent] = '10.0.0.4'
+        segment = {'segmentation_id': 1, 'network_type': 'vxlan'}
+        marker = (len(port_revisions),
+                  sum(row[2] for row in port_revisions),
+                  max((row[1] for row in port_revisions), default=None))
+
+        with mock.patch.object(l2pop_db, 'get_agent_ip',
+                               side_effect=agent_ips.get),\
+                mock.patch.object(l2pop_db, 'get_network_ports_marker',
+                                  return_value=marker),\
+                mock.patch.object(l2pop_db, 'get_network_ports_revisions',
+                                  return_value=port_revisions),\
+                mock.patch.object(l2pop_db,
+                                  'get_nondistributed_active_network_ports',
+                                  return_value=fdb_network_ports) as get_nd,\
+                mock.patch.object(l2pop_db, 'get_dvr_active_network_ports',
+                                  return_value=dvr_network_ports) as get_dvr,\
+                mock.patch.object(l2pop_db, 'get_ha_active_network_ports',
+                                  return_value=ha_network_ports) as get_ha:
+            result = mech_driver._create_agent_fdb(context, agent, segment,
+                                                   'network_id')
+        return result['network_id']['ports'], {
+            'nondistributed': get_nd, 'dvr': get_dvr, 'ha': get_ha}
+
+    def _get_cached_mech_driver(self):
+        mech_driver = l2pop_mech_driver.L2populationMechanismDriver()
+        mech_driver.fdb_cache = fdb_cache.NetworkFdbCache(
+            3600, mech_driver._get_port_fdb_entries)
+        agent = mock.Mock()
+        agent.host = HOST
+        return mech_driver, agent
+
+    @staticmethod
+    def _get_fdb_binding(port_id, ip_address):
+        binding = mock.Mock(port_id=port_id)
+        binding.port = {'mac_address': '00:00:DE:AD:BE:EF',
+                        'fixed_ips': [{'ip_address': ip_address}]}
+        return binding
+
+    def test_create_agent_fdb_cached(self):
+        fdb_network_ports, fdb_agent = self._mock_network_ports(
+            HOST + '2', [self._get_fdb_binding('port1', '1.1.1.1')])
+        mech_driver, agent = self._get_cached_mech_driver()
+        port_revisions = self._get_port_revisions('port1')
+
+        first, queries = self._create_agent_fdb_cached(
+            mech_driver, agent, fdb_network_ports, {fdb_agent: '20.0.0.1'},
+            port_revisions)
+        queries['nondistributed'].assert_called_once_with(
+            context, 'network_id', port_ids=None)
+        second, queries = self._create_agent_fdb_cached(
+            mech_driver, agent, fdb_network_ports, {fdb_agent: '20.0.0.1'},
+            port_revisions)
+        queries['nondistributed'].assert_not_called()
+        queries['dvr'].assert_not_called()
+        self.assertEqual(first, second)
+        expected_ports = {'10.0.0.1': [constants.FLOODING_ENTRY],
+                          '10.0.0.4': [constants.FLOODING_ENTRY],
+                          '20.0.0.1': [constants.FLOODING_ENTRY,
+                                       l2pop_rpc.PortInfo(
+                                           mac_address='00:00:DE:AD:BE:EF',
+                                           ip_address='1.1.1.1')]}
+        self.assertEqual(expected_ports, second)
+        self.assertEqual({'hits': 1, 'misses': 1},
+                         dict(mech_driver.fdb_cache.stats))
+
+    def test_create_agent_fdb_cached_ports_changed(self):
+        mech_driver, agent = self._get_cached_mech_driver()
+        self._create_agent_fdb_cached(mech_driver, agent, [], {},
+                                      self._get_port_revisions('port1'))
+
+        # The port came up, possibly through another server process, only
+        # this port is read again
+        fdb_network_ports, fdb_agent = self._mock_network_ports(
+            HOST + '2', [self._get_fdb_binding('port1', '1.1.1.1')])
+        ports, queries = self._create_agent_fdb_cached(
+            mech_driver, agent, fdb_network_ports, {fdb_agent: '20.0.0.1'},
+            self._get_port_revisions('port1', revision=1))
+        queries['nondistributed'].assert_called_once_with(
+            context, 'network_id', port_ids={'port1'})
+        queries['dvr'].assert_not_called()
+        self.assertIn('20.0.0.1', ports)
+        self.assertEqual({'refreshes': 1, 'misses': 1},
+                         dict(mech_driver.fdb_cache.stats))
+
+    def test_create_agent_fdb_cached_ports_deleted(self):
+        mech_driver, agent = self._get_cached_mech_driver()
+        self._create_agent_fdb_cached(
+            mech_driver, agent, [], {},
+            self._get_port_revisions('port1', 'port2'))
+
+        # A port deleted by another server process rebuilds the view
+        __, queries = self._create_agent_fdb_cached(
+            mech_driver, agent, [], {}, self._get_port_revisions('port1'))
+        queries['nondistributed'].assert_called_once_with(
+            context, 'network_id', port_ids=None)
+        self.assertEqual({'changed': 1, 'misses': 2},
+                         dict(mech_driver.fdb_cache.stats))
+
+        # A port deleted through this process is removed from the view
+        mech_driver.fdb_cache.remove_port('network_id', 'port1')
+        __, queries = self._create_agent_fdb_cached(
+            mech_driver, agent, [], {}, self._get_port_revisions())
+        queries['nondistributed'].assert_not_called()
+        self.assertEqual(1, mech_driver.fdb_cache.stats['hits'])
+
+    def test_create_agent_fdb_cached_without_ha_ports(self):
+        mech_driver, agent = self._get_cached_mech_driver()
+        ports, queries = self._create_agent_fdb_cached(
+            mech_driver, agent, [], {}, self._get_port_revisions()[1:])
+        queries['ha'].assert_not_called()
+        self.assertEqual({'10.0.0.1'}, set(ports))
+
+    def test_create_agent_fdb_cached_agent_without_ip(self):
+        fdb_network_ports, __ = self._mock_network_ports(
+            HOST + '2', [self._get_fdb_binding('port1', '1.1.1.1')])
+        mech_driver, agent = self._get_cached_mech_driver()
+        ports, __ = self._create_agent_fdb_cached(
+            mech_driver, agent, fdb_network_ports, {},
+            self._get_port_revisions('port1'))
+        self.assertNotIn(None, ports)
+        self.assertEqual({'10.0.0.1', '10.0.0.4'}, set(ports))
@@ -152,6 +152,47 @@ class QosOVSAgentDriverTestCase(ovs_test_base.OVSAgentConfigTestBase):
         self.create_egress.assert_not_called()
         self.update_ingress.assert_not_called()
 
+    def test_update_ports(self):
+        port2 = self._create_fake_port(self.qos_policy.id)
+        port2['vif_port'] = mock.Mock(port_name='fakeport2', ofport=112)
+        port3 = self._create_fake_port(self.qos_policy.id)
+        port3.pop('vif_port')
+        self.qos_driver.update_ports([self.port, port2, port3],
+                                     self.qos_policy, self.qos_policy)
+        limits = {
+            'fakeport': (self.rules[0].max_kbps,
+                         self.rules[0].max_burst_kbps),
+            'fakeport2': (self.rules[0].max_kbps,
+                          self.rules[0].max_burst_kbps)}
+        self.qos_driver.br_int.set_egress_bw_limit_for_ports.\
+            assert_called_once_with(limits)
+        self.qos_driver.br_int.update_ingress_bw_limit_for_ports.\
+            assert_called_once_with(limits)
+        self.create_egress.assert_not_called()
+        self.update_ingress.assert_not_called()
+        self.delete_egress.assert_not_called()
+        self.delete_ingress.assert_not_called()
+        self.assertEqual(
+            2, self.qos_driver.br_int.install_dscp_marking_rule.call_count)
+        self.assertEqual(
+            port2, self.qos_driver.ports[port2['port_id']][
+                (qos_consts.RULE_TYPE_BANDWIDTH_LIMIT,
+                 constants.INGRESS_DIRECTION)])
+
+    def test_update_ports_removed_rules(self):
+        qos_policy = self._create_qos_policy_obj([self.rules[0]])
+        self.port['qos_policy_id'] = qos_policy.id
+        self.qos_driver.update_ports([self.port], qos_policy,
+                                     self.qos_policy)
+        self.qos_driver.br_int.set_egress_bw_limit_for_ports.\
+            assert_called_once_with(
+                {'fakeport': (self.rules[0].max_kbps,
+                              self.rules[0].max_burst_kbps)})
+        self.qos_driver.br_int.update_ingress_bw_limit_for_ports.\
+            assert_not_called()
+        self.delete_egress.assert_not_called()
+        self.delete_ingress.assert_called_once_with(self.port_name)
+
     def _test_delete_rules(self, qos_policy):
         self.qos_driver.br_int.get_ingress_bw_limit_for_port = mock.Mock(
             return_value=(self.rules[1].max_kbps,
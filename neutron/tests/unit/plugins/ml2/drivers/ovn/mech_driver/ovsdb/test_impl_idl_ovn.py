@@ -16,6 +16,8 @@ import copy
 import uuid
 
 import mock
+from ovsdbapp.backend.ovs_idl import idlutils
+from ovsdbapp.backend.ovs_idl import transaction as idl_trans
 
 from neutron.common.ovn import constants as ovn_const
 from neutron.common.ovn import utils
@@ -412,6 +414,24 @@ class TestNBImplIdlOvn(TestDBImplIdlOvn):
         inst = impl_idl_ovn.OvsdbNbOvnIdl(mock.Mock())
         inst.idl._session.reconnect.set_probe_interval.assert_called_with(5000)
 
+    @mock.patch.object(impl_idl_ovn.OvsdbNbOvnIdl, 'ovsdb_connection', None)
+    @mock.patch.object(impl_idl_ovn, 'get_connection', mock.Mock())
+    def test_create_transaction_without_coalescer(self):
+        inst = impl_idl_ovn.OvsdbNbOvnIdl(mock.Mock())
+        self.assertIsNone(inst.txn_coalescer)
+        txn = inst.create_transaction()
+        self.assertEqual(inst.ovsdb_connection, txn.ovsdb_connection)
+
+    @mock.patch.object(impl_idl_ovn.OvsdbNbOvnIdl, 'ovsdb_connection', None)
+    @mock.patch.object(impl_idl_ovn, 'get_connection', mock.Mock())
+    @mock.patch.object(ovn_conf, 'get_ovn_ovsdb_txn_coalesce_window')
+    def test_create_transaction_with_coalescer(self, mock_get_window):
+        mock_get_window.return_value = 20
+        inst = impl_idl_ovn.OvsdbNbOvnIdl(mock.Mock())
+        self.assertEqual(0.02, inst.txn_coalescer.window)
+        txn = inst.create_transaction()
+        self.assertEqual(inst.txn_coalescer, txn.ovsdb_connection)
+
     def test_get_all_logical_switches_with_ports(self):
         # Test empty
         mapping = self.nb_ovn_idl.get_all_logical_switches_with_ports()
@@ -776,6 +796,94 @@ class TestNBImplIdlOvn(TestDBImplIdlOvn):
         self.assertEqual({}, port_groups)
 
 
+class TestOvnNbTransactionCoalescer(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestOvnNbTransactionCoalescer, self).setUp()
+        self.api = mock.Mock()
+        self.api.ovsdb_connection.timeout = 10
+        self.coalescer = impl_idl_ovn.OvnNbTransactionCoalescer(self.api,
+                                                                0.01)
+        self.mock_sleep = mock.patch.object(impl_idl_ovn.time,
+                                            'sleep').start()
+
+    def _make_txn(self, num_commands, bump_nb_cfg=False):
+        txn = impl_idl_ovn.OvnNbTransaction(self.api, self.coalescer,
+                                            bump_nb_cfg=bump_nb_cfg)
+        for _ in range(num_commands):
+            txn.add(mock.Mock())
+        return txn
+
+    def test_queue_txn_single(self):
+        txn = self._make_txn(2)
+        self.coalescer.queue_txn(txn)
+        self.mock_sleep.assert_called_once_with(0.01)
+        self.api.ovsdb_connection.queue_txn.assert_called_once_with(txn)
+        self.assertEqual({'transactions': 1, 'commits': 1},
+                         dict(self.coalescer.stats))
+
+    def test_queue_txn_coalesced(self):
+        txn1 = self._make_txn(1)
+        txn2 = self._make_txn(2, bump_nb_cfg=True)
+        # Another request commits its transaction during the window
+        self.mock_sleep.side_effect = lambda _: self.coalescer.queue_txn(
+            txn2)
+        self.coalescer.queue_txn(txn1)
+
+        self.mock_sleep.assert_called_once_with(0.01)
+        self.api.ovsdb_connection.queue_txn.assert_called_once_with(mock.ANY)
+        coalesced = self.api.ovsdb_connection.queue_txn.call_args[0][0]
+        self.assertIsInstance(coalesced,
+                              impl_idl_ovn.OvnNbCoalescedTransaction)
+        self.assertEqual([txn1, txn2], coalesced.transactions)
+        self.assertEqual(txn1.commands + txn2.commands, coalesced.commands)
+        self.assertTrue(coalesced.bump_nb_cfg)
+        self.assertEqual({'transactions': 2, 'commits': 1},
+                         dict(self.coalescer.stats))
+
+    def test_queue_txn_connection_error(self):
+        txn = self._make_txn(1)
+        self.api.ovsdb_connection.queue_txn.side_effect = RuntimeError
+        self.coalescer.queue_txn(txn)
+        result = txn.results.get_nowait()
+        self.assertIsInstance(result, idlutils.ExceptionResult)
+        self.assertIsInstance(result.ex, RuntimeError)
+
+    @mock.patch.object(idl_trans.Transaction, 'do_commit', autospec=True)
+    def test_coalesced_do_commit(self, mock_do_commit):
+        txn1 = self._make_txn(1)
+        txn2 = self._make_txn(2)
+        coalesced = impl_idl_ovn.OvnNbCoalescedTransaction(
+            self.api, self.api.ovsdb_connection, 10, [txn1, txn2])
+        mock_do_commit.return_value = ['res1', 'res2', 'res3']
+
+        self.assertEqual(['res1', 'res2', 'res3'], coalesced.do_commit())
+        mock_do_commit.assert_called_once_with(coalesced)
+        self.assertEqual(['res1'], txn1.results.get_nowait())
+        self.assertEqual(['res2', 'res3'], txn2.results.get_nowait())
+
+    @mock.patch.object(idl_trans.Transaction, 'do_commit', autospec=True)
+    def test_coalesced_do_commit_failure(self, mock_do_commit):
+        txn1 = self._make_txn(1)
+        txn2 = self._make_txn(1)
+        coalesced = impl_idl_ovn.OvnNbCoalescedTransaction(
+            self.api, self.api.ovsdb_connection, 10, [txn1, txn2])
+
+        def do_commit(txn):
+            if txn is txn1:
+                return ['res1']
+            raise RuntimeError('OVSDB Error')
+
+        mock_do_commit.side_effect = do_commit
+        self.assertIsNone(coalesced.do_commit())
+        mock_do_commit.assert_has_calls([mock.call(coalesced),
+                                         mock.call(txn1), mock.call(txn2)])
+        self.assertEqual(['res1'], txn1.results.get_nowait())
+        result = txn2.results.get_nowait()
+        self.assertIsInstance(result, idlutils.ExceptionResult)
+        self.assertEqual('OVSDB Error', str(result.ex))
+
+
 class TestSBImplIdlOvn(TestDBImplIdlOvn):
 
     fake_set = {
@@ -100,6 +100,63 @@ class TestDBInconsistenciesPeriodics(testlib_api.SqlTestCaseLight,
         self.periodic.check_for_inconsistencies()
         mock_fix_net.assert_called_once_with(mock.ANY, fake_row)
 
+    @mock.patch.object(maintenance.DBInconsistenciesPeriodics,
+                       '_fix_create_update_subnet')
+    @mock.patch.object(maintenance.DBInconsistenciesPeriodics,
+                       '_fix_create_update')
+    @mock.patch.object(ovn_revision_numbers_db, 'get_inconsistent_resources')
+    def test_check_for_inconsistencies_batch(self, mock_get_incon_res,
+                                             mock_fix, mock_fix_subnet):
+        cfg.CONF.set_override('maintenance_batch_size', 2, group='ovn')
+        net_rows = [mock.Mock(resource_type=constants.TYPE_NETWORKS,
+                              resource_uuid='net-%d' % i) for i in range(3)]
+        subnet_row = mock.Mock(resource_type=constants.TYPE_SUBNETS,
+                               resource_uuid='subnet-0')
+        mock_get_incon_res.return_value = net_rows + [subnet_row]
+        get_networks = self.fake_ovn_client._plugin.get_networks
+        # net-1 was deleted from the Neutron DB in the meantime
+        get_networks.side_effect = [[{'id': 'net-0'}], [{'id': 'net-2'}]]
+
+        with mock.patch.object(maintenance.LOG, 'info') as mock_log:
+            self.periodic.check_for_inconsistencies()
+
+        get_networks.assert_has_calls([
+            mock.call(mock.ANY, filters={'id': ['net-0', 'net-1']}),
+            mock.call(mock.ANY, filters={'id': ['net-2']})])
+        self.assertEqual(2, mock_fix.call_count)
+        mock_fix.assert_has_calls([
+            mock.call(mock.ANY, net_rows[0], n_obj={'id': 'net-0'}),
+            mock.call(mock.ANY, net_rows[2], n_obj={'id': 'net-2'})])
+        mock_fix_subnet.assert_called_once_with(mock.ANY, subnet_row)
+        self.fake_ovn_client._plugin.get_subnets.assert_not_called()
+        stats = mock_log.call_args[0][1]
+        self.assertEqual(4, stats['scanned'])
+        self.assertEqual(3, stats['fixed'])
+        self.assertEqual(1, stats['skipped'])
+        self.assertEqual(0, stats['failed'])
+
+    @mock.patch.object(maintenance.DBInconsistenciesPeriodics,
+                       '_fix_create_update')
+    @mock.patch.object(ovn_revision_numbers_db, 'get_inconsistent_resources')
+    def test_check_for_inconsistencies_batch_bulk_get_fails(
+            self, mock_get_incon_res, mock_fix):
+        cfg.CONF.set_override('maintenance_batch_size', 10, group='ovn')
+        fake_row = mock.Mock(resource_type=constants.TYPE_PORTS,
+                             resource_uuid='port-0')
+        mock_get_incon_res.return_value = [fake_row]
+        self.fake_ovn_client._plugin.get_ports.side_effect = Exception
+        mock_fix.side_effect = Exception
+
+        with mock.patch.object(maintenance.LOG, 'info') as mock_log:
+            self.periodic.check_for_inconsistencies()
+
+        # The Neutron object is retrieved when fixing the row instead
+        mock_fix.assert_called_once_with(mock.ANY, fake_row)
+        stats = mock_log.call_args[0][1]
+        self.assertEqual(1, stats['scanned'])
+        self.assertEqual(0, stats['fixed'])
+        self.assertEqual(1, stats['failed'])
+
     def _test_migrate_to_port_groups_helper(self, pg_supported, a_sets,
                                             migration_expected, never_again):
         self.fake_ovn_client._nb_idl.is_port_groups_supported.return_value = (
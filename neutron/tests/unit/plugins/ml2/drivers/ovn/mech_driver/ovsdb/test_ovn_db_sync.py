@@ -19,6 +19,7 @@ from neutron_lib import constants as const
 
 from neutron.common.ovn import acl
 from neutron.common.ovn import constants as ovn_const
+from neutron.conf.plugins.ml2.drivers.ovn import ovn_conf
 from neutron.plugins.ml2.drivers.ovn.mech_driver.ovsdb import impl_idl_ovn
 from neutron.plugins.ml2.drivers.ovn.mech_driver.ovsdb import ovn_client
 from neutron.plugins.ml2.drivers.ovn.mech_driver.ovsdb import ovn_db_sync
@@ -516,6 +517,28 @@ class TestOvnNbSyncML2(test_mech_driver.OVNMechanismDriverTestCase):
         ovn_nb_synchronizer._ovn_client.get_port_dns_records = mock.Mock()
         ovn_nb_synchronizer._ovn_client.get_port_dns_records.return_value = {}
 
+    def _mock_chunked_queries(self, ovn_nb_synchronizer):
+        core_plugin = ovn_nb_synchronizer.core_plugin
+
+        def _filter(resources, filters):
+            network_ids = (filters or {}).get('network_id')
+            if network_ids is None:
+                return resources
+            return [res for res in resources
+                    if res['network_id'] in network_ids]
+
+        def get_networks(ctx, sorts=None, limit=None, marker=None):
+            networks = sorted(self.networks, key=lambda net: net['id'])
+            if marker:
+                networks = [net for net in networks if net['id'] > marker]
+            return networks[:limit]
+
+        core_plugin.get_networks.side_effect = get_networks
+        core_plugin.get_ports.side_effect = (
+            lambda ctx, filters=None: _filter(self.ports, filters))
+        core_plugin.get_subnets.side_effect = (
+            lambda ctx, filters=None: _filter(self.subnets, filters))
+
     def _test_ovn_nb_sync_helper(self, ovn_nb_synchronizer,
                                  networks, ports,
                                  routers, router_ports,
@@ -534,8 +557,13 @@ class TestOvnNbSyncML2(test_mech_driver.OVNMechanismDriverTestCase):
                                  delete_dhcp_options_list,
                                  add_port_groups_list,
                                  del_port_groups_list,
-                                 port_groups_supported=False):
+                                 port_groups_supported=False,
+                                 chunk_size=0):
         self._test_mocks_helper(ovn_nb_synchronizer)
+        if chunk_size:
+            ovn_conf.cfg.CONF.set_override('neutron_sync_chunk_size',
+                                           chunk_size, group='ovn')
+            self._mock_chunked_queries(ovn_nb_synchronizer)
 
         core_plugin = ovn_nb_synchronizer.core_plugin
         ovn_api = ovn_nb_synchronizer.ovn_api
@@ -740,7 +768,8 @@ class TestOvnNbSyncML2(test_mech_driver.OVNMechanismDriverTestCase):
         ovn_api.delete_dhcp_options.assert_has_calls(
             delete_dhcp_options_calls, any_order=True)
 
-    def _test_ovn_nb_sync_mode_repair_helper(self, port_groups_supported=True):
+    def _test_ovn_nb_sync_mode_repair_helper(self, port_groups_supported=True,
+                                             chunk_size=0):
 
         create_network_list = [{'net': {'id': 'n2', 'mtu': 1450},
                                 'ext_ids': {}}]
@@ -882,7 +911,8 @@ class TestOvnNbSyncML2(test_mech_driver.OVNMechanismDriverTestCase):
                                       delete_dhcp_options_list,
                                       add_port_groups_list,
                                       del_port_groups_list,
-                                      port_groups_supported)
+                                      port_groups_supported,
+                                      chunk_size=chunk_size)
 
     def test_ovn_nb_sync_mode_repair_no_pgs(self):
         self._test_ovn_nb_sync_mode_repair_helper(port_groups_supported=False)
@@ -890,7 +920,8 @@ class TestOvnNbSyncML2(test_mech_driver.OVNMechanismDriverTestCase):
     def test_ovn_nb_sync_mode_repair_pgs(self):
         self._test_ovn_nb_sync_mode_repair_helper(port_groups_supported=True)
 
-    def _test_ovn_nb_sync_mode_log_helper(self, port_groups_supported=True):
+    def _test_ovn_nb_sync_mode_log_helper(self, port_groups_supported=True,
+                                          chunk_size=0):
         create_network_list = []
         create_port_list = []
         create_provnet_port_list = []
@@ -943,7 +974,8 @@ class TestOvnNbSyncML2(test_mech_driver.OVNMechanismDriverTestCase):
                                       delete_dhcp_options_list,
                                       add_port_groups_list,
                                       del_port_groups_list,
-                                      port_groups_supported)
+                                      port_groups_supported,
+                                      chunk_size=chunk_size)
 
     def test_ovn_nb_sync_mode_log_pgs(self):
         self._test_ovn_nb_sync_mode_log_helper(port_groups_supported=True)
@@ -951,6 +983,39 @@ class TestOvnNbSyncML2(test_mech_driver.OVNMechanismDriverTestCase):
     def test_ovn_nb_sync_mode_log_no_pgs(self):
         self._test_ovn_nb_sync_mode_log_helper(port_groups_supported=False)
 
+    def test_ovn_nb_sync_mode_repair_chunked(self):
+        self._test_ovn_nb_sync_mode_repair_helper(chunk_size=1)
+
+    def test_ovn_nb_sync_mode_repair_chunked_multiple_networks(self):
+        self._test_ovn_nb_sync_mode_repair_helper(chunk_size=2)
+
+    def test_ovn_nb_sync_mode_log_chunked(self):
+        self._test_ovn_nb_sync_mode_log_helper(chunk_size=1)
+
+    def test_ovn_nb_sync_chunked_failure(self):
+        ovn_nb_synchronizer = ovn_db_sync.OvnNbSynchronizer(
+            self.plugin, self.mech_driver._nb_ovn, self.mech_driver._sb_ovn,
+            'repair', self.mech_driver)
+        ctx = mock.Mock()
+        with mock.patch.object(ovn_nb_synchronizer, 'sync_address_sets'), \
+                mock.patch.object(ovn_nb_synchronizer, 'sync_port_groups'), \
+                mock.patch.object(
+                    ovn_nb_synchronizer,
+                    'sync_networks_ports_and_dhcp_opts_chunked',
+                    side_effect=ValueError), \
+                mock.patch.object(ovn_nb_synchronizer,
+                                  'sync_port_dns_records') as sync_dns, \
+                mock.patch.object(ovn_nb_synchronizer,
+                                  'sync_routers_and_rports') as sync_routers:
+            # The failure of the switching resources sync is raised once
+            # the routing resources are synced
+            self.assertRaises(ValueError,
+                              ovn_nb_synchronizer._do_sync_chunked, ctx, 1)
+        sync_dns.assert_not_called()
+        sync_routers.assert_called_once_with(mock.ANY)
+        # Each green thread uses its own context
+        self.assertIsNot(ctx, sync_routers.call_args[0][0])
+
 
 class TestOvnSbSyncML2(test_mech_driver.OVNMechanismDriverTestCase):
 
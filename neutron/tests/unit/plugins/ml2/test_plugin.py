@@ -2517,6 +2517,85 @@ class TestMl2PortBindingVnicType(Ml2PluginV2TestCase,
     pass
 
 
+class TestMl2BulkPortBinding(Ml2PluginV2TestCase):
+
+    def setUp(self):
+        super(TestMl2BulkPortBinding, self).setUp()
+        cfg.CONF.set_override('bulk_port_binding', True, group='ml2')
+
+    def _create_ports_bulk_with_host(self, net_id, hosts):
+        data = [{'network_id': net_id,
+                 'tenant_id': self._tenant_id,
+                 portbindings.HOST_ID: host} for host in hosts]
+        res = self._create_bulk_from_list(self.fmt, 'port', data)
+        self.assertEqual(webob.exc.HTTPCreated.code, res.status_int)
+        return self.deserialize(self.fmt, res)['ports']
+
+    def test_create_ports_bulk_with_bulk_port_binding(self):
+        plugin = directory.get_plugin()
+        hosts = ['host-ovs-no_filter', 'host-ovs-no_filter',
+                 'host-bridge-filter']
+        with self.network() as net, self.subnet(network=net), \
+                mock.patch.object(plugin, '_bind_port_if_needed',
+                                  wraps=plugin._bind_port_if_needed) as bpin, \
+                mock.patch.object(plugin, '_commit_port_binding_db',
+                                  wraps=plugin._commit_port_binding_db) as \
+                cpbd:
+            ports = self._create_ports_bulk_with_host(net['network']['id'],
+                                                      hosts)
+        bpin.assert_not_called()
+        self.assertEqual(3, cpbd.call_count)
+        self.assertEqual(
+            [portbindings.VIF_TYPE_OVS, portbindings.VIF_TYPE_OVS,
+             portbindings.VIF_TYPE_BRIDGE],
+            [port[portbindings.VIF_TYPE] for port in ports])
+        for port in ports:
+            port = self._show('ports', port['id'])['port']
+            self.assertNotEqual(portbindings.VIF_TYPE_UNBOUND,
+                                port[portbindings.VIF_TYPE])
+
+    def test_create_ports_bulk_with_bulk_port_binding_failure(self):
+        plugin = directory.get_plugin()
+        hosts = ['host-ovs-no_filter', 'host-fail']
+        with self.network() as net, self.subnet(network=net), \
+                mock.patch.object(plugin, '_bind_port_if_needed',
+                                  wraps=plugin._bind_port_if_needed) as bpin:
+            ports = self._create_ports_bulk_with_host(net['network']['id'],
+                                                      hosts)
+        # Only the port whose bulk binding failed is bound individually.
+        bpin.assert_called_once_with(mock.ANY)
+        self.assertEqual(ports[1]['id'],
+                         bpin.call_args[0][0].current['id'])
+        self.assertEqual(portbindings.VIF_TYPE_OVS,
+                         ports[0][portbindings.VIF_TYPE])
+
+    def test_create_ports_bulk_with_bulk_port_binding_commit_failure(self):
+        plugin = directory.get_plugin()
+        hosts = ['host-ovs-no_filter', 'host-ovs-no_filter']
+        orig_commit = plugin._commit_port_binding_db
+        calls = []
+
+        def commit_port_binding_db(*args):
+            calls.append(args)
+            if len(calls) == 1:
+                raise db_exc.DBDeadlock()
+            return orig_commit(*args)
+
+        with self.network() as net, self.subnet(network=net), \
+                mock.patch.object(plugin, '_commit_port_binding_db',
+                                  side_effect=commit_port_binding_db), \
+                mock.patch.object(plugin, '_bind_port_if_needed',
+                                  side_effect=lambda context: context) as \
+                bpin:
+            ports = self._create_ports_bulk_with_host(net['network']['id'],
+                                                      hosts)
+        # The bulk transaction failed, so both ports are bound individually.
+        self.assertEqual(2, bpin.call_count)
+        self.assertEqual({port['id'] for port in ports},
+                         {call[0][0].current['id']
+                          for call in bpin.call_args_list})
+
+
 class TestMultiSegmentNetworks(Ml2PluginV2TestCase):
 
     def setUp(self, plugin=None):
@@ -19,6 +19,7 @@ import pyroute2
 from pyroute2 import netlink
 from pyroute2.netlink.rtnl import ifinfmsg
 
+from neutron import privileged
 from neutron.privileged.agent.linux import ip_lib as priv_lib
 from neutron.tests import base
 
@@ -243,3 +244,113 @@ class MakeSerializableTestCase(base.BaseTestCase):
     def test_make_serializable(self):
         self.assertEqual(self.OUTPUT_1,
                          priv_lib.make_serializable(self.INPUT_1))
+
+
+class NetlinkSocketPoolTestCase(base.BaseTestCase):
+
+    def setUp(self):
+        super(NetlinkSocketPoolTestCase, self).setUp()
+        self.addCleanup(privileged.default.set_client_mode, True)
+        privileged.default.set_client_mode(False)
+        self.config(netlink_socket_pool_size=2, group='AGENT')
+        mock.patch.object(priv_lib, '_SOCKET_POOL', None).start()
+        self.mock_iproute = mock.patch.object(priv_lib, 'get_iproute').start()
+        self.mock_iproute.side_effect = lambda namespace: mock.Mock()
+        self.inodes = {'ns1': 1, 'ns2': 2, 'ns3': 3}
+        mock.patch.object(priv_lib.NetlinkSocketPool, '_get_inode',
+                          side_effect=self.inodes.get).start()
+
+    def _use_socket(self, namespace):
+        with priv_lib.get_pooled_iproute(namespace) as ip:
+            return ip
+
+    def test_get_pooled_iproute_disabled(self):
+        self.config(netlink_socket_pool_size=0, group='AGENT')
+        self.mock_iproute.side_effect = None
+        ip = self.mock_iproute.return_value.__enter__.return_value
+        self.assertEqual(ip, self._use_socket('ns1'))
+        self._use_socket('ns1')
+        self.assertEqual(2, self.mock_iproute.call_count)
+        self.assertEqual(
+            2, self.mock_iproute.return_value.__exit__.call_count)
+        self.assertEqual({}, priv_lib.get_netlink_socket_pool_stats())
+
+    def test_get_pooled_iproute_reused(self):
+        ip = self._use_socket('ns1')
+        self.assertEqual(ip, self._use_socket('ns1'))
+        self.assertNotEqual(ip, self._use_socket(None))
+        self.mock_iproute.assert_has_calls([mock.call('ns1'),
+                                            mock.call(None)])
+        ip.close.assert_not_called()
+        self.assertEqual({'created': 2, 'reused': 1, 'evicted': 0,
+                          'invalidated': 0, 'open': 2},
+                         priv_lib.get_netlink_socket_pool_stats())
+
+    def test_get_pooled_iproute_namespace_recreated(self):
+        ip = self._use_socket('ns1')
+        self.inodes['ns1'] = 4
+        self.assertNotEqual(ip, self._use_socket('ns1'))
+        ip.close.assert_called_once_with()
+        self.assertEqual({'created': 2, 'reused': 0, 'evicted': 0,
+                          'invalidated': 1, 'open': 1},
+                         priv_lib.get_netlink_socket_pool_stats())
+
+    def test_get_pooled_iproute_evicted(self):
+        ip1 = self._use_socket('ns1')
+        ip2 = self._use_socket('ns2')
+        self._use_socket('ns1')
+        self._use_socket('ns3')
+        ip1.close.assert_not_called()
+        ip2.close.assert_called_once_with()
+        self.assertEqual({'created': 3, 'reused': 1, 'evicted': 1,
+                          'invalidated': 0, 'open': 2},
+                         priv_lib.get_netlink_socket_pool_stats())
+
+    def test_get_pooled_iproute_concurrent_use(self):
+        with priv_lib.get_pooled_iproute('ns1') as ip1:
+            with priv_lib.get_pooled_iproute('ns1') as ip2:
+                self.assertNotEqual(ip1, ip2)
+        with priv_lib.get_pooled_iproute('ns1') as ip3:
+            with priv_lib.get_pooled_iproute('ns1') as ip4:
+                self.assertEqual({ip1, ip2}, {ip3, ip4})
+        with priv_lib.get_pooled_iproute('ns1'):
+            with priv_lib.get_pooled_iproute('ns1'):
+                with priv_lib.get_pooled_iproute('ns1') as ip5:
+                    pass
+        self.assertEqual(1, sum(ip.close.call_count
+                                for ip in (ip1, ip2, ip5)))
+        self.assertEqual(2, priv_lib.get_netlink_socket_pool_stats()['open'])
+
+    def test_get_pooled_iproute_namespace_recreated_while_used(self):
+        with priv_lib.get_pooled_iproute('ns1') as ip1:
+            self.inodes['ns1'] = 4
+            ip2 = self._use_socket('ns1')
+        ip1.close.assert_called_once_with()
+        self.assertEqual(ip2, self._use_socket('ns1'))
+
+    def test_get_pooled_iproute_netlink_error(self):
+        try:
+            with priv_lib.get_pooled_iproute('ns1') as ip:
+                raise pyroute2.NetlinkError(code=errno.EEXIST)
+        except pyroute2.NetlinkError:
+            pass
+        ip.close.assert_not_called()
+        self.assertEqual(ip, self._use_socket('ns1'))
+
+    def test_get_pooled_iproute_socket_error(self):
+        try:
+            with priv_lib.get_pooled_iproute('ns1') as ip:
+                raise OSError(errno.EBADF, 'Bad file descriptor')
+        except OSError:
+            pass
+        ip.close.assert_called_once_with()
+        self.assertEqual(0, priv_lib.get_netlink_socket_pool_stats()['open'])
+
+    @mock.patch.object(priv_lib.netns, 'remove')
+    def test_remove_netns_invalidates_sockets(self, mock_remove):
+        ip = self._use_socket('ns1')
+        priv_lib.remove_netns('ns1')
+        ip.close.assert_called_once_with()
+        self.assertEqual({'created': 1, 'reused': 0, 'evicted': 0,
+                          'invalidated': 1, 'open': 0},
+                         priv_lib.get_netlink_socket_pool_stats())
@@ -19,6 +19,7 @@ from neutron_lib import constants
 from neutron_lib import exceptions
 import testtools
 
+from neutron import privileged
 from neutron.privileged.agent.linux import netlink_constants as nl_constants
 from neutron.privileged.agent.linux import netlink_lib as nl_lib
 from neutron.tests import base
@@ -340,3 +341,50 @@ class NetlinkLibTestCase(base.BaseTestCase):
         nl_lib.nfct.nfct_close.assert_called_once_with(nl_lib.nfct.nfct_open(
             nl_constants.NFNL_SUBSYS_CTNETLINK,
             nl_constants.CONNTRACK))
+
+    def test_delete_entries_by_filters(self):
+        self.addCleanup(privileged.default.set_client_mode, True)
+        privileged.default.set_client_mode(False)
+        raw_entries = {
+            4: ['[1500000000.000000] tcp      6 431999 ESTABLISHED '
+                'src=1.1.1.1 dst=2.2.2.2 sport=1 dport=2 src=2.2.2.2 '
+                'dst=1.1.1.1 sport=2 dport=1 [ASSURED] mark=0 zone=1 use=1',
+                '[1500000000.000000] udp      17 29 src=1.1.1.1 '
+                'dst=3.3.3.3 sport=1 dport=2 src=3.3.3.3 dst=1.1.1.1 '
+                'sport=2 dport=1 [ASSURED] mark=0 zone=1 use=1',
+                '[1500000000.000000] icmp     1 29 src=1.1.1.1 '
+                'dst=2.2.2.2 type=8 code=0 id=1234 src=2.2.2.2 '
+                'dst=1.1.1.1 type=0 code=0 id=1234 [ASSURED] mark=0 zone=2 '
+                'use=1',
+                '[1500000000.000000] gre      47 179 src=1.1.1.1 '
+                'dst=2.2.2.2 srckey=0x0 dstkey=0x0 mark=0 zone=1 use=1'],
+            6: []}
+        with mock.patch.object(
+                nl_lib.ConntrackManager, 'list_entries',
+                side_effect=[raw_entries[4], raw_entries[6]]), \
+                mock.patch.object(nl_lib, '_delete_entries') as delete:
+            # TCP entries from 1.1.1.1 to 2.2.2.2 and every entry to
+            # 2.2.2.2 in zone 1, and every entry from 1.1.1.1 in zone 2
+            deleted, unparsed_filters = nl_lib.delete_entries_by_filters(
+                [(4, 1, constants.IP_PROTOCOL_MAP['tcp'], '1.1.1.1',
+                  '2.2.2.2'),
+                 (4, 1, None, None, '2.2.2.2'),
+                 (4, 2, None, '1.1.1.1', None),
+                 (4, 3, None, None, '1.1.1.1')])
+
+        self.assertEqual(2, deleted)
+        # the GRE entry is left to the caller
+        self.assertEqual([(4, 1, 47, None, '2.2.2.2')], unparsed_filters)
+        delete.assert_called_once_with(
+            [(4, 'tcp', 1, 2, '1.1.1.1', '2.2.2.2', 1),
+             (4, 'icmp', 8, 0, '1.1.1.1', '2.2.2.2', 1234, 2)])
+
+    def test_delete_entries_by_filters_no_match(self):
+        self.addCleanup(privileged.default.set_client_mode, True)
+        privileged.default.set_client_mode(False)
+        with mock.patch.object(nl_lib.ConntrackManager, 'list_entries',
+                               return_value=[]), \
+                mock.patch.object(nl_lib, '_delete_entries') as delete:
+            self.assertEqual((0, []), nl_lib.delete_entries_by_filters(
+                [(4, 1, None, '1.1.1.1', None)]))
+        delete.assert_not_called()
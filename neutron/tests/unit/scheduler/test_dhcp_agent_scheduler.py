@@ -18,6 +18,7 @@ from operator import attrgetter
 import random
 
 import mock
+import netaddr
 from neutron_lib import constants
 from neutron_lib import context
 from neutron_lib.exceptions import dhcpagentscheduler as das_exc
@@ -29,6 +30,7 @@ import testscenarios
 from neutron.db import agentschedulers_db as sched_db
 from neutron.objects import agent
 from neutron.objects import network as network_obj
+from neutron.objects import subnet as subnet_obj
 from neutron.scheduler import dhcp_agent_scheduler
 from neutron.services.segments import db as segments_service_db
 from neutron.tests.common import helpers
@@ -283,6 +285,72 @@ class TestAutoScheduleNetworks(TestDhcpSchedulerBaseTestCase):
         self.assertEqual(expected_hosted_agents, count_hosted_agents)
 
 
+class TestAutoScheduleNetworksInBatches(TestAutoScheduleNetworks):
+    """Same scenarios as TestAutoScheduleNetworks with the set based path."""
+
+    def setUp(self):
+        super(TestAutoScheduleNetworksInBatches, self).setUp()
+        cfg.CONF.set_override('dhcp_auto_schedule_batch_size', 1)
+
+    def _create_subnet(self, network_id, cidr='10.0.0.0/24',
+                       enable_dhcp=True, segment_id=None):
+        subnet_obj.Subnet(self.ctx, network_id=network_id,
+                          cidr=netaddr.IPNetwork(cidr), ip_version=4,
+                          enable_dhcp=enable_dhcp,
+                          segment_id=segment_id).create()
+
+    def test_auto_schedule_network(self):
+        if self.network_present:
+            self._create_subnet(self.network_id,
+                                enable_dhcp=self.enable_dhcp)
+            net = network_obj.Network.get_object(self.ctx, id=self.network_id)
+            net.availability_zone_hints = self.az_hints
+            net.update()
+        super(TestAutoScheduleNetworksInBatches,
+              self).test_auto_schedule_network()
+
+    def test_auto_schedule_routed_networks(self):
+        net_2 = uuidutils.generate_uuid()
+        self._save_networks([net_2])
+        segments = []
+        for network_id in (self.network_id, net_2):
+            segment = network_obj.NetworkSegment(
+                self.ctx, id=uuidutils.generate_uuid(),
+                network_id=network_id, network_type='vlan',
+                physical_network='physnet', segmentation_id=len(segments))
+            segment.create()
+            segments.append(segment)
+            self._create_subnet(network_id, segment_id=segment.id)
+        network_obj.SegmentHostMapping(
+            self.ctx, segment_id=segments[0].id, host='host-a').create()
+        agents = self._create_and_set_agents_down(['host-a'])
+        scheduler = dhcp_agent_scheduler.ChanceScheduler()
+
+        self.assertTrue(scheduler.auto_schedule_networks(
+            mock.Mock(), self.ctx, 'host-a'))
+        bindings = network_obj.NetworkDhcpAgentBinding.get_objects(self.ctx)
+        self.assertEqual([(self.network_id, agents[0].id)],
+                         [(b.network_id, b.dhcp_agent_id) for b in bindings])
+
+    def test_auto_schedule_networks_in_chunks(self):
+        cfg.CONF.set_override('dhcp_auto_schedule_batch_size', 2)
+        net_ids = [self.network_id, uuidutils.generate_uuid(),
+                   uuidutils.generate_uuid()]
+        self._save_networks(net_ids[1:])
+        for i, network_id in enumerate(net_ids):
+            self._create_subnet(network_id, cidr='10.0.%d.0/24' % i)
+        self._create_and_set_agents_down(['host-a'])
+        scheduler = dhcp_agent_scheduler.ChanceScheduler()
+
+        with mock.patch.object(dhcp_agent_scheduler.greenthread,
+                               'sleep') as sleep:
+            self.assertTrue(scheduler.auto_schedule_networks(
+                mock.Mock(), self.ctx, 'host-a'))
+        sleep.assert_called_once_with(0)
+        self.assertEqual(
+            3, network_obj.NetworkDhcpAgentBinding.count(self.ctx))
+
+
 class TestAutoScheduleSegments(test_plugin.Ml2PluginV2TestCase,
                                TestDhcpSchedulerBaseTestCase):
     """Unit test scenarios for ChanceScheduler"""
@@ -440,6 +508,53 @@ class TestNetworksFailover(TestDhcpSchedulerBaseTestCase,
             notifier.network_added_to_agent.assert_called_with(
                 mock.ANY, self.network_id, agents[1].host)
 
+    def test_reschedule_network_from_down_agent_default_options(self):
+        agents = self._create_and_set_agents_down(['host-a', 'host-b'], 1)
+        self._test_schedule_bind_network([agents[0]], self.network_id)
+        with mock.patch.object(self, 'remove_network_from_dhcp_agent'),\
+                mock.patch.object(self,
+                                  'schedule_network',
+                                  return_value=[agents[1]]) as sch,\
+                mock.patch.object(self,
+                                  'get_network',
+                                  create=True,
+                                  return_value={'id': self.network_id}),\
+                mock.patch.object(sched_db.LOG, 'exception') as log_exc:
+            self.agent_notifiers[constants.AGENT_TYPE_DHCP] = mock.Mock()
+            self.remove_networks_from_down_agents()
+        sch.assert_called_once_with(mock.ANY, {'id': self.network_id})
+        log_exc.assert_not_called()
+
+    def test_reschedule_networks_from_down_agents_batched(self):
+        cfg.CONF.set_override('agent_reschedule_batch_size', 10)
+        net_id = uuidutils.generate_uuid()
+        agents = self._create_and_set_agents_down(
+            ['host-a', 'host-b', 'host-c'], 2)
+        self._save_networks([net_id])
+        # the network is hosted by both dead agents
+        self._test_schedule_bind_network(agents[:2], self.network_id)
+        self._test_schedule_bind_network([agents[0]], net_id)
+        networks = [{'id': self.network_id}, {'id': net_id}]
+        with mock.patch.object(self, 'remove_network_from_dhcp_agent') as rn,\
+                mock.patch.object(self,
+                                  'schedule_network',
+                                  return_value=[agents[2]]) as sch,\
+                mock.patch.object(self,
+                                  'get_networks',
+                                  create=True,
+                                  return_value=networks) as gn:
+            notifier = mock.MagicMock()
+            self.agent_notifiers[constants.AGENT_TYPE_DHCP] = notifier
+            self.remove_networks_from_down_agents()
+            self.assertEqual(3, rn.call_count)
+            gn.assert_called_once_with(
+                mock.ANY, filters={'id': mock.ANY})
+            self.assertEqual([mock.call(mock.ANY, net) for net in networks],
+                             sch.call_args_list)
+            notifier.network_added_to_agent.assert_has_calls(
+                [mock.call(mock.ANY, self.network_id, agents[2].host),
+                 mock.call(mock.ANY, net_id, agents[2].host)])
+
     def _test_failed_rescheduling(self, rn_side_effect=None):
         agents = self._create_and_set_agents_down(['host-a', 'host-b'], 1)
         self._test_schedule_bind_network([agents[0]], self.network_id)
@@ -23,6 +23,7 @@ from neutron_lib.api.definitions import portbindings
 from neutron_lib.api.definitions import router_availability_zone
 from neutron_lib import constants
 from neutron_lib import context as n_context
+from neutron_lib.db import api as lib_db_api
 from neutron_lib.exceptions import l3 as l3_exc
 from neutron_lib.plugins import constants as plugin_constants
 from neutron_lib.plugins import directory
@@ -787,6 +788,73 @@ class L3AgentLeastRoutersSchedulerTestCase(L3SchedulerTestCaseMixin,
                         self.assertNotEqual(agent_id1, agent_id3)
 
 
+class L3AgentLeastLoadSchedulerTestCase(L3AgentLeastRoutersSchedulerTestCase):
+
+    def setUp(self):
+        super(L3AgentLeastLoadSchedulerTestCase, self).setUp()
+        self.plugin.router_scheduler = importutils.import_object(
+            'neutron.scheduler.l3_agent_scheduler.LeastLoadScheduler'
+        )
+
+    def test_load_view_refreshed_once(self):
+        scheduler = self.plugin.router_scheduler
+        load_view = scheduler.load_view
+        with self.router() as r1, self.router() as r2:
+            router_ids = [r1['router']['id'], r2['router']['id']]
+            for router_id in router_ids:
+                scheduler.schedule(self.plugin, self.adminContext, router_id)
+            agents = self.plugin.get_l3_agents_hosting_routers(
+                self.adminContext, router_ids)
+        self.assertEqual(1, load_view.stats['refreshes'])
+        self.assertEqual(1, load_view.stats['hits'])
+        # the routers were spread thanks to the in-memory updates
+        self.assertEqual(2, len(set(agent['id'] for agent in agents)))
+
+    def test_schedule_routers_in_one_pass(self):
+        scheduler = self.plugin.router_scheduler
+        with self.router() as r1, self.router() as r2, self.router() as r3:
+            router_ids = [r['router']['id'] for r in (r1, r2, r3)]
+            # r3 is already hosted
+            scheduler.bind_router(self.plugin, self.adminContext,
+                                  router_ids[2], self.agent_id1)
+            with mock.patch.object(self.plugin, 'get_router') as get_router,\
+                    mock.patch.object(
+                        self.plugin, 'get_l3_agents',
+                        wraps=self.plugin.get_l3_agents) as get_l3_agents,\
+                    mock.patch.object(scheduler, 'bind_router',
+                                      wraps=scheduler.bind_router) as bind:
+                self.plugin.schedule_routers(self.adminContext, router_ids)
+            agents = self.plugin.get_l3_agents_hosting_routers(
+                self.adminContext, router_ids[:2])
+
+        self.assertFalse(get_router.called)
+        get_l3_agents.assert_called_once_with(self.adminContext, active=True)
+        # r3 is not bound again
+        self.assertEqual(2, bind.call_count)
+        self.assertEqual(2, len(agents))
+
+    def test_load_view_floatingips_metric(self):
+        load_view = l3_agent_scheduler.L3AgentLoadView('floatingips', 60)
+        router_weights = {'r1': 3}
+        bindings = [('r1', 'agent1'), ('r2', 'agent2'), ('r3', 'agent2')]
+        session = mock.Mock()
+        session.query.return_value.all.return_value = bindings
+        ctx = mock.Mock(session=session)
+        agents = [{'id': 'agent1'}, {'id': 'agent2'}]
+        with mock.patch.object(load_view, '_get_router_weights',
+                               return_value=router_weights),\
+                mock.patch.object(lib_db_api.CONTEXT_READER, 'using'):
+            self.assertEqual(
+                [{'id': 'agent2'}, {'id': 'agent1'}],
+                load_view.get_agents_ordered_by_load(ctx, agents))
+            load_view.add_router('agent2', 'r4')
+            load_view.add_router('agent2', 'r5')
+            self.assertEqual(
+                [{'id': 'agent1'}, {'id': 'agent2'}],
+                load_view.get_agents_ordered_by_load(ctx, agents))
+        self.assertEqual(1, load_view.stats['refreshes'])
+
+
 class L3DvrScheduler(l3_db.L3_NAT_db_mixin,
                      l3_dvrscheduler_db.L3_DVRsch_db_mixin):
     pass
@@ -1959,6 +2027,15 @@ class L3HALeastRoutersSchedulerTestCase(L3HATestCaseMixin):
         self.assertIn(self.agent_id4, agent_ids)
 
 
+class L3HALeastLoadSchedulerTestCase(L3HALeastRoutersSchedulerTestCase):
+
+    def setUp(self):
+        super(L3HALeastLoadSchedulerTestCase, self).setUp()
+        self.plugin.router_scheduler = importutils.import_object(
+            'neutron.scheduler.l3_agent_scheduler.LeastLoadScheduler'
+        )
+
+
 class TestGetL3AgentsWithFilter(testlib_api.SqlTestCase,
                                 L3SchedulerBaseMixin):
     """Test cases to test get_l3_agents.
@@ -313,3 +313,57 @@ class TestOVSFirewallLoggingDriver(base.BaseTestCase):
         ]
         self.mock_bridge.br.delete_flows.assert_has_calls(
             delete_rules, any_order=True)
+
+    def _packet_in_event(self, cookie_id):
+        return mock.Mock(msg=mock.Mock(cookie=cookie_id, data=b'data'))
+
+    @mock.patch.object(ovsfw_log.packet, 'Packet')
+    def test_packet_in_handler(self, mock_packet):
+        cookie_id = self.log_driver.generate_cookie(
+            PORT_ID, ACTION, LOG_ID, PROJECT_ID)
+        with mock.patch.object(ovsfw_log, 'LOG') as mock_log:
+            self.log_driver.packet_in_handler(
+                self._packet_in_event(cookie_id))
+        mock_log.info.assert_called_once_with(
+            mock.ANY, ACTION, PROJECT_ID, [LOG_ID], PORT_ID,
+            mock_packet.return_value)
+
+    @mock.patch.object(ovsfw_log.eventlet, 'spawn_n')
+    def test_packet_in_handler_queue_full(self, mock_spawn):
+        cfg.CONF.set_override('packet_log_queue_size', 2,
+                              group='network_log')
+        self.log_driver.start_packet_log_worker()
+        mock_spawn.assert_called_once_with(
+            self.log_driver._packet_log_worker)
+
+        with mock.patch.object(self.log_driver, '_log_packet') as mock_log:
+            for _ in range(3):
+                self.log_driver.packet_in_handler(
+                    self._packet_in_event(COOKIE_ID))
+            mock_log.assert_not_called()
+        self.assertEqual({'queued': 2, 'dropped': 1},
+                         self.log_driver.packet_log_stats)
+
+    @mock.patch.object(ovsfw_log.eventlet, 'spawn_n')
+    def test__process_packet_log_queue(self, mock_spawn):
+        cfg.CONF.set_override('packet_log_queue_size', 10,
+                              group='network_log')
+        self.log_driver.start_packet_log_worker()
+        for cookie_id in ('cookie1', 'cookie2', 'cookie1', 'cookie1'):
+            self.log_driver.packet_in_handler(
+                self._packet_in_event(cookie_id))
+
+        with mock.patch.object(self.log_driver, '_log_packet') as mock_log:
+            self.log_driver._process_packet_log_queue(0.01)
+        mock_log.assert_has_calls([
+            mock.call('cookie1', b'data', 3, mock.ANY, mock.ANY),
+            mock.call('cookie2', b'data', 1, mock.ANY, mock.ANY)])
+        self.assertEqual(2, self.log_driver.packet_log_stats['aggregated'])
+
+        # Without an aggregation window each packet is logged on its own
+        self.log_driver.packet_in_handler(self._packet_in_event('cookie1'))
+        self.log_driver.packet_in_handler(self._packet_in_event('cookie1'))
+        with mock.patch.object(self.log_driver, '_log_packet') as mock_log:
+            self.log_driver._process_packet_log_queue(0)
+        mock_log.assert_called_once_with('cookie1', b'data', 1, mock.ANY,
+                                         mock.ANY)
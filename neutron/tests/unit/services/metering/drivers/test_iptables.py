@@ -17,6 +17,7 @@ import copy
 import mock
 from oslo_config import cfg
 
+from neutron.conf.services import metering_agent as metering_agent_config
 from neutron.services.metering.drivers.iptables import iptables_driver
 from neutron.tests import base
 
@@ -146,6 +147,7 @@ class IptablesDriverTestCase(base.BaseTestCase):
         self.iptables_cls.return_value = self.iptables_inst
         cfg.CONF.set_override('interface_driver',
                               'neutron.agent.linux.interface.NullDriver')
+        metering_agent_config.register_metering_agent_opts()
         self.metering = iptables_driver.IptablesMeteringDriver('metering',
                                                                cfg.CONF)
 
@@ -684,6 +686,62 @@ class IptablesDriverTestCase(base.BaseTestCase):
         self.assertEqual(1, counters[expected_label_id]['pkts'])
         self.assertEqual(8, counters[expected_label_id]['bytes'])
 
+    def test_get_traffic_counters_bulk(self):
+        cfg.CONF.set_override('bulk_traffic_counters', True)
+        label_ids = []
+        for r in TEST_ROUTERS:
+            rm = iptables_driver.RouterWithMetering(self.metering.conf, r)
+            rm.metering_labels = {r['_metering_labels'][0]['id']: 'fake'}
+            self.metering.routers[r['id']] = rm
+            label_ids.append(r['_metering_labels'][0]['id'])
+
+        mocked_method = (
+            self.iptables_cls.return_value.get_traffic_counters_bulk)
+        mocked_method.side_effect = [
+            {'neutron-meter-l-c5df2fe5-c60': {'pkts': 1, 'bytes': 8}},
+            RuntimeError('Failed to find the chain')]
+
+        counters = self.metering.get_traffic_counters(None, TEST_ROUTERS)
+        mocked_method.assert_has_calls([
+            mock.call(mock.ANY, wrap=False)] * 2)
+        self.assertEqual(['neutron-meter-l-c5df2fe5-c60'],
+                         list(mocked_method.call_args_list[0][0][0]))
+        self.assertEqual({label_ids[0]: {'pkts': 1, 'bytes': 8}}, counters)
+        self.assertFalse(
+            self.iptables_cls.return_value.get_traffic_counters.called)
+        # The router which counters could not be read is reconfigured
+        self.assertNotIn(TEST_ROUTERS[1]['id'], self.metering.routers)
+
+    def test_get_traffic_counters_bulk_differences(self):
+        cfg.CONF.set_override('bulk_traffic_counters', True)
+        router = TEST_ROUTERS[0]
+        label_id = router['_metering_labels'][0]['id']
+        rm = iptables_driver.RouterWithMetering(self.metering.conf, router)
+        rm.metering_labels = {label_id: 'fake'}
+        self.metering.routers[router['id']] = rm
+
+        mocked_method = (
+            self.iptables_cls.return_value.get_traffic_counters_bulk)
+        mocked_method.side_effect = [
+            {'neutron-meter-l-c5df2fe5-c60': {'pkts': 1, 'bytes': 8}},
+            {'neutron-meter-l-c5df2fe5-c60': {'pkts': 3, 'bytes': 20}},
+            {'neutron-meter-l-c5df2fe5-c60': {'pkts': 2, 'bytes': 10}}]
+
+        # The counters are not reset by the reads, the differences with the
+        # previous read are returned, unless the counters were reset since
+        self.assertEqual(
+            {label_id: {'pkts': 1, 'bytes': 8}},
+            self.metering.get_traffic_counters(None, [router]))
+        self.assertEqual(
+            {label_id: {'pkts': 2, 'bytes': 12}},
+            self.metering.get_traffic_counters(None, [router]))
+        self.assertEqual(
+            {label_id: {'pkts': 2, 'bytes': 10}},
+            self.metering.get_traffic_counters(None, [router]))
+
+        self.metering.remove_metering_label(None, [router])
+        self.assertEqual({}, rm.traffic_counters)
+
     def test_sync_router_namespaces(self):
         routers = TEST_DVR_ROUTER[:1]
 
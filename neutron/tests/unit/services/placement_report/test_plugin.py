@@ -16,6 +16,7 @@ import mock
 
 from keystoneauth1 import exceptions as ks_exc
 from neutron_lib.agent import constants as agent_const
+from oslo_config import cfg
 from oslo_log import log as logging
 
 from neutron.services.placement_report import plugin
@@ -249,6 +250,109 @@ class PlacementReportPluginTestCases(test_plugin.Ml2PluginV2TestCase):
             self.assertEqual(1, mock_queue_event.call_count)
             mock_list_rps.assert_called_once_with(name='hypervisor0')
 
+    def test__sync_placement_state_changes_only(self):
+        self.service_plugin._synced_states = {}
+        cfg.CONF.set_override('placement_full_sync_interval', 3600)
+        agent = {
+            'agent_type': 'test_mechanism_driver_agent',
+            'configurations': {
+                'resource_provider_bandwidths': {
+                    'eth0': {'egress': 1000, 'ingress': 1000}},
+                'resource_provider_inventory_defaults': {},
+                'resource_provider_hypervisors': {'eth0': 'hypervisor0'},
+            },
+            'host': 'fake host',
+        }
+        agent_db = mock.Mock()
+        client = mock.Mock()
+        for method in ('update_trait', 'ensure_resource_provider',
+                       'update_resource_provider_traits',
+                       'update_resource_provider_inventories'):
+            getattr(client, method).__name__ = method
+        generations = {}
+
+        def list_resource_providers(name=None, in_tree=None):
+            if name:
+                return {'resource_providers': [{'uuid': 'fake uuid'}]}
+            return {'resource_providers': [
+                {'uuid': rp_uuid, 'generation': generation}
+                for rp_uuid, generation in generations.items()]}
+
+        client.list_resource_providers.side_effect = list_resource_providers
+        self.service_plugin._placement_client = client
+        mech_driver = self.service_plugin._agents.\
+            mechanism_driver_by_agent_type('test_mechanism_driver_agent')
+
+        def sync():
+            client.reset_mock()
+            self.service_plugin._sync_placement_state(agent, agent_db)
+
+        with mock.patch.object(self.service_plugin._batch_notifier,
+                'queue_event', side_effect=lambda batch: batch()), \
+            mock.patch.object(mech_driver, 'get_standard_device_mappings',
+                return_value={'physnet0': ['eth0']}):
+            # The first sync of an agent is a full one, the generations of
+            # its resource providers are read after it
+            sync()
+            self.assertEqual(2, client.update_trait.call_count)
+            self.assertEqual(2, client.ensure_resource_provider.call_count)
+            client.update_resource_provider_traits.assert_called_once()
+            client.update_resource_provider_inventories.assert_called_once()
+            client.list_resource_providers.assert_called_with(
+                in_tree='fake uuid')
+
+            # The generations do not match the ones read after the first
+            # sync, the second one is a full sync
+            rp_uuids = self.service_plugin._get_agent_rp_uuids(
+                mech_driver.resource_provider_uuid5_namespace,
+                {'eth0': {'name': 'hypervisor0', 'uuid': 'fake uuid'}})
+            generations.update({rp_uuid: 1 for rp_uuid in rp_uuids})
+            sync()
+            self.assertEqual(2, client.ensure_resource_provider.call_count)
+
+            # Nothing changed, nothing is sent
+            sync()
+            client.update_trait.assert_not_called()
+            client.ensure_resource_provider.assert_not_called()
+            client.update_resource_provider_traits.assert_not_called()
+            client.update_resource_provider_inventories.assert_not_called()
+            self.assertTrue(agent_db.resources_synced)
+
+            # Only the changed inventory is sent, and sent again when
+            # reverted to its previous value
+            for bandwidth in (2000, 1000):
+                agent['configurations']['resource_provider_bandwidths'][
+                    'eth0']['egress'] = bandwidth
+                sync()
+                client.update_resource_provider_inventories.\
+                    assert_called_once()
+                client.ensure_resource_provider.assert_not_called()
+
+            # A resource provider changed in placement by someone else
+            generations[next(iter(rp_uuids))] += 1
+            sync()
+            self.assertEqual(2, client.ensure_resource_provider.call_count)
+
+            # A placement error leads to a full sync the next time
+            client.update_resource_provider_inventories.side_effect = (
+                ks_exc.HttpError)
+            agent['configurations']['resource_provider_bandwidths'][
+                'eth0']['egress'] = 3000
+            sync()
+            client.ensure_resource_provider.assert_not_called()
+            self.assertFalse(agent_db.resources_synced)
+            client.update_resource_provider_inventories.side_effect = None
+            sync()
+            self.assertEqual(2, client.ensure_resource_provider.call_count)
+            self.assertTrue(agent_db.resources_synced)
+
+            # A full sync is done once the interval expired
+            cfg.CONF.set_override('placement_full_sync_interval', 1)
+            with mock.patch.object(plugin.timeutils, 'is_older_than',
+                                   return_value=True):
+                sync()
+            self.assertEqual(2, client.ensure_resource_provider.call_count)
+
 
 class PlacementReporterAgentsTestCases(test_plugin.Ml2PluginV2TestCase):
 
@@ -217,6 +217,49 @@ class TestOVSDBHandler(base.BaseTestCase):
                 None, self.trunk_id, self.fake_subports)
         self.assertEqual(constants.TRUNK_DEGRADED_STATUS, status)
 
+    @mock.patch('neutron.agent.common.ovs_lib.OVSBridge')
+    def test_wire_subports_for_trunk_bulk(self, br):
+        self.ovsdb_handler.bulk_wiring = True
+        self.ovsdb_handler.trunk_rpc.update_subport_bindings.return_value = (
+            self.subport_bindings)
+        with mock.patch.object(
+                self.ovsdb_handler, '_update_trunk_metadata') as f:
+            status = self.ovsdb_handler.wire_subports_for_trunk(
+                None, self.trunk_id, self.fake_subports,
+                parent_port=self.fake_port)
+        self.assertEqual(constants.TRUNK_ACTIVE_STATUS, status)
+        trunk_rpc = self.ovsdb_handler.trunk_rpc
+        trunk_rpc.update_subport_bindings.assert_called_once_with(
+            None, self.fake_subports)
+        self.trunk_manager.add_sub_ports.assert_called_once_with(
+            self.trunk_id, [(s.port_id, 'mac', s.segmentation_id)
+                            for s in self.fake_subports])
+        self.assertFalse(self.trunk_manager.add_sub_port.called)
+        f.assert_called_once_with(
+            mock.ANY, self.fake_port, self.trunk_id,
+            [s.port_id for s in self.fake_subports])
+        br.return_value.ovsdb.transaction.assert_called_once_with(
+            check_error=True)
+
+    @mock.patch('neutron.agent.common.ovs_lib.OVSBridge')
+    def test_wire_subports_for_trunk_bulk_failure(self, br):
+        self.ovsdb_handler.bulk_wiring = True
+        self.ovsdb_handler.trunk_rpc.update_subport_bindings.return_value = (
+            self.subport_bindings)
+        self.trunk_manager.add_sub_ports.side_effect = (
+            trunk_manager.TrunkManagerError(error='error'))
+        with mock.patch.object(
+                self.ovsdb_handler, '_update_trunk_metadata') as f:
+            status = self.ovsdb_handler.wire_subports_for_trunk(
+                None, self.trunk_id, self.fake_subports,
+                parent_port=self.fake_port)
+        self.assertEqual(constants.TRUNK_ACTIVE_STATUS, status)
+        self.assertEqual(len(self.fake_subports),
+                         self.trunk_manager.add_sub_port.call_count)
+        f.assert_called_once_with(
+            None, self.fake_port, self.trunk_id,
+            [s.port_id for s in self.fake_subports])
+
     @mock.patch('neutron.agent.common.ovs_lib.OVSBridge')
     def test_unwire_subports_for_trunk_port_not_found(self, br):
         self.ovsdb_handler.trunk_rpc.update_subport_bindings.return_value = (
@@ -50,6 +50,18 @@ class TrunkManagerTestCase(base.BaseTestCase):
         with self._resource_fails(trunk_manager.SubPort, 'plug'):
             self.trunk_manager.add_sub_port(None, None, None, None)
 
+    def test_add_sub_ports_plug_fails(self):
+        with self._resource_fails(trunk_manager.SubPort, 'plug'):
+            self.trunk_manager.add_sub_ports(None, [(None, None, None)])
+
+    def test_add_sub_ports_single_transaction(self):
+        bridge = trunk_manager.TrunkBridge.return_value
+        with mock.patch.object(trunk_manager.SubPort, 'plug') as plug:
+            self.trunk_manager.add_sub_ports(
+                'trunk_id', [('port1', 'mac1', 1), ('port2', 'mac2', 2)])
+        self.assertEqual(2, plug.call_count)
+        bridge.ovsdb.transaction.assert_called_once_with(check_error=True)
+
     def test_remove_sub_port_unplug_fails(self):
         with self._resource_fails(trunk_manager.SubPort, 'unplug'):
             self.trunk_manager.remove_sub_port(None, None)
@@ -17,6 +17,7 @@ from neutron_lib.db import api as db_api
 from neutron_lib.plugins import directory
 from neutron_lib import rpc as n_rpc
 from neutron_lib.services.trunk import constants
+from oslo_config import cfg
 from sqlalchemy.orm import exc
 
 from neutron.api.rpc.callbacks import events
@@ -103,6 +104,50 @@ class TrunkSkeletonTest(test_plugin.Ml2PluginV2TestCase):
         for port in updated_subports[trunk['id']]:
             self.assertEqual('trunk_host_id', port[portbindings.HOST_ID])
 
+    def test_update_subport_bindings_bulk_skips_bound_ports(self):
+        cfg.CONF.set_override('trunk_bulk_subport_operations', True)
+        with self.port() as _parent_port:
+            trunk = self._create_test_trunk(_parent_port)
+        subports = []
+        for vid in range(0, 2):
+            with self.port() as new_port:
+                subports.append(trunk_obj.SubPort(
+                    context=self.context,
+                    trunk_id=trunk['id'],
+                    port_id=new_port['port']['id'],
+                    segmentation_type='vlan',
+                    segmentation_id=vid))
+        bound_port = {'id': subports[0].port_id,
+                      'device_owner': constants.TRUNK_SUBPORT_OWNER,
+                      portbindings.HOST_ID: 'trunk_host_id',
+                      portbindings.VIF_TYPE: portbindings.VIF_TYPE_OVS}
+        unbound_port = {'id': subports[1].port_id,
+                        'device_owner': '',
+                        portbindings.HOST_ID: '',
+                        portbindings.VIF_TYPE: portbindings.VIF_TYPE_UNBOUND}
+        updated_port = dict(unbound_port, **{
+            'device_owner': constants.TRUNK_SUBPORT_OWNER,
+            portbindings.HOST_ID: 'trunk_host_id',
+            portbindings.VIF_TYPE: portbindings.VIF_TYPE_OVS})
+        self.mock_update_port.return_value = updated_port
+        test_obj = server.TrunkSkeleton()
+        test_obj._trunk_plugin = self.trunk_plugin
+        test_obj._core_plugin = self.core_plugin
+        with mock.patch.object(
+                self.core_plugin, 'get_port',
+                return_value={portbindings.HOST_ID: 'trunk_host_id'}), \
+                mock.patch.object(self.core_plugin, 'get_ports',
+                                  return_value=[bound_port, unbound_port]):
+            updated_subports = test_obj.update_subport_bindings(
+                self.context, subports=subports)
+
+        self.assertEqual([bound_port, updated_port],
+                         updated_subports[trunk['id']])
+        self.mock_update_port.assert_called_once_with(
+            mock.ANY, subports[1].port_id, mock.ANY)
+        trunk = trunk_obj.Trunk.get_object(self.context, id=trunk['id'])
+        self.assertEqual(constants.TRUNK_BUILD_STATUS, trunk.status)
+
     def test__handle_port_binding_binding_error(self):
         with self.port() as _trunk_port:
             trunk = self._create_test_trunk(_trunk_port)
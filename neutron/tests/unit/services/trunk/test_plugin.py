@@ -18,8 +18,10 @@ from neutron_lib.api.definitions import portbindings
 from neutron_lib.callbacks import events
 from neutron_lib.callbacks import registry
 from neutron_lib.callbacks import resources
+from neutron_lib import exceptions as n_exc
 from neutron_lib.plugins import directory
 from neutron_lib.services.trunk import constants
+from oslo_config import cfg
 import testtools
 
 from neutron.objects import trunk as trunk_objects
@@ -293,6 +295,61 @@ class TrunkPluginTestCase(test_plugin.Ml2PluginV2TestCase):
                 {'sub_ports': [{'port_id': subport['port']['id']}]})
             self.assertEqual(constants.TRUNK_DOWN_STATUS, trunk['status'])
 
+    def test_add_remove_subports_bulk(self):
+        cfg.CONF.set_override('trunk_bulk_subport_operations', True)
+        with self.port() as port, self.port() as subport1, \
+                self.port() as subport2:
+            trunk = self._create_test_trunk(port)
+            subports = [
+                {'segmentation_type': 'vlan', 'segmentation_id': vid,
+                 'port_id': p['port']['id']}
+                for vid, p in ((100, subport1), (101, subport2))]
+            subports.sort(key=lambda subport: subport['port_id'])
+            with mock.patch.object(trunk_objects.SubPort, 'create') as create:
+                trunk = self.trunk_plugin.add_subports(
+                    self.context, trunk['id'], {'sub_ports': subports})
+            self.assertFalse(create.called)
+            by_port = lambda subport: subport['port_id']
+            self.assertEqual(subports,
+                             sorted(trunk['sub_ports'], key=by_port))
+            self.assertEqual(
+                subports,
+                sorted([subport.to_dict() for subport in trunk_objects.
+                        SubPort.get_objects(self.context,
+                                            trunk_id=trunk['id'])],
+                       key=by_port))
+
+            trunk = self.trunk_plugin.remove_subports(
+                self.context, trunk['id'],
+                {'sub_ports': [{'port_id': subports[0]['port_id']}]})
+            self.assertEqual([subports[1]], trunk['sub_ports'])
+            self.assertEqual(
+                [subports[1]['port_id']],
+                [subport.port_id for subport in trunk_objects.SubPort.
+                 get_objects(self.context, trunk_id=trunk['id'])])
+
+    def test_add_subports_bulk_duplicate_segmentation_id(self):
+        cfg.CONF.set_override('trunk_bulk_subport_operations', True)
+        with self.port() as port, self.port() as subport1, \
+                self.port() as subport2:
+            trunk = self._create_test_trunk(
+                port, [create_subport_dict(subport1['port']['id'])])
+            self.assertRaises(
+                trunk_exc.DuplicateSubPort,
+                self.trunk_plugin.add_subports,
+                self.context, trunk['id'],
+                {'sub_ports': [create_subport_dict(subport2['port']['id'])]})
+
+    def test_add_subports_bulk_port_in_use(self):
+        cfg.CONF.set_override('trunk_bulk_subport_operations', True)
+        with self.port() as port, self.port(device_id='vm') as subport:
+            trunk = self._create_test_trunk(port)
+            self.assertRaises(
+                n_exc.PortInUse,
+                self.trunk_plugin.add_subports,
+                self.context, trunk['id'],
+                {'sub_ports': [create_subport_dict(subport['port']['id'])]})
+
     def test__trigger_trunk_status_change_vif_type_changed_unbound(self):
         callback = register_mock_callback(resources.TRUNK, events.AFTER_UPDATE)
         with self.port() as parent: